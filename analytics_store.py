@@ -0,0 +1,400 @@
+"""
+Armazenamento colunar para estatísticas de jogos finalizados.
+
+Cada coluna é um arquivo binário bruto (um dtype NumPy de tamanho fixo por linha)
+dentro de um diretório; novas linhas são acumuladas em memória e anexadas ao
+fim dos arquivos em lote, por uma thread de escrita da tabela (o event loop só
+entrega o lote à fila, como em game_archive). A leitura usa `np.memmap`, então as consultas rodam
+como agregações vetorizadas sobre as colunas sem criar objetos Python por jogo.
+
+NumPy é opcional: sem ele o módulo importa, mas `AnalyticsStore` não pode ser criado.
+"""
+import logging
+import os
+import queue
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depende do ambiente
+    np = None
+
+from card_catalog import NAME_CODES
+from game_manager import DECK_SIZE
+from models import EffectCode, GameState, GameStatus
+from observer_pattern import Observer, GameEvent, GameEventType
+
+logger = logging.getLogger(__name__)
+
+FLUSH_EVERY = 1024
+
+STATUS_CODES = {GameStatus.FINISHED: 0, GameStatus.ABANDONED: 1}
+MOVE_PLAY, MOVE_PASS, MOVE_TIMEOUT = 0, 1, 2
+N_EFFECTS = len(EffectCode)
+
+# nome -> (dtype, formato de cada linha)
+GAME_COLUMNS: Dict[str, Tuple[str, tuple]] = {
+    "game_id": ("<i8", ()),
+    "status": ("<i1", ()),           # STATUS_CODES
+    "player_count": ("<i2", ()),
+    "winner": ("<i2", ()),           # -1 = sem vencedor (abandonado)
+    "deck_count": ("<i1", ()),
+    "plays": ("<i4", ()),            # cartas jogadas
+    "passes": ("<i4", ()),           # passagens pedidas pelo jogador
+    "timeouts": ("<i4", ()),         # passagens forçadas por tempo esgotado
+    "cards_drawn": ("<i4", ()),      # cartas compradas ao passar a vez
+    "reshuffles": ("<i4", ()),       # vezes que o descarte voltou ao monte
+    "effects": ("<i4", (N_EFFECTS,)),  # jogadas por EffectCode
+}
+
+MOVE_COLUMNS: Dict[str, Tuple[str, tuple]] = {
+    "game_id": ("<i8", ()),
+    "seq": ("<i4", ()),
+    "player": ("<i2", ()),
+    "kind": ("<i1", ()),             # MOVE_PLAY / MOVE_PASS / MOVE_TIMEOUT
+    "face": ("<i1", ()),             # código da carta jogada, -1 em passagens
+    "effect": ("<i1", ()),           # EffectCode, -1 em passagens
+    "cards_drawn": ("<i2", ()),
+}
+
+
+class ColumnStore:
+    """Tabela append-only: um arquivo por coluna, lido via memmap"""
+
+    def __init__(self, directory: str, columns: Dict[str, Tuple[str, tuple]]):
+        if np is None:
+            raise RuntimeError("numpy não está instalado")
+        self.directory = directory
+        self.columns = columns
+        self._dtypes = {name: np.dtype(dtype) for name, (dtype, _) in columns.items()}
+        self._row_bytes = {
+            name: self._dtypes[name].itemsize * int(np.prod(shape, dtype=np.int64))
+            for name, (_, shape) in columns.items()
+        }
+        self._pending: Dict[str, list] = {name: [] for name in columns}
+        self._pending_rows = 0
+        # Lotes (colunas, linhas) na ordem em que serão anexados; None encerra a thread
+        self._queue: "queue.Queue[Optional[Tuple[Dict[str, object], int]]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self.write_errors = 0
+        os.makedirs(directory, exist_ok=True)
+        self._rows = self._recover()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.col")
+
+    def _recover(self) -> int:
+        """
+        Linhas completas em disco; uma escrita interrompida é truncada em todas as colunas.
+        Uma coluna sem arquivo (nova no esquema ou apagada) não derruba as outras:
+        é criada com zeros até o número de linhas das existentes.
+        """
+        counts = [
+            os.path.getsize(self._path(name)) // self._row_bytes[name]
+            for name in self.columns if os.path.exists(self._path(name))
+        ]
+        rows = min(counts, default=0)
+        for name in self.columns:
+            path = self._path(name)
+            size = rows * self._row_bytes[name]
+            if not os.path.exists(path) or os.path.getsize(path) != size:
+                with open(path, "a+b") as f:
+                    f.truncate(size)  # trunca ou completa com zeros
+        return rows
+
+    def __len__(self) -> int:
+        return self._rows + self._pending_rows
+
+    def append(self, **row) -> None:
+        """Acumula uma linha; a cada FLUSH_EVERY linhas entrega o lote à thread de escrita"""
+        for name, values in self._pending.items():
+            values.append(row[name])
+        self._pending_rows += 1
+        if self._pending_rows >= FLUSH_EVERY:
+            self.submit()
+
+    def append_batch(self, columns: Dict[str, "np.ndarray"]) -> None:
+        """Anexa várias linhas de uma vez, já como arrays (carga em massa); espera a gravação"""
+        sizes = {len(columns[name]) for name in self.columns}
+        if len(sizes) != 1:
+            raise ValueError("Colunas com tamanhos diferentes")
+        self.submit()
+        self._enqueue(columns, sizes.pop())
+        self.join()
+
+    def submit(self) -> None:
+        """Entrega as linhas pendentes à thread de escrita, sem I/O no chamador"""
+        if not self._pending_rows:
+            return
+        self._enqueue(self._pending, self._pending_rows)
+        self._pending = {name: [] for name in self.columns}
+        self._pending_rows = 0
+
+    def _enqueue(self, columns: Dict[str, object], rows: int) -> None:
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_queued, name="analytics-store", daemon=True)
+            self._writer.start()
+        self._queue.put((columns, rows))
+
+    def _write_queued(self) -> None:
+        while True:
+            batch = self._queue.get()
+            try:
+                if batch is None:
+                    return
+                self._write(*batch)
+            except Exception:
+                self.write_errors += 1
+                logger.exception("Falha ao gravar %d linhas em %s", batch[1], self.directory)
+            finally:
+                self._queue.task_done()
+
+    def _write(self, columns: Dict[str, object], rows: int) -> None:
+        for name, (_, shape) in self.columns.items():
+            data = np.ascontiguousarray(columns[name], dtype=self._dtypes[name]).reshape((-1,) + shape)
+            with open(self._path(name), "ab") as f:
+                f.write(data.tobytes())
+        self._rows += rows  # só depois de todas as colunas: leitores nunca veem linhas parciais
+
+    def join(self) -> None:
+        """Espera a thread de escrita gravar os lotes já entregues (bloqueia: fora do event loop)"""
+        if self._writer is not None:
+            self._queue.join()
+
+    def flush(self) -> None:
+        """Grava as linhas pendentes e espera a gravação (bloqueia)"""
+        self.submit()
+        self.join()
+
+    def close(self) -> None:
+        self.submit()
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+
+    @property
+    def rows(self) -> int:
+        """Linhas já gravadas em disco"""
+        return self._rows
+
+    def column(self, name: str, rows: Optional[int] = None) -> "np.ndarray":
+        """
+        Coluna mapeada do disco (somente leitura), só com as linhas já gravadas
+        (ou as `rows` primeiras). Não grava as pendentes: pode ser chamada de outra
+        thread enquanto o event loop anexa linhas; quem quiser os dados mais
+        recentes chama flush() antes.
+        """
+        _, shape = self.columns[name]
+        rows = self._rows if rows is None else rows
+        if not rows:
+            return np.empty((0,) + shape, dtype=self._dtypes[name])
+        return np.memmap(self._path(name), dtype=self._dtypes[name], mode="r", shape=(rows,) + shape)
+
+
+class AnalyticsStore:
+    """Jogos finalizados (e, opcionalmente, cada jogada) com consultas vetorizadas"""
+
+    def __init__(self, directory: str, record_moves: bool = False):
+        self.games = ColumnStore(os.path.join(directory, "games"), GAME_COLUMNS)
+        self.moves = ColumnStore(os.path.join(directory, "moves"), MOVE_COLUMNS) if record_moves else None
+
+    def _tables(self) -> List[ColumnStore]:
+        return [self.games] if self.moves is None else [self.games, self.moves]
+
+    def submit(self) -> None:
+        """Entrega as linhas pendentes às threads de escrita (pode rodar no event loop)"""
+        for table in self._tables():
+            table.submit()
+
+    def join(self) -> None:
+        """Espera as gravações entregues (bloqueia: chame via run_blocking)"""
+        for table in self._tables():
+            table.join()
+
+    def flush(self) -> None:
+        self.submit()
+        self.join()
+
+    def close(self) -> None:
+        for table in self._tables():
+            table.close()
+
+    def snapshot(self) -> "GameColumns":
+        """Colunas dos jogos fixadas no número de linhas gravadas agora"""
+        return GameColumns(self.games, self.games.rows)
+
+    def win_rate_by_seat(self, player_count: Optional[int] = None) -> List[float]:
+        return self.snapshot().win_rate_by_seat(player_count)
+
+    def average_game_length(self, player_count: Optional[int] = None) -> Optional[float]:
+        return self.snapshot().average_game_length(player_count)
+
+    def effect_frequency(self, player_count: Optional[int] = None) -> Dict[str, float]:
+        return self.snapshot().effect_frequency(player_count)
+
+    def deck_exhaustion_rate(self, player_count: Optional[int] = None) -> Optional[float]:
+        return self.snapshot().deck_exhaustion_rate(player_count)
+
+    def summary(self, player_count: Optional[int] = None) -> Dict[str, object]:
+        return self.snapshot().summary(player_count)
+
+
+class GameColumns:
+    """
+    Consultas vetorizadas sobre as `rows` primeiras linhas da tabela de jogos.
+    Fixar o número de linhas deixa todas as colunas de uma consulta alinhadas,
+    mesmo que o event loop grave novos jogos durante a leitura.
+    """
+    def __init__(self, table: ColumnStore, rows: int):
+        self._table = table
+        self._rows = rows
+        self._cache: Dict[str, "np.ndarray"] = {}
+
+    def __getitem__(self, name: str) -> "np.ndarray":
+        column = self._cache.get(name)
+        if column is None:
+            column = self._cache[name] = self._table.column(name, self._rows)
+        return column
+
+    def _finished(self, player_count: Optional[int] = None) -> "np.ndarray":
+        mask = self["status"] == STATUS_CODES[GameStatus.FINISHED]
+        if player_count is not None:
+            mask &= self["player_count"] == player_count
+        return mask
+
+    def win_rate_by_seat(self, player_count: Optional[int] = None) -> List[float]:
+        """Fração de vitórias de cada assento entre os jogos em que o assento existia"""
+        mask = self._finished(player_count)
+        counts = self["player_count"][mask].astype(np.int64)
+        if not counts.size:
+            return []
+        seats = int(counts.max())
+        wins = np.bincount(self["winner"][mask], minlength=seats)[:seats]
+        # Jogos com pelo menos s+1 jogadores = soma acumulada reversa do histograma
+        present = np.cumsum(np.bincount(counts, minlength=seats + 1)[::-1])[::-1][1:seats + 1]
+        return (wins / np.maximum(present, 1)).tolist()
+
+    def average_game_length(self, player_count: Optional[int] = None) -> Optional[float]:
+        """Média de turnos (jogadas + passagens) dos jogos finalizados"""
+        mask = self._finished(player_count)
+        if not mask.any():
+            return None
+        turns = self["plays"][mask].astype(np.int64) + self["passes"][mask] + self["timeouts"][mask]
+        return float(turns.mean())
+
+    def effect_frequency(self, player_count: Optional[int] = None) -> Dict[str, float]:
+        """Fração das cartas jogadas que gerou cada efeito"""
+        mask = self._finished(player_count)
+        totals = self["effects"][mask].sum(axis=0, dtype=np.int64)
+        played = int(totals.sum())
+        return {code.name: (int(totals[code]) / played if played else 0.0) for code in EffectCode}
+
+    def deck_exhaustion_rate(self, player_count: Optional[int] = None) -> Optional[float]:
+        """Fração dos jogos finalizados em que o monte acabou e o descarte foi reembaralhado"""
+        mask = self._finished(player_count)
+        if not mask.any():
+            return None
+        return float((self["reshuffles"][mask] > 0).mean())
+
+    def summary(self, player_count: Optional[int] = None) -> Dict[str, object]:
+        """Todas as estatísticas (para a rota da API)"""
+        return {
+            "jogos_finalizados": int(self._finished(player_count).sum()),
+            "jogos_abandonados": int((self["status"] == STATUS_CODES[GameStatus.ABANDONED]).sum()),
+            "vitorias_por_assento": self.win_rate_by_seat(player_count),
+            "duracao_media": self.average_game_length(player_count),
+            "frequencia_efeitos": self.effect_frequency(player_count),
+            "taxa_esgotamento_baralho": self.deck_exhaustion_rate(player_count),
+        }
+
+
+@dataclass(slots=True)
+class GameCounters:
+    """Contadores de um jogo em andamento, acumulados a partir dos deltas"""
+    deck_count: int = 1
+    plays: int = 0
+    passes: int = 0
+    timeouts: int = 0
+    cards_drawn: int = 0
+    seq: int = 0  # última jogada gravada na tabela de jogadas
+    effects: List[int] = field(default_factory=lambda: [0] * N_EFFECTS)
+
+
+class AnalyticsObserver(Observer):
+    """
+    Acumula contadores por jogo a partir dos deltas dos eventos e grava
+    uma linha no armazenamento colunar quando o jogo termina ou é abandonado.
+    Jogos importados (migração, checkpoint, seguidor) contam a partir da importação.
+    """
+    def __init__(self, store: AnalyticsStore):
+        self.store = store
+        self._live: Dict[int, GameCounters] = {}
+
+    def update(self, game_state: GameState):
+        pass
+
+    def on_event(self, event: GameEvent):
+        counters = self._live.get(event.game_id)
+        if event.type == GameEventType.GAME_CREATED:
+            self._live[event.game_id] = GameCounters(deck_count=event.delta.get("deck_count", 1))
+            return
+        if event.type == GameEventType.GAME_IMPORTED:
+            game = event.game_state
+            cards = len(game.deck) + len(game.discard_pile) + sum(len(player.hand) for player in game.players)
+            self._live[event.game_id] = GameCounters(deck_count=max(1, round(cards / DECK_SIZE)))
+            return
+        if counters is None:
+            return
+        if event.type == GameEventType.GAME_EXPORTED:
+            del self._live[event.game_id]  # migrado: as estatísticas parciais ficam para trás
+            return
+        delta = event.delta
+        if event.type == GameEventType.CARD_PLAYED:
+            counters.plays += 1
+            counters.effects[delta["effect"]] += 1
+            self._record_move(event, counters, MOVE_PLAY,
+                              NAME_CODES.get(delta["played_card"], -1), int(delta["effect"]), 0)
+        elif event.type in (GameEventType.TURN_PASSED, GameEventType.TURN_TIMED_OUT):
+            timed_out = event.type == GameEventType.TURN_TIMED_OUT
+            if timed_out:
+                counters.timeouts += 1
+            else:
+                counters.passes += 1
+            counters.cards_drawn += delta["cards_drawn"]
+            self._record_move(event, counters, MOVE_TIMEOUT if timed_out else MOVE_PASS,
+                              -1, -1, delta["cards_drawn"])
+        elif event.type in (GameEventType.GAME_FINISHED, GameEventType.GAME_ABANDONED):
+            del self._live[event.game_id]
+            game = event.game_state
+            self.store.games.append(
+                game_id=event.game_id,
+                status=STATUS_CODES[game.status],
+                player_count=len(game.players),
+                winner=-1 if game.winner is None else game.winner,
+                deck_count=counters.deck_count,
+                plays=counters.plays,
+                passes=counters.passes,
+                timeouts=counters.timeouts,
+                cards_drawn=counters.cards_drawn,
+                reshuffles=game.deck.reshuffles,
+                effects=counters.effects,
+            )
+
+    def _record_move(self, event: GameEvent, counters: GameCounters, kind: int,
+                     face: int, effect: int, cards_drawn: int) -> None:
+        moves = self.store.moves
+        if moves is None:
+            return
+        counters.seq += 1
+        moves.append(
+            game_id=event.game_id,
+            seq=counters.seq,
+            player=event.delta["player_id"],
+            kind=kind,
+            face=face,
+            effect=effect,
+            cards_drawn=cards_drawn,
+        )
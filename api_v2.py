@@ -0,0 +1,201 @@
+"""
+API v2 (compacta) do UNO.
+
+Convive com as rotas v1 de main.py, mas troca mensagens e nomes por números:
+- cartas são códigos do catálogo fixo (ver /catalogo e card_catalog.py);
+- cores são índices em PLAYABLE_COLORS (0=RED, 1=BLUE, 2=GREEN, 3=YELLOW);
+- efeitos são valores de EffectCode;
+- rotas que alteram o jogo devolvem apenas o delta do estado.
+
+Chaves do delta:
+    v   versão do estado após a jogada
+    n   próximo jogador
+    c   carta jogada (código)
+    e   efeito (EffectCode)
+    col cor atual
+    h   cartas restantes na mão de quem jogou
+    t   jogador afetado pelo efeito
+    d   quantidade de cartas compradas pelo jogador afetado
+    dir direção do jogo (0=horário, 1=anti-horário), só quando muda
+    w   vencedor, só quando o jogo termina
+    pd  compra acumulada pendente (regra de acúmulo de +2/+4)
+    k   cartas compradas por quem passou a vez (códigos), só em /passa
+
+/jogar e /passa aceitam `v`, a versão do estado vista pelo cliente: se o jogo
+já mudou, a jogada é recusada com 409 e o corpo {"v": versão atual}.
+"""
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Header, HTTPException, Request, Response
+
+from models import Card, CardColor, EffectOutcome, GameState, GameStatus, PlayDirection
+from card_catalog import PLAYABLE_COLORS, card_code_or_name
+from game_manager import GameManager, VersionConflictError
+from game_locks import GameLockRegistry
+from idempotency import IdempotencyCache, IdempotencyKeyConflict, IDEMPOTENCY_HEADER, REPLAYED_HEADER
+from memory_budget import AdmissionController, AdmissionRejected, estimate_new_game_bytes
+from serialization import render
+from rules import parse_ruleset
+
+COLOR_CODES: Dict[CardColor, int] = {color: code for code, color in enumerate(PLAYABLE_COLORS)}
+DIRECTION_CODES: Dict[PlayDirection, int] = {PlayDirection.CLOCKWISE: 0, PlayDirection.COUNTER_CLOCKWISE: 1}
+
+
+def _color_code(color: Optional[CardColor]) -> Optional[int]:
+    return COLOR_CODES.get(color) if color else None
+
+
+def play_delta(game: GameState, player_id: int, card: Card, outcome: EffectOutcome) -> Dict[str, Any]:
+    """Delta compacto de uma jogada"""
+    delta = {
+        "v": game.version,
+        "n": game.current_player_index,
+        "c": card_code_or_name(card),
+        "e": int(outcome.code),
+        "col": _color_code(game.current_color),
+        "h": len(game.players[player_id].hand)
+    }
+    if outcome.target_player is not None:
+        delta["t"] = outcome.target_player
+    if outcome.cards_drawn:
+        delta["d"] = len(outcome.cards_drawn)
+    if outcome.pending_draw:
+        delta["pd"] = outcome.pending_draw
+    if outcome.new_direction is not None:
+        delta["dir"] = DIRECTION_CODES[outcome.new_direction]
+    if game.status == GameStatus.FINISHED:
+        delta["w"] = game.winner
+    return delta
+
+
+def pass_delta(game: GameState, player_id: int, cards: List[Card]) -> Dict[str, Any]:
+    """Delta compacto de uma passagem de vez"""
+    delta = {
+        "v": game.version,
+        "n": game.current_player_index,
+        "h": len(game.players[player_id].hand)
+    }
+    if cards:
+        delta["k"] = [card_code_or_name(card) for card in cards]
+    return delta
+
+
+def _respond(payload: Dict[str, Any], request: Request) -> Response:
+    content, media_type = render(lambda compact: payload, request.headers.get("accept"))
+    return Response(content=content, media_type=media_type)
+
+
+def create_v2_router(manager: GameManager, game_locks: GameLockRegistry,
+                     idempotency: Optional[IdempotencyCache] = None,
+                     admission: Optional[AdmissionController] = None) -> APIRouter:
+    """
+    Cria as rotas v2 ligadas ao GameManager informado
+    Com `idempotency`, /jogar e /passa aceitam o cabeçalho Idempotency-Key
+    Com `admission`, a criação de jogos respeita o orçamento de memória (503 + Retry-After)
+    """
+    router = APIRouter(prefix="/v2", tags=["v2"])
+    idempotency = idempotency if idempotency is not None else IdempotencyCache()
+
+    async def _mutate(id_jogo: int, jogador: int, idempotency_key: Optional[str],
+                      fingerprint: tuple, operation, request: Request,
+                      expected_version: Optional[int] = None) -> Response:
+        """
+        Executa a jogada sob o lock do jogo, uma vez por Idempotency-Key
+        Versões desatualizadas são recusadas antes de esperar o lock
+        """
+        key = ("v2", id_jogo, jogador, idempotency_key) if idempotency_key else None
+        try:
+            delta, replayed = await idempotency.run(
+                key, fingerprint + (expected_version,), game_locks.hold(id_jogo), operation,
+                lambda: manager.check_version(id_jogo, expected_version)
+            )
+        except VersionConflictError as e:
+            raise HTTPException(status_code=409, detail={"v": e.current_version})
+        except IdempotencyKeyConflict as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        response = _respond(delta, request)
+        if replayed:
+            response.headers[REPLAYED_HEADER] = "true"
+        return response
+
+    @router.post("/jogos")
+    async def criar_jogo(jogadores: int, request: Request, regras: Optional[str] = None, festa: bool = False,
+                         semente: Optional[int] = None):
+        """Cria um jogo e devolve id, versão e a carta inicial (`semente` fixa o embaralhamento)"""
+        try:
+            ruleset = parse_ruleset(regras)
+            manager.validar_novo_jogo(jogadores, festa, seed=semente)  # antes da admissão
+            if admission is not None:
+                admission.check(estimate_new_game_bytes(jogadores))
+            game_id = manager.novo_jogo(jogadores, ruleset, festa, seed=semente)
+        except AdmissionRejected as e:
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        game = manager.get_game_state(game_id)
+        top_card = game.get_top_discard_card()
+        return _respond({
+            "id": game_id,
+            "v": game.version,
+            "n": game.current_player_index,
+            "top": card_code_or_name(top_card) if top_card else None,
+            "col": _color_code(game.current_color)
+        }, request)
+
+    @router.get("/jogos/{id_jogo}/vez")
+    async def jogador_da_vez(id_jogo: int, request: Request):
+        """Jogador da vez e versão atual do estado"""
+        try:
+            snapshot = manager.get_snapshot(id_jogo)
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        return _respond({"v": snapshot.version, "n": snapshot.current_player}, request)
+
+    @router.get("/jogos/{id_jogo}/jogadores/{id_jogador}/mao")
+    async def mao_jogador(id_jogo: int, id_jogador: int, request: Request):
+        """Mão do jogador como lista de códigos de carta"""
+        try:
+            snapshot = manager.get_snapshot(id_jogo)
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        if not 0 <= id_jogador < snapshot.player_count:
+            raise HTTPException(status_code=404, detail="Jogador não encontrado")
+        return _respond({
+            "v": snapshot.version,
+            "cards": [card_code_or_name(card) for card in snapshot.hand(id_jogador)]
+        }, request)
+
+    @router.put("/jogos/{id_jogo}/jogar")
+    async def jogar(id_jogo: int, jogador: int, carta: int, request: Request,
+                    cor: Optional[int] = None, alvo: Optional[int] = None, v: Optional[int] = None,
+                    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER)):
+        """
+        Joga a carta de índice `carta` da mão; `cor` é o índice da cor escolhida
+        e `alvo` o jogador da troca de mão (regra 7-0); `v` é a versão esperada
+        """
+        chosen_color = None
+        if cor is not None:
+            if not 0 <= cor < len(PLAYABLE_COLORS):
+                raise HTTPException(status_code=400, detail="Cor inválida")
+            chosen_color = PLAYABLE_COLORS[cor]
+
+        def operation():
+            game, played_card, outcome = manager.resolver_jogada(id_jogo, jogador, carta, chosen_color, alvo, v)
+            return play_delta(game, jogador, played_card, outcome)
+
+        return await _mutate(id_jogo, jogador, idempotency_key, ("jogar", carta, cor, alvo), operation, request, v)
+
+    @router.put("/jogos/{id_jogo}/passa")
+    async def passar(id_jogo: int, jogador: int, request: Request, v: Optional[int] = None,
+                     idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER)):
+        """Passa a vez comprando uma carta; `v` é a versão esperada"""
+
+        def operation():
+            game, cards = manager.resolver_passagem(id_jogo, jogador, expected_version=v)
+            return pass_delta(game, jogador, cards)
+
+        return await _mutate(id_jogo, jogador, idempotency_key, ("passa",), operation, request, v)
+
+    return router
@@ -0,0 +1,68 @@
+"""
+Benchmark das consultas do armazenamento colunar.
+
+Grava N jogos sintéticos em lote (direto nas colunas) e mede o tempo de
+cada consulta vetorizada sobre os arquivos mapeados em memória.
+
+Uso: python benchmarks/bench_analytics.py [--jogos 2000000] [--dir /tmp/uno-analytics]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import numpy as np
+
+from analytics_store import AnalyticsStore, N_EFFECTS
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jogos", type=int, default=2_000_000)
+    parser.add_argument("--dir", default=None)
+    args = parser.parse_args()
+
+    directory = args.dir or tempfile.mkdtemp(prefix="uno-analytics-")
+    rng = np.random.default_rng(1)
+    n = args.jogos
+    players = rng.integers(2, 11, n)
+    batch = {
+        "game_id": np.arange(n),
+        "status": (rng.random(n) < 0.05).astype(np.int8),
+        "player_count": players,
+        "winner": (rng.random(n) * players).astype(np.int16),
+        "deck_count": np.ones(n),
+        "plays": rng.integers(10, 200, n),
+        "passes": rng.integers(0, 100, n),
+        "timeouts": rng.integers(0, 5, n),
+        "cards_drawn": rng.integers(0, 150, n),
+        "reshuffles": rng.poisson(0.3, n),
+        "effects": rng.integers(0, 20, (n, N_EFFECTS)),
+    }
+
+    try:
+        store = AnalyticsStore(directory)
+        start = time.perf_counter()
+        store.games.append_batch(batch)
+        print(f"{n:,} jogos gravados em {time.perf_counter() - start:.2f} s")
+
+        store = AnalyticsStore(directory)  # reabre: nada carregado em objetos Python
+        for name in ("win_rate_by_seat", "average_game_length", "effect_frequency",
+                     "deck_exhaustion_rate", "summary"):
+            start = time.perf_counter()
+            getattr(store, name)()
+            print(f"{name}: {(time.perf_counter() - start) * 1000:.1f} ms")
+        start = time.perf_counter()
+        store.summary(player_count=4)
+        print(f"summary(player_count=4): {(time.perf_counter() - start) * 1000:.1f} ms")
+    finally:
+        if args.dir is None:
+            shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
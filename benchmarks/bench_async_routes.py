@@ -0,0 +1,93 @@
+"""
+Benchmark de operações/s: rotas síncronas (threadpool) vs. rotas async (main.app).
+
+As duas aplicações executam as mesmas chamadas do GameManager; a diferença é
+só o modo de execução. O tráfego é um mix de leituras (jogador da vez, mão)
+e jogadas (passa) em vários jogos, com `--concorrencia` clientes simultâneos.
+
+Uso: python benchmarks/bench_async_routes.py [--requisicoes 5000] [--concorrencia 64]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import httpx
+from fastapi import FastAPI, HTTPException
+
+import main
+from game_manager import GameManager
+
+
+def build_threadpool_app() -> FastAPI:
+    """Mesmas rotas, declaradas com `def` (cada requisição passa pelo threadpool)"""
+    app = FastAPI()
+    manager = GameManager()
+
+    @app.get("/novoJogo")
+    def novo_jogo(quantidadeJog: int):
+        return {"game_id": manager.novo_jogo(quantidadeJog)}
+
+    @app.get("/jogo/{id_jogo}/jogador_da_vez")
+    def jogador_da_vez(id_jogo: int):
+        return {"game_id": id_jogo, "current_player": manager.get_current_player(id_jogo)}
+
+    @app.get("/jogo/{id_jogo}/jogador/{id_jogador}")
+    def ver_cartas_jogador(id_jogo: int, id_jogador: int):
+        cards = manager.get_player_hand(id_jogo, id_jogador)
+        return {"cards": [str(card) for card in cards], "card_count": len(cards)}
+
+    @app.put("/jogo/{id_jogo}/passa")
+    def passar_vez(id_jogo: int, id_jogador: int):
+        try:
+            return manager.passar_vez(id_jogo, id_jogador)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    return app
+
+
+async def drive(app, total: int, concurrency: int, games: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        game_ids = []
+        for _ in range(games):
+            response = await client.get("/novoJogo", params={"quantidadeJog": 2})
+            game_ids.append(response.json()["game_id"])
+
+        counter = iter(range(total))
+
+        async def worker():
+            for i in counter:
+                game_id = game_ids[i % games]
+                kind = i % 3
+                if kind == 0:
+                    await client.get(f"/jogo/{game_id}/jogador_da_vez")
+                elif kind == 1:
+                    await client.get(f"/jogo/{game_id}/jogador/0")
+                else:
+                    current = (await client.get(f"/jogo/{game_id}/jogador_da_vez")).json()["current_player"]
+                    await client.put(f"/jogo/{game_id}/passa", params={"id_jogador": current})
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return time.perf_counter() - start
+
+
+def main_bench():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requisicoes", type=int, default=5000)
+    parser.add_argument("--concorrencia", type=int, default=64)
+    parser.add_argument("--jogos", type=int, default=50)
+    args = parser.parse_args()
+
+    for label, app in (("threadpool (def)", build_threadpool_app()), ("async (main.app)", main.app)):
+        elapsed = asyncio.run(drive(app, args.requisicoes, args.concorrencia, args.jogos))
+        print(f"{label:<20} {args.requisicoes / elapsed:10.0f} operações/s")
+
+
+if __name__ == "__main__":
+    main_bench()
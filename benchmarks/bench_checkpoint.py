@@ -0,0 +1,61 @@
+"""
+Benchmark do checkpoint mapeado em memória.
+
+Cria N jogos em andamento, grava o checkpoint e mede a reabertura (o tempo
+até o servidor poder atender) e o custo de carregar um jogo na primeira
+vez que ele é tocado.
+
+Uso: python benchmarks/bench_checkpoint.py [--jogos 100000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from checkpoint import CheckpointReader, collect_entries, write_checkpoint
+from game_manager import GameManager
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jogos", type=int, default=100_000)
+    parser.add_argument("--toques", type=int, default=10_000)
+    args = parser.parse_args()
+
+    manager = GameManager()
+    for i in range(args.jogos):
+        manager.novo_jogo(2 + i % 3)
+    path = os.path.join(tempfile.mkdtemp(), "jogos.ckpt")
+
+    started = time.perf_counter()
+    entries = list(collect_entries(manager))
+    encoded = time.perf_counter()
+    size = write_checkpoint(path, entries, manager.next_game_id)
+    written = time.perf_counter()
+    print(f"{args.jogos} jogos: {size / 2**20:.1f} MiB, codificar {encoded - started:.2f} s, "
+          f"gravar {written - encoded:.2f} s")
+
+    started = time.perf_counter()
+    restored = GameManager()
+    restored.restaurar_checkpoint(CheckpointReader(path))
+    ready = time.perf_counter() - started
+    print(f"reabertura até atender: {ready * 1000:.2f} ms")
+
+    ids = random.sample(range(1, args.jogos + 1), min(args.toques, args.jogos))
+    started = time.perf_counter()
+    for game_id in ids:
+        restored.get_snapshot(game_id)
+    first = (time.perf_counter() - started) / len(ids)
+    started = time.perf_counter()
+    for game_id in ids:
+        restored.get_snapshot(game_id)
+    warm = (time.perf_counter() - started) / len(ids)
+    print(f"primeiro toque {first * 1e6:.1f} µs por jogo, toques seguintes {warm * 1e6:.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark do modelo interno: dataclasses com __slots__ vs. o modelo pydantic antigo.
+
+Mede o custo de criar um jogo (108 cartas + jogadores + estado) e o custo
+de uma jogada típica (pop do deck, append na mão, append no descarte).
+
+Uso: python benchmarks/bench_models.py
+"""
+import os
+import sys
+import time
+from typing import List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from pydantic import BaseModel, ConfigDict
+
+from card_effects import CardEffectFactory
+from game_manager import GameManager
+from models import Card, CardColor, CardEffectStrategy, CardType, GameState, GameStatus, Player
+
+
+# Réplica do modelo pydantic anterior, só para comparação
+class LegacyCard(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+    id: int
+    color: CardColor
+    type: CardType
+    value: Optional[int] = None
+    effect_strategy: Optional[CardEffectStrategy] = None
+
+class LegacyPlayer(BaseModel):
+    id: int
+    hand: List[LegacyCard] = []
+
+class LegacyGameState(BaseModel):
+    id: int
+    players: List[LegacyPlayer]
+    deck: List[LegacyCard]
+    discard_pile: List[LegacyCard]
+    current_player_index: int
+    status: GameStatus
+
+
+def _faces():
+    faces = []
+    for color in [CardColor.RED, CardColor.BLUE, CardColor.GREEN, CardColor.YELLOW]:
+        faces.append((color, CardType.NUMBER, 0))
+        for value in range(1, 10):
+            faces += [(color, CardType.NUMBER, value)] * 2
+        for card_type in (CardType.SKIP, CardType.REVERSE, CardType.DRAW_TWO):
+            faces += [(color, card_type, None)] * 2
+    faces += [(CardColor.WILD, CardType.WILD, None)] * 4
+    faces += [(CardColor.WILD, CardType.WILD_DRAW_FOUR, None)] * 4
+    return faces
+
+
+FACES = _faces()
+STRATEGY = CardEffectFactory.create_effect(CardType.NUMBER)
+
+
+def build_game(card_cls, player_cls, state_cls, players=4):
+    deck = [card_cls(id=i, color=c, type=t, value=v, effect_strategy=STRATEGY)
+            for i, (c, t, v) in enumerate(FACES)]
+    hands = [player_cls(id=i) for i in range(players)]
+    return state_cls(id=1, players=hands, deck=deck, discard_pile=[deck.pop()],
+                     current_player_index=0, status=GameStatus.IN_PROGRESS)
+
+
+def play_moves(game, moves):
+    for turn in range(moves):
+        player = game.players[turn % len(game.players)]
+        if not game.deck:
+            game.deck.extend(game.discard_pile[:-1])
+            del game.discard_pile[:-1]
+        player.hand.append(game.deck.pop())
+        game.discard_pile.append(player.hand.pop())
+        game.current_player_index = (game.current_player_index + 1) % len(game.players)
+
+
+def timeit(label, fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<45} {elapsed / repeat * 1e6:10.2f} µs")
+    return elapsed / repeat
+
+
+def main():
+    repeat = 2000
+    print("Criação de jogo (108 cartas, 4 jogadores)")
+    old = timeit("  pydantic BaseModel", lambda: build_game(LegacyCard, LegacyPlayer, LegacyGameState), repeat)
+    new = timeit("  dataclass(slots=True)", lambda: build_game(Card, Player, GameState), repeat)
+    print(f"  ganho: {old / new:.1f}x")
+
+    print("Jogadas (1000 por amostra)")
+    legacy_game = build_game(LegacyCard, LegacyPlayer, LegacyGameState)
+    game = build_game(Card, Player, GameState)
+    old = timeit("  pydantic BaseModel", lambda: play_moves(legacy_game, 1000), 200)
+    new = timeit("  dataclass(slots=True)", lambda: play_moves(game, 1000), 200)
+    print(f"  ganho: {old / new:.1f}x")
+
+    print("GameManager.novo_jogo completo")
+    manager = GameManager()
+    timeit("  novo_jogo(4)", lambda: manager.novo_jogo(4), repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Benchmark da busca de sugestões (Monte Carlo determinizado).
+
+Mede quantas simulações completas cabem no orçamento da dica, numa única
+thread e dividindo a busca entre processos.
+
+Uso: python benchmarks/bench_move_search.py [--jogadores 4] [--orcamento 100] [--processos 4]
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from game_manager import GameManager
+from move_search import MoveSearch
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jogadores", type=int, default=4)
+    parser.add_argument("--orcamento", type=float, default=100.0, help="orçamento por busca (ms)")
+    parser.add_argument("--processos", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    manager = GameManager()
+    game = manager.get_game_state(manager.novo_jogo(args.jogadores))
+
+    single = MoveSearch(budget_ms=args.orcamento, cache_size=0)
+    suggestion = single.suggest(game, 0)
+    print(f"1 thread: {suggestion.rollouts:,} simulações em {args.orcamento:.0f} ms "
+          f"({suggestion.rollouts / args.orcamento * 1000:,.0f}/s)")
+
+    pooled = MoveSearch(budget_ms=args.orcamento, workers=args.processos, cache_size=0)
+    try:
+        asyncio.run(pooled.suggest_async(game, 0))  # aquece os processos
+        suggestion = asyncio.run(pooled.suggest_async(game, 0))
+    finally:
+        pooled.shutdown()
+    print(f"{args.processos} processos: {suggestion.rollouts:,} simulações em {args.orcamento:.0f} ms "
+          f"({suggestion.rollouts / args.orcamento * 1000:,.0f}/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark do modo festa: jogadas/s em uma mesa com 1000 jogadores.
+
+Cada jogada do jogador da vez é a primeira carta jogável da mão (ou passa a vez).
+Um observador inscrito em todos os eventos garante que o custo de notificação
+entra na medição.
+
+Uso: python benchmarks/bench_party_mode.py [--jogadores 1000] [--jogadas 20000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from game_manager import GameManager
+from match_tracker import MatchTracker
+from models import GameStatus
+from card_catalog import PLAYABLE_COLORS
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jogadores", type=int, default=1000)
+    parser.add_argument("--jogadas", type=int, default=20000)
+    args = parser.parse_args()
+
+    manager = GameManager()
+    manager.attach(MatchTracker())
+
+    start = time.perf_counter()
+    game_id = manager.novo_jogo(args.jogadores, modo_festa=True)
+    created = time.perf_counter() - start
+    game = manager.get_game_state(game_id)
+    print(f"novo_jogo({args.jogadores}): {created * 1000:.1f} ms, "
+          f"{manager.decks_needed(args.jogadores)} baralhos, {len(game.deck)} cartas no monte")
+
+    # Reverse faz a vez oscilar entre vizinhos, então partidas terminam cedo:
+    # novas mesas são criadas até completar as jogadas (criação fora da medição)
+    moves = 0
+    games = 1
+    elapsed = 0.0
+    while moves < args.jogadas:
+        if game.status != GameStatus.IN_PROGRESS:
+            game_id = manager.novo_jogo(args.jogadores, modo_festa=True)
+            game = manager.get_game_state(game_id)
+            games += 1
+        start = time.perf_counter()
+        while moves < args.jogadas and game.status == GameStatus.IN_PROGRESS:
+            player_id = game.current_player_index
+            top = game.get_top_discard_card()
+            hand = game.players[player_id].hand
+            for index, card in enumerate(hand):
+                if game.rules.can_play(card, top, game.current_color, game.pending_draw):
+                    manager.resolver_jogada(game_id, player_id, index, PLAYABLE_COLORS[moves % 4])
+                    break
+            else:
+                manager.resolver_passagem(game_id, player_id)
+            moves += 1
+        elapsed += time.perf_counter() - start
+    print(f"{moves} jogadas em {games} mesas, {elapsed:.2f} s: {moves / elapsed:,.0f} jogadas/s")
+
+
+if __name__ == "__main__":
+    main()
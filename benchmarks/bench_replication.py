@@ -0,0 +1,79 @@
+"""
+Benchmark da replicação primário/seguidor.
+
+Joga partidas no primário enquanto um seguidor, conectado por socket Unix no
+mesmo processo, aplica o log. Mede os registros por segundo, o tamanho médio
+do registro, a fração enviada como snapshot e o atraso de replicação.
+
+Uso: python benchmarks/bench_replication.py [--jogos 200] [--jogadas 60]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from game_manager import GameManager
+from models import CardColor, GameStatus
+from replication import ReplicationFollower, ReplicationPrimary
+
+
+def _play(manager: GameManager, game_id: int) -> None:
+    game = manager.get_game_state(game_id)
+    if game.status != GameStatus.IN_PROGRESS:
+        return
+    seat = game.current_player_index
+    top = game.get_top_discard_card()
+    for index, card in enumerate(game.players[seat].hand):
+        if game.rules.can_play(card, top, game.current_color, game.pending_draw):
+            manager.jogar_carta(game_id, seat, index, CardColor.RED if card.color == CardColor.WILD else None)
+            return
+    manager.passar_vez(game_id, seat)
+
+
+async def _run(games: int, moves: int) -> None:
+    address = os.path.join(tempfile.mkdtemp(), "replicacao.sock")
+    primary_manager, follower_manager = GameManager(), GameManager()
+    primary = ReplicationPrimary(primary_manager)
+    primary_manager.attach(primary)
+    await primary.start(address)
+    follower = ReplicationFollower(follower_manager)
+    follower.start(address)
+    while not primary.get_metrics()["seguidores"]:
+        await asyncio.sleep(0.01)
+
+    ids = [primary_manager.novo_jogo(2 + i % 3) for i in range(games)]
+    started = time.perf_counter()
+    for _ in range(moves):
+        for game_id in ids:
+            _play(primary_manager, game_id)
+        await asyncio.sleep(0)  # deixa o seguidor aplicar entre as rodadas
+    sent = primary.get_metrics()
+    while follower.applied < sent["registros_enviados"]:
+        await asyncio.sleep(0.001)
+    elapsed = time.perf_counter() - started
+
+    metrics = follower.get_metrics()
+    print(f"{sent['registros_enviados']} registros em {elapsed:.2f} s "
+          f"({sent['registros_enviados'] / elapsed:,.0f}/s com primário e seguidor no mesmo processo)")
+    print(f"tamanho médio {sent['bytes_enviados'] / sent['registros_enviados']:.1f} bytes, "
+          f"snapshots {sent['snapshots_enviados'] / sent['registros_enviados']:.1%}")
+    print(f"atraso: último {metrics['atraso_ms']} ms, máximo {metrics['atraso_max_ms']} ms; "
+          f"divergências {metrics['divergencias']}")
+    follower.promote()
+    await primary.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jogos", type=int, default=200)
+    parser.add_argument("--jogadas", type=int, default=60)
+    args = parser.parse_args()
+    asyncio.run(_run(args.jogos, args.jogadas))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Benchmark do codec binário de snapshots de jogo.
+
+Mede o tamanho do snapshot e o tempo de codificar/decodificar um jogo em
+andamento, para mesas normais e do modo festa.
+
+Uso: python benchmarks/bench_snapshot_codec.py [--repeticoes 20000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from game_manager import GameManager
+from snapshot_codec import decode_game, encode_game
+
+
+def _measure(func, arg, repetitions: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repetitions):
+        func(arg)
+    return (time.perf_counter() - started) / repetitions * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeticoes", type=int, default=20_000)
+    args = parser.parse_args()
+
+    manager = GameManager()
+    for players, party in ((2, False), (4, False), (10, False), (100, True)):
+        game = manager.get_game_state(manager.novo_jogo(players, modo_festa=party))
+        data = encode_game(game)
+        repetitions = max(1, args.repeticoes // players)
+        encode_us = _measure(encode_game, game, repetitions)
+        decode_us = _measure(decode_game, data, repetitions)
+        print(f"{players:>3} jogadores: {len(data):>5} bytes, "
+              f"codificar {encode_us:7.1f} µs, decodificar {decode_us:7.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark do modo espectador.
+
+Mede o custo de entregar uma nova versão do jogo a N espectadores (todos
+no mesmo event loop) e quantas vezes o estado foi serializado.
+
+Uso: python benchmarks/bench_spectator.py [--espectadores 10000] [--versoes 50]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from game_manager import GameManager
+from spectator import SpectatorHub
+
+
+async def _consume(stream, received):
+    async for _ in stream:
+        received[0] += 1
+
+
+async def _run(spectators: int, versions: int):
+    manager = GameManager()
+    hub = SpectatorHub(manager)
+    manager.attach(hub)
+    game_id = manager.novo_jogo(2)
+    game = manager.get_game_state(game_id)
+
+    received = [0]
+    tasks = [asyncio.create_task(_consume(hub.subscribe(game_id), received)) for _ in range(spectators)]
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    for _ in range(versions):
+        manager.passar_vez(game_id, game.current_player_index)
+        await asyncio.sleep(0)  # cada espectador acorda e escreve a versão nova
+        await asyncio.sleep(0)
+    elapsed = time.perf_counter() - started
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return elapsed, received[0], hub.frames_built
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--espectadores", type=int, default=10_000)
+    parser.add_argument("--versoes", type=int, default=50)
+    args = parser.parse_args()
+
+    for spectators in (100, args.espectadores):
+        elapsed, received, built = asyncio.run(_run(spectators, args.versoes))
+        print(f"{spectators:,} espectadores: {elapsed / args.versoes * 1000:.2f} ms por versão, "
+              f"{elapsed / max(received, 1) * 1e6:.2f} µs por entrega, {built} serializações")
+
+
+if __name__ == "__main__":
+    main()
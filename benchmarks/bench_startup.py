@@ -0,0 +1,123 @@
+"""
+Benchmark da partida do servidor: tempo de importação, tempo até a primeira
+resposta e memória (RSS/PSS) de cada worker do pre-fork (main.serve).
+
+- importação: `import main` em um interpretador novo (mediana de `--repeticoes`);
+- primeira resposta: create_app + primeira requisição em processo (ASGI), e do
+  início do processo até todos os workers do pre-fork responderem por HTTP;
+- memória: RSS e PSS (/proc/<pid>/smaps_rollup) de cada worker depois de
+  `--jogos` jogos criados em cada um. PSS divide as páginas compartilhadas
+  entre os processos; RSS - PSS é o que o copy-on-write economiza.
+
+Uso: python benchmarks/bench_startup.py [--workers 4] [--jogos 200] [--porta 18000]
+"""
+import argparse
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, ROOT)
+
+IMPORT_SCRIPT = """
+import time
+start = time.perf_counter()
+import main
+print(time.perf_counter() - start)
+"""
+
+FIRST_RESPONSE_SCRIPT = """
+import asyncio, time
+import httpx
+import main
+start = time.perf_counter()
+main.preload()
+app = main.create_app({})
+created = time.perf_counter()
+
+async def first():
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://uno") as client:
+        (await client.get("/novoJogo", params={"quantidadeJog": 4})).raise_for_status()
+
+asyncio.run(first())
+print(created - start, time.perf_counter() - start)
+"""
+
+
+def _python(script: str) -> str:
+    return subprocess.run([sys.executable, "-c", script], cwd=ROOT, check=True,
+                          capture_output=True, text=True).stdout
+
+
+def _memory(pid: int) -> dict:
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as file:
+        for line in file:
+            name, _, rest = line.partition(":")
+            if name in ("Rss", "Pss", "Shared_Clean", "Shared_Dirty"):
+                values[name] = int(rest.split()[0])  # kB
+    return values
+
+
+def _children(pid: int) -> list:
+    with open(f"/proc/{pid}/task/{pid}/children") as file:
+        return [int(child) for child in file.read().split()]
+
+
+def _wait_ready(port: int, deadline: float) -> None:
+    while True:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1).read()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.01)
+
+
+def bench_prefork(workers: int, games: int, port: int) -> None:
+    script = f"import main; main.serve('127.0.0.1', {port}, {workers})"
+    start = time.monotonic()
+    parent = subprocess.Popen([sys.executable, "-c", script], cwd=ROOT,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        for index in range(workers):
+            _wait_ready(port + index, start + 30)
+        print(f"pre-fork até {workers} workers responderem: {(time.monotonic() - start) * 1000:8.1f} ms")
+        for index in range(workers):
+            for _ in range(games):
+                urllib.request.urlopen(f"http://127.0.0.1:{port + index}/novoJogo?quantidadeJog=4").read()
+        pids = _children(parent.pid) if workers > 1 else [parent.pid]
+        print(f"{'worker':>8} {'RSS (MiB)':>10} {'PSS (MiB)':>10} {'compart. (MiB)':>15}")
+        for pid in pids:
+            memory = _memory(pid)
+            shared = memory["Shared_Clean"] + memory["Shared_Dirty"]
+            print(f"{pid:>8} {memory['Rss'] / 1024:10.1f} {memory['Pss'] / 1024:10.1f} {shared / 1024:15.1f}")
+    finally:
+        parent.send_signal(signal.SIGTERM)
+        parent.wait(timeout=30)
+
+
+def main_bench():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--jogos", type=int, default=200)
+    parser.add_argument("--porta", type=int, default=18000)
+    args = parser.parse_args()
+
+    imports = [float(_python(IMPORT_SCRIPT)) for _ in range(args.repeticoes)]
+    print(f"import main:                     {statistics.median(imports) * 1000:8.1f} ms")
+    created, responded = zip(*(map(float, _python(FIRST_RESPONSE_SCRIPT).split())
+                               for _ in range(args.repeticoes)))
+    print(f"preload + create_app:            {statistics.median(created) * 1000:8.1f} ms")
+    print(f"... + primeira resposta (ASGI):  {statistics.median(responded) * 1000:8.1f} ms")
+    bench_prefork(args.workers, args.jogos, args.porta)
+
+
+if __name__ == "__main__":
+    main_bench()
@@ -0,0 +1,66 @@
+"""
+Benchmark da roda de tempo com muitos jogos ativos.
+
+Cada jogo mantém um prazo de vez; a cada "jogada" o prazo é cancelado e
+reagendado (o que o TurnTimeoutService faz por evento). O custo por jogada
+deve ficar constante ao aumentar o número de jogos, e o tick só visita os
+temporizadores vencidos.
+
+Uso: python benchmarks/bench_timing_wheel.py [--jogos 100000] [--jogadas 1000000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from timing_wheel import HierarchicalTimingWheel
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jogos", type=int, default=100_000)
+    parser.add_argument("--jogadas", type=int, default=1_000_000)
+    parser.add_argument("--prazo", type=float, default=60.0)
+    args = parser.parse_args()
+
+    clock = FakeClock()
+    wheel = HierarchicalTimingWheel(tick=0.5, clock=clock)
+    expired = []
+    timers = [wheel.schedule(args.prazo, expired.append, game_id) for game_id in range(args.jogos)]
+
+    rng = random.Random(1)
+    picks = [rng.randrange(args.jogos) for _ in range(args.jogadas)]
+    start = time.perf_counter()
+    for game_id in picks:
+        wheel.cancel(timers[game_id])
+        timers[game_id] = wheel.schedule(args.prazo, expired.append, game_id)
+    elapsed = time.perf_counter() - start
+    print(f"{args.jogos:,} jogos, {args.jogadas:,} reagendamentos: "
+          f"{args.jogadas / elapsed:,.0f} reagendamentos/s")
+
+    start = time.perf_counter()
+    for step in range(1, int(args.prazo / wheel.tick)):
+        clock.now = step * wheel.tick
+        wheel.advance()
+    idle = time.perf_counter() - start
+    print(f"{int(args.prazo / wheel.tick)} ticks até o prazo (inclui cascatas): {idle * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    clock.now = args.prazo + wheel.tick
+    fired = wheel.advance()
+    print(f"{fired:,} prazos vencidos disparados em {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark do ambiente vetorizado de treino.
+
+Mede passos por segundo com ações aleatórias (dentro da máscara), avançando
+as partidas no próprio processo e divididas entre processos com os buffers em
+memória compartilhada.
+
+Uso: python benchmarks/bench_training_env.py [--partidas 256] [--jogadores 2] [--passos 200] [--processos 4]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import numpy as np
+
+from training_env import VectorEnv
+
+
+def _run(env: VectorEnv, steps: int) -> float:
+    rng = np.random.default_rng(0)
+    _, masks = env.reset(seed=0)
+    started = time.perf_counter()
+    for _ in range(steps):
+        actions = (rng.random(masks.shape) * masks).argmax(axis=1)
+        _, masks, _, _ = env.step(actions)
+    return env.num_envs * steps / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--partidas", type=int, default=256)
+    parser.add_argument("--jogadores", type=int, default=2)
+    parser.add_argument("--passos", type=int, default=200)
+    parser.add_argument("--processos", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    for workers in sorted({0, args.processos}):
+        with VectorEnv(args.partidas, args.jogadores, workers=workers) as env:
+            rate = _run(env, args.passos)
+            label = "processo principal" if not workers else f"{workers} processo(s)"
+            print(f"{label}: {rate:,.0f} passos/s ({env.episodes:,} partidas concluídas)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+from typing import Dict, List, Optional, Tuple
+from models import Card, CardColor, CardType, CARD_DISPLAY_NAMES
+
+# Catálogo fixo das faces de carta do UNO.
+# Cada face (cor, tipo, valor) recebe um código inteiro estável (0-53),
+# usado nas tabelas pré-calculadas e nos formatos compactos da API.
+
+PLAYABLE_COLORS: Tuple[CardColor, ...] = (CardColor.RED, CardColor.BLUE, CardColor.GREEN, CardColor.YELLOW)
+ACTION_TYPES: Tuple[CardType, ...] = (CardType.SKIP, CardType.REVERSE, CardType.DRAW_TWO)
+WILD_TYPES: Tuple[CardType, ...] = (CardType.WILD, CardType.WILD_DRAW_FOUR)
+
+Face = Tuple[CardColor, CardType, Optional[int]]
+
+
+def _build_faces() -> Tuple[Face, ...]:
+    """Monta a lista de faces na ordem dos códigos"""
+    faces: List[Face] = []
+    for color in PLAYABLE_COLORS:
+        for value in range(10):
+            faces.append((color, CardType.NUMBER, value))
+        for card_type in ACTION_TYPES:
+            faces.append((color, card_type, None))
+    for card_type in WILD_TYPES:
+        faces.append((CardColor.WILD, card_type, None))
+    return tuple(faces)
+
+
+def _point_value(card_type: CardType, value: Optional[int]) -> int:
+    if card_type == CardType.NUMBER:
+        return value or 0
+    if card_type in ACTION_TYPES:
+        return 20
+    return 50
+
+
+CARD_FACES: Tuple[Face, ...] = _build_faces()
+FACE_CODES: Dict[Face, int] = {face: code for code, face in enumerate(CARD_FACES)}
+DISPLAY_NAMES: Tuple[str, ...] = tuple(CARD_DISPLAY_NAMES[face] for face in CARD_FACES)
+NAME_CODES: Dict[str, int] = {name: code for code, name in enumerate(DISPLAY_NAMES)}
+POINT_VALUES: Tuple[int, ...] = tuple(_point_value(card_type, value) for _, card_type, value in CARD_FACES)
+
+# Quantas cópias de cada face existem em um baralho padrão de 108 cartas
+FACE_COPIES: Tuple[int, ...] = tuple(
+    4 if card_type in WILD_TYPES else (1 if value == 0 else 2)
+    for _, card_type, value in CARD_FACES
+)
+
+WILD_CODE = FACE_CODES[(CardColor.WILD, CardType.WILD, None)]
+WILD_DRAW_FOUR_CODE = FACE_CODES[(CardColor.WILD, CardType.WILD_DRAW_FOUR, None)]
+
+
+def face_code(card: Card) -> Optional[int]:
+    """Retorna o código da face da carta, ou None se a face não estiver no catálogo"""
+    return FACE_CODES.get((card.color, card.type, card.value))
+
+
+def card_code_or_name(card: Card):
+    """Código inteiro da carta; cartas fora do catálogo caem para o nome"""
+    code = FACE_CODES.get((card.color, card.type, card.value))
+    return code if code is not None else str(card)
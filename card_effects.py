@@ -1,5 +1,5 @@
 from typing import Dict, Any
-from abc import ABC, abstractmethod
+from abc import ABC
 from models import Card, CardColor, CardType, GameState, CardEffectStrategy
 
 # Strategy Base
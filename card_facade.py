@@ -1,6 +1,11 @@
 from typing import List, Optional
 from models import Card, CardColor, CardType, GameState
 from card_effects import CardEffectFactory
+from card_catalog import FACE_CODES, POINT_VALUES
+import rules
+
+_DECK_FACES: Optional[List[tuple]] = None
+_DECK_TEMPLATE: Optional[List[tuple]] = None
 
 class CardFacade:
     """
@@ -9,101 +14,68 @@ class CardFacade:
     """
     
     @staticmethod
-    def create_uno_deck() -> List[Card]:
+    def deck_faces() -> List[tuple]:
+        """
+        Faces (cor, tipo, valor) de um baralho de 108 cartas, na ordem de criação
+        Calculado uma vez e reutilizado por todos os jogos
+        """
+        global _DECK_FACES
+        if _DECK_FACES is None:
+            faces = []
+            for color in [CardColor.RED, CardColor.BLUE, CardColor.GREEN, CardColor.YELLOW]:
+                faces.append((color, CardType.NUMBER, 0))
+                for value in range(1, 10):
+                    faces.append((color, CardType.NUMBER, value))
+                    faces.append((color, CardType.NUMBER, value))
+            
+            action_cards = [
+                (CardType.SKIP, 2),
+                (CardType.REVERSE, 2), 
+                (CardType.DRAW_TWO, 2)
+            ]
+            for color in [CardColor.RED, CardColor.BLUE, CardColor.GREEN, CardColor.YELLOW]:
+                for card_type, quantity in action_cards:
+                    faces.extend([(color, card_type, None)] * quantity)
+            
+            # Cartas curinga (4 de cada)
+            for card_type in (CardType.WILD, CardType.WILD_DRAW_FOUR):
+                faces.extend([(CardColor.WILD, card_type, None)] * 4)
+            _DECK_FACES = faces
+        return _DECK_FACES
+    
+    @staticmethod
+    def deck_template() -> List[tuple]:
+        """
+        (cor, tipo, valor, strategy) de cada posição do baralho, montado uma vez
+        As strategies não têm estado: uma instância por tipo serve a todas as cartas
+        """
+        global _DECK_TEMPLATE
+        if _DECK_TEMPLATE is None:
+            strategies = {card_type: CardEffectFactory.create_effect(card_type) for card_type in CardType}
+            _DECK_TEMPLATE = [(color, card_type, value, strategies[card_type])
+                              for color, card_type, value in CardFacade.deck_faces()]
+        return _DECK_TEMPLATE
+    
+    @staticmethod
+    def create_uno_deck(num_decks: int = 1) -> List[Card]:
         """
-        Cria um baralho completo de UNO sem cartas especiais
+        Cria um baralho completo de UNO (108 cartas por baralho)
+        Com `num_decks` > 1 os baralhos são unidos, com ids únicos
+        As cartas são novas a cada jogo; só o modelo (deck_template) é compartilhado
         Retorna: Lista de cartas ordenadas
         """
-        deck = []
-        card_id = 0
-        
-        for color in [CardColor.RED, CardColor.BLUE, CardColor.GREEN, CardColor.YELLOW]:
-            deck.append(Card(
-                id=card_id, 
-                color=color, 
-                type=CardType.NUMBER, 
-                value=0,
-                effect_strategy=CardEffectFactory.create_effect(CardType.NUMBER)
-            ))
-            card_id += 1
-            
-            for value in range(1, 10):
-                deck.append(Card(
-                    id=card_id, 
-                    color=color, 
-                    type=CardType.NUMBER, 
-                    value=value,
-                    effect_strategy=CardEffectFactory.create_effect(CardType.NUMBER)
-                ))
-                card_id += 1
-                deck.append(Card(
-                    id=card_id, 
-                    color=color, 
-                    type=CardType.NUMBER, 
-                    value=value,
-                    effect_strategy=CardEffectFactory.create_effect(CardType.NUMBER)
-                ))
-                card_id += 1
-        
-        action_cards = [
-            (CardType.SKIP, 2),
-            (CardType.REVERSE, 2), 
-            (CardType.DRAW_TWO, 2)
-        ]
-        
-        for color in [CardColor.RED, CardColor.BLUE, CardColor.GREEN, CardColor.YELLOW]:
-            for card_type, quantity in action_cards:
-                for _ in range(quantity):
-                    deck.append(Card(
-                        id=card_id,
-                        color=color,
-                        type=card_type,
-                        effect_strategy=CardEffectFactory.create_effect(card_type)
-                    ))
-                    card_id += 1
-        
-        # Cartas curinga (4 de cada) - FORA DE TODOS OS LOOPS
-        wild_cards = [
-            (CardType.WILD, 4),
-            (CardType.WILD_DRAW_FOUR, 4)
-        ]
-        
-        for card_type, quantity in wild_cards:
-            for _ in range(quantity):
-                deck.append(Card(
-                    id=card_id,
-                    color=CardColor.WILD,
-                    type=card_type,
-                    effect_strategy=CardEffectFactory.create_effect(card_type)
-                ))
-                card_id += 1
-        
-        return deck
+        template = CardFacade.deck_template()
+        size = len(template)
+        return [Card(card_id, *template[card_id % size]) for card_id in range(num_decks * size)]
     
     @staticmethod
     def can_play_card(card: Card, top_card: Card, current_color: Optional[CardColor] = None) -> bool:
         """
         Verifica se uma carta pode ser jogada sobre a carta do topo
         Considera a cor atual para cartas curinga
+        (consulta a tabela de legalidade do motor de regras)
         """
-
-        if card.type in [CardType.WILD, CardType.WILD_DRAW_FOUR]:
-            return True
-        
-        effective_top_color = current_color if current_color else top_card.color
-        
-        if effective_top_color == CardColor.WILD:
-            return False
-            
-        if card.color == effective_top_color:
-            return True
-
-        if card.type == top_card.type:
-            if card.type == CardType.NUMBER:
-                return card.value == top_card.value
-            return True
-            
-        return False
+        return rules.can_play_card(card, top_card, current_color)
     
     @staticmethod
     def apply_card_effect(card: Card, game: GameState, player_id: int, **kwargs) -> dict:
@@ -116,17 +88,18 @@ class CardFacade:
     def get_card_display_name(card: Card) -> str:
         """
         Retorna uma representação em string da carta
+        (consulta a tabela de nomes pré-calculada)
         """
-        if card.type == CardType.NUMBER:
-            return f"{card.color.value}_{card.value}"
-        else:
-            return f"{card.color.value}_{card.type.value}"
+        return str(card)
     
     @staticmethod
     def get_card_point_value(card: Card) -> int:
         """
         Retorna o valor em pontos da carta
         """
+        code = FACE_CODES.get((card.color, card.type, card.value))
+        if code is not None:
+            return POINT_VALUES[code]
         if card.type == CardType.NUMBER:
             return card.value or 0
         elif card.type in [CardType.SKIP, CardType.REVERSE, CardType.DRAW_TWO]:
@@ -0,0 +1,164 @@
+"""
+Checkpoint dos jogos em andamento em um único arquivo mapeado em memória.
+
+O arquivo é escrito no desligamento e periodicamente. Na partida seguinte
+ele é só aberto com mmap: ler o cabeçalho custa O(1), qualquer que seja o
+número de jogos. Cada jogo só é decodificado (snapshot_codec) quando uma
+rota o toca pela primeira vez (GameManager.restaurar_checkpoint). Jogos
+nunca tocados continuam no arquivo. O próximo checkpoint copia os bytes
+deles sem decodificá-los.
+
+Layout (little-endian, sem padding entre as seções):
+    cabeçalho  HEADER: magic, versão do formato, quantidade de jogos,
+               próximo id de jogo
+    ids        q por jogo, em ordem crescente (busca binária sem índice em memória)
+    offsets    Q por jogo + 1: início do snapshot de cada jogo e fim do último
+    snapshots  bytes do snapshot_codec, concatenados na ordem dos ids
+
+O arquivo é escrito ao lado e trocado com os.replace. Um checkpoint
+interrompido não estraga o anterior, e quem já tem o antigo mapeado continua
+lendo o conteúdo antigo.
+"""
+import asyncio
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from game_manager import GameManager
+from models import GameStatus
+from snapshot_codec import encode_game
+
+MAGIC = b"UC"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<2sBxIq")  # magic, versão, jogos, próximo id de jogo
+COLLECT_CHUNK = 1000  # jogos codificados por vez antes de devolver o event loop
+
+Entry = Tuple[int, bytes]
+
+
+class CheckpointFormatError(ValueError):
+    """Arquivo que não é um checkpoint válido desta versão do formato"""
+
+
+def write_checkpoint(path: str, entries: List[Entry], next_game_id: int) -> int:
+    """Grava os snapshots (id, bytes) de forma atômica; retorna o tamanho do arquivo"""
+    entries = sorted(entries, key=lambda entry: entry[0])
+    ids = array("q", (game_id for game_id, _ in entries))
+    offsets = array("Q")
+    position = HEADER.size + len(entries) * (ids.itemsize + offsets.itemsize) + offsets.itemsize
+    for _, data in entries:
+        offsets.append(position)
+        position += len(data)
+    offsets.append(position)
+
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as file:
+        file.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(entries), next_game_id))
+        file.write(ids.tobytes())
+        file.write(offsets.tobytes())
+        for _, data in entries:
+            file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+    return position
+
+
+class CheckpointReader:
+    """
+    Checkpoint aberto com mmap. `take` entrega o snapshot de um jogo uma única
+    vez; depois disso o jogo vive no GameManager e o arquivo não responde mais por ele.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < HEADER.size:
+                raise CheckpointFormatError("Checkpoint truncado")
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, format_version, count, self.next_game_id = HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise CheckpointFormatError("Não é um checkpoint de jogos")
+        if format_version != FORMAT_VERSION:
+            raise CheckpointFormatError(f"Versão do formato não suportada: {format_version}")
+        ids_end = HEADER.size + count * 8
+        if ids_end + (count + 1) * 8 > size:
+            raise CheckpointFormatError("Checkpoint truncado")
+        view = memoryview(self._map)
+        self._ids = view[HEADER.size:ids_end].cast("q")
+        self._offsets = view[ids_end:ids_end + (count + 1) * 8].cast("Q")
+        if self._offsets[count] != size:
+            raise CheckpointFormatError("Checkpoint truncado")
+        self._view = view
+        self._taken = bytearray(count)
+        self.remaining = count
+
+    def __len__(self) -> int:
+        return self.remaining
+
+    def _position(self, game_id: int) -> Optional[int]:
+        index = bisect_left(self._ids, game_id)
+        if index < len(self._ids) and self._ids[index] == game_id and not self._taken[index]:
+            return index
+        return None
+
+    def __contains__(self, game_id: int) -> bool:
+        return self._position(game_id) is not None
+
+    def _snapshot(self, index: int) -> memoryview:
+        return self._view[self._offsets[index]:self._offsets[index + 1]]
+
+    def take(self, game_id: int) -> Optional[memoryview]:
+        """Snapshot do jogo, marcado como entregue; None se não está (mais) no arquivo"""
+        index = self._position(game_id)
+        if index is None:
+            return None
+        self._taken[index] = 1
+        self.remaining -= 1
+        return self._snapshot(index)
+
+    def pending(self) -> Iterator[Entry]:
+        """(id, snapshot) dos jogos ainda não entregues"""
+        taken = self._taken
+        for index in range(len(taken)):
+            if not taken[index]:
+                yield self._ids[index], self._snapshot(index)
+
+
+def collect_entries(manager: GameManager) -> Iterator[Entry]:
+    """
+    Snapshots dos jogos em andamento, para o próximo checkpoint: os que nunca
+    saíram do arquivo são copiados como estão e os que estão em memória são codificados
+    """
+    yield from manager.cold_snapshots()
+    for game_id, game in list(manager.games.items()):
+        if game.status == GameStatus.IN_PROGRESS:
+            try:
+                yield game_id, encode_game(game)
+            except ValueError:
+                continue  # cartas fora do baralho padrão
+
+
+async def collect_entries_async(manager: GameManager, chunk: int = COLLECT_CHUNK) -> List[Entry]:
+    """
+    collect_entries sem travar o event loop: devolve o controle a cada `chunk`
+    jogos. Cada jogo é codificado de uma vez, então o snapshot de cada um é
+    consistente; jogos diferentes podem ser de instantes diferentes. Um jogo
+    tirado do arquivo durante a coleta aparece de novo já em memória: fica a
+    versão mais recente. Um jogo que terminou ou saiu do processo durante a
+    coleta é descartado: o snapshot coletado antes ainda o mostra em andamento.
+    """
+    entries: Dict[int, bytes] = {}
+    for count, (game_id, data) in enumerate(collect_entries(manager), 1):
+        entries[game_id] = data
+        if count % chunk == 0:
+            await asyncio.sleep(0)
+    games = manager.games
+    return [
+        (game_id, data) for game_id, data in entries.items()
+        if manager.is_cold(game_id)
+        or (game_id in games and games[game_id].status == GameStatus.IN_PROGRESS)
+    ]
@@ -0,0 +1,127 @@
+import random
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional
+
+if TYPE_CHECKING:
+    from models import Card
+
+
+class Deck:
+    """
+    Monte de compra em um buffer circular de tamanho fixo.
+
+    As cartas vivas ocupam `size` posições a partir de `_bottom`; o topo é
+    a última delas. Comprar só move o cursor (sem realocar), colocar no fundo
+    é O(1) e o reabastecimento a partir do descarte embaralha no lugar apenas
+    as cartas que entraram.
+
+    Com `seed`, cada reabastecimento usa um gerador derivado de (seed,
+    reabastecimentos anteriores): basta guardar a semente e a contagem para
+    que um jogo restaurado embaralhe igual ao original.
+    """
+    __slots__ = ("_buffer", "_bottom", "_size", "_rng", "seed", "reshuffles")
+
+    def __init__(self, cards: Iterable['Card'] = (), rng: Optional[random.Random] = None,
+                 seed: Optional[int] = None):
+        self._buffer: List[Optional['Card']] = list(cards)
+        self._bottom = 0
+        self._size = len(self._buffer)
+        if rng is None and seed is not None:
+            rng = random.Random(seed)
+        self._rng = rng or random  # sem rng próprio usa o gerador global do módulo
+        self.seed = seed
+        self.reshuffles = 0  # Quantas vezes o monte acabou e foi refeito com o descarte
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def __iter__(self) -> Iterator['Card']:
+        """Percorre as cartas do fundo para o topo"""
+        buffer, capacity = self._buffer, len(self._buffer)
+        for offset in range(self._size):
+            yield buffer[(self._bottom + offset) % capacity]
+
+    def __repr__(self) -> str:
+        return f"Deck({list(self)!r})"
+
+    @property
+    def capacity(self) -> int:
+        return len(self._buffer)
+
+    def _ensure_capacity(self, extra: int) -> None:
+        """Cresce o buffer (raro: só quando entram cartas de fora do monte original)"""
+        if self._size + extra <= len(self._buffer):
+            return
+        cards = list(self)
+        new_capacity = max(len(self._buffer) * 2, self._size + extra, 8)
+        self._buffer = cards + [None] * (new_capacity - len(cards))
+        self._bottom = 0
+
+    def draw(self) -> Optional['Card']:
+        """Compra a carta do topo; None se o monte estiver vazio"""
+        if not self._size:
+            return None
+        self._size -= 1
+        index = (self._bottom + self._size) % len(self._buffer)
+        card = self._buffer[index]
+        self._buffer[index] = None
+        return card
+
+    def pop(self) -> 'Card':
+        """Compra a carta do topo (compatível com list.pop)"""
+        card = self.draw()
+        if card is None:
+            raise IndexError("pop from empty deck")
+        return card
+
+    def push(self, card: 'Card') -> None:
+        """Coloca uma carta no topo"""
+        self._ensure_capacity(1)
+        self._buffer[(self._bottom + self._size) % len(self._buffer)] = card
+        self._size += 1
+
+    append = push
+
+    def put_bottom(self, card: 'Card') -> None:
+        """Coloca uma carta no fundo do monte em O(1)"""
+        self._ensure_capacity(1)
+        self._bottom = (self._bottom - 1) % len(self._buffer)
+        self._buffer[self._bottom] = card
+        self._size += 1
+
+    def _shuffle_region(self, count: int) -> None:
+        """Fisher-Yates no lugar sobre as `count` cartas do fundo"""
+        buffer, capacity, bottom = self._buffer, len(self._buffer), self._bottom
+        randrange = self._rng.randrange
+        for i in range(count - 1, 0, -1):
+            j = randrange(i + 1)
+            a, b = (bottom + i) % capacity, (bottom + j) % capacity
+            buffer[a], buffer[b] = buffer[b], buffer[a]
+
+    def shuffle(self) -> None:
+        """Embaralha todas as cartas do monte no lugar"""
+        self._shuffle_region(self._size)
+
+    def refill_from(self, discard_pile: List['Card']) -> int:
+        """
+        Reabastece o monte com o descarte (exceto a carta do topo).
+        As cartas entram pelo fundo e só elas são embaralhadas;
+        a pilha de descarte é reduzida no lugar. Retorna quantas entraram.
+        """
+        count = len(discard_pile) - 1
+        if count <= 0:
+            return 0
+        self._ensure_capacity(count)
+        capacity = len(self._buffer)
+        for index in range(count):
+            self._bottom = (self._bottom - 1) % capacity
+            self._buffer[self._bottom] = discard_pile[index]
+        self._size += count
+        del discard_pile[:count]
+        if self.seed is not None:
+            self._rng = random.Random(self.seed << 32 | self.reshuffles)
+        self._shuffle_region(count)
+        self.reshuffles += 1
+        return count
@@ -0,0 +1,276 @@
+"""
+Solver exato de fim de jogo para partidas de 2 jogadores.
+
+Quando restam poucas cartas nas mãos, a posição é resolvida por negamax com
+poda alfa-beta sobre o mesmo motor de simulação da busca de sugestões
+(move_search.Simulation). Esse motor segue as tabelas do RulesEngine e a
+ordem de turnos do GameManager. Os valores são +1 (quem joga vence), -1
+(perde) e 0 (não resolvido dentro da profundidade máxima).
+
+A mão do adversário e a ordem do monte são ocultas. Por isso a posição real
+é amostrada em algumas determinizações, e cada uma é resolvida com
+informação completa. Em cada amostra as jogadas são testadas na ordem abaixo
+até uma vencer comprovadamente. A nota de cada jogada é a fração das amostras
+em que ela foi essa vencedora; a que vence em todas é dada como vencedora.
+Quando o monte está vazio, a mão do adversário é exatamente o conjunto de
+cartas não vistas e uma única amostra basta. Só a ordem do
+descarte reembaralhado continua suposta, mantida como está, sem embaralhar.
+
+As posições resolvidas ficam numa tabela de transposição limitada (LRU), uma
+por conjunto de regras. A chave é a posição compacta de Simulation.key; a
+ordem das cartas na mão não importa. Uma posição que se repete no caminho
+atual (todos passando com o monte vazio) vale 0. A ordenação de jogadas põe
+primeiro a que esvazia a mão, depois as que punem o adversário, e passar por
+último.
+"""
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+from card_catalog import CARD_FACES, PLAYABLE_COLORS
+from models import CardType
+from move_search import PASS, Candidate, SearchState, Simulation
+from rules import Ruleset
+
+DEFAULT_MAX_CARDS = 6         # total de cartas nas duas mãos para acionar o solver
+DEFAULT_MAX_DEPTH = 40        # lances por determinização
+DEFAULT_TABLE_SIZE = 200_000
+DEFAULT_DETERMINIZATIONS = 4
+DEFAULT_BUDGET_MS = 5
+
+WIN, UNKNOWN, LOSS = 1, 0, -1
+_EXACT, _LOWER, _UPPER = 0, 1, 2
+
+# Prioridade na ordenação (menor primeiro): compras e bloqueios antes de números
+_TYPE_ORDER = {
+    CardType.WILD_DRAW_FOUR: 0, CardType.DRAW_TWO: 1, CardType.SKIP: 2,
+    CardType.REVERSE: 2, CardType.NUMBER: 3, CardType.WILD: 4
+}
+_ORDER = tuple(_TYPE_ORDER[card_type] for _, card_type, _ in CARD_FACES)
+# Slot de cor de cada face; curingas caem no slot extra (não contam para nenhuma cor)
+_COLORS = tuple(PLAYABLE_COLORS.index(color) if color in PLAYABLE_COLORS else len(PLAYABLE_COLORS)
+                for color, _, _ in CARD_FACES)
+
+
+class _OutOfTime(TimeoutError):
+    pass
+
+
+class EndgameSolver:
+    """
+    Negamax com alfa-beta e tabela de transposição para fins de jogo de 2 jogadores.
+    A tabela é compartilhada entre consultas (jogadas seguintes reaproveitam as posições).
+    """
+    def __init__(self, max_cards: int = DEFAULT_MAX_CARDS, max_depth: int = DEFAULT_MAX_DEPTH,
+                 table_size: int = DEFAULT_TABLE_SIZE, determinizations: int = DEFAULT_DETERMINIZATIONS,
+                 budget_ms: float = DEFAULT_BUDGET_MS):
+        self.max_cards = max_cards
+        self.max_depth = max_depth
+        self.table_size = table_size
+        self.determinizations = determinizations
+        self.budget_ms = budget_ms
+        self._tables: Dict[Ruleset, "OrderedDict[tuple, Tuple[int, int, int]]"] = {}
+        self._table: "OrderedDict[tuple, Tuple[int, int, int]]" = OrderedDict()
+        self._path: Set[tuple] = set()
+        self._lock = threading.Lock()  # as consultas rodam em threads (run_blocking)
+        self._deadline = 0.0
+        self.nodes = 0
+        self.table_hits = 0
+        self.evictions = 0
+        self.solved = 0
+        self.timeouts = 0
+        self.expired = 0  # consultas cujo prazo acabou esperando a vez no lock
+
+    def applies(self, state: SearchState) -> bool:
+        """Só partidas de 2 jogadores com poucas cartas nas mãos"""
+        return len(state.hand_sizes) == 2 and sum(state.hand_sizes) <= self.max_cards
+
+    def _store(self, key: tuple, value: int, depth: int, flag: int) -> None:
+        table = self._table
+        table[key] = (value, depth, flag)
+        table.move_to_end(key)
+        if len(table) > self.table_size:
+            table.popitem(last=False)
+            self.evictions += 1
+
+    def _ordered_moves(self, sim: Simulation) -> List[Candidate]:
+        hand = sim.hands[sim.current]
+        # Curingas primeiro na cor de que o jogador tem mais cartas
+        colors = [0] * (len(PLAYABLE_COLORS) + 1)
+        for code in hand:
+            colors[_COLORS[code]] += 1
+
+        def priority(move: Candidate) -> Tuple[int, int, int]:
+            code, slot = move
+            if code == PASS:
+                return (9, 0, 0)
+            return (0 if len(hand) == 1 else 1, _ORDER[code], -colors[slot] if slot is not None else 0)
+
+        return sorted(sim.moves(), key=priority)
+
+    def _child_value(self, sim: Simulation, move: Candidate, depth: int, alpha: int, beta: int) -> int:
+        """Valor da jogada para quem a fez (o próximo a jogar pode ser ele mesmo)"""
+        mover = sim.current
+        child = sim.clone()
+        child.apply(move)
+        if child.winner is not None:
+            return WIN if child.winner == mover else LOSS
+        if child.current == mover:
+            return self._negamax(child, depth - 1, alpha, beta)
+        return -self._negamax(child, depth - 1, -beta, -alpha)
+
+    def _negamax(self, sim: Simulation, depth: int, alpha: int, beta: int) -> int:
+        self.nodes += 1
+        if self.nodes & 31 == 0 and time.monotonic() > self._deadline:
+            raise _OutOfTime()
+        if depth <= 0:
+            return UNKNOWN
+
+        key = sim.key()
+        if key in self._path:
+            return UNKNOWN  # repetição: ninguém progride
+        entry = self._table.get(key)
+        if entry is not None:
+            value, stored_depth, flag = entry
+            # Vitória/derrota provada vale em qualquer profundidade
+            if value != UNKNOWN or stored_depth >= depth:
+                self.table_hits += 1
+                if flag == _EXACT:
+                    return value
+                if flag == _LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+
+        original_alpha = alpha
+        best = LOSS
+        self._path.add(key)
+        for move in self._ordered_moves(sim):
+            value = self._child_value(sim, move, depth, alpha, beta)
+            if value > best:
+                best = value
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+        self._path.discard(key)
+
+        if best <= original_alpha:
+            flag = _UPPER
+        elif best >= beta:
+            flag = _LOWER
+        else:
+            flag = _EXACT
+        self._store(key, best, depth, flag)
+        return best
+
+    def _deadline_for(self, budget_ms: Optional[float], deadline: Optional[float]) -> float:
+        """Prazo absoluto (time.monotonic) da consulta, contado antes de esperar o lock"""
+        own = time.monotonic() + (self.budget_ms if budget_ms is None else budget_ms) / 1000
+        return own if deadline is None else min(own, deadline)
+
+    def _acquire(self, deadline: float) -> bool:
+        """
+        Espera o lock no máximo até o prazo: a espera conta no orçamento, e uma
+        consulta vencida libera logo a thread (o pool de run_blocking é compartilhado)
+        """
+        if self._lock.acquire(timeout=max(0.0, deadline - time.monotonic())):
+            if time.monotonic() < deadline:
+                return True
+            self._lock.release()
+        self.expired += 1
+        return False
+
+    def _begin(self, ruleset: Ruleset, deadline: float) -> None:
+        self._table = self._tables.setdefault(ruleset, OrderedDict())
+        self._path.clear()
+        self._deadline = deadline
+
+    def evaluate(self, sim: Simulation, budget_ms: Optional[float] = None,
+                 deadline: Optional[float] = None) -> Dict[Candidate, int]:
+        """
+        Valor exato (janela completa) de cada jogada da posição determinizada
+        TimeoutError se o orçamento acabar antes
+        """
+        deadline = self._deadline_for(budget_ms, deadline)
+        if not self._acquire(deadline):
+            raise _OutOfTime()
+        try:
+            self._begin(sim.ruleset, deadline)
+            return {move: self._child_value(sim, move, self.max_depth, LOSS, WIN)
+                    for move in self._ordered_moves(sim)}
+        finally:
+            self._lock.release()
+
+    def _winning_move_in(self, sim: Simulation, depth: int) -> Optional[Candidate]:
+        """
+        Primeira jogada (na ordenação) que vence comprovadamente em até `depth` lances.
+        Cada jogada só precisa decidir "vence ou não" (janela nula).
+        """
+        for move in self._ordered_moves(sim):
+            if self._child_value(sim, move, depth, UNKNOWN, WIN) == WIN:
+                return move
+        return None
+
+    def solve(self, state: SearchState, seed: Optional[int] = None, budget_ms: Optional[float] = None,
+              deadline: Optional[float] = None) -> Optional[Dict[Candidate, float]]:
+        """
+        Fração das determinizações em que cada jogada foi a vencedora encontrada.
+        Aprofundamento iterativo (2, 4, ... lances): vale a última profundidade
+        concluída dentro do orçamento, e a busca para quando uma jogada vence em
+        todas as amostras. O orçamento inclui a espera pelo lock
+        e não passa de `deadline` (time.monotonic), se dado. None se a
+        posição não se aplica, se o prazo acabou na fila ou se nem a primeira
+        profundidade coube no orçamento.
+        """
+        if not self.applies(state):
+            return None
+        rng = random.Random(seed)
+        # Com o monte vazio a mão do adversário é conhecida: uma amostra basta
+        samples = [Simulation(state, rng) for _ in range(1 if state.deck_size == 0 else self.determinizations)]
+        result: Optional[Dict[Candidate, float]] = None
+        deadline = self._deadline_for(budget_ms, deadline)
+        if not self._acquire(deadline):
+            return None
+        try:
+            self._begin(state.ruleset, deadline)
+            try:
+                for depth in range(2, self.max_depth + 1, 2):
+                    totals: Dict[Candidate, float] = dict.fromkeys(state.candidates(), 0.0)
+                    for sim in samples:
+                        move = self._winning_move_in(sim, depth)
+                        if move is not None:
+                            totals[move] += 1
+                    result = {move: total / len(samples) for move, total in totals.items()}
+                    if max(result.values()) == 1.0:
+                        break
+            except _OutOfTime:
+                self.timeouts += 1
+        finally:
+            self._lock.release()
+        if result is not None:
+            self.solved += 1
+        return result
+
+    def winning_move(self, state: SearchState, seed: Optional[int] = None,
+                     budget_ms: Optional[float] = None) -> Optional[Candidate]:
+        """Jogada que vence em todas as determinizações, se houver"""
+        scores = self.solve(state, seed, budget_ms)
+        if not scores:
+            return None
+        move, score = max(scores.items(), key=lambda item: item[1])
+        return move if score == 1.0 else None
+
+    def get_metrics(self) -> Dict:
+        return {
+            "resolvidas": self.solved,
+            "sem_tempo": self.timeouts,
+            "expiradas_na_fila": self.expired,
+            "nos": self.nodes,
+            "posicoes_na_tabela": sum(len(table) for table in self._tables.values()),
+            "acertos_tabela": self.table_hits,
+            "despejos": self.evictions
+        }
@@ -0,0 +1,58 @@
+"""
+Exporta os históricos do arquivo NDJSON de jogos (ver game_archive.py).
+
+O fluxo é lido e escrito registro a registro, com memória constante.
+O cursor final é impresso na saída de erro para retomar a exportação.
+
+Uso:
+    python export_games.py --arquivo jogos.ndjson [--saida jogos.ndjson.gz --gzip]
+                           [--desde 1700000000] [--ate 1800000000]
+                           [--status FINISHED] [--cursor 0] [--limite 1000]
+"""
+import argparse
+import sys
+
+from game_archive import GameArchive, ndjson_stream
+from models import GameStatus
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Exporta históricos de jogos em NDJSON")
+    parser.add_argument("--arquivo", required=True, help="arquivo NDJSON gravado pelo servidor")
+    parser.add_argument("--saida", default="-", help="arquivo de saída (padrão: stdout)")
+    parser.add_argument("--desde", type=float, help="encerrados a partir deste instante (epoch)")
+    parser.add_argument("--ate", type=float, help="encerrados antes deste instante (epoch)")
+    parser.add_argument("--status", choices=[GameStatus.FINISHED.value, GameStatus.ABANDONED.value])
+    parser.add_argument("--cursor", type=int, default=0, help="retoma a partir deste cursor")
+    parser.add_argument("--limite", type=int, help="quantidade máxima de jogos")
+    parser.add_argument("--gzip", action="store_true", help="comprime a saída com gzip")
+    args = parser.parse_args(argv)
+
+    archive = GameArchive(args.arquivo)
+    status = GameStatus(args.status) if args.status else None
+    cursor = args.cursor
+    exported = 0
+
+    def tracked():
+        nonlocal cursor, exported
+        for record, next_cursor in archive.iter_records(args.cursor, args.desde, args.ate, status, args.limite):
+            cursor = next_cursor
+            exported += 1
+            yield record, next_cursor
+
+    out = sys.stdout.buffer if args.saida == "-" else open(args.saida, "wb")
+    try:
+        for chunk in ndjson_stream(tracked(), args.gzip):
+            out.write(chunk)
+    except (OSError, ValueError) as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+    print(f"{exported} jogos exportados; cursor: {cursor}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""
+Arquivo de históricos de jogos em NDJSON (uma linha JSON por jogo encerrado).
+
+O `GameArchiveObserver` junta os eventos de cada jogo e, quando ele termina
+ou é abandonado, anexa uma linha com o resumo e todas as jogadas. A linha é
+serializada e gravada por uma thread própria do arquivo: o callback do evento
+(no event loop) só põe o histórico na fila. A exportação
+lê o arquivo linha a linha (memória constante) e o cursor é o deslocamento em
+bytes do próximo registro, então retomar uma exportação é um seek.
+"""
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import zlib
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from models import GameState, GameStatus
+from observer_pattern import Observer, GameEvent, GameEventType
+from rules import RULE_NAMES
+from serialization import dumps_json
+
+logger = logging.getLogger(__name__)
+
+_END_EVENTS = (GameEventType.GAME_FINISHED, GameEventType.GAME_ABANDONED)
+_GZIP_WBITS = 16 + zlib.MAX_WBITS  # cabeçalho gzip no fluxo do zlib
+
+
+class GameArchive:
+    """Arquivo NDJSON append-only com leitura em fluxo a partir de um cursor"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None  # aberto para escrita só no primeiro append (a CLI apenas lê)
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self.write_errors = 0
+
+    def append(self, record: Dict[str, Any]) -> int:
+        """Anexa um registro; retorna o cursor (deslocamento) onde ele começa"""
+        if self._file is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self.path, "ab")
+        offset = self._file.tell()
+        self._file.write(dumps_json(record) + b"\n")
+        self._file.flush()
+        return offset
+
+    def enqueue(self, record: Dict[str, Any]) -> None:
+        """Anexa o registro em segundo plano, pela thread de escrita (na ordem da fila)"""
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_queued, name="game-archive", daemon=True)
+            self._writer.start()
+        self._queue.put(record)
+
+    def _write_queued(self) -> None:
+        while True:
+            record = self._queue.get()
+            try:
+                if record is None:
+                    return
+                self.append(record)
+            except Exception:
+                # Qualquer falha fica no registro: a thread segue consumindo a fila (flush/close não travam)
+                self.write_errors += 1
+                logger.exception("Falha ao arquivar o jogo %s", record.get("game_id"))
+            finally:
+                self._queue.task_done()
+
+    def flush(self) -> None:
+        """Espera a fila de escrita esvaziar"""
+        if self._writer is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def check_cursor(self, cursor: int) -> None:
+        """O cursor deve apontar para o início de um registro (logo após uma quebra de linha)"""
+        if cursor == 0:
+            return
+        if cursor < 0 or not os.path.exists(self.path) or cursor > os.path.getsize(self.path):
+            raise ValueError("Cursor inválido")
+        with open(self.path, "rb") as f:
+            f.seek(cursor - 1)
+            if f.read(1) != b"\n":
+                raise ValueError("Cursor inválido")
+
+    def iter_records(self, cursor: int = 0, since: Optional[float] = None,
+                     until: Optional[float] = None, status: Optional[GameStatus] = None,
+                     limit: Optional[int] = None) -> Iterator[Tuple[Dict[str, Any], int]]:
+        """
+        Percorre os registros a partir de `cursor`, filtrando por horário de
+        encerramento [since, until) e status. Gera (registro, cursor do próximo).
+        """
+        self.check_cursor(cursor)
+        if (limit is not None and limit <= 0) or not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            f.seek(cursor)
+            emitted = 0
+            while True:
+                line = f.readline()
+                if not line.endswith(b"\n"):
+                    return  # fim do arquivo (ou linha ainda sendo escrita)
+                record = json.loads(line)
+                if since is not None and record["finished_at"] < since:
+                    continue
+                if until is not None and record["finished_at"] >= until:
+                    continue
+                if status is not None and record["status"] != status.value:
+                    continue
+                yield record, f.tell()
+                emitted += 1
+                if limit is not None and emitted >= limit:
+                    return
+
+    def export_lines(self, cursor: int = 0, since: Optional[float] = None,
+                     until: Optional[float] = None, status: Optional[GameStatus] = None,
+                     limit: Optional[int] = None, compress: bool = False) -> Iterator[bytes]:
+        """
+        Gera o NDJSON da exportação em pedaços (opcionalmente gzip em fluxo).
+        """
+        return ndjson_stream(self.iter_records(cursor, since, until, status, limit), compress)
+
+
+def ndjson_stream(records: Iterable[Tuple[Dict[str, Any], int]], compress: bool = False) -> Iterator[bytes]:
+    """
+    Serializa (registro, cursor do próximo) como NDJSON, um registro por vez.
+    Cada linha leva o campo `cursor` para retomar a exportação a partir do próximo.
+    """
+    compressor = zlib.compressobj(wbits=_GZIP_WBITS) if compress else None
+    for record, next_cursor in records:
+        record["cursor"] = next_cursor
+        chunk = dumps_json(record) + b"\n"
+        if compressor is None:
+            yield chunk
+        else:
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+    if compressor is not None:
+        yield compressor.flush()
+
+
+class GameArchiveObserver(Observer):
+    """Acumula os eventos de cada jogo e grava o histórico quando ele acaba"""
+
+    def __init__(self, archive: GameArchive, clock: Callable[[], float] = time.time):
+        self.archive = archive
+        self.clock = clock
+        self._live: Dict[int, Dict[str, Any]] = {}
+
+    def update(self, game_state: GameState):
+        pass
+
+    def on_event(self, event: GameEvent):
+        now = self.clock()
+        if event.type in (GameEventType.GAME_CREATED, GameEventType.GAME_IMPORTED):
+            game = event.game_state
+            self._live[event.game_id] = history = {
+                "game_id": event.game_id,
+                "created_at": now,
+                "player_count": len(game.players),
+                "accounts": [player.account_id for player in game.players],
+                "rules": [name for name in RULE_NAMES if getattr(game.rules.ruleset, name)],
+                "start": event.delta,
+                "moves": []
+            }
+            if event.type == GameEventType.GAME_IMPORTED:
+                # Migrado ou restaurado: as jogadas anteriores a esta versão ficaram em outro processo
+                history["imported_at_version"] = event.version
+            return
+        history = self._live.get(event.game_id)
+        if history is None:
+            return
+        if event.type == GameEventType.GAME_EXPORTED:
+            del self._live[event.game_id]  # migrado: o histórico parcial não é arquivado aqui
+            return
+        if event.type in _END_EVENTS:
+            del self._live[event.game_id]
+            game = event.game_state
+            moves: List[Dict[str, Any]] = history.pop("moves")
+            history.update({
+                "status": game.status.value,
+                "finished_at": now,
+                "winner": game.winner,
+                "move_count": len(moves),
+                "moves": moves
+            })
+            self.archive.enqueue(history)
+            return
+        history["moves"].append({"type": event.type.value, "version": event.version, "at": now, **event.delta})
+
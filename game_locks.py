@@ -0,0 +1,76 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Any, Callable, Dict, Optional, Set
+
+from models import GameState
+from observer_pattern import Observer, GameEvent, GameEventType
+
+
+class GameLockRegistry(Observer):
+    """
+    Locks asyncio por jogo, criados sob demanda.
+    Serializa as operações de um mesmo jogo sem bloquear os demais.
+    Como Observer de GAME_FINISHED/GAME_ABANDONED, descarta o lock de jogos encerrados.
+    """
+    def __init__(self):
+        self._locks: Dict[int, asyncio.Lock] = {}
+        self._retired: Set[int] = set()
+
+    def lock_for(self, game_id: int) -> asyncio.Lock:
+        """Retorna (criando se preciso) o lock do jogo"""
+        lock = self._locks.get(game_id)
+        if lock is None:
+            lock = self._locks[game_id] = asyncio.Lock()
+        return lock
+
+    @asynccontextmanager
+    async def hold(self, game_id: int):
+        """Mantém o lock do jogo durante o bloco `async with`"""
+        lock = self.lock_for(game_id)
+        async with lock:
+            yield
+        if game_id in self._retired and not lock.locked():
+            self._retired.discard(game_id)
+            self._locks.pop(game_id, None)
+
+    def discard(self, game_id: int) -> None:
+        """Remove o lock de um jogo que não receberá mais jogadas"""
+        lock = self._locks.get(game_id)
+        if lock is None:
+            return
+        if lock.locked():
+            # Quem segura o lock o libera ao sair de `hold`
+            self._retired.add(game_id)
+        else:
+            del self._locks[game_id]
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    def update(self, game_state: GameState):
+        pass
+
+    def on_event(self, event: GameEvent):
+        if event.type in (GameEventType.GAME_FINISHED, GameEventType.GAME_ABANDONED,
+                          GameEventType.GAME_EXPORTED):
+            self.discard(event.game_id)
+
+
+# Executor dedicado para subsistemas bloqueantes (disco, arquivamento),
+# para não ocupar o threadpool que o Starlette usa nas rotas síncronas.
+_blocking_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_blocking_executor() -> ThreadPoolExecutor:
+    global _blocking_executor
+    if _blocking_executor is None:
+        _blocking_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="uno-blocking")
+    return _blocking_executor
+
+
+async def run_blocking(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Executa uma função bloqueante fora do event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_blocking_executor(), partial(func, *args, **kwargs))
@@ -1,33 +1,84 @@
-import random
-from typing import List, Dict, Optional
-from models import Card, CardColor, CardType, Player, GameState, GameStatus, PlayDirection
+import math
+from typing import List, Dict, Optional, Tuple
+from models import (
+    Card, CardColor, CardType, Player, GameState, GameSnapshot, GameStatus, PlayDirection,
+    EffectOutcome, describe_effect
+)
 from card_facade import CardFacade
+from deck import Deck
+from rules import Ruleset, STANDARD, compile_ruleset
+
+from observer_pattern import Subject, GameEvent, GameEventType
+from snapshot_codec import decode_game, encode_game
+
+MAX_PLAYERS = 10
+MAX_PARTY_PLAYERS = 1000
+CARDS_PER_PLAYER = 5
+DECK_SIZE = 108
+
+
+class VersionConflictError(Exception):
+    """A jogada foi feita sobre uma versão do estado que já não é a atual"""
+
+    def __init__(self, game_id: int, expected_version: int, current_version: int):
+        super().__init__(
+            f"Versão desatualizada do jogo {game_id}: esperada {expected_version}, atual {current_version}"
+        )
+        self.expected_version = expected_version
+        self.current_version = current_version
 
-from observer_pattern import Subject, Observer
 
 class GameManager(Subject):
     def __init__(self):
         super().__init__()
         self.games: Dict[int, GameState] = {}
         self.next_game_id = 1
+        # Último snapshot imutável de cada jogo, refeito só quando a versão muda
+        self._snapshots: Dict[int, GameSnapshot] = {}
+        # Checkpoint (checkpoint.CheckpointReader) com jogos ainda não carregados
+        self._cold = None
 
-    def notify(self, game_state: GameState):
-        """Notifica todos os observadores anexados."""
-        for observer in self._observers:
-            observer.update(game_state)
+    def _commit(self, game: GameState, event_type: GameEventType, delta: dict) -> None:
+        """Confirma uma mudança no jogo e publica o evento só para os inscritos"""
+        game.version += 1
+        self.publish(GameEvent(
+            type=event_type,
+            game_id=game.id,
+            version=game.version,
+            delta=delta,
+            game_state=game
+        ))
     
-    def _shuffle_deck(self, deck: List[Card]) -> List[Card]:
-        """Embaralha o deck"""
-        random.shuffle(deck)
+    def _shuffle_deck(self, deck: Deck) -> Deck:
+        """Embaralha o deck no lugar"""
+        deck.shuffle()
         return deck
     
+    def _get_game(self, game_id: int) -> Optional[GameState]:
+        """Jogo em memória ou, na primeira vez que é tocado, carregado do checkpoint"""
+        game = self.games.get(game_id)
+        if game is None and self._cold is not None:
+            game = self._materialize(game_id)
+        return game
+
     def _validate_game_exists(self, game_id: int) -> GameState:
         """Valida se o jogo existe e retorna o estado do jogo"""
-        game = self.games.get(game_id)
+        game = self._get_game(game_id)
         if not game:
             raise ValueError("Jogo não encontrado")
         return game
     
+    def _validate_expected_version(self, game: GameState, expected_version: Optional[int]) -> None:
+        """Compare-and-swap: com versão esperada, só aceita a jogada se o estado não mudou"""
+        if expected_version is not None and expected_version != game.version:
+            raise VersionConflictError(game.id, expected_version, game.version)
+    
+    def check_version(self, game_id: int, expected_version: Optional[int]) -> None:
+        """Rejeita cedo (sem lock) uma jogada feita sobre uma versão desatualizada"""
+        game = self._get_game(game_id)
+        if game is not None:
+            self._validate_expected_version(game, expected_version)
+    
     def _validate_player_exists(self, game: GameState, player_id: int) -> None:
         """Valida se o jogador existe no jogo"""
         if player_id < 0 or player_id >= len(game.players):
@@ -43,50 +94,88 @@ class GameManager(Subject):
         if player_id != game.current_player_index:
             raise ValueError("Não é a vez deste jogador")
     
-    def _create_players(self, quantidade_jogadores: int) -> List[Player]:
-        """Cria a lista de jogadores para o jogo"""
+    def _create_players(self, quantidade_jogadores: int,
+                        player_ids: Optional[List[Optional[str]]] = None) -> List[Player]:
+        """Cria a lista de jogadores para o jogo, com as identidades de conta quando informadas"""
         players = []
         for i in range(quantidade_jogadores):
-            players.append(Player(id=i))
+            players.append(Player(id=i, account_id=player_ids[i] if player_ids else None))
         return players
     
-    def _deal_cards(self, players: List[Player], deck: List[Card], cards_per_player: int = 5) -> None:
+    def _deal_cards(self, players: List[Player], deck: Deck, cards_per_player: int = CARDS_PER_PLAYER) -> None:
         """Distribui cartas para cada jogador"""
         for player in players:
             for _ in range(cards_per_player):
-                if deck:
-                    card = deck.pop()
-                    player.add_card(card)
+                card = deck.draw()
+                if card is None:
+                    return
+                player.add_card(card)
     
-    def _setup_discard_pile(self, deck: List[Card]) -> List[Card]:
+    def _setup_discard_pile(self, deck: Deck) -> List[Card]:
         """Configura a pilha de descarte com a primeira carta apropriada"""
         discard_pile = []
-        first_card = None
-        while deck and (first_card is None or first_card.type != CardType.NUMBER):
-            first_card = deck.pop()
-            if first_card.type == CardType.NUMBER:
-                discard_pile.append(first_card)
-            else:
-                deck.insert(0, first_card)  # Coloca no fundo do deck
-                first_card = None
+        # Cartas de ação vão para o fundo (O(1)); cada carta é vista no máximo uma vez
+        for _ in range(len(deck)):
+            card = deck.draw()
+            if card.type == CardType.NUMBER:
+                discard_pile.append(card)
+                return discard_pile
+            deck.put_bottom(card)
                 
-        if not discard_pile and deck:
-            first_card = deck.pop()
-            discard_pile.append(first_card)
+        if deck:
+            discard_pile.append(deck.draw())
         
         return discard_pile
     
-    def novo_jogo(self, quantidade_jogadores: int) -> int:
-        """Inicia um novo jogo e retorna o ID do jogo"""
-        if quantidade_jogadores < 2 or quantidade_jogadores > 10:
+    @staticmethod
+    def decks_needed(quantidade_jogadores: int) -> int:
+        """
+        Quantos baralhos de 108 cartas unir: a distribuição inicial
+        deve consumir no máximo metade das cartas
+        """
+        return max(1, math.ceil(quantidade_jogadores * CARDS_PER_PLAYER * 2 / DECK_SIZE))
+    
+    @staticmethod
+    def validar_novo_jogo(quantidade_jogadores: int, modo_festa: bool = False,
+                          player_ids: Optional[List[Optional[str]]] = None, seed: Optional[int] = None) -> None:
+        """
+        ValueError se os parâmetros não formam um jogo válido.
+        As rotas validam antes da admissão: pedido inválido não conta como admitido.
+        """
+        if modo_festa:
+            if quantidade_jogadores < 2 or quantidade_jogadores > MAX_PARTY_PLAYERS:
+                raise ValueError(f"Número de jogadores deve ser entre 2 e {MAX_PARTY_PLAYERS} no modo festa")
+        elif quantidade_jogadores < 2 or quantidade_jogadores > MAX_PLAYERS:
             raise ValueError("Número de jogadores deve ser entre 2 e 10")
         
+        if seed is not None and not -2 ** 63 <= seed < 2 ** 63:
+            raise ValueError("Semente deve caber em 64 bits")
+
+        if player_ids is not None:
+            if len(player_ids) != quantidade_jogadores:
+                raise ValueError("Quantidade de identidades diferente da quantidade de jogadores")
+            named = [account for account in player_ids if account is not None]
+            if len(set(named)) != len(named):
+                raise ValueError("Um jogador não pode ocupar dois assentos")
+
+    def novo_jogo(self, quantidade_jogadores: int, ruleset: Ruleset = STANDARD, modo_festa: bool = False,
+                  player_ids: Optional[List[Optional[str]]] = None, seed: Optional[int] = None) -> int:
+        """
+        Inicia um novo jogo e retorna o ID do jogo.
+        O `ruleset` (variantes da casa) é compilado em tabelas uma vez por conjunto de regras.
+        No `modo_festa` aceita até MAX_PARTY_PLAYERS jogadores, unindo vários baralhos.
+        `player_ids` associa cada assento a uma conta persistente (None = anônimo).
+        `seed` fixa o embaralhamento do jogo (o inicial e os do descarte): a mesma
+        sequência de jogadas reproduz o mesmo jogo.
+        """
+        self.validar_novo_jogo(quantidade_jogadores, modo_festa, player_ids, seed)
+
         # Criar e embaralhar o deck
-        deck = CardFacade.create_uno_deck()
-        deck = self._shuffle_deck(deck)
+        num_decks = self.decks_needed(quantidade_jogadores)
+        deck = self._shuffle_deck(Deck(CardFacade.create_uno_deck(num_decks), seed=seed))
         
         # Criar jogadores e distribuir cartas
-        players = self._create_players(quantidade_jogadores)
+        players = self._create_players(quantidade_jogadores, player_ids)
         self._deal_cards(players, deck)
         
         # Configurar pilha de descarte
@@ -101,14 +190,22 @@ class GameManager(Subject):
             current_player_index=0,
             status=GameStatus.IN_PROGRESS,
             play_direction=PlayDirection.CLOCKWISE,
-            current_color=discard_pile[0].color if discard_pile else None
+            current_color=discard_pile[0].color if discard_pile else None,
+            rules=compile_ruleset(ruleset)
         )
         
         self.games[self.next_game_id] = game_state
         game_id = self.next_game_id
         self.next_game_id += 1
 
-        self.notify(game_state)
+        top_card = game_state.get_top_discard_card()
+        self._commit(game_state, GameEventType.GAME_CREATED, {
+            "player_count": quantidade_jogadores,
+            "deck_count": num_decks,
+            "top_card": str(top_card) if top_card else None,
+            "current_player": game_state.current_player_index,
+            "current_color": game_state.current_color
+        })
         
         return game_id
     
@@ -124,10 +221,24 @@ class GameManager(Subject):
         game = self._validate_game_exists(game_id)
         return game.current_player_index
     
-    def can_play_card(self, card: Card, top_card: Card, current_color: CardColor = None) -> bool:
+    def get_snapshot(self, game_id: int) -> GameSnapshot:
+        """
+        Snapshot imutável da versão atual do jogo, para leituras sem lock.
+        É reconstruído apenas na primeira leitura após uma mudança de versão.
+        """
+        game = self._validate_game_exists(game_id)
+        snapshot = self._snapshots.get(game_id)
+        if snapshot is None or snapshot.version != game.version:
+            snapshot = self._snapshots[game_id] = GameSnapshot.of(game)
+        return snapshot
+    
+    def can_play_card(self, card: Card, top_card: Card, current_color: CardColor = None,
+                      game: Optional[GameState] = None) -> bool:
         """Verifica se uma carta pode ser jogada sobre a carta do topo"""
-        # Usar a fachada que considera a current_color
-        return CardFacade.can_play_card(card, top_card, current_color)
+        if game is None:
+            # Usar a fachada que considera a current_color
+            return CardFacade.can_play_card(card, top_card, current_color)
+        return game.rules.can_play(card, top_card, current_color, game.pending_draw)
     
     def get_playable_cards(self, game_id: int, player_id: int) -> List[Card]:
         """Retorna as cartas jogáveis do jogador"""
@@ -139,13 +250,40 @@ class GameManager(Subject):
             return []
         
         player_hand = game.players[player_id].hand
-        return CardFacade.filter_playable_cards(player_hand, top_card)
+        return [card for card in player_hand
+                if game.rules.can_play(card, top_card, game.current_color, game.pending_draw)]
     
-    def jogar_carta(self, game_id: int, player_id: int, card_index: int, chosen_color: CardColor = None) -> dict:
-        """Joga uma carta da mão do jogador"""
+    def _validate_turn_or_jump_in(self, game: GameState, player_id: int, card_index: int) -> bool:
+        """
+        Valida a vez; com a regra jump-in, uma carta idêntica ao topo pode furar a vez
+        Retorna True se é um jump-in: a vez só muda depois que a jogada inteira for validada
+        """
+        if player_id == game.current_player_index:
+            return False
+        if game.rules.ruleset.jump_in:
+            self._validate_player_exists(game, player_id)
+            hand = game.players[player_id].hand
+            top_card = game.get_top_discard_card()
+            if (top_card and 0 <= card_index < len(hand)
+                    and game.rules.can_jump_in(hand[card_index], top_card, game.pending_draw)):
+                return True
+        self._validate_player_turn(game, player_id)
+        return False
+    
+    def resolver_jogada(self, game_id: int, player_id: int, card_index: int,
+                   chosen_color: CardColor = None,
+                   target_player: Optional[int] = None,
+                   expected_version: Optional[int] = None) -> Tuple[GameState, Card, EffectOutcome]:
+        """
+        Valida e executa uma jogada, publicando os eventos.
+        Não monta mensagens: as rotas v1 e v2 formatam o resultado como precisarem.
+        `target_player` só é usado por efeitos com alvo (troca de mão da regra 7-0).
+        Com `expected_version`, a jogada é rejeitada (VersionConflictError) se o estado mudou.
+        """
         game = self._validate_game_exists(game_id)
+        self._validate_expected_version(game, expected_version)
         self._validate_game_in_progress(game)
-        self._validate_player_turn(game, player_id)
+        jump_in = self._validate_turn_or_jump_in(game, player_id, card_index)
         
         player = game.players[player_id]
         top_card = game.get_top_discard_card()
@@ -156,10 +294,18 @@ class GameManager(Subject):
         if card_index < 0 or card_index >= len(player.hand):
             raise ValueError("Índice de carta inválido")
         
+        if target_player is not None:
+            self._validate_player_exists(game, target_player)
+        
         card_to_play = player.hand[card_index]
         
         # Verificar se a carta pode ser jogada
-        if not self.can_play_card(card_to_play, top_card, game.current_color):
+        if not self.can_play_card(card_to_play, top_card, game.current_color, game):
+            if game.pending_draw:
+                raise ValueError(
+                    f"Há uma compra acumulada de {game.pending_draw} cartas: "
+                    f"jogue um +2/+4 ou passe a vez para comprar"
+                )
             current_color_display = game.current_color.value if game.current_color else top_card.color.value
             raise ValueError(
             f"Carta não pode ser jogada. Carta do topo: {top_card}, "
@@ -174,12 +320,16 @@ class GameManager(Subject):
         if chosen_color and chosen_color not in [CardColor.RED, CardColor.BLUE, CardColor.GREEN, CardColor.YELLOW]:
             raise ValueError("Cor escolhida deve ser RED, BLUE, GREEN ou YELLOW")
         
+        if jump_in:
+            # A vez passa a ser de quem entrou; o jogo segue a partir dele
+            game.current_player_index = player_id
+        
         # Remover carta da mão do jogador e colocar na pilha de descarte
         played_card = player.remove_card(card_index)
         game.discard_pile.append(played_card)
         
         # Aplicar efeito da carta - passando a cor escolhida
-        effect_result = game.apply_card_effect(played_card, chosen_color)
+        outcome = game.resolve_card_effect(played_card, chosen_color, target_player)
         
         # Atualizar cor atual se necessário
         if played_card.type in [CardType.WILD, CardType.WILD_DRAW_FOUR] and chosen_color:
@@ -187,14 +337,39 @@ class GameManager(Subject):
         elif played_card.type != CardType.WILD and played_card.type != CardType.WILD_DRAW_FOUR:
             game.current_color = played_card.color
         
+        played_delta = {
+            "player_id": player_id,
+            "played_card": str(played_card),
+            "hand_size": player.get_card_count(),
+            "current_color": game.current_color,
+            "effect": outcome.code
+        }
+        
         # Verificar se o jogador ganhou
         if not player.has_cards():
             game.status = GameStatus.FINISHED
             game.winner = player_id
             game.next_turn()
 
-            self.notify(game)
+            played_delta["next_player"] = game.current_player_index
+            self._commit(game, GameEventType.CARD_PLAYED, played_delta)
+            self._commit(game, GameEventType.GAME_FINISHED, {"winner": player_id})
+            return game, played_card, outcome
 
+        game.next_turn()
+        played_delta["next_player"] = game.current_player_index
+        self._commit(game, GameEventType.CARD_PLAYED, played_delta)
+        return game, played_card, outcome
+    
+    def jogar_carta(self, game_id: int, player_id: int, card_index: int, chosen_color: CardColor = None,
+                    target_player: Optional[int] = None, expected_version: Optional[int] = None) -> dict:
+        """Joga uma carta da mão do jogador"""
+        game, played_card, outcome = self.resolver_jogada(
+            game_id, player_id, card_index, chosen_color, target_player, expected_version
+        )
+        effect_result = describe_effect(outcome)
+        
+        if game.status == GameStatus.FINISHED:
             return {
                 "message": "Carta jogada com sucesso",
                 "winner": player_id,
@@ -202,9 +377,6 @@ class GameManager(Subject):
                 "played_card": CardFacade.get_card_display_name(played_card),
                 "effect": effect_result
             }
-
-        game.next_turn()
-        self.notify(game)
         
         return {
             "message": "Carta jogada com sucesso",
@@ -213,25 +385,64 @@ class GameManager(Subject):
             "effect": effect_result
         }
     
-    def passar_vez(self, game_id: int, player_id: int) -> dict:
-        """Passa a vez, comprando uma carta"""
+    def _draw_until_playable(self, game: GameState, player_id: int) -> List[Card]:
+        """Regra draw-until-playable: compra até sair uma carta jogável (ou acabar o baralho)"""
+        drawn: List[Card] = []
+        top_card = game.get_top_discard_card()
+        while True:
+            cards = game.draw_cards_for_player(player_id, 1)
+            if not cards:
+                return drawn
+            drawn.append(cards[0])
+            if top_card is None or game.rules.can_play(cards[0], top_card, game.current_color):
+                return drawn
+    
+    def resolver_passagem(self, game_id: int, player_id: int,
+                          event_type: GameEventType = GameEventType.TURN_PASSED,
+                          expected_version: Optional[int] = None) -> Tuple[GameState, List[Card]]:
+        """
+        Valida e executa a passagem de vez; retorna as cartas compradas.
+        Com compra acumulada pendente, o jogador compra o total e perde a vez.
+        Na regra draw-until-playable, se a carta comprada for jogável a vez continua com ele.
+        `event_type` distingue a passagem pedida pelo jogador da forçada por tempo esgotado.
+        """
         game = self._validate_game_exists(game_id)
+        self._validate_expected_version(game, expected_version)
         self._validate_game_in_progress(game)
         self._validate_player_turn(game, player_id)
         
         player = game.players[player_id]
+        keeps_turn = False
         
-        # Comprar uma carta do deck
-        if game.deck:
-            card = game.deck.pop()
-            player.add_card(card)
-            card_message = f"Comprou: {CardFacade.get_card_display_name(card)}"
+        if game.pending_draw:
+            drawn = game.draw_cards_for_player(player_id, game.pending_draw)
+            game.pending_draw = 0
+        elif game.rules.ruleset.draw_until_playable:
+            drawn = self._draw_until_playable(game, player_id)
+            keeps_turn = bool(drawn) and game.rules.can_play(drawn[-1], game.get_top_discard_card(), game.current_color)
         else:
-            card_message = "Deck vazio - não foi possível comprar carta"
+            # Comprar uma carta do deck (reabastecendo com o descarte se preciso)
+            drawn = game.draw_cards_for_player(player_id, 1)
         
         # Passar para o próximo jogador
-        game.next_turn()
-        self.notify(game)
+        if not keeps_turn:
+            game.next_turn()
+        self._commit(game, event_type, {
+            "player_id": player_id,
+            "cards_drawn": len(drawn),
+            "hand_size": player.get_card_count(),
+            "next_player": game.current_player_index
+        })
+        return game, drawn
+    
+    def passar_vez(self, game_id: int, player_id: int, expected_version: Optional[int] = None) -> dict:
+        """Passa a vez, comprando uma carta"""
+        game, drawn = self.resolver_passagem(game_id, player_id, expected_version=expected_version)
+        
+        if drawn:
+            card_message = "Comprou: " + ", ".join(CardFacade.get_card_display_name(card) for card in drawn)
+        else:
+            card_message = "Deck vazio - não foi possível comprar carta"
         
         return {
             "message": "Vez passada com sucesso",
@@ -239,7 +450,114 @@ class GameManager(Subject):
             "next_player": game.current_player_index
         }
     
+    def expirar_vez(self, game_id: int) -> Tuple[GameState, List[Card]]:
+        """Tempo da vez esgotado: passa a vez do jogador atual (publica TURN_TIMED_OUT)"""
+        game = self._validate_game_exists(game_id)
+        return self.resolver_passagem(game_id, game.current_player_index, GameEventType.TURN_TIMED_OUT)
+    
+    def encerrar_jogo(self, game_id: int, motivo: str = "inatividade") -> GameState:
+        """
+        Encerra um jogo abandonado e o remove de `games`.
+        Os observadores recebem GAME_ABANDONED com o estado final.
+        """
+        game = self._validate_game_exists(game_id)
+        self._validate_game_in_progress(game)
+        game.status = GameStatus.ABANDONED
+        self._commit(game, GameEventType.GAME_ABANDONED, {"reason": motivo})
+        del self.games[game_id]
+        self._snapshots.pop(game_id, None)
+        return game
+    
+    def _announce(self, game: GameState, event_type: GameEventType, delta: dict) -> None:
+        """Publica um evento sem mudar a versão (o estado do jogo não mudou)"""
+        self.publish(GameEvent(type=event_type, game_id=game.id, version=game.version,
+                               delta=delta, game_state=game))
+
+    def exportar_jogo(self, game_id: int, remover: bool = False) -> bytes:
+        """
+        Snapshot binário do jogo (snapshot_codec), para migrá-lo ou arquivá-lo.
+        Com `remover` o jogo sai deste GameManager (esvaziar o nó) e os
+        observadores recebem GAME_EXPORTED; a versão não muda.
+        """
+        game = self._validate_game_exists(game_id)
+        data = encode_game(game)
+        if remover:
+            del self.games[game_id]
+            self._snapshots.pop(game_id, None)
+            self._announce(game, GameEventType.GAME_EXPORTED, {"size": len(data)})
+        return data
+
+    def descartar_jogo(self, game_id: int) -> GameState:
+        """
+        Tira da memória um jogo já encerrado (alívio de memória). Para os
+        observadores é como a exportação: recebem GAME_EXPORTED e esquecem o jogo.
+        """
+        game = self._validate_game_exists(game_id)
+        if game.status == GameStatus.IN_PROGRESS:
+            raise ValueError("Só jogos encerrados podem ser descartados")
+        del self.games[game_id]
+        self._snapshots.pop(game_id, None)
+        self._announce(game, GameEventType.GAME_EXPORTED, {"evicted": True})
+        return game
+
+    def importar_jogo(self, data: bytes) -> int:
+        """
+        Recebe um jogo exportado por outro GameManager, com o mesmo id e a
+        mesma versão: a partida continua de onde parou, e jogadas com a versão
+        esperada seguem válidas. Os observadores recebem GAME_IMPORTED.
+        """
+        game = decode_game(data)
+        if game.id in self.games or (self._cold is not None and game.id in self._cold):
+            raise ValueError("Já existe um jogo com esse id")
+        if game.status != GameStatus.IN_PROGRESS:
+            raise ValueError("Só jogos em andamento podem ser importados")
+        self.games[game.id] = game
+        self.next_game_id = max(self.next_game_id, game.id + 1)
+        self._announce(game, GameEventType.GAME_IMPORTED, {
+            "player_count": len(game.players),
+            "current_player": game.current_player_index
+        })
+        return game.id
+
+    def restaurar_checkpoint(self, reader) -> int:
+        """
+        Usa um checkpoint (checkpoint.CheckpointReader) como armazenamento frio:
+        nada é decodificado agora; cada jogo é carregado quando for tocado.
+        Retorna quantos jogos estão no checkpoint.
+        """
+        self._cold = reader
+        self.next_game_id = max(self.next_game_id, reader.next_game_id)
+        return len(reader)
+
+    def _materialize(self, game_id: int) -> Optional[GameState]:
+        data = self._cold.take(game_id)
+        if data is None:
+            return None
+        game = decode_game(bytes(data))
+        self.games[game_id] = game
+        if not self._cold:
+            self._cold = None  # todos carregados: o arquivo não é mais necessário
+        # Para os observadores o jogo chega como uma importação (prazos, resumo, memória)
+        self._announce(game, GameEventType.GAME_IMPORTED, {
+            "player_count": len(game.players),
+            "current_player": game.current_player_index,
+            "checkpoint": True
+        })
+        return game
+
+    def cold_games(self) -> int:
+        """Quantos jogos do checkpoint ainda não foram carregados"""
+        return len(self._cold) if self._cold is not None else 0
+
+    def is_cold(self, game_id: int) -> bool:
+        """True se o jogo ainda está só no checkpoint (não carregado)"""
+        return self._cold is not None and game_id in self._cold
+
+    def cold_snapshots(self):
+        """(id, snapshot) dos jogos do checkpoint que ainda não foram carregados"""
+        return self._cold.pending() if self._cold is not None else iter(())
+
     def get_game_state(self, game_id: int) -> Optional[GameState]:
         """Retorna o estado completo do jogo (para debug)"""
-        return self.games.get(game_id)
+        return self._get_game(game_id)
 
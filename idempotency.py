@@ -0,0 +1,138 @@
+"""
+Cache de idempotência para as rotas que alteram o jogo.
+
+Clientes que repetem uma requisição (timeout, rede móvel) enviam o mesmo
+cabeçalho `Idempotency-Key`. A primeira execução guarda o resultado, de sucesso
+ou de erro de validação, sob a chave (escopo, jogo, jogador, chave); repetições recebem o
+mesmo resultado sem tocar no GameState nem esperar o lock do jogo.
+
+O cache é limitado em tamanho e em tempo de vida. As entradas ficam na ordem de
+criação, então as expiradas e as mais antigas saem sempre pelo início (O(1)).
+"""
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, AsyncContextManager, Callable, Dict, Hashable, Optional, Tuple
+
+DEFAULT_MAX_ENTRIES = 100_000
+DEFAULT_TTL = 600.0  # segundos
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+class IdempotencyKeyConflict(Exception):
+    """A mesma chave foi reutilizada com parâmetros diferentes"""
+
+
+@dataclass(slots=True)
+class CachedResult:
+    expires_at: float
+    fingerprint: Hashable
+    payload: Any = None
+    error: Optional[str] = None
+
+    def replay(self) -> Any:
+        """Devolve o resultado guardado (ou repete o erro de validação original)"""
+        if self.error is not None:
+            raise ValueError(self.error)
+        return self.payload
+
+
+class IdempotencyCache:
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: float = DEFAULT_TTL,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: "OrderedDict[Hashable, CachedResult]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.conflicts = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _purge_expired(self, now: float) -> None:
+        entries = self._entries
+        while entries:
+            oldest = next(iter(entries.values()))
+            if oldest.expires_at > now:
+                return
+            entries.popitem(last=False)
+            self.expirations += 1
+
+    def lookup(self, key: Hashable, fingerprint: Hashable) -> Optional[CachedResult]:
+        """Resultado guardado para a chave, ou None; chave reaproveitada com outros parâmetros é conflito"""
+        self._purge_expired(self.clock())
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.fingerprint != fingerprint:
+            self.conflicts += 1
+            raise IdempotencyKeyConflict(
+                f"{IDEMPOTENCY_HEADER} já usada com parâmetros diferentes nesta partida"
+            )
+        return entry
+
+    def store(self, key: Hashable, fingerprint: Hashable, payload: Any = None,
+              error: Optional[str] = None) -> None:
+        now = self.clock()
+        self._purge_expired(now)
+        self._entries[key] = CachedResult(now + self.ttl, fingerprint, payload, error)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def run(self, key: Optional[Hashable], fingerprint: Hashable,
+                  hold: AsyncContextManager, operation: Callable[[], Any],
+                  precheck: Optional[Callable[[], None]] = None) -> Tuple[Any, bool]:
+        """
+        Executa `operation` dentro de `hold` (o lock do jogo) uma única vez por chave.
+        Retorna (resultado, repetido). Sem chave, apenas executa.
+        Erros de validação (ValueError) também são guardados e repetidos.
+        `precheck` roda antes de esperar o lock (ex.: rejeitar versão desatualizada);
+        repetições já resolvidas não passam por ele.
+        """
+        if key is None:
+            if precheck is not None:
+                precheck()
+            async with hold:
+                return operation(), False
+
+        # Caminho rápido: repetição já resolvida não espera o lock do jogo
+        entry = self.lookup(key, fingerprint)
+        if entry is None:
+            if precheck is not None:
+                precheck()
+            async with hold:
+                # Repetição concorrente: a primeira execução pode ter terminado enquanto esperávamos
+                entry = self.lookup(key, fingerprint)
+                if entry is None:
+                    self.misses += 1
+                    try:
+                        payload = operation()
+                    except ValueError as e:
+                        self.store(key, fingerprint, error=str(e))
+                        raise
+                    self.store(key, fingerprint, payload)
+                    return payload, False
+        self.hits += 1
+        return entry.replay(), True
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Métricas para a rota da API"""
+        total = self.hits + self.misses
+        return {
+            "entradas": len(self._entries),
+            "capacidade": self.max_entries,
+            "ttl_segundos": self.ttl,
+            "acertos": self.hits,
+            "falhas": self.misses,
+            "taxa_acerto": self.hits / total if total else 0.0,
+            "despejos": self.evictions,
+            "expiradas": self.expirations,
+            "conflitos": self.conflicts
+        }
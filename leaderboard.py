@@ -0,0 +1,255 @@
+"""
+Ranking entre partidas.
+
+- `PlayerRegistry`: ratings por conta (identidade persistente de `Player.account_id`),
+  com persistência opcional em JSON;
+- `Leaderboard`: skip list indexável ordenada por rating, com "posição do jogador X"
+  e "top-k" em O(log n);
+- `RatingObserver`: Observer de GAME_FINISHED que atualiza os ratings (Elo
+  multijogador) e os pontos (soma das mãos dos perdedores) incrementalmente.
+"""
+import json
+import os
+import random
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+
+from card_facade import CardFacade
+from models import GameState, GameStatus
+from observer_pattern import Observer, GameEvent, GameEventType
+
+INITIAL_RATING = 1500.0
+K_FACTOR = 32.0
+_MAX_LEVEL = 32
+_P = 0.25
+
+
+@dataclass(slots=True)
+class PlayerRating:
+    account_id: str
+    rating: float = INITIAL_RATING
+    games: int = 0
+    wins: int = 0
+    points: int = 0
+
+
+class _Node:
+    __slots__ = ("key", "forward", "width")
+
+    def __init__(self, key, level: int):
+        self.key = key
+        self.forward: List[Optional['_Node']] = [None] * level
+        self.width: List[int] = [1] * level
+
+
+class Leaderboard:
+    """
+    Skip list indexável: cada ponteiro guarda quantos nós ele salta,
+    então posição e acesso por índice saem na mesma descida O(log n).
+    Ordem: maior rating primeiro; empate desfeito pelo account_id.
+    """
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        self._rng = rng or random.Random()
+        self._head = _Node(None, _MAX_LEVEL)
+        self._level = 1
+        self._size = 0
+        self._keys: Dict[str, Tuple[float, str]] = {}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, account_id: str) -> bool:
+        return account_id in self._keys
+
+    def _random_level(self) -> int:
+        level = 1
+        while level < _MAX_LEVEL and self._rng.random() < _P:
+            level += 1
+        return level
+
+    def _path(self, key) -> Tuple[List[_Node], List[int]]:
+        """Último nó antes de `key` em cada nível e a posição (0-based) de cada um"""
+        update: List[_Node] = [self._head] * _MAX_LEVEL
+        positions = [0] * _MAX_LEVEL
+        node = self._head
+        position = -1  # a cabeça fica antes do índice 0
+        for level in range(self._level - 1, -1, -1):
+            while node.forward[level] is not None and node.forward[level].key < key:
+                position += node.width[level]
+                node = node.forward[level]
+            update[level] = node
+            positions[level] = position
+        return update, positions
+
+    def insert(self, account_id: str, rating: float) -> None:
+        """Insere (ou reposiciona) a conta com o novo rating"""
+        if account_id in self._keys:
+            self.remove(account_id)
+        key = (-rating, account_id)
+        update, positions = self._path(key)
+        level = self._random_level()
+        if level > self._level:
+            for extra in range(self._level, level):
+                update[extra] = self._head
+                positions[extra] = -1
+                self._head.width[extra] = self._size + 1
+            self._level = level
+
+        node = _Node(key, level)
+        index = positions[0] + 1  # posição do novo nó
+        for lvl in range(level):
+            prev = update[lvl]
+            node.forward[lvl] = prev.forward[lvl]
+            prev.forward[lvl] = node
+            # O ponteiro antigo de `prev` é dividido entre `prev` e o novo nó
+            node.width[lvl] = prev.width[lvl] - (index - positions[lvl]) + 1
+            prev.width[lvl] = index - positions[lvl]
+        for lvl in range(level, self._level):
+            update[lvl].width[lvl] += 1
+        self._keys[account_id] = key
+        self._size += 1
+
+    def remove(self, account_id: str) -> None:
+        key = self._keys.pop(account_id)
+        update, _ = self._path(key)
+        node = update[0].forward[0]
+        for lvl in range(self._level):
+            prev = update[lvl]
+            if prev.forward[lvl] is node:
+                prev.width[lvl] += node.width[lvl] - 1
+                prev.forward[lvl] = node.forward[lvl]
+            else:
+                prev.width[lvl] -= 1
+        while self._level > 1 and self._head.forward[self._level - 1] is None:
+            self._level -= 1
+        self._size -= 1
+
+    def rank(self, account_id: str) -> int:
+        """Posição (1 = primeiro) da conta no ranking"""
+        key = self._keys.get(account_id)
+        if key is None:
+            raise ValueError("Jogador não está no ranking")
+        _, positions = self._path(key)
+        return positions[0] + 2
+
+    def top(self, k: int, offset: int = 0) -> List[Tuple[str, float]]:
+        """As `k` primeiras contas a partir da posição `offset` (0-based)"""
+        if offset >= self._size or k <= 0:
+            return []
+        node = self._head
+        position = -1
+        for level in range(self._level - 1, -1, -1):
+            while node.forward[level] is not None and position + node.width[level] < offset:
+                position += node.width[level]
+                node = node.forward[level]
+        node = node.forward[0]
+        result = []
+        while node is not None and len(result) < k:
+            rating, account_id = -node.key[0], node.key[1]
+            result.append((account_id, rating))
+            node = node.forward[0]
+        return result
+
+
+class PlayerRegistry:
+    """Ratings por conta; opcionalmente carregados de/salvos em um arquivo JSON"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.ratings: Dict[str, PlayerRating] = {}
+        self.leaderboard = Leaderboard()
+        self.changes = 0  # partidas registradas; o gravador periódico compara com a última gravada
+        if path and os.path.exists(path):
+            self.load()
+
+    def get(self, account_id: str) -> PlayerRating:
+        rating = self.ratings.get(account_id)
+        if rating is None:
+            rating = self.ratings[account_id] = PlayerRating(account_id)
+        return rating
+
+    def set_rating(self, account_id: str, rating: float) -> None:
+        self.get(account_id).rating = rating
+        self.leaderboard.insert(account_id, rating)
+
+    def load(self) -> None:
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        for entry in data:
+            player = PlayerRating(**entry)
+            self.ratings[player.account_id] = player
+            self.leaderboard.insert(player.account_id, player.rating)
+
+    def entries(self) -> List[Dict[str, object]]:
+        """Cópia dos ratings para gravar fora do event loop (as contas continuam mudando nele)"""
+        return [asdict(player) for player in self.ratings.values()]
+
+    def save(self, entries: Optional[List[Dict[str, object]]] = None) -> None:
+        """Grava atomicamente (arquivo temporário + rename) os `entries` ou os ratings atuais"""
+        if not self.path:
+            return
+        if entries is None:
+            entries = self.entries()
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, self.path)
+
+    def profile(self, account_id: str) -> Dict[str, object]:
+        """Resumo da conta para a rota da API"""
+        player = self.ratings.get(account_id)
+        if player is None:
+            raise ValueError("Jogador não encontrado")
+        return {**asdict(player), "rank": self.leaderboard.rank(account_id)}
+
+
+class RatingObserver(Observer):
+    """
+    Observer de GAME_FINISHED: o vencedor "vence" cada perdedor em um confronto
+    Elo, com K dividido pelo número de adversários. Assentos anônimos não contam.
+    O vencedor soma os pontos das mãos dos perdedores (calculate_hand_value).
+    """
+    def __init__(self, registry: PlayerRegistry, k_factor: float = K_FACTOR):
+        self.registry = registry
+        self.k_factor = k_factor
+
+    def update(self, game_state: GameState):
+        pass
+
+    def on_event(self, event: GameEvent):
+        if event.type == GameEventType.GAME_FINISHED:
+            self.record_game(event.game_state)
+
+    def record_game(self, game: GameState) -> None:
+        if game.status != GameStatus.FINISHED or game.winner is None:
+            return
+        registry = self.registry
+        registry.changes += 1
+        winner = game.players[game.winner]
+        losers = [player for player in game.players if player.id != game.winner]
+
+        for player in game.players:
+            if player.account_id is not None:
+                registry.get(player.account_id).games += 1
+                if player.account_id not in registry.leaderboard:
+                    registry.set_rating(player.account_id, registry.get(player.account_id).rating)
+
+        if winner.account_id is None:
+            return
+        winner_rating = registry.get(winner.account_id)
+        winner_rating.wins += 1
+        winner_rating.points += sum(CardFacade.calculate_hand_value(player.hand) for player in losers)
+
+        rated = [player.account_id for player in losers if player.account_id is not None]
+        if not rated:
+            return
+        k = self.k_factor / len(rated)
+        gain = 0.0
+        for account_id in rated:
+            rating = registry.get(account_id).rating
+            expected = 1.0 / (1.0 + 10 ** ((rating - winner_rating.rating) / 400.0))
+            delta = k * (1.0 - expected)
+            gain += delta
+            registry.set_rating(account_id, rating - delta)
+        registry.set_rating(winner.account_id, winner_rating.rating + gain)
@@ -0,0 +1,248 @@
+"""
+Lobby de matchmaking na frente do GameManager.
+
+Jogadores entram na fila com o tamanho de mesa preferido (2-10) e, opcionalmente,
+uma faixa de habilidade. Cada par (tamanho, faixa) tem seu próprio heap ordenado
+pela hora de entrada, então entrar e sair da fila custam O(log n). Cancelamentos
+são preguiçosos: o ticket é marcado e descartado quando chega ao topo do heap.
+
+O matcher (`match`) roda em lote: forma todas as mesas possíveis de uma vez,
+cria os jogos com `novo_jogo` e acorda quem está esperando no long-poll.
+Com controle de admissão (memory_budget), só forma as mesas que cabem no
+orçamento de memória; os demais tickets continuam na fila para a próxima rodada.
+"""
+import asyncio
+import heapq
+import itertools
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from game_manager import MAX_PLAYERS
+from memory_budget import estimate_new_game_bytes
+
+MIN_TABLE_SIZE = 2
+WAIT_SAMPLES = 10_000       # janela de tempos de espera usada nos percentis
+MATCHED_RETENTION = 100_000  # tickets já pareados guardados até o cliente consultar
+
+QueueKey = Tuple[int, Optional[int]]
+
+
+class TicketStatus(str, Enum):
+    WAITING = "WAITING"
+    MATCHED = "MATCHED"
+    CANCELLED = "CANCELLED"
+
+
+@dataclass(slots=True)
+class LobbyTicket:
+    id: int
+    table_size: int
+    skill_bucket: Optional[int]
+    enqueued_at: float
+    account_id: Optional[str] = None
+    status: TicketStatus = TicketStatus.WAITING
+    game_id: Optional[int] = None
+    player_id: Optional[int] = None
+    wait_time: Optional[float] = None
+
+    @property
+    def queue_key(self) -> QueueKey:
+        return (self.table_size, self.skill_bucket)
+
+
+class Lobby:
+    """Filas de espera por (tamanho da mesa, faixa de habilidade)"""
+
+    def __init__(self, manager, clock: Callable[[], float] = time.monotonic, admission=None):
+        self.manager = manager
+        self.clock = clock
+        self.admission = admission
+        self._seq = itertools.count(1)
+        self._queues: Dict[QueueKey, List[Tuple[float, int]]] = {}
+        self._depth: Dict[QueueKey, int] = {}
+        self._waiting: Dict[int, LobbyTicket] = {}
+        self._accounts: Dict[str, int] = {}
+        self._matched: "OrderedDict[int, LobbyTicket]" = OrderedDict()
+        self._events: Dict[int, asyncio.Event] = {}
+        self._wait_times: Deque[float] = deque(maxlen=WAIT_SAMPLES)
+        self.tables_formed = 0
+        self.players_matched = 0
+        self.tables_deferred = 0  # filas cujas mesas ficaram para a próxima rodada por falta de memória
+
+    def enqueue(self, table_size: int, skill_bucket: Optional[int] = None,
+                account_id: Optional[str] = None) -> LobbyTicket:
+        """
+        Coloca um jogador na fila; retorna o ticket usado para acompanhar o pareamento.
+        `account_id` identifica o jogador no jogo criado (ranking); uma conta só entra uma vez.
+        """
+        if table_size < MIN_TABLE_SIZE or table_size > MAX_PLAYERS:
+            raise ValueError(f"Tamanho da mesa deve ser entre {MIN_TABLE_SIZE} e {MAX_PLAYERS}")
+        if account_id is not None and account_id in self._accounts:
+            raise ValueError("Jogador já está na fila")
+        ticket = LobbyTicket(
+            id=next(self._seq),
+            table_size=table_size,
+            skill_bucket=skill_bucket,
+            enqueued_at=self.clock(),
+            account_id=account_id
+        )
+        if account_id is not None:
+            self._accounts[account_id] = ticket.id
+        key = ticket.queue_key
+        heapq.heappush(self._queues.setdefault(key, []), (ticket.enqueued_at, ticket.id))
+        self._depth[key] = self._depth.get(key, 0) + 1
+        self._waiting[ticket.id] = ticket
+        return ticket
+
+    def cancel(self, ticket_id: int) -> LobbyTicket:
+        """Retira o ticket da fila (remoção preguiçosa do heap)"""
+        ticket = self._waiting.pop(ticket_id, None)
+        if ticket is None:
+            raise ValueError("Ticket não está na fila")
+        ticket.status = TicketStatus.CANCELLED
+        self._accounts.pop(ticket.account_id, None)
+        key = ticket.queue_key
+        self._depth[key] -= 1
+        heap = self._queues[key]
+        if len(heap) > 2 * self._depth[key] + 64:
+            # Muitos cancelados acumulados: reconstrói o heap só com os vivos (O(n) amortizado)
+            heap[:] = [entry for entry in heap if entry[1] in self._waiting]
+            heapq.heapify(heap)
+        self._wake(ticket_id)
+        return ticket
+
+    def get_ticket(self, ticket_id: int) -> LobbyTicket:
+        ticket = self._waiting.get(ticket_id) or self._matched.get(ticket_id)
+        if ticket is None:
+            raise ValueError("Ticket não encontrado")
+        return ticket
+
+    def _pop_group(self, key: QueueKey, size: int) -> List[LobbyTicket]:
+        """Retira os `size` tickets mais antigos da fila, pulando os cancelados"""
+        heap = self._queues[key]
+        group = []
+        while len(group) < size:
+            _, ticket_id = heapq.heappop(heap)
+            ticket = self._waiting.pop(ticket_id, None)
+            if ticket is not None:
+                group.append(ticket)
+        self._depth[key] -= size
+        return group
+
+    def _requeue(self, group: List[LobbyTicket]) -> None:
+        """Devolve à fila, na posição original, os tickets de uma mesa que não virou jogo"""
+        for ticket in group:
+            key = ticket.queue_key
+            heapq.heappush(self._queues[key], (ticket.enqueued_at, ticket.id))
+            self._depth[key] += 1
+            self._waiting[ticket.id] = ticket
+
+    def match(self) -> List[int]:
+        """
+        Forma todas as mesas completas e cria os jogos em lote.
+        Retorna os ids dos jogos criados.
+        """
+        now = self.clock()
+        tables: List[List[LobbyTicket]] = []
+        reserved = 0
+        for key, depth in self._depth.items():
+            size = key[0]
+            needed = estimate_new_game_bytes(size)
+            for _ in range(depth // size):
+                if self.admission is not None and not self.admission.allows(reserved + needed,
+                                                                            reserved_games=len(tables)):
+                    self.tables_deferred += 1
+                    break
+                reserved += needed
+                tables.append(self._pop_group(key, size))
+
+        game_ids = []
+        for index, group in enumerate(tables):
+            accounts = [ticket.account_id for ticket in group]
+            try:
+                game_id = self.manager.novo_jogo(
+                    len(group), player_ids=accounts if any(accounts) else None
+                )
+            except Exception:
+                # As mesas ainda não criadas voltam para a fila: nenhum ticket se perde
+                for pending in tables[index:]:
+                    self._requeue(pending)
+                raise
+            for account_id in accounts:
+                self._accounts.pop(account_id, None)
+            game_ids.append(game_id)
+            for player_id, ticket in enumerate(group):
+                ticket.status = TicketStatus.MATCHED
+                ticket.game_id = game_id
+                ticket.player_id = player_id
+                ticket.wait_time = now - ticket.enqueued_at
+                self._wait_times.append(ticket.wait_time)
+                self._remember(ticket)
+                self._wake(ticket.id)
+            self.players_matched += len(group)
+        self.tables_formed += len(tables)
+
+        # Heaps só de cancelados ficam vazios de fato: libera a memória
+        for key in [key for key, depth in self._depth.items() if depth == 0]:
+            del self._depth[key]
+            del self._queues[key]
+        return game_ids
+
+    def _remember(self, ticket: LobbyTicket) -> None:
+        self._matched[ticket.id] = ticket
+        if len(self._matched) > MATCHED_RETENTION:
+            self._matched.popitem(last=False)
+
+    def _wake(self, ticket_id: int) -> None:
+        event = self._events.pop(ticket_id, None)
+        if event is not None:
+            event.set()
+
+    async def wait_for_match(self, ticket_id: int, timeout: float) -> LobbyTicket:
+        """Long-poll: retorna quando o ticket for pareado/cancelado ou quando o tempo acabar"""
+        ticket = self.get_ticket(ticket_id)
+        if ticket.status == TicketStatus.WAITING:
+            event = self._events.get(ticket_id)
+            if event is None:
+                event = self._events[ticket_id] = asyncio.Event()
+            try:
+                await asyncio.wait_for(event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return ticket
+
+    def queue_depths(self) -> Dict[str, int]:
+        """Jogadores esperando por fila ("tamanho" ou "tamanho/faixa")"""
+        return {
+            (str(size) if bucket is None else f"{size}/{bucket}"): depth
+            for (size, bucket), depth in self._depth.items() if depth
+        }
+
+    def wait_percentiles(self, percentiles=(50, 90, 99)) -> Dict[str, Optional[float]]:
+        """Percentis (nearest-rank) dos tempos de espera mais recentes, em segundos"""
+        ordered = sorted(self._wait_times)
+        result = {}
+        for p in percentiles:
+            if not ordered:
+                result[f"p{p}"] = None
+                continue
+            rank = max(1, -(-p * len(ordered) // 100))
+            result[f"p{p}"] = ordered[rank - 1]
+        return result
+
+    def get_metrics(self) -> Dict[str, object]:
+        """Métricas para a rota da API"""
+        return {
+            "jogadores_na_fila": len(self._waiting),
+            "profundidade_filas": self.queue_depths(),
+            "mesas_formadas": self.tables_formed,
+            "jogadores_pareados": self.players_matched,
+            "mesas_adiadas": self.tables_deferred,
+            "tempo_espera": self.wait_percentiles()
+        }
+
+    def __len__(self) -> int:
+        return len(self._waiting)
@@ -1,128 +1,802 @@
-from fastapi import FastAPI, HTTPException
+import asyncio
+import gc
+import itertools
+import logging
+import os
+import signal
+import socket
+import traceback
+from contextlib import asynccontextmanager
 
-from game_manager import GameManager
+from fastapi import FastAPI, Header, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from game_manager import GameManager, VersionConflictError
 from match_tracker import MatchTracker
-from typing import List, Optional
-from models import Card, CardColor
+from typing import Dict, Mapping, Optional
+from models import CardColor, GameStatus
+from observer_pattern import GameEventType
+from schemas import (
+    NovoJogoResponse, JogadorDaVezResponse, CartasJogadorResponse,
+    JogadaResponse, PassarVezResponse, GameStateDebugResponse,
+    LobbyTicketResponse, ticket_to_schema
+)
+from serialization import render, hand_payload, game_state_payload
+from card_catalog import DISPLAY_NAMES, POINT_VALUES
+from api_v2 import create_v2_router
+from game_locks import GameLockRegistry, run_blocking
+from rules import RULE_NAMES, Ruleset, compile_ruleset, parse_ruleset
+from card_facade import CardFacade
+from timing_wheel import HierarchicalTimingWheel
+from turn_timeouts import TurnTimeoutService, DEFAULT_TURN_TIMEOUT, DEFAULT_IDLE_TIMEOUT
+from lobby import Lobby
+from leaderboard import PlayerRegistry, RatingObserver
+from game_archive import GameArchive, GameArchiveObserver
+from idempotency import IdempotencyCache, IdempotencyKeyConflict, IDEMPOTENCY_HEADER, REPLAYED_HEADER
+from move_search import BotPlayers, MoveSearch, DEFAULT_BUDGET_MS, MAX_BUDGET_MS
+from endgame_solver import EndgameSolver, DEFAULT_MAX_CARDS
+from spectator import SpectatorHub, KEEPALIVE_INTERVAL, SSE_MEDIA_TYPE
+from snapshot_codec import SNAPSHOT_MEDIA_TYPE, peek_snapshot
+from memory_budget import (
+    AdmissionController, AdmissionRejected, MemoryAccountant, PRIORITY_IN_PROGRESS, estimate_new_game_bytes
+)
+from replication import ReplicationPrimary, ReplicationFollower
+from checkpoint import CheckpointReader, collect_entries, collect_entries_async, write_checkpoint
+from traffic_recorder import TrafficRecorder
+
+logger = logging.getLogger(__name__)
 
+TIMEOUT_TICK = 0.5  # resolução (segundos) da roda de tempo dos prazos
+LOBBY_MATCH_INTERVAL = 0.25  # intervalo (segundos) entre rodadas do matcher
+BOT_INTERVAL = 0.1  # intervalo (segundos) entre as rodadas dos bots
+DEFAULT_CHECKPOINT_INTERVAL = 60.0  # intervalo (segundos) entre checkpoints periódicos
+DEFAULT_RATINGS_SAVE_INTERVAL = 30.0  # intervalo (segundos) entre gravações dos ratings
+# Arquivos de cada worker: com mais de um worker, cada um recebe o sufixo .<índice>
+WORKER_PATH_SETTINGS = ("UNO_CHECKPOINT_PATH", "UNO_RATINGS_PATH", "UNO_ARCHIVE_PATH", "UNO_ANALYTICS_DIR",
+                        "UNO_TRAFFIC_RECORD")
 
-app = FastAPI(title="UNO Game API", description="API para gerenciar jogos de UNO")
 
-GameManager = GameManager()
-match_tracker = MatchTracker()
+def _unavailable(e: AdmissionRejected) -> HTTPException:
+    return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
 
-GameManager.attach(match_tracker)
 
-@app.get("/")
-def read_root():
-    return {"message": "Bem-vindo à API do UNO!"}
+def _version_conflict(error: VersionConflictError) -> HTTPException:
+    """409 com a versão atual, para o cliente reler o estado e tentar de novo"""
+    return HTTPException(status_code=409, detail={
+        "message": str(error),
+        "current_version": error.current_version
+    })
 
-@app.get("/partidas")
-def get_partidas():
+
+def preload() -> None:
     """
-    Retorna as estatísticas de todas as partidas
-    (em andamento e finalizadas),
-    rastreadas pelo Observer.
+    Monta as tabelas imutáveis compartilhadas por todos os jogos: o catálogo de
+    faces e nomes (card_catalog, montado na importação), o modelo do baralho, a
+    tabela de legalidade e o motor de regras de cada combinação de variantes
     """
-    return match_tracker.get_match_stats()
+    if os.environ.get("UNO_ANALYTICS_DIR"):
+        import analytics_store  # noqa: F401 (numpy compartilhado pelos workers)
+    CardFacade.deck_template()
+    for flags in itertools.product((False, True), repeat=len(RULE_NAMES)):
+        compile_ruleset(Ruleset(*flags))
+
 
-@app.get("/novoJogo")
-def novo_jogo(quantidadeJog: int):
+def create_app(environ: Optional[Mapping[str, str]] = None) -> FastAPI:
     """
-    Inicia um novo jogo com a quantidade especificada de jogadores
-    Retorna o ID do jogo criado
+    Cria a aplicação e todo o estado mutável dela (jogos, lobby, ranking, caches),
+    configurado pelas variáveis UNO_* de `environ` (padrão: os.environ)
+    Nada disso existe antes da chamada: no pre-fork (serve) cada worker chama
+    create_app depois do fork e só as tabelas de preload ficam compartilhadas
     """
-    try:
-        game_id = GameManager.novo_jogo(quantidadeJog)
-        return {
-            "message": f"Novo jogo criado com {quantidadeJog} jogadores",
-            "game_id": game_id,
-            "quantidade_jogadores": quantidadeJog
-        }
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    env = os.environ if environ is None else environ
+
+    manager = GameManager()
+    match_tracker = MatchTracker()
+
+    manager.attach(match_tracker)
+
+    # Memória estimada dos jogos e do MatchTracker, com limites globais (UNO_MEMORY_BUDGET_MB,
+    # UNO_MAX_GAMES): acima deles, criar jogo responde 503 com Retry-After e as jogadas seguem
+    memory_accountant = MemoryAccountant(manager, match_tracker)
+    manager.attach(memory_accountant, event_types=[
+        GameEventType.GAME_CREATED, GameEventType.GAME_IMPORTED, GameEventType.GAME_FINISHED,
+        GameEventType.GAME_ABANDONED, GameEventType.GAME_EXPORTED
+    ])
+    memory_budget_mb = env.get("UNO_MEMORY_BUDGET_MB")
+    admission = AdmissionController(
+        memory_accountant,
+        budget_bytes=int(float(memory_budget_mb) * 2**20) if memory_budget_mb else None,
+        max_games=int(env["UNO_MAX_GAMES"]) if env.get("UNO_MAX_GAMES") else None
+    )
+
+    # As rotas são async: rodam no event loop, sem passar pelo threadpool.
+    # Jogadas de um mesmo jogo são serializadas pelo lock do jogo.
+    game_locks = GameLockRegistry()
+    manager.attach(game_locks, event_types=[
+        GameEventType.GAME_FINISHED, GameEventType.GAME_ABANDONED, GameEventType.GAME_EXPORTED
+    ])
+
+    # Prazo por vez (passa a vez automaticamente) e encerramento de jogos parados.
+    # Os callbacks rodam no event loop, sem await, então não se intercalam com as rotas.
+    turn_timeouts = TurnTimeoutService(
+        manager,
+        HierarchicalTimingWheel(tick=TIMEOUT_TICK),
+        turn_timeout=float(env.get("UNO_TURN_TIMEOUT", DEFAULT_TURN_TIMEOUT)),
+        idle_timeout=float(env.get("UNO_IDLE_TIMEOUT", DEFAULT_IDLE_TIMEOUT))
+    )
+    manager.attach(turn_timeouts)
+
+    # Ratings por conta, atualizados a cada jogo finalizado (UNO_RATINGS_PATH persiste em JSON)
+    player_registry = PlayerRegistry(env.get("UNO_RATINGS_PATH"))
+    ratings_save_interval = float(env.get("UNO_RATINGS_SAVE_INTERVAL", DEFAULT_RATINGS_SAVE_INTERVAL))
+    manager.attach(RatingObserver(player_registry), event_types=[GameEventType.GAME_FINISHED])
+
+    # Estatísticas em armazenamento colunar (requer numpy e UNO_ANALYTICS_DIR;
+    # UNO_ANALYTICS_MOVES=1 grava também cada jogada). Importado só se ativado: o numpy
+    # pesa na partida de quem não usa
+    analytics_store = None
+    if env.get("UNO_ANALYTICS_DIR"):
+        from analytics_store import AnalyticsObserver, AnalyticsStore
+        analytics_store = AnalyticsStore(
+            env["UNO_ANALYTICS_DIR"],
+            record_moves=env.get("UNO_ANALYTICS_MOVES") == "1"
+        )
+        manager.attach(AnalyticsObserver(analytics_store))
+
+    # Histórico completo de cada jogo encerrado, em NDJSON (UNO_ARCHIVE_PATH)
+    game_archive = None
+    if env.get("UNO_ARCHIVE_PATH"):
+        game_archive = GameArchive(env["UNO_ARCHIVE_PATH"])
+        manager.attach(GameArchiveObserver(game_archive))
+
+    # Checkpoint dos jogos em andamento (UNO_CHECKPOINT_PATH), no desligamento e a cada
+    # UNO_CHECKPOINT_INTERVAL segundos; na partida o arquivo é mapeado e lido sob demanda
+    checkpoint_path = env.get("UNO_CHECKPOINT_PATH")
+    checkpoint_interval = float(env.get("UNO_CHECKPOINT_INTERVAL", DEFAULT_CHECKPOINT_INTERVAL))
+    checkpoint_stats = {"jogos_restaurados": 0, "checkpoints": 0, "jogos_gravados": 0, "bytes_gravados": 0}
+
+    # Lobby de matchmaking: jogadores entram na fila e o matcher cria os jogos
+    lobby = Lobby(manager, admission=admission)
+
+    # Respostas das rotas que alteram o jogo, por Idempotency-Key (repetições de clientes móveis)
+    idempotency_cache = IdempotencyCache()
+
+    # Busca Monte Carlo para a dica (/sugestao) e para os bots dos assentos vazios
+    # (UNO_SEARCH_WORKERS > 0 divide a busca entre processos); fins de jogo de 2 jogadores
+    # com até UNO_ENDGAME_MAX_CARDS cartas nas mãos são resolvidos de forma exata
+    move_search = MoveSearch(
+        budget_ms=float(env.get("UNO_SEARCH_BUDGET_MS", DEFAULT_BUDGET_MS)),
+        workers=int(env.get("UNO_SEARCH_WORKERS", 0)),
+        endgame=EndgameSolver(max_cards=int(env.get("UNO_ENDGAME_MAX_CARDS", DEFAULT_MAX_CARDS)))
+    )
+    bot_players = BotPlayers(manager, move_search, game_locks)
+    manager.attach(bot_players)
+
+    # Espectadores: visão pública serializada uma vez por versão e enviada a todos por SSE
+    spectator_hub = SpectatorHub(manager)
+    manager.attach(spectator_hub)
+
+    # Replicação warm standby: o primário (UNO_REPLICATION_LISTEN, "host:porta" ou caminho
+    # de socket Unix) transmite cada mudança confirmada; o seguidor (UNO_REPLICATION_PRIMARY)
+    # aplica o log, responde só leituras e assume com POST /replicacao/promover
+    replication_primary = None
+    if env.get("UNO_REPLICATION_LISTEN"):
+        replication_primary = ReplicationPrimary(manager)
+        manager.attach(replication_primary)
+
+    replication_follower = None
+    if env.get("UNO_REPLICATION_PRIMARY"):
+        replication_follower = ReplicationFollower(manager)
+
+    # Gravação das requisições (UNO_TRAFFIC_RECORD) para reproduzi-las com replay_traffic.py
+    traffic_recorder = TrafficRecorder(env["UNO_TRAFFIC_RECORD"]) if env.get("UNO_TRAFFIC_RECORD") else None
+
+
+    def _following() -> bool:
+        """Seguidor ainda não promovido: o estado só muda pelo log do primário"""
+        return replication_follower is not None and not replication_follower.promoted
+
+    async def _tick_timeouts():
+        """Avança a roda de tempo periodicamente; só os temporizadores vencidos são visitados"""
+        while True:
+            await asyncio.sleep(TIMEOUT_TICK)
+            if not _following():
+                turn_timeouts.tick()
+
+
+    async def _run_matcher():
+        """Forma as mesas do lobby em lote a cada intervalo"""
+        while True:
+            await asyncio.sleep(LOBBY_MATCH_INTERVAL)
+            if _following():
+                continue
+            try:
+                lobby.match()
+            except Exception:
+                logger.exception("Falha na rodada do matcher")
+
+
+    async def _run_bots():
+        """Joga a vez dos bots cujos jogos estão esperando por eles"""
+        while True:
+            await asyncio.sleep(BOT_INTERVAL)
+            if _following():
+                continue
+            try:
+                await bot_players.play_pending()
+            except Exception:
+                logger.exception("Falha na rodada dos bots")
+
+
+    async def _keep_spectators_alive():
+        """Comentário SSE periódico para todos os espectadores (um temporizador só)"""
+        while True:
+            await asyncio.sleep(KEEPALIVE_INTERVAL)
+            spectator_hub.keepalive()
+
+
+    async def _checkpoint_periodically():
+        """Checkpoint periódico: coleta em lotes no event loop e grava fora dele"""
+        while True:
+            await asyncio.sleep(checkpoint_interval)
+            try:
+                entries = await collect_entries_async(manager)
+                size = await run_blocking(write_checkpoint, checkpoint_path, entries, manager.next_game_id)
+                _record_checkpoint(size, len(entries))
+            except Exception:
+                # Um checkpoint que falha (disco cheio, permissão) não pode parar os próximos
+                logger.exception("Falha no checkpoint periódico")
+
+
+    async def _save_ratings_periodically():
+        """Grava os ratings quando houve partidas novas: uma queda perde no máximo um intervalo"""
+        saved = player_registry.changes
+        while True:
+            await asyncio.sleep(ratings_save_interval)
+            changes = player_registry.changes
+            if changes == saved:
+                continue
+            try:
+                await run_blocking(player_registry.save, player_registry.entries())
+                saved = changes
+            except Exception:
+                logger.exception("Falha ao gravar os ratings")
+
+    def _record_checkpoint(size: int, games: int) -> None:
+        checkpoint_stats["jogos_gravados"] = games
+        checkpoint_stats["bytes_gravados"] = size
+        checkpoint_stats["checkpoints"] += 1
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        if checkpoint_path and os.path.exists(checkpoint_path) and not _following():
+            # Só abre o arquivo: os jogos são carregados quando uma rota os toca
+            checkpoint_stats["jogos_restaurados"] = manager.restaurar_checkpoint(CheckpointReader(checkpoint_path))
+        tasks = [
+            asyncio.create_task(_tick_timeouts()),
+            asyncio.create_task(_run_matcher()),
+            asyncio.create_task(_run_bots()),
+            asyncio.create_task(_keep_spectators_alive())
+        ]
+        if checkpoint_path:
+            tasks.append(asyncio.create_task(_checkpoint_periodically()))
+        if player_registry.path:
+            tasks.append(asyncio.create_task(_save_ratings_periodically()))
+        if replication_primary is not None:
+            await replication_primary.start(env["UNO_REPLICATION_LISTEN"])
+        if replication_follower is not None:
+            tasks.append(replication_follower.start(env["UNO_REPLICATION_PRIMARY"]))
+        try:
+            yield
+        finally:
+            for task in tasks:
+                task.cancel()
+            if replication_primary is not None:
+                await replication_primary.stop()
+            if checkpoint_path:
+                entries = list(collect_entries(manager))
+                _record_checkpoint(write_checkpoint(checkpoint_path, entries, manager.next_game_id), len(entries))
+            move_search.shutdown()
+            player_registry.save()
+            if analytics_store is not None:
+                analytics_store.close()
+            if game_archive is not None:
+                game_archive.close()
+            if traffic_recorder is not None:
+                traffic_recorder.close()
+
+    app = FastAPI(title="UNO Game API", description="API para gerenciar jogos de UNO", lifespan=lifespan)
+
+    @app.middleware("http")
+    async def _reject_writes_on_follower(request: Request, call_next):
+        # /novoJogo e a exportação com remoção também alteram o estado, apesar do GET
+        path = request.url.path
+        writes = request.method not in ("GET", "HEAD") or path == "/novoJogo" or \
+            (path.endswith("/exportar") and request.query_params.get("remover") not in (None, "false", "0"))
+        if writes and _following() and path != "/replicacao/promover":
+            return JSONResponse(status_code=503, content={"detail": "Nó seguidor: só leituras até ser promovido"})
+        return await call_next(request)
+
+    if traffic_recorder is not None:
+        # Registrado por último: é o middleware mais externo e mede a latência toda
+        app.middleware("http")(traffic_recorder)
+
+    # API compacta (v2) em paralelo às rotas v1 abaixo
+    app.include_router(create_v2_router(manager, game_locks, idempotency_cache, admission))
+
+    @app.get("/")
+    async def read_root():
+        return {"message": "Bem-vindo à API do UNO!"}
+
+    @app.get("/partidas")
+    async def get_partidas():
+        """
+        Retorna as estatísticas de todas as partidas
+        (em andamento e finalizadas),
+        rastreadas pelo Observer.
+        """
+        return match_tracker.get_match_stats()
+
+    @app.get("/catalogo")
+    async def catalogo_cartas():
+        """
+        Retorna o catálogo de faces: o índice de cada nome é o código
+        inteiro usado nas respostas compactas (MessagePack)
+        """
+        return {"display_names": DISPLAY_NAMES, "point_values": POINT_VALUES}
+
+    @app.get("/novoJogo", response_model=NovoJogoResponse)
+    async def novo_jogo(quantidadeJog: int, regras: Optional[str] = None, modoFesta: bool = False,
+                        contas: Optional[str] = None, bots: int = Query(0, ge=0),
+                        semente: Optional[int] = None):
+        """
+        Inicia um novo jogo com a quantidade especificada de jogadores
+        `regras` ativa variantes da casa, separadas por vírgula
+        (stacking, seven_zero, jump_in, draw_until_playable)
+        `modoFesta` permite mesas de até 1000 jogadores (vários baralhos)
+        `contas` identifica os jogadores de cada assento, separados por vírgula
+        (assento vazio = anônimo); só jogadores identificados entram no ranking
+        `bots` ocupa os últimos assentos com bots
+        `semente` fixa o embaralhamento (jogos reproduzíveis)
+        Retorna o ID do jogo criado
+        """
+        try:
+            if bots >= quantidadeJog:
+                raise ValueError("O jogo precisa de ao menos um jogador humano")
+            player_ids = [account.strip() or None for account in contas.split(",")] if contas else None
+            ruleset = parse_ruleset(regras)
+            # Pedido inválido é recusado antes da admissão: não conta nem descarta jogos
+            manager.validar_novo_jogo(quantidadeJog, modoFesta, player_ids, semente)
+            admission.check(estimate_new_game_bytes(quantidadeJog))
+            game_id = manager.novo_jogo(quantidadeJog, ruleset, modoFesta, player_ids, semente)
+            if bots:
+                bot_players.add(game_id, range(quantidadeJog - bots, quantidadeJog))
+            return {
+                "message": f"Novo jogo criado com {quantidadeJog} jogadores",
+                "game_id": game_id,
+                "quantidade_jogadores": quantidadeJog
+            }
+        except AdmissionRejected as e:
+            raise _unavailable(e)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
     
-@app.get("/jogo/{id_jogo}/jogador_da_vez")
-def jogador_da_vez(id_jogo: int):
-    """
-    Retorna o ID do jogador da vez
-    """
-    try:
-        current_player = GameManager.get_current_player(id_jogo)
+    @app.get("/jogo/{id_jogo}/jogador_da_vez", response_model=JogadorDaVezResponse)
+    async def jogador_da_vez(id_jogo: int):
+        """
+        Retorna o ID do jogador da vez e a versão do estado lido
+        (lida de um snapshot imutável, sem lock)
+        """
+        try:
+            snapshot = manager.get_snapshot(id_jogo)
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
         return {
             "game_id": id_jogo,
-            "current_player": current_player
+            "current_player": snapshot.current_player,
+            "version": snapshot.version
         }
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
 
-@app.get("/jogo/{id_jogo}/jogador/{id_jogador}")
-def ver_cartas_jogador(id_jogo: int, id_jogador: int):
-    """
-    Retorna as cartas na mão do jogador especificado
-    """
-    try:
-        cards = GameManager.get_player_hand(id_jogo, id_jogador)
+    @app.get("/jogo/{id_jogo}/jogador/{id_jogador}", response_model=CartasJogadorResponse)
+    async def ver_cartas_jogador(id_jogo: int, id_jogador: int, request: Request):
+        """
+        Retorna as cartas na mão do jogador especificado e a versão do estado lido
+        (JSON por padrão; MessagePack com códigos de carta via Accept)
+        """
+        try:
+            snapshot = manager.get_snapshot(id_jogo)
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        if not 0 <= id_jogador < snapshot.player_count:
+            raise HTTPException(status_code=404, detail="Jogador não encontrado")
+
+        cards = snapshot.hand(id_jogador)
+        content, media_type = render(
+            lambda compact: hand_payload(id_jogo, id_jogador, cards, compact, snapshot.version),
+            request.headers.get("accept")
+        )
+        return Response(content=content, media_type=media_type)
+
+    @app.get("/jogo/{id_jogo}/sugestao")
+    async def sugestao(id_jogo: int, id_jogador: int,
+                       orcamento_ms: float = Query(DEFAULT_BUDGET_MS, gt=0, le=MAX_BUDGET_MS)):
+        """
+        Sugere a jogada do jogador por Monte Carlo determinizado: as mãos ocultas são
+        sorteadas a partir das cartas não vistas e a partida é simulada até o fim
+        A busca dura no máximo `orcamento_ms`; consultas repetidas na mesma posição
+        continuam a partir das simulações já feitas
+        """
+        game = manager.get_game_state(id_jogo)
+        if not game:
+            raise HTTPException(status_code=404, detail="Jogo não encontrado")
+        if not 0 <= id_jogador < len(game.players):
+            raise HTTPException(status_code=404, detail="Jogador não encontrado")
+        if game.status != GameStatus.IN_PROGRESS:
+            raise HTTPException(status_code=400, detail="Jogo não está em andamento")
+        version = game.version
+        try:
+            suggestion = await move_search.suggest_async(game, id_jogador, orcamento_ms)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         return {
             "game_id": id_jogo,
             "player_id": id_jogador,
-            "cards": [str(card) for card in cards],
-            "card_count": len(cards)
+            "version": version,
+            "action": "passar" if suggestion.card_index is None else "jogar",
+            "card_index": suggestion.card_index,
+            "card": suggestion.card,
+            "chosen_color": suggestion.chosen_color,
+            "win_rate": round(suggestion.win_rate, 4),
+            "rollouts": suggestion.rollouts,
+            "cached_rollouts": suggestion.cached_rollouts,
+            "solved": suggestion.solved,
+            "candidates": suggestion.candidates
         }
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
 
-@app.put("/jogo/{id_jogo}/jogar")
-def jogar_carta(id_jogo: int, id_jogador: int, id_carta: int,
-    cor_escolhida: Optional[CardColor] = None):
-    """
-    Joga uma carta da mão do jogador
-    """
-    try:
-        result = GameManager.jogar_carta(id_jogo, id_jogador, id_carta, cor_escolhida)
+    @app.get("/bots/metricas")
+    async def metricas_bots():
+        """
+        Jogadas dos bots e uso do cache da busca de sugestões
+        """
+        return bot_players.get_metrics()
+
+    @app.put("/jogo/{id_jogo}/jogar", response_model=JogadaResponse, response_model_exclude_none=True)
+    async def jogar_carta(id_jogo: int, id_jogador: int, id_carta: int, response: Response,
+        cor_escolhida: Optional[CardColor] = None, id_alvo: Optional[int] = None,
+        versao: Optional[int] = None,
+        idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER)):
+        """
+        Joga uma carta da mão do jogador
+        `id_alvo` escolhe com quem trocar de mão ao jogar um 7 (regra 7-0)
+        `versao` é a versão do estado vista pelo cliente: se o jogo já mudou,
+        a jogada é recusada com 409 e a versão atual
+        Com o cabeçalho Idempotency-Key, repetições devolvem a resposta original
+        """
+        key = ("v1", id_jogo, id_jogador, idempotency_key) if idempotency_key else None
+        try:
+            result, replayed = await idempotency_cache.run(
+                key, ("jogar", id_carta, cor_escolhida, id_alvo, versao), game_locks.hold(id_jogo),
+                lambda: manager.jogar_carta(id_jogo, id_jogador, id_carta, cor_escolhida, id_alvo, versao),
+                lambda: manager.check_version(id_jogo, versao)
+            )
+        except VersionConflictError as e:
+            raise _version_conflict(e)
+        except IdempotencyKeyConflict as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if replayed:
+            response.headers[REPLAYED_HEADER] = "true"
         return result
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
 
-@app.put("/jogo/{id_jogo}/passa")
-def passar_vez(id_jogo: int, id_jogador: int):
-    """
-    Passa a vez, comprando uma carta
-    """
-    try:
-        result = GameManager.passar_vez(id_jogo, id_jogador)
+    @app.put("/jogo/{id_jogo}/passa", response_model=PassarVezResponse)
+    async def passar_vez(id_jogo: int, id_jogador: int, response: Response, versao: Optional[int] = None,
+                         idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER)):
+        """
+        Passa a vez, comprando uma carta
+        `versao` é a versão esperada do estado (409 se o jogo já mudou)
+        Com o cabeçalho Idempotency-Key, repetições devolvem a resposta original
+        """
+        key = ("v1", id_jogo, id_jogador, idempotency_key) if idempotency_key else None
+        try:
+            result, replayed = await idempotency_cache.run(
+                key, ("passa", versao), game_locks.hold(id_jogo),
+                lambda: manager.passar_vez(id_jogo, id_jogador, versao),
+                lambda: manager.check_version(id_jogo, versao)
+            )
+        except VersionConflictError as e:
+            raise _version_conflict(e)
+        except IdempotencyKeyConflict as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if replayed:
+            response.headers[REPLAYED_HEADER] = "true"
         return result
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
 
-# Rota adicional para debug - visualizar estado completo do jogo
-@app.get("/debug/jogo/{id_jogo}")
-def debug_game_state(id_jogo: int):
+    @app.get("/idempotencia/metricas")
+    async def metricas_idempotencia():
+        """
+        Tamanho e taxa de acerto do cache de idempotência
+        """
+        return idempotency_cache.get_metrics()
+
+    @app.post("/lobby/fila", response_model=LobbyTicketResponse)
+    async def entrar_na_fila(tamanhoMesa: int, faixaHabilidade: Optional[int] = None,
+                             conta: Optional[str] = None):
+        """
+        Entra na fila do lobby com o tamanho de mesa preferido (2 a 10)
+        e, opcionalmente, uma faixa de habilidade e a conta do jogador (ranking)
+        Retorna o ticket usado para acompanhar o pareamento
+        """
+        try:
+            return ticket_to_schema(lobby.enqueue(tamanhoMesa, faixaHabilidade, conta))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    @app.get("/lobby/fila/{id_ticket}", response_model=LobbyTicketResponse)
+    async def aguardar_pareamento(id_ticket: int, espera: float = Query(25.0, ge=0, le=60)):
+        """
+        Long-poll: responde assim que o ticket for pareado (com game_id e player_id)
+        ou após `espera` segundos, com o status atual
+        """
+        try:
+            return ticket_to_schema(await lobby.wait_for_match(id_ticket, espera))
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+
+    @app.delete("/lobby/fila/{id_ticket}", response_model=LobbyTicketResponse)
+    async def sair_da_fila(id_ticket: int):
+        """
+        Sai da fila do lobby
+        """
+        try:
+            return ticket_to_schema(lobby.cancel(id_ticket))
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+
+    @app.get("/lobby/metricas")
+    async def metricas_lobby():
+        """
+        Profundidade das filas e percentis do tempo de espera
+        """
+        return lobby.get_metrics()
+
+    @app.get("/ranking")
+    async def ranking(top: int = Query(10, ge=1, le=100), offset: int = Query(0, ge=0)):
+        """
+        Os `top` primeiros do ranking a partir da posição `offset`
+        """
+        return {
+            "total_jogadores": len(player_registry.leaderboard),
+            "ranking": [
+                {"posicao": offset + i + 1, "conta": account_id, "rating": round(rating, 1)}
+                for i, (account_id, rating) in enumerate(player_registry.leaderboard.top(top, offset))
+            ]
+        }
+
+    @app.get("/ranking/{conta}")
+    async def posicao_no_ranking(conta: str):
+        """
+        Rating, estatísticas e posição da conta no ranking
+        """
+        try:
+            return player_registry.profile(conta)
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+
+    @app.get("/estatisticas")
+    async def estatisticas(jogadores: Optional[int] = None):
+        """
+        Estatísticas agregadas dos jogos finalizados: vitórias por assento,
+        duração média, frequência de efeitos e taxa de esgotamento do baralho
+        `jogadores` restringe aos jogos com essa quantidade de jogadores
+        """
+        if analytics_store is None:
+            raise HTTPException(status_code=503, detail="Armazenamento de estatísticas desativado")
+        analytics_store.submit()  # as linhas pendentes entram na fila; a gravação fica na thread da tabela
+        await run_blocking(analytics_store.join)
+        return await run_blocking(analytics_store.summary, jogadores)
+
+    @app.get("/exportar/jogos")
+    async def exportar_jogos(desde: Optional[float] = None, ate: Optional[float] = None,
+                             status: Optional[GameStatus] = None, cursor: int = Query(0, ge=0),
+                             limite: Optional[int] = Query(None, ge=1), gzip: bool = False):
+        """
+        Exporta em fluxo (NDJSON, opcionalmente gzip) os históricos dos jogos encerrados
+        `desde`/`ate` filtram pelo instante de encerramento (epoch, intervalo [desde, ate))
+        Cada linha traz `cursor`: passe o último recebido para continuar de onde parou
+        """
+        if game_archive is None:
+            raise HTTPException(status_code=503, detail="Arquivo de históricos desativado")
+        try:
+            game_archive.check_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        headers = {"Content-Encoding": "gzip"} if gzip else {}
+        # Gerador síncrono: o Starlette o consome no threadpool, fora do event loop
+        return StreamingResponse(
+            game_archive.export_lines(cursor, desde, ate, status, limite, gzip),
+            media_type="application/x-ndjson",
+            headers=headers
+        )
+
+    @app.get("/jogo/{id_jogo}/espectar")
+    async def espectar(id_jogo: int):
+        """
+        Acompanha o jogo por Server-Sent Events (evento `estado` a cada versão)
+        Só dados públicos: o tamanho das mãos, nunca as cartas. Conexões lentas
+        recebem direto a versão mais recente, pulando as intermediárias.
+        """
+        try:
+            stream = spectator_hub.subscribe(id_jogo)
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        return StreamingResponse(stream, media_type=SSE_MEDIA_TYPE,
+                                 headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+    @app.get("/espectadores/metricas")
+    async def metricas_espectadores():
+        """Canais abertos, espectadores conectados e eventos serializados/enviados"""
+        return spectator_hub.get_metrics()
+
+    @app.get("/jogo/{id_jogo}/exportar")
+    async def exportar_jogo(id_jogo: int, remover: bool = False):
+        """
+        Snapshot binário do jogo (snapshot_codec) para migrá-lo a outro processo
+        Com `remover` o jogo sai deste nó; importe os bytes em /jogos/importar no destino
+        """
+        async with game_locks.hold(id_jogo):
+            if manager.get_game_state(id_jogo) is None:
+                raise HTTPException(status_code=404, detail="Jogo não encontrado")
+            try:
+                data = manager.exportar_jogo(id_jogo, remover)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        return Response(content=data, media_type=SNAPSHOT_MEDIA_TYPE)
+
+    @app.post("/jogos/importar")
+    async def importar_jogo(request: Request):
+        """Recebe um jogo exportado por outro nó; a partida continua com o mesmo id e a mesma versão"""
+        data = await request.body()
+        try:
+            # Jogo em andamento tem prioridade sobre jogo novo: pode usar o orçamento todo
+            admission.check(estimate_new_game_bytes(peek_snapshot(data).player_count), PRIORITY_IN_PROGRESS)
+            game_id = manager.importar_jogo(data)
+        except AdmissionRejected as e:
+            raise _unavailable(e)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        game = manager.get_game_state(game_id)
+        return {"game_id": game_id, "version": game.version, "current_player": game.current_player_index}
+
+    @app.get("/memoria/metricas")
+    async def metricas_memoria():
+        """Bytes estimados por categoria, limites e jogos admitidos, recusados e descartados"""
+        return admission.get_metrics()
+
+    @app.get("/checkpoint/metricas")
+    async def metricas_checkpoint():
+        """Jogos restaurados do último checkpoint, ainda no arquivo, e o que foi gravado"""
+        return {**checkpoint_stats, "jogos_no_arquivo": manager.cold_games()}
+
+    @app.get("/trafego/metricas")
+    async def metricas_trafego():
+        """Requisições gravadas para replay e sementes sorteadas para os jogos criados"""
+        if traffic_recorder is None:
+            raise HTTPException(status_code=503, detail="Gravação de tráfego desativada")
+        return traffic_recorder.get_metrics()
+
+    @app.post("/replicacao/promover")
+    async def promover_seguidor():
+        """Promove o seguidor a primário: para de seguir e passa a aceitar jogadas"""
+        if replication_follower is None:
+            raise HTTPException(status_code=400, detail="Este nó não é seguidor")
+        replication_follower.promote()
+        return replication_follower.get_metrics()
+
+    @app.get("/replicacao/metricas")
+    async def metricas_replicacao():
+        """Seguidores e registros enviados (primário); atraso e taxa de aplicação (seguidor)"""
+        return {
+            "primario": replication_primary.get_metrics() if replication_primary is not None else None,
+            "seguidor": replication_follower.get_metrics() if replication_follower is not None else None
+        }
+
+    # Rota adicional para debug - visualizar estado completo do jogo
+    @app.get("/debug/jogo/{id_jogo}", response_model=GameStateDebugResponse)
+    async def debug_game_state(id_jogo: int, request: Request,
+                               offset: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=1000)):
+        """
+        Rota para debug - retorna o estado completo do jogo
+        Os jogadores são paginados por `offset`/`limit` (mesas do modo festa)
+        """
+        game_state = manager.get_game_state(id_jogo)
+        if not game_state:
+            raise HTTPException(status_code=404, detail="Jogo não encontrado")
+    
+        content, media_type = render(
+            lambda compact: game_state_payload(game_state, compact, offset, limit),
+            request.headers.get("accept")
+        )
+        return Response(content=content, media_type=media_type)
+
+    return app
+
+
+def __getattr__(name: str):
+    # main.app (uvicorn main:app, benchmarks) cria a aplicação na primeira leitura
+    if name == "app":
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _worker_env(index: int, workers: int) -> Dict[str, str]:
+    env = dict(os.environ)
+    if workers > 1:
+        for name in WORKER_PATH_SETTINGS:
+            if env.get(name):
+                env[name] = f"{env[name]}.{index}"
+    return env
+
+
+def _listen(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    return sock
+
+
+def serve(host: str = "0.0.0.0", port: int = 8000, workers: int = 1) -> None:
     """
-    Rota para debug - retorna o estado completo do jogo
+    Sobe `workers` processos por pre-fork. O processo pai importa tudo, roda
+    preload com o GC desligado e congela esses objetos (gc.freeze) antes do
+    fork: o GC dos workers não visita nem escreve nos cabeçalhos deles, então
+    as páginas continuam compartilhadas (copy-on-write) entre os processos.
+    Cada worker cria o próprio estado (create_app) depois do fork e é um nó
+    independente, na porta `port + índice`: os jogos de um worker só existem
+    nele, então o balanceador na frente deve fixar cada jogo no seu worker.
     """
-    game_state = GameManager.get_game_state(id_jogo)
-    if not game_state:
-        raise HTTPException(status_code=404, detail="Jogo não encontrado")
-    
-    return {
-        "game_id": game_state.id,
-        "status": game_state.status,
-        "current_player": game_state.current_player_index,
-        "top_discard_card": str(game_state.get_top_discard_card()) if game_state.get_top_discard_card() else None,
-        "deck_size": len(game_state.deck),
-        "discard_pile_size": len(game_state.discard_pile),
-        "players": [
-            {
-                "player_id": player.id,
-                "card_count": len(player.hand),
-                "cards": [str(card) for card in player.hand]
-            }
-            for player in game_state.players
-        ],
-        "winner": game_state.winner
-    }
+    import uvicorn
+
+    if workers > 1 and (os.environ.get("UNO_REPLICATION_LISTEN") or os.environ.get("UNO_REPLICATION_PRIMARY")):
+        raise ValueError("Replicação só é suportada com um worker")
+    gc.disable()
+    preload()
+    sockets = [_listen(host, port + index) for index in range(workers)]
+    gc.freeze()
+
+    def run(index: int) -> None:
+        gc.enable()
+        app = create_app(_worker_env(index, workers))
+        uvicorn.Server(uvicorn.Config(app, host=host, port=port + index)).run(sockets=[sockets[index]])
+
+    if workers == 1:
+        run(0)
+        return
+    children = []
+    for index in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                for other, sock in enumerate(sockets):
+                    if other != index:
+                        sock.close()
+                run(index)
+            except BaseException:
+                traceback.print_exc()
+                code = 1
+            finally:
+                os._exit(code)
+        children.append(pid)
+    signal.signal(signal.SIGTERM, lambda signum, frame: [os.kill(pid, signum) for pid in children])
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C já chega aos workers (mesmo grupo de processos)
+    for pid in children:
+        os.waitpid(pid, 0)
+
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    serve(workers=int(os.environ.get("UNO_WORKERS", 1)))
@@ -1,6 +1,6 @@
 from typing import Dict, Any
 from models import GameState, GameStatus
-from observer_pattern import Observer
+from observer_pattern import Observer, GameEvent, GameEventType
 
 class MatchTracker(Observer):
     """
@@ -27,14 +27,39 @@ class MatchTracker(Observer):
             if game_id in self.games_finished:
                 del self.games_finished[game_id]
 
-        elif game_state.status == GameStatus.FINISHED:
-            # Se o jogo terminou, move para "finalizados"
+        elif game_state.status in (GameStatus.FINISHED, GameStatus.ABANDONED):
+            # Se o jogo terminou (ou foi abandonado), move para "finalizados"
             self.games_finished[game_id] = self._summarize_state(game_state)
             
             # Remove dos "em andamento"
             if game_id in self.games_in_progress:
                 del self.games_in_progress[game_id]
+
+    def on_event(self, event: GameEvent):
+        """
+        Usa o delta do evento para atualizar só o que mudou,
+        sem recalcular o resumo a cada jogada.
+        """
+        if event.type in (GameEventType.GAME_CREATED, GameEventType.GAME_FINISHED,
+                          GameEventType.GAME_ABANDONED, GameEventType.GAME_IMPORTED):
+            self.update(event.game_state)
+            return
+        if event.type == GameEventType.GAME_EXPORTED:
+            # A partida continua em outro processo
+            self.games_in_progress.pop(event.game_id, None)
+            return
+
+        summary = self.games_in_progress.get(event.game_id)
+        if summary is None:
+            return
+        summary["current_player_turn"] = event.delta.get("next_player", summary["current_player_turn"])
+        if event.type == GameEventType.CARD_PLAYED:
+            summary["top_card"] = event.delta["played_card"]
                 
+    def forget(self, game_id: int) -> bool:
+        """Esquece o resumo de um jogo encerrado (alívio de memória); True se existia"""
+        return self.games_finished.pop(game_id, None) is not None
+
     def _summarize_state(self, game_state: GameState) -> Dict[str, Any]:
         """Cria um resumo simples do estado do jogo."""
         # A "rodada" pode ser interpretada como quem é o jogador da vez
@@ -0,0 +1,219 @@
+"""
+Contabilidade de memória dos jogos e controle de admissão.
+
+MemoryAccountant é um observer que mantém, de forma incremental, quantos
+bytes cada jogo ocupa no GameManager e no MatchTracker. As jogadas não
+mudam a conta: as cartas de um jogo só trocam de lugar entre monte,
+descarte e mãos. Por isso a estimativa de cada jogo é feita uma vez, ao
+criá-lo ou importá-lo, e os totais só mudam quando um jogo entra, termina
+ou sai. A estimativa usa sys.getsizeof dos objetos do modelo e é
+aproximada: não conta o ruleset compilado (compartilhado entre os jogos)
+nem a sobra de capacidade das listas.
+
+AdmissionController aplica os limites globais (bytes e número de jogos),
+com duas prioridades:
+- jogos em andamento (importados de outro nó) podem usar o orçamento todo;
+- jogos novos só entram até `new_game_share` do orçamento.
+A folga que sobra é dos jogos que já existem. Jogadas nunca passam pela
+admissão. Antes de recusar um jogo, os jogos encerrados mais antigos são
+descartados da memória (são o que menos importa manter). A recusa leva o
+Retry-After sugerido ao cliente (503).
+"""
+import struct
+import sys
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from card_facade import CardFacade
+from game_manager import CARDS_PER_PLAYER, DECK_SIZE, GameManager
+from models import Card, CardColor, CardType, GameSnapshot, GameState, GameStatus, Player
+from observer_pattern import Observer, GameEvent, GameEventType
+
+PRIORITY_IN_PROGRESS = 0
+PRIORITY_NEW_GAME = 1
+
+DEFAULT_NEW_GAME_SHARE = 0.9
+DEFAULT_RETRY_AFTER = 5  # segundos sugeridos ao cliente recusado
+
+_POINTER = struct.calcsize("P")
+# Cada carta é referenciada pelo buffer do monte e pela lista onde está
+# (o snapshot de leitura só copia as mãos lidas, e elas são poucas)
+CARD_BYTES = sys.getsizeof(Card(0, CardColor.RED, CardType.NUMBER, 0)) + 2 * _POINTER
+
+
+def _base_sizes():
+    game = GameState(0, [Player(0)], [], [], 0, GameStatus.IN_PROGRESS)
+    player = sys.getsizeof(game.players[0]) + sys.getsizeof([])
+    fixed = (sys.getsizeof(game) + sys.getsizeof(game.deck) + sys.getsizeof([]) * 2
+             + sys.getsizeof(GameSnapshot.of(game)) + sys.getsizeof({}) + 4 * _POINTER)
+    return player, fixed
+
+
+PLAYER_BYTES, GAME_BYTES = _base_sizes()
+# Resumo do MatchTracker: dicionário de 6 chaves com a carta do topo no nome de exibição
+_TOP_CARD_NAME = CardFacade.get_card_display_name(Card(0, CardColor.RED, CardType.NUMBER, 7))
+SUMMARY_BYTES = sys.getsizeof(dict.fromkeys(range(6))) + sys.getsizeof(_TOP_CARD_NAME) + 4 * _POINTER
+
+
+def estimate_new_game_bytes(player_count: int) -> int:
+    """Bytes de um jogo novo com `player_count` jogadores, antes de criá-lo"""
+    cards = GameManager.decks_needed(player_count) * DECK_SIZE
+    return GAME_BYTES + player_count * (PLAYER_BYTES + CARDS_PER_PLAYER * _POINTER) + cards * CARD_BYTES
+
+
+def estimate_game_bytes(game: GameState) -> int:
+    """Bytes de um jogo existente (conta as cartas uma vez; O(jogadores))"""
+    players = game.players
+    cards = len(game.deck) + len(game.discard_pile) + sum(len(player.hand) for player in players)
+    accounts = sum(sys.getsizeof(player.account_id) for player in players if player.account_id is not None)
+    return GAME_BYTES + len(players) * PLAYER_BYTES + cards * CARD_BYTES + accounts
+
+
+class AdmissionRejected(Exception):
+    """O jogo não cabe nos limites de memória agora; o cliente deve tentar depois"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class MemoryAccountant(Observer):
+    """Bytes estimados dos jogos em memória, atualizados pelos eventos do GameManager"""
+
+    def __init__(self, manager: GameManager, tracker=None):
+        self.manager = manager
+        self.tracker = tracker
+        self._live: Dict[int, int] = {}
+        # Jogos encerrados na ordem em que terminaram: bytes ainda no GameManager
+        # (0 se o jogo já saiu e só resta o resumo no MatchTracker)
+        self._finished: "OrderedDict[int, int]" = OrderedDict()
+        self.live_bytes = 0
+        self.finished_bytes = 0
+        self.summaries = 0
+        self.games_shed = 0
+
+    @property
+    def total_bytes(self) -> int:
+        return self.live_bytes + self.finished_bytes + self.summaries * SUMMARY_BYTES
+
+    @property
+    def live_games(self) -> int:
+        return len(self._live)
+
+    def update(self, game_state: GameState):
+        pass
+
+    def on_event(self, event: GameEvent):
+        game_id = event.game_id
+        if event.type in (GameEventType.GAME_CREATED, GameEventType.GAME_IMPORTED):
+            size = estimate_game_bytes(event.game_state)
+            self._live[game_id] = size
+            self.live_bytes += size
+            if self.tracker is not None:
+                self.summaries += 1
+        elif event.type in (GameEventType.GAME_FINISHED, GameEventType.GAME_ABANDONED):
+            size = self._live.pop(game_id, None)
+            if size is None:
+                return
+            self.live_bytes -= size
+            # Abandonado sai do GameManager na hora; encerrado fica até ser descartado
+            kept = size if event.type == GameEventType.GAME_FINISHED else 0
+            self._finished[game_id] = kept
+            self.finished_bytes += kept
+        elif event.type == GameEventType.GAME_EXPORTED:
+            size = self._live.pop(game_id, None)
+            if size is not None:
+                self.live_bytes -= size
+                if self.tracker is not None:
+                    self.summaries -= 1  # o MatchTracker também esquece o jogo em andamento
+            elif self._finished.get(game_id):
+                self.finished_bytes -= self._finished[game_id]
+                self._finished[game_id] = 0
+
+    def shed(self, target_bytes: int) -> int:
+        """
+        Descarta os jogos encerrados mais antigos (e os resumos deles) até o
+        total ficar em `target_bytes`; jogos em andamento nunca são tocados.
+        Retorna quantos jogos foram descartados.
+        """
+        shed = 0
+        while self._finished and self.total_bytes > target_bytes:
+            game_id, size = self._finished.popitem(last=False)
+            if size:
+                self.finished_bytes -= size
+                self.manager.descartar_jogo(game_id)
+            if self.tracker is not None and self.tracker.forget(game_id):
+                self.summaries -= 1
+            shed += 1
+        self.games_shed += shed
+        return shed
+
+    def get_metrics(self) -> Dict:
+        return {
+            "bytes_estimados": self.total_bytes,
+            "bytes_em_andamento": self.live_bytes,
+            "bytes_encerrados": self.finished_bytes,
+            "bytes_resumos": self.summaries * SUMMARY_BYTES,
+            "jogos_em_andamento": len(self._live),
+            "jogos_encerrados": len(self._finished),
+            "jogos_descartados": self.games_shed
+        }
+
+
+class AdmissionController:
+    """Limites globais de memória e de jogos; decide se um jogo novo pode entrar"""
+
+    def __init__(self, accountant: MemoryAccountant, budget_bytes: Optional[int] = None,
+                 max_games: Optional[int] = None, new_game_share: float = DEFAULT_NEW_GAME_SHARE,
+                 retry_after: int = DEFAULT_RETRY_AFTER):
+        if not 0 < new_game_share <= 1:
+            raise ValueError("new_game_share deve estar em (0, 1]")
+        self.accountant = accountant
+        self.budget_bytes = budget_bytes
+        self.max_games = max_games
+        self.new_game_share = new_game_share
+        self.retry_after = retry_after
+        self.admitted = 0
+        self.rejected = {PRIORITY_IN_PROGRESS: 0, PRIORITY_NEW_GAME: 0}
+
+    def _limit(self, priority: int) -> Optional[int]:
+        if self.budget_bytes is None:
+            return None
+        if priority == PRIORITY_IN_PROGRESS:
+            return self.budget_bytes
+        return int(self.budget_bytes * self.new_game_share)
+
+    def allows(self, needed_bytes: int, priority: int = PRIORITY_NEW_GAME, reserved_games: int = 0) -> bool:
+        """
+        True se `needed_bytes` cabem no limite da prioridade, descartando
+        jogos encerrados se preciso; não conta como admissão nem recusa.
+        `reserved_games` são jogos já reservados num lote e ainda não criados
+        (o limite de jogos só enxerga os jogos criados).
+        """
+        accountant = self.accountant
+        if priority == PRIORITY_NEW_GAME and self.max_games is not None \
+                and accountant.live_games + reserved_games >= self.max_games:
+            return False
+        limit = self._limit(priority)
+        if limit is None or accountant.total_bytes + needed_bytes <= limit:
+            return True
+        accountant.shed(limit - needed_bytes)
+        return accountant.total_bytes + needed_bytes <= limit
+
+    def check(self, needed_bytes: int, priority: int = PRIORITY_NEW_GAME) -> None:
+        """AdmissionRejected (com o Retry-After sugerido) se o jogo não cabe agora"""
+        if not self.allows(needed_bytes, priority):
+            self.rejected[priority] += 1
+            raise AdmissionRejected("Servidor sem capacidade para novos jogos; tente novamente mais tarde",
+                                    self.retry_after)
+        self.admitted += 1
+
+    def get_metrics(self) -> Dict:
+        return {
+            **self.accountant.get_metrics(),
+            "orcamento_bytes": self.budget_bytes,
+            "limite_jogos": self.max_games,
+            "admitidos": self.admitted,
+            "recusados_novos": self.rejected[PRIORITY_NEW_GAME],
+            "recusados_em_andamento": self.rejected[PRIORITY_IN_PROGRESS]
+        }
@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
-from enum import Enum
-from typing import Any, List, Optional, Dict
-from pydantic import BaseModel
+from dataclasses import dataclass, field
+from enum import Enum, IntEnum
+from typing import Any, List, Optional, Dict, Tuple
+from deck import Deck
 
 class CardColor(str, Enum):
     RED = "RED"
@@ -22,6 +23,23 @@ class PlayDirection(str, Enum):
     CLOCKWISE = "CLOCKWISE"
     COUNTER_CLOCKWISE = "COUNTER_CLOCKWISE"
     
+def format_card_name(color: CardColor, card_type: CardType, value: Optional[int]) -> str:
+    """Formata o nome de exibição de uma carta (ex.: RED_5, BLUE_SKIP)"""
+    if card_type == CardType.NUMBER:
+        return f"{color.value}_{value}"
+    return f"{color.value}_{card_type.value}"
+
+# Nomes de exibição pré-calculados por face (cor, tipo, valor).
+# Faces fora do baralho padrão são formatadas uma vez e memorizadas.
+CARD_DISPLAY_NAMES: Dict[tuple, str] = {}
+for _color in (CardColor.RED, CardColor.BLUE, CardColor.GREEN, CardColor.YELLOW):
+    for _value in range(10):
+        CARD_DISPLAY_NAMES[(_color, CardType.NUMBER, _value)] = format_card_name(_color, CardType.NUMBER, _value)
+    for _type in (CardType.SKIP, CardType.REVERSE, CardType.DRAW_TWO):
+        CARD_DISPLAY_NAMES[(_color, _type, None)] = format_card_name(_color, _type, None)
+for _type in (CardType.WILD, CardType.WILD_DRAW_FOUR):
+    CARD_DISPLAY_NAMES[(CardColor.WILD, _type, None)] = format_card_name(CardColor.WILD, _type, None)
+    
 class CardEffectStrategy(ABC):
     @abstractmethod
     def apply_effect(self, game: 'GameState', player_id: int) -> Dict[str, Any]:
@@ -31,21 +49,22 @@ class CardEffectStrategy(ABC):
     def can_play(self, card: 'Card', top_card: 'Card') -> bool:
         pass
 
-class Card(BaseModel):
+# Modelo interno do motor: dataclasses com __slots__, sem validação.
+# A validação fica na borda da API (schemas.py).
+@dataclass(slots=True)
+class Card:
     id: int
     color: CardColor
     type: CardType
     value: Optional[int] = None  # Para cartas numéricas (0-9)
-    effect_strategy: Optional[CardEffectStrategy] = None
-    
-    class Config:
-        arbitrary_types_allowed = True
+    effect_strategy: Optional[CardEffectStrategy] = field(default=None, repr=False, compare=False)
     
     def __str__(self):
-        if self.type == CardType.NUMBER:
-            return f"{self.color.value}_{self.value}"
-        else:
-            return f"{self.color.value}_{self.type.value}"
+        key = (self.color, self.type, self.value)
+        name = CARD_DISPLAY_NAMES.get(key)
+        if name is None:
+            name = CARD_DISPLAY_NAMES[key] = format_card_name(self.color, self.type, self.value)
+        return name
         
     def apply_effect(self, game: 'GameState', player_id: int) -> Dict[str, Any]:
         if self.effect_strategy:
@@ -57,9 +76,11 @@ class Card(BaseModel):
             return self.effect_strategy.can_play(self, top_card)
         return False
 
-class Player(BaseModel):
+@dataclass(slots=True)
+class Player:
     id: int
-    hand: List[Card] = []
+    hand: List[Card] = field(default_factory=list)
+    account_id: Optional[str] = None  # identidade persistente (ranking); None = anônimo
     
     def add_card(self, card: Card):
         self.hand.append(card)
@@ -75,21 +96,147 @@ class Player(BaseModel):
     def get_card_count(self) -> int:
         return len(self.hand)
 
+class EffectCode(IntEnum):
+    """Código numérico do efeito de uma jogada (usado na API compacta)"""
+    NONE = 0
+    SKIP = 1
+    REVERSE = 2
+    REVERSE_AS_SKIP = 3
+    DRAW_TWO = 4
+    WILD = 5
+    WILD_CHOOSE_COLOR = 6
+    WILD_DRAW_FOUR = 7
+    SWAP_HANDS = 8
+    ROTATE_HANDS = 9
+
+@dataclass(slots=True)
+class EffectOutcome:
+    """
+    Resultado estruturado do efeito de uma carta, sem mensagens.
+    As mensagens da API v1 são montadas sob demanda por `describe_effect`.
+    """
+    code: EffectCode
+    next_player: int
+    target_player: Optional[int] = None
+    cards_drawn: List['Card'] = field(default_factory=list)
+    new_color: Optional[CardColor] = None
+    old_direction: Optional[PlayDirection] = None
+    new_direction: Optional[PlayDirection] = None
+    pending_draw: int = 0  # Total acumulado de compra (regra de acúmulo de +2/+4)
+
+def describe_effect(outcome: EffectOutcome) -> Dict[str, Any]:
+    """Monta o dicionário detalhado (com mensagem) usado pela API v1"""
+    code = outcome.code
+    if outcome.pending_draw:
+        result = {
+            "message": f"Compra acumulada em {outcome.pending_draw} cartas para o jogador {outcome.target_player}!",
+            "effect": "draw_stacked",
+            "target_player": outcome.target_player,
+            "pending_draw": outcome.pending_draw,
+            "next_player": outcome.next_player
+        }
+        if outcome.new_color:
+            result["new_color"] = outcome.new_color.value
+            result["message"] += f" Cor mudada para {outcome.new_color.value}!"
+        return result
+    if code == EffectCode.SWAP_HANDS:
+        return {
+            "message": f"Mão trocada com o jogador {outcome.target_player}!",
+            "effect": "swap_hands",
+            "target_player": outcome.target_player,
+            "next_player": outcome.next_player
+        }
+    if code == EffectCode.ROTATE_HANDS:
+        return {
+            "message": "Todas as mãos foram passadas no sentido do jogo!",
+            "effect": "rotate_hands",
+            "next_player": outcome.next_player
+        }
+    if code == EffectCode.SKIP:
+        return {
+            "message": f"Jogador {outcome.target_player} pulado!",
+            "effect": "skip",
+            "skipped_player": outcome.target_player,
+            "next_player": outcome.next_player
+        }
+    if code in (EffectCode.REVERSE, EffectCode.REVERSE_AS_SKIP):
+        result = {
+            "message": f"Direção do jogo invertida de {outcome.old_direction.value} para {outcome.new_direction.value}!",
+            "effect": "reverse",
+            "old_direction": outcome.old_direction.value,
+            "new_direction": outcome.new_direction.value,
+            "next_player": outcome.next_player
+        }
+        if code == EffectCode.REVERSE_AS_SKIP:
+            result["message"] = "Em 2 jogadores, Reverse age como Skip! Próximo jogador pulado."
+            result["effect"] = "reverse_as_skip"
+        return result
+    if code == EffectCode.DRAW_TWO:
+        return {
+            "message": f"Jogador {outcome.target_player} comprou 2 cartas e perdeu a vez!",
+            "effect": "draw_two",
+            "target_player": outcome.target_player,
+            "cards_drawn": [str(card) for card in outcome.cards_drawn],
+            "next_player": outcome.next_player
+        }
+    if code == EffectCode.WILD:
+        return {
+            "message": f"Cor mudada para {outcome.new_color.value}!",
+            "effect": "wild",
+            "new_color": outcome.new_color.value,
+            "next_player": outcome.next_player
+        }
+    if code == EffectCode.WILD_CHOOSE_COLOR:
+        return {
+            "message": "Carta curinga jogada - cor deve ser escolhida",
+            "effect": "wild_choose_color",
+            "next_player": outcome.next_player
+        }
+    if code == EffectCode.WILD_DRAW_FOUR:
+        result = {
+            "message": f"Jogador {outcome.target_player} comprou 4 cartas e perdeu a vez!",
+            "effect": "wild_draw_four",
+            "target_player": outcome.target_player,
+            "cards_drawn": [str(card) for card in outcome.cards_drawn],
+            "next_player": outcome.next_player
+        }
+        if outcome.new_color:
+            result["new_color"] = outcome.new_color.value
+            result["message"] += f" Cor mudada para {outcome.new_color.value}!"
+        return result
+    return {
+        "message": "Carta numérica jogada",
+        "effect": "none",
+        "next_player": outcome.next_player
+    }
+
 class GameStatus(str, Enum):
     NOT_STARTED = "NOT_STARTED"
     IN_PROGRESS = "IN_PROGRESS"
     FINISHED = "FINISHED"
+    ABANDONED = "ABANDONED"
 
-class GameState(BaseModel):
+@dataclass(slots=True)
+class GameState:
     id: int
     players: List[Player]
-    deck: List[Card]
+    deck: Deck  # Aceita uma lista na construção; é convertida em Deck
     discard_pile: List[Card]
     current_player_index: int
     status: GameStatus
     winner: Optional[int] = None
     play_direction: PlayDirection = PlayDirection.CLOCKWISE
     current_color: Optional[CardColor] = None
+    version: int = 0  # Incrementado a cada mudança de estado confirmada
+    pending_draw: int = 0  # Compra acumulada aguardando o próximo jogador (regra de acúmulo)
+    rules: Any = field(default=None, repr=False, compare=False)  # RulesEngine compilado
+    
+    def __post_init__(self):
+        if not isinstance(self.deck, Deck):
+            self.deck = Deck(self.deck)
+        if self.rules is None:
+            from rules import compile_ruleset  # import tardio: rules depende deste módulo
+            self.rules = compile_ruleset()
     
     def get_current_player(self) -> Player:
         return self.players[self.current_player_index]
@@ -106,6 +253,11 @@ class GameState(BaseModel):
         else:
             self.current_player_index = (self.current_player_index - 1) % len(self.players)
     
+    def peek_next_player(self) -> int:
+        """Retorna quem joga depois do jogador atual, sem avançar o turno"""
+        step = 1 if self.play_direction == PlayDirection.CLOCKWISE else -1
+        return (self.current_player_index + step) % len(self.players)
+    
     def reverse_direction(self):
         """Inverte a direção do jogo - Ação da carta REVERSE"""
         if self.play_direction == PlayDirection.CLOCKWISE:
@@ -124,136 +276,154 @@ class GameState(BaseModel):
     def draw_cards_for_player(self, player_id: int, quantity: int) -> List[Card]:
         """Faz um jogador comprar cartas - Ação das cartas DRAW TWO e WILD DRAW FOUR"""
         cards_drawn = []
+        hand = self.players[player_id].hand
         for _ in range(quantity):
-            if self.deck:
-                card = self.deck.pop()
-                self.players[player_id].add_card(card)
-                cards_drawn.append(card)
-            else:
+            card = self.deck.draw()
+            if card is None:
                 # Se o deck acabar, reinicia com as cartas de descarte (exceto a do topo)
                 self._replenish_deck_from_discard()
-                if self.deck:
-                    card = self.deck.pop()
-                    self.players[player_id].add_card(card)
-                    cards_drawn.append(card)
+                card = self.deck.draw()
+                if card is None:
+                    break
+            hand.append(card)
+            cards_drawn.append(card)
         return cards_drawn
     
     def _replenish_deck_from_discard(self):
         """Reabastece o deck com as cartas da pilha de descarte (exceto a do topo)"""
-        if len(self.discard_pile) > 1:
-            top_card = self.discard_pile.pop()  # Mantém a carta do topo
-            self.deck = self.discard_pile.copy()  # Usa o resto para o deck
-            self.discard_pile = [top_card]  # Recria a pilha de descarte apenas com a carta do topo
-            
-            import random
-            random.shuffle(self.deck)
+        self.deck.refill_from(self.discard_pile)
     
     def set_current_color(self, color: CardColor):
         """Define a cor atual - Ação das cartas WILD e WILD DRAW FOUR"""
         self.current_color = color
     
-    def apply_skip_effect(self) -> Dict[str, Any]:
-        """Aplica o efeito da carta SKIP"""
+    def resolve_skip_effect(self) -> EffectOutcome:
+        """Executa o efeito da carta SKIP"""
         skipped_player = self.current_player_index
         self.skip_player()
         self.skip_player()
-        
-        return {
-            "message": f"Jogador {skipped_player} pulado!",
-            "effect": "skip",
-            "skipped_player": skipped_player,
-            "next_player": self.current_player_index
-        }
+        return EffectOutcome(EffectCode.SKIP, self.current_player_index, target_player=skipped_player)
     
-    def apply_reverse_effect(self) -> Dict[str, Any]:
-        """Aplica o efeito da carta REVERSE"""
+    def resolve_reverse_effect(self) -> EffectOutcome:
+        """Executa o efeito da carta REVERSE"""
         old_direction = self.play_direction
         self.reverse_direction()
         self.skip_player()
         
-        result = {
-            "message": f"Direção do jogo invertida de {old_direction.value} para {self.play_direction.value}!",
-            "effect": "reverse",
-            "old_direction": old_direction.value,
-            "new_direction": self.play_direction.value,
-            "next_player": self.current_player_index
-        }
-        
         # Em jogos com 2 jogadores, Reverse age como Skip
-        if len(self.players) == 2:
-            result["message"] = "Em 2 jogadores, Reverse age como Skip! Próximo jogador pulado."
-            result["effect"] = "reverse_as_skip"
-        
-        return result
+        code = EffectCode.REVERSE_AS_SKIP if len(self.players) == 2 else EffectCode.REVERSE
+        return EffectOutcome(
+            code,
+            self.current_player_index,
+            old_direction=old_direction,
+            new_direction=self.play_direction
+        )
     
-    def apply_draw_two_effect(self) -> Dict[str, Any]:
-        """Aplica o efeito da carta DRAW TWO"""
+    def resolve_draw_two_effect(self) -> EffectOutcome:
+        """Executa o efeito da carta DRAW TWO"""
         self.skip_player()
         target_player = self.current_player_index
         cards_drawn = self.draw_cards_for_player(target_player, 2)
-        
-        return {
-            "message": f"Jogador {target_player} comprou 2 cartas e perdeu a vez!",
-            "effect": "draw_two",
-            "target_player": target_player,
-            "cards_drawn": [str(card) for card in cards_drawn],
-            "next_player": self.current_player_index
-        }
+        return EffectOutcome(
+            EffectCode.DRAW_TWO,
+            self.current_player_index,
+            target_player=target_player,
+            cards_drawn=cards_drawn
+        )
     
-    def apply_wild_effect(self, chosen_color: CardColor = None) -> Dict[str, Any]:
-        """Aplica o efeito da carta WILD"""
+    def resolve_wild_effect(self, chosen_color: CardColor = None) -> EffectOutcome:
+        """Executa o efeito da carta WILD"""
         if chosen_color:
             self.set_current_color(chosen_color)
             self.skip_player()
-            return {
-                "message": f"Cor mudada para {chosen_color.value}!",
-                "effect": "wild",
-                "new_color": chosen_color.value,
-                "next_player": self.current_player_index
-            }
-        else:
-            return {
-                "message": "Carta curinga jogada - cor deve ser escolhida",
-                "effect": "wild_choose_color",
-                "next_player": self.current_player_index
-            }
+            return EffectOutcome(EffectCode.WILD, self.current_player_index, new_color=chosen_color)
+        return EffectOutcome(EffectCode.WILD_CHOOSE_COLOR, self.current_player_index)
     
-    def apply_wild_draw_four_effect(self, chosen_color: CardColor = None) -> Dict[str, Any]:
-        """Aplica o efeito da carta WILD DRAW FOUR"""
+    def resolve_wild_draw_four_effect(self, chosen_color: CardColor = None) -> EffectOutcome:
+        """Executa o efeito da carta WILD DRAW FOUR"""
         self.skip_player()  # Pula o jogador que comprou as cartas
         target_player = self.current_player_index
         cards_drawn = self.draw_cards_for_player(target_player, 4)
         
-        result = {
-            "message": f"Jogador {target_player} comprou 4 cartas e perdeu a vez!",
-            "effect": "wild_draw_four",
-            "target_player": target_player,
-            "cards_drawn": [str(card) for card in cards_drawn],
-            "next_player": self.current_player_index
-        }
-        
         if chosen_color:
             self.set_current_color(chosen_color)
-            result["new_color"] = chosen_color.value
-            result["message"] += f" Cor mudada para {chosen_color.value}!"
         
-        return result
+        return EffectOutcome(
+            EffectCode.WILD_DRAW_FOUR,
+            self.current_player_index,
+            target_player=target_player,
+            cards_drawn=cards_drawn,
+            new_color=chosen_color
+        )
+    
+    def resolve_card_effect(self, card: Card, chosen_color: CardColor = None,
+                            target_player: Optional[int] = None) -> EffectOutcome:
+        """Executa o efeito de uma carta pela tabela de despacho do motor de regras"""
+        return self.rules.resolve(self, self.current_player_index, card, chosen_color, target_player)
+    
+    def apply_skip_effect(self) -> Dict[str, Any]:
+        """Aplica o efeito da carta SKIP"""
+        return describe_effect(self.resolve_skip_effect())
+    
+    def apply_reverse_effect(self) -> Dict[str, Any]:
+        """Aplica o efeito da carta REVERSE"""
+        return describe_effect(self.resolve_reverse_effect())
+    
+    def apply_draw_two_effect(self) -> Dict[str, Any]:
+        """Aplica o efeito da carta DRAW TWO"""
+        return describe_effect(self.resolve_draw_two_effect())
+    
+    def apply_wild_effect(self, chosen_color: CardColor = None) -> Dict[str, Any]:
+        """Aplica o efeito da carta WILD"""
+        return describe_effect(self.resolve_wild_effect(chosen_color))
+    
+    def apply_wild_draw_four_effect(self, chosen_color: CardColor = None) -> Dict[str, Any]:
+        """Aplica o efeito da carta WILD DRAW FOUR"""
+        return describe_effect(self.resolve_wild_draw_four_effect(chosen_color))
     
     def apply_card_effect(self, card: Card, chosen_color: CardColor = None) -> Dict[str, Any]:
         """Aplica o efeito de uma carta baseado no seu tipo"""
-        if card.type == CardType.SKIP:
-            return self.apply_skip_effect()
-        elif card.type == CardType.REVERSE:
-            return self.apply_reverse_effect()
-        elif card.type == CardType.DRAW_TWO:
-            return self.apply_draw_two_effect()
-        elif card.type == CardType.WILD:
-            return self.apply_wild_effect(chosen_color)
-        elif card.type == CardType.WILD_DRAW_FOUR:
-            return self.apply_wild_draw_four_effect(chosen_color)
-        else:
-            return {
-                "message": "Carta numérica jogada",
-                "effect": "none",
-                "next_player": self.current_player_index
-            }
\ No newline at end of file
+        return describe_effect(self.resolve_card_effect(card, chosen_color))
+
+@dataclass(frozen=True, slots=True)
+class GameSnapshot:
+    """
+    Cópia imutável do que as rotas de leitura expõem, presa a uma versão do jogo.
+    Leitores usam o snapshot sem lock; jogadas seguintes criam um novo snapshot.
+    Só os escalares são copiados ao criá-lo (O(1), mesmo em mesas de 1000 jogadores);
+    a mão de cada jogador é copiada na primeira leitura dela nesta versão.
+    """
+    game_id: int
+    version: int
+    status: GameStatus
+    current_player: int
+    current_color: Optional[CardColor]
+    top_card: Optional[Card]
+    player_count: int
+    _game: 'GameState' = field(repr=False, compare=False)
+    _hands: Dict[int, Tuple[Card, ...]] = field(default_factory=dict, repr=False, compare=False)
+
+    @classmethod
+    def of(cls, game: GameState) -> 'GameSnapshot':
+        return cls(
+            game_id=game.id,
+            version=game.version,
+            status=game.status,
+            current_player=game.current_player_index,
+            current_color=game.current_color,
+            top_card=game.get_top_discard_card(),
+            player_count=len(game.players),
+            _game=game
+        )
+
+    def hand(self, seat: int) -> Tuple[Card, ...]:
+        """
+        Mão do jogador nesta versão. Uma mão que ainda não foi lida não pode
+        mais ser copiada depois que o jogo mudou de versão: use o snapshot atual
+        """
+        hand = self._hands.get(seat)
+        if hand is None:
+            if self._game.version != self.version:
+                raise ValueError("Snapshot de uma versão anterior; leia o snapshot atual do jogo")
+            hand = self._hands[seat] = tuple(self._game.players[seat].hand)
+        return hand
@@ -0,0 +1,677 @@
+"""
+Sugestão de jogadas por Monte Carlo determinizado (botão de dica e bots).
+
+A partir do que o jogador enxerga (a própria mão, a pilha de descarte e o
+tamanho das outras mãos), cada iteração sorteia uma determinização: as mãos
+ocultas e o monte são distribuídos a partir das cartas ainda não vistas. Em
+seguida a jogada candidata é aplicada e a partida é simulada até o fim com
+uma política aleatória. As candidatas são escolhidas por UCB1, e vence a mais
+visitada.
+
+A simulação usa um motor interno com códigos de face (card_catalog) e as
+tabelas do RulesEngine. Ele reproduz a ordem de turnos do GameManager,
+inclusive o acúmulo de +2/+4, a regra 7-0 e draw-until-playable. O jump-in
+não é simulado.
+
+A busca respeita um orçamento em milissegundos, com prazo absoluto em
+time.monotonic (o mesmo relógio em todos os processos). Com `workers`, as
+iterações são divididas entre processos de um ProcessPoolExecutor. As
+estatísticas ficam num cache de transposição indexado pelo conjunto de
+informação (SearchState). Uma nova consulta na mesma posição, seja a dica
+seguida da jogada do bot ou uma posição que se repete em turnos seguintes,
+continua de onde a anterior parou.
+
+Com um EndgameSolver (endgame_solver.py), fins de jogo de 2 jogadores com
+poucas cartas são resolvidos de forma exata antes de recorrer às simulações.
+
+BotPlayers usa a mesma busca para jogar pelos assentos vazios.
+"""
+import asyncio
+import logging
+import math
+import os
+import random
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from typing import Dict, List, Optional, Set, Tuple
+
+from models import CardColor, CardType, GameState, GameStatus, PlayDirection
+from card_catalog import CARD_FACES, DISPLAY_NAMES, FACE_CODES, FACE_COPIES, PLAYABLE_COLORS, face_code
+from card_facade import CardFacade
+from game_locks import GameLockRegistry, run_blocking
+from game_manager import CARDS_PER_PLAYER, GameManager, VersionConflictError
+from observer_pattern import Observer, GameEvent, GameEventType
+from rules import Ruleset, color_slot, compile_ruleset
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGET_MS = 50
+MAX_BUDGET_MS = 2000
+DEFAULT_CACHE_SIZE = 10_000
+MAX_ROLLOUT_TURNS = 300
+UCB_EXPLORATION = 1.4
+DECK_SIZE = 108
+
+PASS = -1  # código da candidata "passar a vez"
+
+# Candidata: (código da face jogada ou PASS, slot da cor escolhida para curingas ou None)
+Candidate = Tuple[int, Optional[int]]
+
+_TYPES = tuple(card_type for _, card_type, _ in CARD_FACES)
+_VALUES = tuple(value for _, _, value in CARD_FACES)
+_COLOR_SLOTS = tuple(color_slot(color) for color, _, _ in CARD_FACES)
+_IS_WILD = tuple(card_type in (CardType.WILD, CardType.WILD_DRAW_FOUR) for card_type in _TYPES)
+_N_COLOR_SLOTS = color_slot(CardColor.WILD) + 1
+
+
+@lru_cache(maxsize=None)
+def _playable_masks(ruleset: Ruleset) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    """
+    Máscaras de bits das faces jogáveis, tiradas das tabelas do RulesEngine:
+    por (topo, slot de cor) e, com compra acumulada pendente, por topo.
+    Nas simulações a legalidade vira um deslocamento de bits.
+    """
+    engine = compile_ruleset(ruleset)
+    faces = range(len(CARD_FACES))
+    normal = tuple(
+        sum(1 << code for code in faces if engine.can_play_code(code, top, slot))
+        for top in faces for slot in range(_N_COLOR_SLOTS)
+    )
+    stacked = tuple(sum(1 << code for code in faces if engine.can_play_code(code, top, 0, 1)) for top in faces)
+    return normal, stacked
+
+
+def _playable_mask(ruleset: Ruleset, top: int, slot: int, pending: int) -> int:
+    normal, stacked = _playable_masks(ruleset)
+    return stacked[top] if pending else normal[top * _N_COLOR_SLOTS + slot]
+
+
+@dataclass(frozen=True, slots=True)
+class SearchState:
+    """
+    Conjunto de informação de um jogador, só com dados públicos e a própria mão.
+    Imutável e hashable: é a chave do cache de transposição e vai para os processos.
+    """
+    player: int
+    hand: Tuple[int, ...]           # códigos de face na ordem da mão
+    hand_sizes: Tuple[int, ...]
+    top: int
+    color: int                      # slot de cor (ver rules.color_slot)
+    direction: int                  # 1 = horário, -1 = anti-horário
+    pending: int
+    discard: Tuple[int, ...]        # descarte abaixo do topo (volta ao monte quando ele acaba)
+    unseen: Tuple[int, ...]         # cópias não vistas de cada face (outras mãos + monte)
+    deck_size: int
+    ruleset: Ruleset
+
+    @classmethod
+    def of(cls, game: GameState, player_id: int) -> 'SearchState':
+        """Extrai o conjunto de informação do jogador (cartas fora do catálogo no descarte são ignoradas)"""
+        hand = tuple(map(face_code, game.players[player_id].hand))
+        if None in hand:
+            raise ValueError("A mão tem cartas fora do catálogo; não é possível sugerir jogadas")
+        discard = tuple(code for code in map(face_code, game.discard_pile) if code is not None)
+        if not discard:
+            raise ValueError("Não há carta no topo da pilha de descarte")
+        total = len(game.deck) + len(game.discard_pile) + sum(len(p.hand) for p in game.players)
+        decks = max(1, math.ceil(total / DECK_SIZE))
+        unseen = [copies * decks for copies in FACE_COPIES]
+        for code in hand + discard:
+            unseen[code] = max(0, unseen[code] - 1)
+        return cls(
+            player=player_id,
+            hand=hand,
+            hand_sizes=tuple(len(p.hand) for p in game.players),
+            top=discard[-1],
+            color=color_slot(game.current_color),
+            direction=1 if game.play_direction == PlayDirection.CLOCKWISE else -1,
+            pending=game.pending_draw,
+            discard=discard[:-1],
+            unseen=tuple(unseen),
+            deck_size=len(game.deck),
+            ruleset=game.rules.ruleset
+        )
+
+    def candidates(self) -> List[Candidate]:
+        """Jogadas distintas possíveis: cada face jogável (curingas em cada cor) e passar"""
+        mask = _playable_mask(self.ruleset, self.top, self.color, self.pending)
+        result: List[Candidate] = []
+        for code in dict.fromkeys(self.hand):
+            if not mask >> code & 1:
+                continue
+            if _IS_WILD[code]:
+                result.extend((code, slot) for slot in range(len(PLAYABLE_COLORS)))
+            else:
+                result.append((code, None))
+        result.append((PASS, None))
+        return result
+
+
+class Simulation:
+    """
+    Partida determinizada em códigos de face, com a mesma ordem de turnos do GameManager.
+    Sem `rng` (cópias do solver de fim de jogo), o descarte volta ao monte sem embaralhar.
+    """
+    __slots__ = ("hands", "deck", "discard", "top", "color", "direction", "current",
+                 "pending", "winner", "masks", "ruleset", "rng")
+
+    def __init__(self, state: SearchState, rng: random.Random):
+        pool = [code for code, copies in enumerate(state.unseen) for _ in range(copies)]
+        rng.shuffle(pool)
+        hands: List[List[int]] = []
+        for seat, size in enumerate(state.hand_sizes):
+            if seat == state.player:
+                hands.append(list(state.hand))
+            else:
+                hands.append(pool[-size:] if size else [])
+                del pool[len(pool) - len(hands[-1]):]
+        self.hands = hands
+        self.deck = pool[-state.deck_size:] if state.deck_size else []
+        self.discard = list(state.discard)
+        self.top = state.top
+        self.color = state.color
+        self.direction = state.direction
+        self.current = state.player
+        self.pending = state.pending
+        self.winner: Optional[int] = None
+        self.masks = _playable_masks(state.ruleset)
+        self.ruleset = state.ruleset
+        self.rng = rng
+
+    @classmethod
+    def deal(cls, player_count: int, ruleset: Ruleset, rng: random.Random) -> 'Simulation':
+        """
+        Partida nova com o mesmo preparo do GameManager.novo_jogo: baralhos
+        embaralhados, CARDS_PER_PLAYER cartas por jogador e a primeira carta
+        numérica no topo (as de ação vão para o fundo do monte)
+        """
+        faces = [FACE_CODES[face] for face in CardFacade.deck_faces()]
+        deck = faces * GameManager.decks_needed(player_count)
+        rng.shuffle(deck)
+        hands = []
+        for _ in range(player_count):
+            hands.append(deck[-CARDS_PER_PLAYER:])
+            del deck[-CARDS_PER_PLAYER:]
+        top = None
+        for _ in range(len(deck)):
+            code = deck.pop()
+            if _TYPES[code] == CardType.NUMBER:
+                top = code
+                break
+            deck.insert(0, code)
+
+        simulation = cls.__new__(cls)
+        simulation.hands = hands
+        simulation.deck = deck
+        simulation.discard = []
+        simulation.top = top
+        simulation.color = _COLOR_SLOTS[top]
+        simulation.direction = 1
+        simulation.current = 0
+        simulation.pending = 0
+        simulation.winner = None
+        simulation.masks = _playable_masks(ruleset)
+        simulation.ruleset = ruleset
+        simulation.rng = rng
+        return simulation
+
+    def clone(self) -> 'Simulation':
+        """Cópia independente (sem rng) para explorar uma jogada"""
+        copy = Simulation.__new__(Simulation)
+        copy.hands = [list(hand) for hand in self.hands]
+        copy.deck = list(self.deck)
+        copy.discard = list(self.discard)
+        copy.top, copy.color, copy.direction = self.top, self.color, self.direction
+        copy.current, copy.pending, copy.winner = self.current, self.pending, self.winner
+        copy.masks, copy.ruleset, copy.rng = self.masks, self.ruleset, None
+        return copy
+
+    def key(self) -> tuple:
+        """Chave compacta da posição (mãos como multiconjuntos; monte e descarte em ordem)"""
+        return (self.current, self.direction, self.top, self.color, self.pending,
+                tuple(tuple(sorted(hand)) for hand in self.hands), tuple(self.deck), tuple(self.discard))
+
+    def moves(self) -> List[Candidate]:
+        """Jogadas distintas do jogador da vez (curingas em cada cor) e passar"""
+        hand = self.hands[self.current]
+        result: List[Candidate] = []
+        for code in dict.fromkeys(hand[i] for i in self.legal(self.current)):
+            if _IS_WILD[code]:
+                result.extend((code, slot) for slot in range(len(PLAYABLE_COLORS)))
+            else:
+                result.append((code, None))
+        result.append((PASS, None))
+        return result
+
+    def _advance(self, steps: int = 1) -> None:
+        self.current = (self.current + steps * self.direction) % len(self.hands)
+
+    def _draw(self, seat: int, quantity: int) -> List[int]:
+        drawn = []
+        for _ in range(quantity):
+            if not self.deck:
+                if not self.discard:
+                    break
+                self.deck = self.discard
+                self.discard = []
+                if self.rng is not None:
+                    self.rng.shuffle(self.deck)
+            drawn.append(self.deck.pop())
+        self.hands[seat].extend(drawn)
+        return drawn
+
+    def legal(self, seat: int) -> List[int]:
+        """Índices das cartas jogáveis na mão do jogador"""
+        normal, stacked = self.masks
+        mask = stacked[self.top] if self.pending else normal[self.top * _N_COLOR_SLOTS + self.color]
+        return [i for i, code in enumerate(self.hands[seat]) if mask >> code & 1]
+
+    def play(self, index: int, chosen_slot: Optional[int]) -> None:
+        seat = self.current
+        hand = self.hands[seat]
+        code = hand.pop(index)
+        self.discard.append(self.top)
+        self.top = code
+        card_type = _TYPES[code]
+        stacking = self.ruleset.stacking
+
+        if card_type == CardType.NUMBER:
+            # Com a última carta o jogador vence: a mão vazia não troca de dono
+            seven_zero = self.ruleset.seven_zero and hand
+            if seven_zero and _VALUES[code] == 7:
+                target = (seat + self.direction) % len(self.hands)
+                self.hands[seat], self.hands[target] = self.hands[target], hand
+            elif seven_zero and _VALUES[code] == 0:
+                shift = self.direction
+                self.hands = [self.hands[(i - shift) % len(self.hands)] for i in range(len(self.hands))]
+        elif card_type == CardType.SKIP:
+            self._advance(2)
+        elif card_type == CardType.REVERSE:
+            self.direction = -self.direction
+            self._advance(2 if len(self.hands) == 2 else 1)
+        elif card_type == CardType.DRAW_TWO:
+            if stacking:
+                self.pending += 2
+            else:
+                self._advance()
+                self._draw(self.current, 2)
+        elif card_type == CardType.WILD:
+            self._advance()
+        else:
+            if stacking:
+                self.pending += 4
+            else:
+                self._advance()
+                self._draw(self.current, 4)
+
+        if _IS_WILD[code]:
+            self.color = chosen_slot if chosen_slot is not None else self.color
+        else:
+            self.color = _COLOR_SLOTS[code]
+
+        if not self.hands[seat]:
+            self.winner = seat
+        self._advance()
+
+    def pass_turn(self) -> None:
+        seat = self.current
+        if self.pending:
+            self._draw(seat, self.pending)
+            self.pending = 0
+        elif self.ruleset.draw_until_playable:
+            while True:
+                drawn = self._draw(seat, 1)
+                if not drawn:
+                    break
+                if self.masks[0][self.top * _N_COLOR_SLOTS + self.color] >> drawn[0] & 1:
+                    return  # a vez continua com quem comprou
+        else:
+            self._draw(seat, 1)
+        self._advance()
+
+    def apply(self, candidate: Candidate) -> None:
+        code, chosen_slot = candidate
+        if code == PASS:
+            self.pass_turn()
+        else:
+            self.play(self.hands[self.current].index(code), chosen_slot)
+
+    def _favourite_color(self, hand: List[int]) -> int:
+        counts = [0] * len(PLAYABLE_COLORS)
+        for code in hand:
+            if not _IS_WILD[code]:
+                counts[_COLOR_SLOTS[code]] += 1
+        return counts.index(max(counts))
+
+    def rollout(self, max_turns: int = MAX_ROLLOUT_TURNS) -> None:
+        """Política padrão: carta jogável aleatória (curinga na cor mais comum da mão) ou passa"""
+        rng = self.rng
+        for _ in range(max_turns):
+            if self.winner is not None:
+                return
+            playable = self.legal(self.current)
+            if not playable:
+                self.pass_turn()
+                continue
+            index = playable[int(rng.random() * len(playable))]
+            code = self.hands[self.current][index]
+            self.play(index, self._favourite_color(self.hands[self.current]) if _IS_WILD[code] else None)
+
+    def reward(self, seat: int) -> float:
+        """1 se venceu, 0 se perdeu; partidas cortadas valem pela proporção de cartas"""
+        if self.winner is not None:
+            return 1.0 if self.winner == seat else 0.0
+        mine = len(self.hands[seat])
+        best_other = min(len(hand) for i, hand in enumerate(self.hands) if i != seat)
+        return best_other / (mine + best_other) if mine + best_other else 0.5
+
+
+def evaluate(state: SearchState, deadline: float, seed: Optional[int] = None,
+             max_iterations: Optional[int] = None) -> List[Tuple[int, float]]:
+    """
+    Executa iterações até o prazo (time.monotonic) e devolve (visitas, recompensa)
+    por candidata, na ordem de `state.candidates()`. Roda nos processos de busca.
+    """
+    candidates = state.candidates()
+    visits = [0] * len(candidates)
+    rewards = [0.0] * len(candidates)
+    rng = random.Random(seed)
+    total = 0
+    while time.monotonic() < deadline and (max_iterations is None or total < max_iterations):
+        if total < len(candidates):
+            choice = total
+        else:
+            log_total = math.log(total)
+            choice = max(range(len(candidates)), key=lambda i: (
+                rewards[i] / visits[i] + UCB_EXPLORATION * math.sqrt(log_total / visits[i])
+            ))
+        simulation = Simulation(state, rng)
+        simulation.apply(candidates[choice])
+        simulation.rollout()
+        visits[choice] += 1
+        rewards[choice] += simulation.reward(state.player)
+        total += 1
+    return list(zip(visits, rewards))
+
+
+@dataclass(slots=True)
+class Suggestion:
+    """Jogada sugerida; `card_index` (na mão avaliada) None significa passar a vez"""
+    card_index: Optional[int]
+    card: Optional[str]
+    chosen_color: Optional[CardColor]
+    win_rate: float
+    rollouts: int
+    cached_rollouts: int
+    candidates: List[Dict]
+    solved: bool = False  # resolvida pelo solver de fim de jogo
+
+
+class MoveSearch:
+    """
+    Busca de jogadas com orçamento de tempo e cache de transposição (LRU).
+    `workers` > 0 divide as iterações entre processos; 0 roda numa thread.
+    `endgame` (EndgameSolver) resolve antes os fins de jogo a que se aplica.
+    """
+    def __init__(self, budget_ms: float = DEFAULT_BUDGET_MS, workers: int = 0,
+                 cache_size: int = DEFAULT_CACHE_SIZE, endgame=None):
+        self.budget_ms = budget_ms
+        self.workers = workers
+        self.cache_size = cache_size
+        self.endgame = endgame
+        self._cache: "OrderedDict[SearchState, List[Tuple[int, float]]]" = OrderedDict()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.cache_hits = 0
+        self.searches = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def _cached(self, state: SearchState) -> Optional[List[Tuple[int, float]]]:
+        stats = self._cache.get(state)
+        if stats is not None:
+            self._cache.move_to_end(state)
+            self.cache_hits += 1
+        return stats
+
+    def _store(self, state: SearchState, stats: List[Tuple[int, float]]) -> None:
+        self._cache[state] = stats
+        self._cache.move_to_end(state)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _solved(self, state: SearchState, scores: Dict[Candidate, float]) -> Suggestion:
+        """
+        Sugestão do solver exato (só quando alguma jogada vence comprovadamente);
+        empates favorecem a ordem de candidates(), com passar por último
+        """
+        self.searches += 1
+        candidates = state.candidates()
+        best = max(range(len(candidates)), key=lambda i: (scores[candidates[i]], -i))
+        code, chosen_slot = candidates[best]
+        return Suggestion(
+            card_index=state.hand.index(code) if code != PASS else None,
+            card=DISPLAY_NAMES[code] if code != PASS else None,
+            chosen_color=PLAYABLE_COLORS[chosen_slot] if chosen_slot is not None else None,
+            win_rate=scores[candidates[best]],
+            rollouts=0,
+            cached_rollouts=0,
+            candidates=[
+                {"card": DISPLAY_NAMES[c] if c != PASS else None,
+                 "color": PLAYABLE_COLORS[s].value if s is not None else None,
+                 "visits": 0, "win_rate": scores[(c, s)]}
+                for c, s in candidates
+            ],
+            solved=True
+        )
+
+    def _choose(self, state: SearchState, stats: List[Tuple[int, float]], cached: int) -> Suggestion:
+        candidates = state.candidates()
+        # Sem nenhuma visita (orçamento zero), prefere jogar a primeira candidata a passar
+        best = max(range(len(candidates)), key=lambda i: (stats[i][0], -i))
+        code, chosen_slot = candidates[best]
+        visits, reward = stats[best]
+        return Suggestion(
+            card_index=state.hand.index(code) if code != PASS else None,
+            card=DISPLAY_NAMES[code] if code != PASS else None,
+            chosen_color=PLAYABLE_COLORS[chosen_slot] if chosen_slot is not None else None,
+            win_rate=reward / visits if visits else 0.0,
+            rollouts=sum(v for v, _ in stats),
+            cached_rollouts=cached,
+            candidates=[
+                {"card": DISPLAY_NAMES[c] if c != PASS else None,
+                 "color": PLAYABLE_COLORS[s].value if s is not None else None,
+                 "visits": v, "win_rate": round(r / v, 4) if v else None}
+                for (c, s), (v, r) in zip(candidates, stats)
+            ]
+        )
+
+    def suggest(self, game: GameState, player_id: int, budget_ms: Optional[float] = None,
+                seed: Optional[int] = None) -> Suggestion:
+        """Busca síncrona (testes, benchmarks e quem já está fora do event loop)"""
+        state = SearchState.of(game, player_id)
+        deadline = time.monotonic() + (self.budget_ms if budget_ms is None else budget_ms) / 1000
+        if self.endgame is not None and self.endgame.applies(state):
+            scores = self.endgame.solve(state, seed, deadline=deadline)
+            if scores and max(scores.values()) > 0:
+                return self._solved(state, scores)
+        previous = self._cached(state)
+        stats = _merge(previous, [evaluate(state, deadline, seed)])
+        return self._finish(state, previous, stats)
+
+    async def suggest_async(self, game: GameState, player_id: int,
+                            budget_ms: Optional[float] = None) -> Suggestion:
+        """
+        Busca fora do event loop. O SearchState é extraído antes do primeiro await,
+        então jogadas concorrentes não afetam a posição avaliada.
+        """
+        state = SearchState.of(game, player_id)
+        deadline = time.monotonic() + (self.budget_ms if budget_ms is None else budget_ms) / 1000
+        if self.endgame is not None and self.endgame.applies(state):
+            scores = await run_blocking(partial(self.endgame.solve, state, deadline=deadline))
+            if scores and max(scores.values()) > 0:
+                return self._solved(state, scores)
+        previous = self._cached(state)
+        if self.workers > 0:
+            loop = asyncio.get_running_loop()
+            executor = self._get_executor()
+            results = await asyncio.gather(*[
+                loop.run_in_executor(executor, partial(evaluate, state, deadline, os.urandom(8)))
+                for _ in range(self.workers)
+            ])
+        else:
+            results = [await run_blocking(evaluate, state, deadline)]
+        return self._finish(state, previous, _merge(previous, results))
+
+    def _finish(self, state: SearchState, previous: Optional[List[Tuple[int, float]]],
+                stats: List[Tuple[int, float]]) -> Suggestion:
+        self.searches += 1
+        self._store(state, stats)
+        cached = sum(v for v, _ in previous) if previous else 0
+        return self._choose(state, stats, cached)
+
+    def get_metrics(self) -> Dict:
+        metrics = {
+            "buscas": self.searches,
+            "acertos_cache": self.cache_hits,
+            "posicoes_em_cache": len(self._cache),
+            "processos": self.workers,
+            "orcamento_ms": self.budget_ms
+        }
+        if self.endgame is not None:
+            metrics["fim_de_jogo"] = self.endgame.get_metrics()
+        return metrics
+
+
+def _merge(previous: Optional[List[Tuple[int, float]]],
+           results: List[List[Tuple[int, float]]]) -> List[Tuple[int, float]]:
+    """Soma as estatísticas por candidata (cache + cada processo)"""
+    merged = [list(pair) for pair in previous] if previous else [[0, 0.0] for _ in results[0]]
+    for result in results:
+        for slot, (visits, reward) in zip(merged, result):
+            slot[0] += visits
+            slot[1] += reward
+    return [(visits, reward) for visits, reward in merged]
+
+
+class BotPlayers(Observer):
+    """
+    Assentos controlados por bots.
+    Como Observer, enfileira o jogo sempre que a vez passa para um bot. `play_pending`
+    (chamado pelo laço do servidor) busca a jogada fora do lock e a aplica sob o lock
+    com a versão esperada: se o jogo mudou durante a busca, a jogada é refeita.
+    """
+    def __init__(self, manager: GameManager, search: MoveSearch, game_locks: GameLockRegistry,
+                 budget_ms: Optional[float] = None):
+        self.manager = manager
+        self.search = search
+        self.game_locks = game_locks
+        self.budget_ms = budget_ms
+        self._seats: Dict[int, Set[int]] = {}
+        self._pending: Set[int] = set()
+        self.moves = 0
+        self.conflicts = 0
+        self.errors = 0
+
+    def add(self, game_id: int, seats) -> None:
+        """Coloca bots nos assentos informados de um jogo em andamento"""
+        game = self.manager.get_game_state(game_id)
+        if game is None:
+            raise ValueError("Jogo não encontrado")
+        self._seats.setdefault(game_id, set()).update(seats)
+        self._queue_if_bot_turn(game)
+
+    def is_bot(self, game_id: int, player_id: int) -> bool:
+        return player_id in self._seats.get(game_id, ())
+
+    def _queue_if_bot_turn(self, game: GameState) -> None:
+        if game.status == GameStatus.IN_PROGRESS and game.current_player_index in self._seats.get(game.id, ()):
+            self._pending.add(game.id)
+
+    def update(self, game_state: GameState):
+        pass
+
+    def on_event(self, event: GameEvent):
+        if event.game_id not in self._seats:
+            return
+        if event.type in (GameEventType.GAME_FINISHED, GameEventType.GAME_ABANDONED,
+                          GameEventType.GAME_EXPORTED):
+            del self._seats[event.game_id]
+            self._pending.discard(event.game_id)
+            return
+        self._queue_if_bot_turn(event.game_state)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    async def play_pending(self) -> int:
+        """
+        Joga a vez de todos os bots enfileirados (jogos diferentes em paralelo)
+        O erro de um jogo é registrado e não impede a vez dos bots dos outros
+        """
+        pending, self._pending = list(self._pending), set()
+        results = await asyncio.gather(*[self._play_turn(game_id) for game_id in pending],
+                                       return_exceptions=True)
+        played = 0
+        for game_id, result in zip(pending, results):
+            if isinstance(result, Exception):
+                self.errors += 1
+                logger.error("Falha na vez do bot no jogo %s", game_id, exc_info=result)
+            elif result:
+                played += 1
+        return played
+
+    async def _play_turn(self, game_id: int) -> bool:
+        game = self.manager.get_game_state(game_id)
+        if game is None:
+            return False
+        seat = game.current_player_index
+        if game.status != GameStatus.IN_PROGRESS or not self.is_bot(game_id, seat):
+            return False
+        version = game.version
+        try:
+            suggestion = await self.search.suggest_async(game, seat, self.budget_ms)
+        except ValueError as e:
+            # O jogo terminou, foi descartado ou mudou de forma incompatível durante a busca
+            self.errors += 1
+            logger.warning("Busca do bot no jogo %s falhou: %s", game_id, e)
+            return False
+        async with self.game_locks.hold(game_id):
+            try:
+                if suggestion.card_index is None:
+                    self.manager.resolver_passagem(game_id, seat, expected_version=version)
+                else:
+                    self.manager.resolver_jogada(
+                        game_id, seat, suggestion.card_index, suggestion.chosen_color, None, version
+                    )
+            except VersionConflictError:
+                # Alguém jogou durante a busca: reavalia a partir do estado novo
+                self.conflicts += 1
+                self._queue_if_bot_turn(game)
+                return False
+            except ValueError as e:
+                # Jogo encerrado ou descartado enquanto o bot pensava
+                self.errors += 1
+                logger.warning("Jogada do bot no jogo %s recusada: %s", game_id, e)
+                return False
+        self.moves += 1
+        return True
+
+    def get_metrics(self) -> Dict:
+        return {
+            "jogos_com_bots": len(self._seats),
+            "jogadas": self.moves,
+            "conflitos": self.conflicts,
+            "erros": self.errors,
+            **self.search.get_metrics()
+        }
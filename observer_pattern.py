@@ -1,7 +1,35 @@
 from abc import ABC, abstractmethod
-from typing import List, Any
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
 from models import GameState  # Vamos importar o GameState para tipagem
 
+
+class GameEventType(str, Enum):
+    GAME_CREATED = "game_created"
+    CARD_PLAYED = "card_played"
+    TURN_PASSED = "turn_passed"
+    GAME_FINISHED = "game_finished"
+    TURN_TIMED_OUT = "turn_timed_out"
+    GAME_ABANDONED = "game_abandoned"
+    GAME_EXPORTED = "game_exported"    # jogo migrado para outro processo (sai deste GameManager)
+    GAME_IMPORTED = "game_imported"    # jogo migrado de outro processo, no meio da partida
+
+
+@dataclass(frozen=True)
+class GameEvent:
+    """
+    Evento tipado enviado aos observadores.
+    `delta` contém apenas o que mudou; `game_state` fica disponível
+    para observadores que ainda precisam do estado completo.
+    """
+    type: GameEventType
+    game_id: int
+    version: int
+    delta: Dict[str, Any] = field(default_factory=dict)
+    game_state: Optional[GameState] = field(default=None, repr=False, compare=False)
+
+
 # Interface para o Observador
 class Observer(ABC):
     @abstractmethod
@@ -9,25 +37,94 @@ class Observer(ABC):
         """Recebe a notificação do Subject."""
         pass
 
+    def on_event(self, event: GameEvent):
+        """
+        Recebe um evento tipado.
+        Por padrão repassa o estado completo para `update`, mantendo
+        compatíveis os observadores que só conhecem o estado.
+        """
+        self.update(event.game_state)
+
+
+# Chave do índice de assinaturas: (id do jogo, tipo de evento); None = qualquer um
+SubscriptionKey = Tuple[Optional[int], Optional[GameEventType]]
+
+# Eventos depois dos quais o jogo sai deste processo: as assinaturas dele são descartadas
+RELEASING_EVENTS = frozenset((
+    GameEventType.GAME_FINISHED, GameEventType.GAME_ABANDONED, GameEventType.GAME_EXPORTED
+))
+_EVENT_KEYS: Tuple[Optional[GameEventType], ...] = (None, *GameEventType)
+
+
 # Interface para o Sujeito (Subject)
 class Subject(ABC):
     def __init__(self):
-        """Inicializa o Subject com uma lista vazia de observadores."""
-        self._observers: List[Observer] = []
-
-    def attach(self, observer: Observer):
-        """Adiciona um observador."""
-        if observer not in self._observers:
-            self._observers.append(observer)
-    
+        """Inicializa o Subject sem observadores."""
+        # Dicionários em ordem de inserção: entrega na ordem do attach, attach/detach O(1)
+        self._observers: Dict[Observer, Set[SubscriptionKey]] = {}
+        self._subscriptions: Dict[SubscriptionKey, Dict[Observer, None]] = {}
+
+    def attach(self, observer: Observer, game_id: Optional[int] = None,
+               event_types: Optional[Iterable[GameEventType]] = None):
+        """
+        Adiciona um observador.
+        `game_id` e `event_types` filtram quais eventos ele recebe;
+        sem filtros o observador recebe todos os eventos de todos os jogos.
+        Inscrições num jogo são descartadas quando ele termina ou sai do processo.
+        """
+        if observer in self._observers:
+            return
+
+        types: FrozenSet[Optional[GameEventType]] = (
+            frozenset(event_types) if event_types else frozenset([None])
+        )
+        keys = {(game_id, event_type) for event_type in types}
+        for key in keys:
+            self._subscriptions.setdefault(key, {})[observer] = None
+        self._observers[observer] = keys
+
     def detach(self, observer: Observer):
         """Remove um observador."""
-        try:
-            self._observers.remove(observer)
-        except ValueError:
-            pass # Ignora se o observador não estiver na lista
+        keys = self._observers.pop(observer, None)
+        if keys is None:
+            return # Ignora se o observador não estiver anexado
 
-    @abstractmethod
-    def notify(self, game_state: GameState):
-        """Notifica todos os observadores sobre uma mudança."""
-        pass
\ No newline at end of file
+        for key in keys:
+            bucket = self._subscriptions.get(key)
+            if bucket is None:
+                continue
+            bucket.pop(observer, None)
+            if not bucket:
+                del self._subscriptions[key]
+
+    def _release_game(self, game_id: int):
+        """Descarta as inscrições do jogo; quem só assinava esse jogo deixa de ser observador"""
+        for event_type in _EVENT_KEYS:
+            key = (game_id, event_type)
+            bucket = self._subscriptions.pop(key, None)
+            if bucket is None:
+                continue
+            for observer in bucket:
+                keys = self._observers.get(observer)
+                if keys is None:
+                    continue
+                keys.discard(key)
+                if not keys:
+                    del self._observers[observer]
+
+    def subscribers_for(self, game_id: int, event_type: GameEventType) -> List[Observer]:
+        """Retorna os observadores interessados no evento, consultando só o índice."""
+        subscriptions = self._subscriptions
+        found: List[Observer] = []
+        for key in ((game_id, event_type), (game_id, None), (None, event_type), (None, None)):
+            bucket = subscriptions.get(key)
+            if bucket:
+                found.extend(bucket)
+        return found
+
+    def publish(self, event: GameEvent):
+        """Entrega o evento apenas aos observadores inscritos nele."""
+        for observer in self.subscribers_for(event.game_id, event.type):
+            observer.on_event(event)
+        if event.type in RELEASING_EVENTS:
+            self._release_game(event.game_id)
@@ -0,0 +1,211 @@
+"""
+Reproduz um tráfego gravado (ver traffic_recorder.py) contra uma instância nova.
+
+As requisições saem no mesmo ritmo da gravação, dividido por `--velocidade`
+(0 = sem espera). As requisições de um mesmo jogo saem em ordem: cada uma
+espera a resposta da anterior. As requisições de um jogo ainda não criado
+esperam as criações em curso. Jogos diferentes andam em paralelo.
+
+O relatório compara vazão e latências (p50/p95 por rota) com a gravação,
+ou com um resumo salvo de outra build (`--salvar` / `--base`). A latência
+gravada é medida no servidor; a da reprodução inclui o cliente. Para comparar
+builds, use o mesmo modo de reprodução nas duas. Com as sementes
+gravadas, os jogos criados por requisição se repetem. Por isso as respostas
+das rotas determinísticas são comparadas pelo resumo do corpo. Ficam de fora
+as métricas, a busca de sugestões e o lobby, que dependem do relógio. Jogos
+do matcher, jogadas dos bots e prazos de vez vencidos também dependem do relógio
+e podem divergir.
+
+Sem `--url`, a instância é main.create_app() no mesmo processo, sem rede, com as
+tarefas de fundo rodando.
+
+Uso:
+    python replay_traffic.py --arquivo trafego.bin [--velocidade 10] [--url http://localhost:8000]
+                             [--salvar resumo.json] [--base resumo.json]
+"""
+import argparse
+import asyncio
+import json
+import re
+import sys
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+import httpx
+
+from traffic_recorder import SEEDED_ROUTES, TrafficRecord, read_traffic, response_digest
+
+GAME_PATH = re.compile(r"/jogos?/(\d+)(?:/|$)")
+CREATION_ROUTES = SEEDED_ROUTES + (("POST", "/jogos/importar"),)
+# Respostas que dependem do relógio ou de sorteios sem semente
+NONDETERMINISTIC = re.compile(r"metricas|/sugestao|/lobby/|/replicacao/|/exportar/jogos|/estatisticas|"
+                              r"/partidas|/ranking")
+_NUMBER = re.compile(r"/\d+(?=/|$)")
+MAX_REPORTED_MISMATCHES = 10
+
+
+class ReplayResult(NamedTuple):
+    latency: float
+    status: int
+    digest: bytes
+
+
+def route_of(target: str) -> str:
+    """Rota sem a query e com os ids trocados por {id}, para agrupar as latências"""
+    return _NUMBER.sub("/{id}", target.split("?", 1)[0])
+
+
+def _percentiles(values: Sequence[float], percentiles=(50, 95, 99)) -> Dict[str, Optional[float]]:
+    """Percentis (nearest-rank), em milissegundos"""
+    ordered = sorted(values)
+    result = {}
+    for p in percentiles:
+        rank = max(1, -(-p * len(ordered) // 100))
+        result[f"p{p}"] = round(ordered[rank - 1] * 1000, 3) if ordered else None
+    return result
+
+
+def summarize(records: Sequence[TrafficRecord], latencies: Sequence[float], elapsed: float) -> Dict:
+    """Vazão e percentis de latência, no total e por rota"""
+    by_route: Dict[str, List[float]] = {}
+    for record, latency in zip(records, latencies):
+        by_route.setdefault(route_of(record.target), []).append(latency)
+    return {
+        "requisicoes": len(records),
+        "duracao_s": round(elapsed, 3),
+        "vazao": round(len(records) / elapsed, 1) if elapsed > 0 else None,
+        "latencia_ms": _percentiles(latencies),
+        "rotas": {route: {"n": len(values), **_percentiles(values, (50, 95))}
+                  for route, values in sorted(by_route.items())}
+    }
+
+
+def recorded_summary(records: Sequence[TrafficRecord]) -> Dict:
+    elapsed = max((record.offset + record.latency for record in records), default=0.0)
+    return summarize(records, [record.latency for record in records], elapsed)
+
+
+def mismatches(records: Sequence[TrafficRecord], results: Sequence[ReplayResult]) -> List[int]:
+    """Índices das requisições determinísticas cuja resposta não bate com a gravada"""
+    return [
+        index for index, (record, result) in enumerate(zip(records, results))
+        if not NONDETERMINISTIC.search(record.target.split("?", 1)[0])
+        and (record.status != result.status or record.digest != result.digest)
+    ]
+
+
+async def _send(client: httpx.AsyncClient, record: TrafficRecord, previous: Optional[asyncio.Task],
+                clock: Callable[[], float]) -> ReplayResult:
+    if previous is not None:
+        await asyncio.wait([previous])  # só a ordem importa, não o resultado da anterior
+    started = clock()
+    response = await client.request(record.method, record.target, headers=dict(record.headers),
+                                    content=record.body or None)
+    return ReplayResult(clock() - started, response.status_code, response_digest(response.content).digest())
+
+
+async def replay(records: Sequence[TrafficRecord], client: httpx.AsyncClient, speed: float = 1.0,
+                 clock: Callable[[], float] = time.perf_counter):
+    """Envia as requisições no ritmo gravado / `speed`; retorna (resultados, duração)"""
+    if speed < 0:
+        raise ValueError("velocidade deve ser >= 0")
+    by_game: Dict[int, asyncio.Task] = {}
+    last_creation: Optional[asyncio.Task] = None
+    tasks = []
+    started = clock()
+    for record in records:
+        if speed:
+            delay = started + record.offset / speed - clock()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        match = GAME_PATH.search(record.target.split("?", 1)[0])
+        game_id = int(match.group(1)) if match else None
+        creation = (record.method, record.target.split("?", 1)[0]) in CREATION_ROUTES
+        previous = by_game.get(game_id, last_creation) if game_id is not None else \
+            last_creation if creation else None
+        task = asyncio.create_task(_send(client, record, previous, clock))
+        if creation:
+            last_creation = task
+        elif game_id is not None:
+            by_game[game_id] = task
+        tasks.append(task)
+    results = await asyncio.gather(*tasks)
+    return results, clock() - started
+
+
+async def _replay_in_process(records: Sequence[TrafficRecord], speed: float):
+    import main  # só quando a instância é local: a importação sobe o app inteiro
+
+    app = main.create_app({})
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://uno", timeout=None) as client:
+            return await replay(records, client, speed)
+
+
+async def _replay_remote(records: Sequence[TrafficRecord], url: str, speed: float):
+    async with httpx.AsyncClient(base_url=url, timeout=None) as client:
+        return await replay(records, client, speed)
+
+
+def _delta(base: Optional[float], value: Optional[float]) -> str:
+    if not base or value is None:
+        return ""
+    return f"{(value - base) / base * 100:+.0f}%"
+
+
+def print_report(base: Dict, current: Dict, base_label: str) -> None:
+    print(f"{'':<40} {base_label:>14} {'replay':>14}")
+    print(f"{'vazão (req/s)':<40} {base['vazao'] or 0:>14.1f} {current['vazao'] or 0:>14.1f} "
+          f"{_delta(base['vazao'], current['vazao'])}")
+    for name in ("p50", "p95", "p99"):
+        before, after = base["latencia_ms"][name], current["latencia_ms"][name]
+        print(f"{'latência ' + name + ' (ms)':<40} {before or 0:>14.3f} {after or 0:>14.3f} {_delta(before, after)}")
+    print()
+    print(f"{'rota':<40} {'n':>6} {'p50 base':>10} {'p50':>10} {'p95 base':>10} {'p95':>10}")
+    for route, stats in current["rotas"].items():
+        before = base["rotas"].get(route, {})
+        print(f"{route:<40} {stats['n']:>6} {before.get('p50') or 0:>10.3f} {stats['p50']:>10.3f} "
+              f"{before.get('p95') or 0:>10.3f} {stats['p95']:>10.3f} {_delta(before.get('p95'), stats['p95'])}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Reproduz um tráfego gravado e compara com a gravação")
+    parser.add_argument("--arquivo", required=True, help="gravação feita com UNO_TRAFFIC_RECORD")
+    parser.add_argument("--velocidade", type=float, default=1.0,
+                        help="multiplicador do ritmo gravado (ex.: 1 a 100; 0 = sem espera)")
+    parser.add_argument("--url", help="instância já rodando (padrão: main.create_app() neste processo)")
+    parser.add_argument("--salvar", help="grava o resumo desta execução em JSON")
+    parser.add_argument("--base", help="compara com o resumo JSON de outra build em vez da gravação")
+    args = parser.parse_args(argv)
+
+    try:
+        _, records = read_traffic(args.arquivo)
+        if args.url:
+            results, elapsed = asyncio.run(_replay_remote(records, args.url, args.velocidade))
+        else:
+            results, elapsed = asyncio.run(_replay_in_process(records, args.velocidade))
+    except (OSError, ValueError) as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+
+    current = summarize(records, [result.latency for result in results], elapsed)
+    if args.base:
+        with open(args.base) as file:
+            print_report(json.load(file), current, "base")
+    else:
+        print_report(recorded_summary(records), current, "gravação")
+    if args.salvar:
+        with open(args.salvar, "w") as file:
+            json.dump(current, file, indent=2)
+
+    different = mismatches(records, results)
+    print(f"\n{len(records)} requisições reproduzidas; {len(different)} respostas diferentes da gravação")
+    for index in different[:MAX_REPORTED_MISMATCHES]:
+        record, result = records[index], results[index]
+        print(f"  {record.method} {record.target}: status {record.status} -> {result.status}", file=sys.stderr)
+    return 1 if different else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
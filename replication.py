@@ -0,0 +1,358 @@
+"""
+Replicação primário/seguidor (warm standby) pelo log de jogadas.
+
+O primário abre um socket local (TCP "host:porta" ou caminho de socket Unix).
+Cada seguidor se conecta e recebe primeiro o snapshot (snapshot_codec) de
+todos os jogos em memória. Depois passa a receber um registro por mudança
+confirmada no GameManager do primário. O seguidor aplica os registros no
+próprio GameManager, pelos mesmos métodos das rotas. Assim os observadores
+dele (locks, prazos, espectadores) ficam em dia, e a promoção não precisa
+recarregar nada.
+
+Jogadas e passagens vão como registros de poucos bytes e são reexecutadas no
+seguidor. Quando a reexecução não reproduziria o primário, vai o snapshot do
+jogo: o monte reembaralhado (a ordem sorteada só existe no primário) ou a
+troca de mão da regra 7-0 (o alvo não está no evento). Todo registro leva a
+versão resultante. Se o seguidor chegar a outra versão, ele reconecta e
+recomeça pelo snapshot completo.
+
+Quadro: FRAME_HEADER (tamanho do corpo, tipo, jogo, versão, instante do
+commit em time.time) seguido do corpo do tipo. O atraso de replicação é
+medido no seguidor pela diferença entre o instante de aplicação e o do
+commit, com primário e seguidor na mesma máquina (ou com relógios
+sincronizados).
+
+Um seguidor lento não faz o primário acumular memória sem limite: acima de
+`max_buffer` bytes pendentes a conexão é derrubada, e o seguidor se
+reconecta e ressincroniza.
+"""
+import asyncio
+import struct
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+from game_manager import GameManager
+from models import CardColor, CardType, EffectCode, GameState, GameStatus
+from observer_pattern import Observer, GameEvent, GameEventType
+from snapshot_codec import decode_game, encode_game, peek_snapshot
+
+KIND_SNAPSHOT, KIND_PLAY, KIND_PASS, KIND_FINISHED, KIND_ABANDONED, KIND_REMOVED = range(6)
+
+FRAME_HEADER = struct.Struct("<IBqId")  # tamanho do corpo, tipo, jogo, versão, instante do commit
+PLAY_BODY = struct.Struct("<HHB")       # jogador, id da carta jogada, cor escolhida
+PASS_BODY = struct.Struct("<HB")        # jogador, 1 = vez expirada por tempo
+NO_COLOR = 0xFF
+
+DEFAULT_MAX_BUFFER = 8 * 1024 * 1024
+DEFAULT_RETRY_INTERVAL = 1.0
+RATE_WINDOW = 1024  # registros usados no cálculo da taxa de aplicação
+
+_COLORS = tuple(CardColor)
+_COLOR_CODES = {color: code for code, color in enumerate(_COLORS)}
+_WILD_TYPES = (CardType.WILD, CardType.WILD_DRAW_FOUR)
+
+
+class ReplicationDivergence(Exception):
+    """O seguidor não chegou ao mesmo estado do primário ao aplicar um registro"""
+
+
+def frame(kind: int, game_id: int, version: int, committed_at: float, body: bytes = b"") -> bytes:
+    return FRAME_HEADER.pack(len(body), kind, game_id, version, committed_at) + body
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Tuple[int, int, int, float, bytes]:
+    """(tipo, jogo, versão, instante do commit, corpo); IncompleteReadError quando a conexão fecha"""
+    size, kind, game_id, version, committed_at = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+    body = await reader.readexactly(size) if size else b""
+    return kind, game_id, version, committed_at, body
+
+
+async def _open_connection(address: str):
+    host, _, port = address.rpartition(":")
+    if host and port.isdigit():
+        return await asyncio.open_connection(host, int(port))
+    return await asyncio.open_unix_connection(address)
+
+
+async def _start_server(callback, address: str):
+    host, _, port = address.rpartition(":")
+    if host and port.isdigit():
+        return await asyncio.start_server(callback, host, int(port))
+    return await asyncio.start_unix_server(callback, address)
+
+
+class ReplicationPrimary(Observer):
+    """Observer que transmite as mudanças confirmadas aos seguidores conectados"""
+
+    def __init__(self, manager: GameManager, max_buffer: int = DEFAULT_MAX_BUFFER,
+                 clock=time.time):
+        self.manager = manager
+        self.max_buffer = max_buffer
+        self.clock = clock
+        self._followers: List[asyncio.StreamWriter] = []
+        self._connections: Set[asyncio.Task] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._reshuffles: Dict[int, int] = {}
+        self._snapshotted: Set[int] = set()  # jogos cujo último registro foi um snapshot
+        self.records_sent = 0
+        self.bytes_sent = 0
+        self.snapshots_sent = 0
+        self.followers_dropped = 0
+        self.unreplicable = 0
+
+    async def start(self, address: str) -> None:
+        self._server = await _start_server(self._on_follower, address)
+
+    async def stop(self) -> None:
+        for writer in self._followers:
+            writer.close()
+        self._followers = []
+        if self._connections:
+            # Com o socket fechado, cada conexão termina ao ler o fim do fluxo
+            await asyncio.gather(*self._connections, return_exceptions=True)
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _on_follower(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Envia o estado completo e passa a transmitir as mudanças"""
+        now = self.clock()
+        for game in list(self.manager.games.values()):
+            record = self._snapshot(game, now)
+            if record is not None:
+                writer.write(record)
+        # Jogos do checkpoint ainda não carregados já estão no formato do snapshot
+        for game_id, data in self.manager.cold_snapshots():
+            writer.write(frame(KIND_SNAPSHOT, game_id, peek_snapshot(data).version, now, data))
+            self.snapshots_sent += 1
+        self._followers.append(writer)
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            await reader.read()  # o seguidor não envia nada; retorna quando ele desconecta
+        except ConnectionError:
+            pass
+        finally:
+            self._connections.discard(task)
+            if writer in self._followers:
+                self._followers.remove(writer)
+            writer.close()
+
+    def _snapshot(self, game: GameState, committed_at: float) -> Optional[bytes]:
+        try:
+            body = encode_game(game)
+        except ValueError:
+            self.unreplicable += 1  # cartas fora do baralho padrão
+            return None
+        self._reshuffles[game.id] = game.deck.reshuffles
+        self._snapshotted.add(game.id)
+        self.snapshots_sent += 1
+        return frame(KIND_SNAPSHOT, game.id, game.version, committed_at, body)
+
+    def _record(self, event: GameEvent, committed_at: float) -> Optional[bytes]:
+        game = event.game_state
+        game_id = event.game_id
+        if event.type in (GameEventType.GAME_CREATED, GameEventType.GAME_IMPORTED):
+            return self._snapshot(game, committed_at)
+        if game_id not in self._reshuffles:
+            return None  # jogo que não pôde ir no snapshot: o seguidor não o conhece
+        if event.type == GameEventType.GAME_ABANDONED:
+            self._forget(game_id)
+            return frame(KIND_ABANDONED, game_id, event.version, committed_at,
+                         str(event.delta.get("reason", "")).encode("utf-8"))
+        if event.type == GameEventType.GAME_EXPORTED:
+            self._forget(game_id)
+            return frame(KIND_REMOVED, game_id, event.version, committed_at)
+        if event.type == GameEventType.GAME_FINISHED:
+            if game_id in self._snapshotted:
+                return self._snapshot(game, committed_at)
+            return frame(KIND_FINISHED, game_id, event.version, committed_at)
+
+        # Reembaralhamento e troca de mão não se reproduzem no seguidor: vai o estado
+        if game.deck.reshuffles != self._reshuffles.get(game_id) or \
+                event.delta.get("effect") == EffectCode.SWAP_HANDS:
+            return self._snapshot(game, committed_at)
+        self._snapshotted.discard(game_id)
+        if event.type == GameEventType.CARD_PLAYED:
+            card = game.discard_pile[-1]
+            color = _COLOR_CODES[game.current_color] if card.type in _WILD_TYPES else NO_COLOR
+            return frame(KIND_PLAY, game_id, event.version, committed_at,
+                         PLAY_BODY.pack(event.delta["player_id"], card.id, color))
+        timed_out = event.type == GameEventType.TURN_TIMED_OUT
+        return frame(KIND_PASS, game_id, event.version, committed_at,
+                     PASS_BODY.pack(event.delta["player_id"], timed_out))
+
+    def _forget(self, game_id: int) -> None:
+        self._reshuffles.pop(game_id, None)
+        self._snapshotted.discard(game_id)
+
+    def update(self, game_state: GameState):
+        pass
+
+    def on_event(self, event: GameEvent):
+        if not self._followers:
+            # Sem seguidores só o controle de reembaralhamento precisa ficar em dia;
+            # quem se conectar depois começa pelo snapshot
+            if event.type in (GameEventType.GAME_CREATED, GameEventType.GAME_IMPORTED):
+                self._reshuffles[event.game_id] = event.game_state.deck.reshuffles
+            elif event.type in (GameEventType.GAME_ABANDONED, GameEventType.GAME_EXPORTED):
+                self._forget(event.game_id)
+            elif event.game_id in self._reshuffles:
+                self._reshuffles[event.game_id] = event.game_state.deck.reshuffles
+            return
+        record = self._record(event, self.clock())
+        if record is None:
+            return
+        for writer in list(self._followers):
+            if writer.transport.get_write_buffer_size() > self.max_buffer:
+                # Seguidor atrasado demais: reconecta e ressincroniza pelo snapshot
+                self._followers.remove(writer)
+                writer.close()
+                self.followers_dropped += 1
+                continue
+            writer.write(record)
+        self.records_sent += 1
+        self.bytes_sent += len(record)
+
+    def get_metrics(self) -> Dict:
+        return {
+            "seguidores": len(self._followers),
+            "registros_enviados": self.records_sent,
+            "bytes_enviados": self.bytes_sent,
+            "snapshots_enviados": self.snapshots_sent,
+            "seguidores_descartados": self.followers_dropped,
+            "jogos_nao_replicaveis": self.unreplicable
+        }
+
+
+class ReplicationFollower:
+    """Aplica no GameManager local o log recebido do primário"""
+
+    def __init__(self, manager: GameManager, retry_interval: float = DEFAULT_RETRY_INTERVAL,
+                 clock=time.time):
+        self.manager = manager
+        self.retry_interval = retry_interval
+        self.clock = clock
+        self.connected = False
+        self.promoted = False
+        self.applied = 0
+        self.snapshots_applied = 0
+        self.divergences = 0
+        self.reconnections = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self._applied_at: Deque[float] = deque(maxlen=RATE_WINDOW)
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self, address: str) -> asyncio.Task:
+        self._task = asyncio.create_task(self.run(address))
+        return self._task
+
+    async def run(self, address: str) -> None:
+        """Segue o primário, reconectando (e ressincronizando) quando a conexão cai"""
+        while not self.promoted:
+            try:
+                reader, writer = await _open_connection(address)
+            except OSError:
+                await asyncio.sleep(self.retry_interval)
+                continue
+            self.reconnections += 1
+            self.connected = True
+            self._clear()
+            try:
+                while True:
+                    self.apply(*await read_frame(reader))
+            except (asyncio.IncompleteReadError, ConnectionError):
+                pass
+            except ReplicationDivergence:
+                self.divergences += 1
+            finally:
+                self.connected = False
+                writer.close()
+
+    def promote(self) -> None:
+        """Deixa de seguir o primário; o estado em memória passa a ser o oficial"""
+        self.promoted = True
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self.connected = False
+
+    def _clear(self) -> None:
+        """Descarta os jogos locais antes do snapshot completo de uma nova conexão"""
+        for game_id in list(self.manager.games):
+            self.manager.exportar_jogo(game_id, remover=True)
+
+    def _install(self, body: bytes) -> None:
+        game = decode_game(body)
+        if game.id in self.manager.games:
+            self.manager.exportar_jogo(game.id, remover=True)
+        if game.status == GameStatus.IN_PROGRESS:
+            self.manager.importar_jogo(body)
+        else:
+            # Encerrado no primário: só fica para consulta
+            self.manager.games[game.id] = game
+            self.manager.next_game_id = max(self.manager.next_game_id, game.id + 1)
+        self.snapshots_applied += 1
+
+    def apply(self, kind: int, game_id: int, version: int, committed_at: float, body: bytes) -> None:
+        """Aplica um registro; ReplicationDivergence se a versão resultante não bater"""
+        manager = self.manager
+        try:
+            if kind == KIND_SNAPSHOT:
+                self._install(body)
+            elif kind == KIND_PLAY:
+                player_id, card_id, color = PLAY_BODY.unpack(body)
+                hand = manager.games[game_id].players[player_id].hand
+                index = next(i for i, card in enumerate(hand) if card.id == card_id)
+                manager.resolver_jogada(game_id, player_id, index, None if color == NO_COLOR else _COLORS[color])
+            elif kind == KIND_PASS:
+                player_id, timed_out = PASS_BODY.unpack(body)
+                manager.resolver_passagem(
+                    game_id, player_id,
+                    GameEventType.TURN_TIMED_OUT if timed_out else GameEventType.TURN_PASSED
+                )
+            elif kind == KIND_ABANDONED:
+                manager.encerrar_jogo(game_id, body.decode("utf-8"))
+            elif kind == KIND_REMOVED:
+                manager.exportar_jogo(game_id, remover=True)
+            # KIND_FINISHED: o fim já foi produzido pela jogada reexecutada
+        except (KeyError, IndexError, StopIteration, ValueError) as e:
+            raise ReplicationDivergence(f"Registro do jogo {game_id} não aplicável: {e}") from e
+
+        game = manager.games.get(game_id)
+        if kind in (KIND_ABANDONED, KIND_REMOVED):
+            if game is not None:
+                raise ReplicationDivergence(f"Jogo {game_id} deveria ter saído")
+        elif game is None or game.version < version or \
+                (game.version > version and not (kind == KIND_PLAY and game.status == GameStatus.FINISHED)):
+            # Uma jogada vencedora produz também o GAME_FINISHED (versão + 1), que chega em seguida
+            raise ReplicationDivergence(f"Jogo {game_id} na versão {game and game.version}, esperada {version}")
+
+        now = self.clock()
+        self.applied += 1
+        self._applied_at.append(now)
+        self.last_lag = max(0.0, now - committed_at)
+        self.max_lag = max(self.max_lag, self.last_lag)
+
+    def apply_rate(self) -> float:
+        """Registros aplicados por segundo, nos últimos RATE_WINDOW registros"""
+        if len(self._applied_at) < 2:
+            return 0.0
+        elapsed = self._applied_at[-1] - self._applied_at[0]
+        return (len(self._applied_at) - 1) / elapsed if elapsed > 0 else 0.0
+
+    def get_metrics(self) -> Dict:
+        return {
+            "conectado": self.connected,
+            "promovido": self.promoted,
+            "registros_aplicados": self.applied,
+            "snapshots_aplicados": self.snapshots_applied,
+            "taxa_aplicacao": round(self.apply_rate(), 1),
+            "atraso_ms": round(self.last_lag * 1000, 3),
+            "atraso_max_ms": round(self.max_lag * 1000, 3),
+            "divergencias": self.divergences,
+            "conexoes": self.reconnections
+        }
@@ -0,0 +1,256 @@
+"""
+Motor de regras do UNO.
+
+Um `Ruleset` (conjunto de regras da casa) é compilado uma única vez em um
+`RulesEngine` com tabelas planas:
+- legalidade: bytearray indexado por (face da carta, face do topo, cor atual);
+- acúmulo (+2/+4): bytearray indexado por (face da carta, face do topo);
+- efeitos: tupla de handlers indexada pela face da carta.
+
+Por jogada o custo é só uma consulta de tabela, independente das variantes
+ativas. Engines compilados ficam em cache por Ruleset.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
+
+from models import Card, CardColor, CardType, EffectCode, EffectOutcome, GameState, PlayDirection
+from card_catalog import CARD_FACES, FACE_CODES, PLAYABLE_COLORS
+
+
+@dataclass(frozen=True)
+class Ruleset:
+    """Variantes de regra da casa; o padrão é o UNO oficial"""
+    stacking: bool = False             # +2/+4 podem ser acumulados em vez de comprados
+    seven_zero: bool = False           # 7 troca de mão com outro jogador, 0 gira todas as mãos
+    jump_in: bool = False              # carta idêntica ao topo pode ser jogada fora da vez
+    draw_until_playable: bool = False  # ao passar, compra até sair uma carta jogável
+
+
+STANDARD = Ruleset()
+
+RULE_NAMES = ("stacking", "seven_zero", "jump_in", "draw_until_playable")
+
+
+def parse_ruleset(names: Optional[str]) -> Ruleset:
+    """Converte uma lista separada por vírgulas (ex.: "stacking,jump_in") em Ruleset"""
+    if not names:
+        return STANDARD
+    flags = {}
+    for name in names.split(","):
+        name = name.strip().lower()
+        if not name or name == "standard":
+            continue
+        if name not in RULE_NAMES:
+            raise ValueError(f"Regra desconhecida: {name}")
+        flags[name] = True
+    return Ruleset(**flags)
+
+
+def standard_can_play(card: Card, top_card: Card, current_color: Optional[CardColor] = None) -> bool:
+    """
+    Regra oficial de legalidade (referência usada para compilar as tabelas
+    e para cartas fora do catálogo)
+    """
+    if card.type in (CardType.WILD, CardType.WILD_DRAW_FOUR):
+        return True
+
+    effective_top_color = current_color if current_color else top_card.color
+
+    if effective_top_color == CardColor.WILD:
+        return False
+
+    if card.color == effective_top_color:
+        return True
+
+    if card.type == top_card.type:
+        if card.type == CardType.NUMBER:
+            return card.value == top_card.value
+        return True
+
+    return False
+
+
+def _can_stack(card_type: CardType, top_type: CardType) -> bool:
+    """+2 acumula sobre +2; +4 acumula sobre +2 ou +4"""
+    if card_type == CardType.DRAW_TWO:
+        return top_type == CardType.DRAW_TWO
+    if card_type == CardType.WILD_DRAW_FOUR:
+        return top_type in (CardType.DRAW_TWO, CardType.WILD_DRAW_FOUR)
+    return False
+
+
+# Índice da cor atual nas tabelas: 0-3 cores jogáveis, 4 = sem cor definida, 5 = WILD
+_COLOR_SLOTS: Dict[Optional[CardColor], int] = {color: i for i, color in enumerate(PLAYABLE_COLORS)}
+_COLOR_SLOTS[None] = 4
+_COLOR_SLOTS[CardColor.WILD] = 5
+_COLOR_SLOT_VALUES: Tuple[Optional[CardColor], ...] = PLAYABLE_COLORS + (None, CardColor.WILD)
+_N_FACES = len(CARD_FACES)
+
+
+def color_slot(color: Optional[CardColor]) -> int:
+    """Índice da cor atual nas tabelas (0-3 = PLAYABLE_COLORS, 4 = sem cor, 5 = WILD)"""
+    return _COLOR_SLOTS[color]
+
+
+_N_SLOTS = len(_COLOR_SLOT_VALUES)
+
+
+@lru_cache(maxsize=1)
+def _legality_table() -> bytes:
+    """Tabela de legalidade padrão (igual para todas as variantes)"""
+    samples = [Card(id=code, color=c, type=t, value=v) for code, (c, t, v) in enumerate(CARD_FACES)]
+    table = bytearray(_N_FACES * _N_FACES * _N_SLOTS)
+    for card_code, card in enumerate(samples):
+        for top_code, top_card in enumerate(samples):
+            base = (card_code * _N_FACES + top_code) * _N_SLOTS
+            for slot, color in enumerate(_COLOR_SLOT_VALUES):
+                table[base + slot] = standard_can_play(card, top_card, color)
+    return bytes(table)
+
+
+# Handlers de efeito: (jogo, jogador, carta, cor escolhida, alvo) -> EffectOutcome
+EffectHandler = Callable[[GameState, int, Card, Optional[CardColor], Optional[int]], EffectOutcome]
+
+
+def _no_effect(game, player_id, card, chosen_color, target_player):
+    return EffectOutcome(EffectCode.NONE, game.current_player_index)
+
+def _skip(game, player_id, card, chosen_color, target_player):
+    return game.resolve_skip_effect()
+
+def _reverse(game, player_id, card, chosen_color, target_player):
+    return game.resolve_reverse_effect()
+
+def _draw_two(game, player_id, card, chosen_color, target_player):
+    return game.resolve_draw_two_effect()
+
+def _wild(game, player_id, card, chosen_color, target_player):
+    return game.resolve_wild_effect(chosen_color)
+
+def _wild_draw_four(game, player_id, card, chosen_color, target_player):
+    return game.resolve_wild_draw_four_effect(chosen_color)
+
+def _stack_draw_two(game, player_id, card, chosen_color, target_player):
+    game.pending_draw += 2
+    return EffectOutcome(
+        EffectCode.DRAW_TWO,
+        game.current_player_index,
+        target_player=game.peek_next_player(),
+        pending_draw=game.pending_draw
+    )
+
+def _stack_wild_draw_four(game, player_id, card, chosen_color, target_player):
+    game.pending_draw += 4
+    if chosen_color:
+        game.set_current_color(chosen_color)
+    return EffectOutcome(
+        EffectCode.WILD_DRAW_FOUR,
+        game.current_player_index,
+        target_player=game.peek_next_player(),
+        new_color=chosen_color,
+        pending_draw=game.pending_draw
+    )
+
+def _swap_hands(game, player_id, card, chosen_color, target_player):
+    """7: troca de mão com o alvo (padrão: próximo jogador)"""
+    if not game.players[player_id].hand:
+        return _no_effect(game, player_id, card, chosen_color, target_player)  # última carta: vence, sem troca
+    if target_player is None or target_player == player_id:
+        target_player = game.peek_next_player()
+    players = game.players
+    players[player_id].hand, players[target_player].hand = players[target_player].hand, players[player_id].hand
+    return EffectOutcome(EffectCode.SWAP_HANDS, game.current_player_index, target_player=target_player)
+
+def _rotate_hands(game, player_id, card, chosen_color, target_player):
+    """0: cada mão passa para o próximo jogador no sentido do jogo"""
+    if not game.players[player_id].hand:
+        return _no_effect(game, player_id, card, chosen_color, target_player)  # última carta: vence, sem rodízio
+    hands = [player.hand for player in game.players]
+    shift = 1 if game.play_direction == PlayDirection.CLOCKWISE else -1
+    count = len(hands)
+    for index, player in enumerate(game.players):
+        player.hand = hands[(index - shift) % count]
+    return EffectOutcome(EffectCode.ROTATE_HANDS, game.current_player_index)
+
+
+class RulesEngine:
+    """Conjunto de regras compilado em tabelas de consulta"""
+    __slots__ = ("ruleset", "effects", "effects_by_type", "_legal", "_stack")
+
+    def __init__(self, ruleset: Ruleset):
+        self.ruleset = ruleset
+        self._legal = _legality_table()
+
+        self.effects_by_type: Dict[CardType, EffectHandler] = {
+            CardType.NUMBER: _no_effect,
+            CardType.SKIP: _skip,
+            CardType.REVERSE: _reverse,
+            CardType.DRAW_TWO: _stack_draw_two if ruleset.stacking else _draw_two,
+            CardType.WILD: _wild,
+            CardType.WILD_DRAW_FOUR: _stack_wild_draw_four if ruleset.stacking else _wild_draw_four,
+        }
+
+        effects = []
+        for _, card_type, value in CARD_FACES:
+            handler = self.effects_by_type[card_type]
+            if ruleset.seven_zero and card_type == CardType.NUMBER:
+                if value == 7:
+                    handler = _swap_hands
+                elif value == 0:
+                    handler = _rotate_hands
+            effects.append(handler)
+        self.effects: Tuple[EffectHandler, ...] = tuple(effects)
+
+        stack = bytearray(_N_FACES * _N_FACES)
+        if ruleset.stacking:
+            for card_code, (_, card_type, _) in enumerate(CARD_FACES):
+                for top_code, (_, top_type, _) in enumerate(CARD_FACES):
+                    stack[card_code * _N_FACES + top_code] = _can_stack(card_type, top_type)
+        self._stack = bytes(stack)
+
+    def can_play(self, card: Card, top_card: Card, current_color: Optional[CardColor] = None,
+                 pending_draw: int = 0) -> bool:
+        """Legalidade da jogada; com compra acumulada pendente só vale acumular"""
+        card_code = FACE_CODES.get((card.color, card.type, card.value))
+        top_code = FACE_CODES.get((top_card.color, top_card.type, top_card.value))
+        if pending_draw:
+            if card_code is None or top_code is None:
+                return _can_stack(card.type, top_card.type) and self.ruleset.stacking
+            return bool(self._stack[card_code * _N_FACES + top_code])
+        slot = _COLOR_SLOTS.get(current_color)
+        if card_code is None or top_code is None or slot is None:
+            return standard_can_play(card, top_card, current_color)
+        return bool(self._legal[(card_code * _N_FACES + top_code) * _N_SLOTS + slot])
+
+    def can_play_code(self, card_code: int, top_code: int, color_slot: int, pending_draw: int = 0) -> bool:
+        """Legalidade por códigos de face e slot de cor (simulações, sem objetos Card)"""
+        if pending_draw:
+            return bool(self._stack[card_code * _N_FACES + top_code])
+        return bool(self._legal[(card_code * _N_FACES + top_code) * _N_SLOTS + color_slot])
+
+    def can_jump_in(self, card: Card, top_card: Card, pending_draw: int = 0) -> bool:
+        """Jump-in: só com carta idêntica (mesma cor e valor/tipo) e sem compra pendente"""
+        if not self.ruleset.jump_in or pending_draw:
+            return False
+        if card.type in (CardType.WILD, CardType.WILD_DRAW_FOUR):
+            return False
+        return (card.color, card.type, card.value) == (top_card.color, top_card.type, top_card.value)
+
+    def resolve(self, game: GameState, player_id: int, card: Card,
+                chosen_color: Optional[CardColor] = None, target_player: Optional[int] = None) -> EffectOutcome:
+        """Executa o efeito da carta consultando a tabela de despacho"""
+        code = FACE_CODES.get((card.color, card.type, card.value))
+        handler = self.effects[code] if code is not None else self.effects_by_type.get(card.type, _no_effect)
+        return handler(game, player_id, card, chosen_color, target_player)
+
+
+@lru_cache(maxsize=None)
+def compile_ruleset(ruleset: Ruleset = STANDARD) -> RulesEngine:
+    """Compila (uma vez por Ruleset) as tabelas do motor de regras"""
+    return RulesEngine(ruleset)
+
+
+def can_play_card(card: Card, top_card: Card, current_color: Optional[CardColor] = None) -> bool:
+    """Legalidade pela regra padrão, usando a tabela compilada"""
+    return compile_ruleset(STANDARD).can_play(card, top_card, current_color)
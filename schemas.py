@@ -0,0 +1,77 @@
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel
+
+from models import GameStatus
+from lobby import LobbyTicket, TicketStatus
+
+# Schemas pydantic usados apenas na borda da API (main.py).
+# O motor do jogo trabalha com as dataclasses de models.py; os corpos das
+# respostas são montados em serialization.py (JSON/MessagePack).
+
+class NovoJogoResponse(BaseModel):
+    message: str
+    game_id: int
+    quantidade_jogadores: int
+
+class JogadorDaVezResponse(BaseModel):
+    game_id: int
+    current_player: int
+    version: Optional[int] = None
+
+class CartasJogadorResponse(BaseModel):
+    game_id: int
+    player_id: int
+    cards: List[str]
+    card_count: int
+    version: Optional[int] = None
+
+class JogadaResponse(BaseModel):
+    message: str
+    played_card: str
+    effect: Dict[str, Any]
+    next_player: Optional[int] = None
+    winner: Optional[int] = None
+    game_finished: Optional[bool] = None
+
+class PassarVezResponse(BaseModel):
+    message: str
+    card_bought: str
+    next_player: int
+
+class PlayerDebugSchema(BaseModel):
+    player_id: int
+    card_count: int
+    cards: List[str]
+
+class GameStateDebugResponse(BaseModel):
+    game_id: int
+    status: GameStatus
+    current_player: int
+    top_discard_card: Optional[str] = None
+    deck_size: int
+    discard_pile_size: int
+    player_count: int
+    players: List[PlayerDebugSchema]
+    winner: Optional[int] = None
+
+class LobbyTicketResponse(BaseModel):
+    ticket_id: int
+    status: TicketStatus
+    table_size: int
+    skill_bucket: Optional[int] = None
+    game_id: Optional[int] = None
+    player_id: Optional[int] = None
+    wait_time: Optional[float] = None
+
+
+def ticket_to_schema(ticket: LobbyTicket) -> LobbyTicketResponse:
+    """Converte um ticket do lobby para o schema da API"""
+    return LobbyTicketResponse(
+        ticket_id=ticket.id,
+        status=ticket.status,
+        table_size=ticket.table_size,
+        skill_bucket=ticket.skill_bucket,
+        game_id=ticket.game_id,
+        player_id=ticket.player_id,
+        wait_time=ticket.wait_time
+    )
@@ -0,0 +1,133 @@
+import json
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from models import Card, GameState
+from card_catalog import card_code_or_name
+
+# orjson e msgpack são opcionais: sem eles caímos para o json da stdlib
+# e o formato binário simplesmente não é oferecido na negociação.
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - depende do ambiente
+    msgpack = None
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+_MSGPACK_ALIASES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack", "application/vnd.msgpack")
+
+
+def dumps_json(payload: Any) -> bytes:
+    """Serializa para JSON usando orjson quando disponível"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_msgpack(payload: Any) -> bytes:
+    """Serializa para MessagePack (requer o pacote msgpack)"""
+    if msgpack is None:
+        raise RuntimeError("msgpack não está instalado")
+    return msgpack.packb(payload, use_bin_type=True)
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """
+    Escolhe o formato da resposta a partir do cabeçalho Accept.
+    MessagePack só é escolhido se foi pedido explicitamente e está disponível.
+    """
+    if accept and msgpack is not None:
+        for media_range in accept.split(","):
+            if media_range.split(";", 1)[0].strip().lower() in _MSGPACK_ALIASES:
+                return MSGPACK_MEDIA_TYPE
+    return JSON_MEDIA_TYPE
+
+
+def encode_cards(cards: Sequence[Card], compact: bool) -> list:
+    """Nomes das cartas (JSON) ou códigos inteiros do catálogo (formato compacto)"""
+    if compact:
+        return [card_code_or_name(card) for card in cards]
+    return [str(card) for card in cards]
+
+
+def hand_payload(game_id: int, player_id: int, hand: Sequence[Card], compact: bool = False,
+                 version: Optional[int] = None) -> Dict[str, Any]:
+    """Resposta da rota de cartas do jogador (`version`: versão do estado lido)"""
+    payload = {
+        "game_id": game_id,
+        "player_id": player_id,
+        "cards": encode_cards(hand, compact),
+        "card_count": len(hand)
+    }
+    if version is not None:
+        payload["version"] = version
+    return payload
+
+
+def game_state_payload(game_state: GameState, compact: bool = False,
+                       offset: int = 0, limit: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Resposta da rota de debug com o estado do jogo.
+    Só os jogadores da página [offset, offset + limit) são serializados
+    (mesas grandes do modo festa não são enviadas inteiras).
+    """
+    end = len(game_state.players) if limit is None else offset + limit
+    top_card = game_state.get_top_discard_card()
+    if top_card is None:
+        top = None
+    else:
+        top = card_code_or_name(top_card) if compact else str(top_card)
+    return {
+        "game_id": game_state.id,
+        "status": game_state.status.value,
+        "current_player": game_state.current_player_index,
+        "top_discard_card": top,
+        "deck_size": len(game_state.deck),
+        "discard_pile_size": len(game_state.discard_pile),
+        "player_count": len(game_state.players),
+        "players": [
+            {
+                "player_id": player.id,
+                "card_count": len(player.hand),
+                "cards": encode_cards(player.hand, compact)
+            }
+            for player in game_state.players[offset:end]
+        ],
+        "winner": game_state.winner
+    }
+
+
+def spectator_payload(game_state: GameState) -> Dict[str, Any]:
+    """
+    Visão pública do jogo para espectadores: só o tamanho das mãos, nunca as cartas
+    """
+    top_card = game_state.get_top_discard_card()
+    return {
+        "game_id": game_state.id,
+        "version": game_state.version,
+        "status": game_state.status.value,
+        "current_player": game_state.current_player_index,
+        "direction": game_state.play_direction.value,
+        "current_color": game_state.current_color.value if game_state.current_color else None,
+        "top_discard_card": str(top_card) if top_card else None,
+        "pending_draw": game_state.pending_draw,
+        "deck_size": len(game_state.deck),
+        "hand_sizes": [len(player.hand) for player in game_state.players],
+        "winner": game_state.winner
+    }
+
+
+def render(payload_builder, accept: Optional[str]) -> Tuple[bytes, str]:
+    """
+    Monta e serializa a resposta no formato negociado.
+    `payload_builder(compact)` recebe True quando o formato é binário,
+    para que as cartas sejam enviadas como códigos inteiros.
+    """
+    media_type = negotiate(accept)
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return dumps_msgpack(payload_builder(True)), media_type
+    return dumps_json(payload_builder(False)), media_type
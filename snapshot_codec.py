@@ -0,0 +1,223 @@
+"""
+Codec binário compacto e versionado do GameState.
+
+Serve para mover um jogo em andamento entre processos (rebalanceamento,
+esvaziar um nó) e para arquivá-lo, sem serializar objetos Card nem as
+strategies de efeito. Uma partida de 2 jogadores ocupa cerca de 150 bytes.
+
+Formato (little-endian):
+    cabeçalho fixo   HEADER (magic, versão do formato, flags e estado escalar)
+    semente          q, só com a flag SEEDED (jogo criado com semente)
+    monte            ids das cartas, do fundo para o topo
+    descarte         ids das cartas, da base para o topo
+    jogadores        por assento: tamanho da mão (H), conta (H + UTF-8,
+                     0xFFFF = anônimo) e os ids das cartas da mão
+
+As quantidades do monte e do descarte estão no cabeçalho. Cada id ocupa
+1 byte; com mais de um baralho (ids acima de 255) a flag IDS_U16 indica 2
+bytes. A semente do monte (Deck.seed) e a contagem de reembaralhamentos
+bastam para que o jogo restaurado embaralhe o descarte como o original.
+O id determina a face da carta: CardFacade.create_uno_deck numera
+as cartas na ordem de CardFacade.deck_faces(), baralho após baralho. Por
+isso cartas criadas fora do baralho padrão não podem ser codificadas.
+
+Na decodificação, o mesmo objeto Card é usado para um id em todos os jogos
+(cartas não mudam depois de criadas). Decodificar um jogo é só indexar uma
+lista, sem construir 108 objetos por baralho.
+"""
+import struct
+from typing import List, NamedTuple, Sequence
+
+from card_facade import CardFacade
+from deck import Deck
+from models import Card, CardColor, GameState, GameStatus, Player, PlayDirection
+from rules import RULE_NAMES, Ruleset, compile_ruleset
+
+SNAPSHOT_MEDIA_TYPE = "application/vnd.uno.snapshot"
+MAGIC = b"US"
+FORMAT_VERSION = 1
+IDS_U16 = 0x01
+SEEDED = 0x02
+NO_COLOR = 0xFF
+NO_WINNER = -1
+ANONYMOUS = 0xFFFF
+
+# magic, versão, flags, id do jogo, versão do estado, status, vencedor, jogador da vez,
+# direção, cor atual, compra pendente, regras, reembaralhamentos, jogadores, monte, descarte
+HEADER = struct.Struct("<2sBBqIBhHBBHBIHHH")
+_U16 = struct.Struct("<H")
+_SEED = struct.Struct("<q")
+
+_STATUSES = tuple(GameStatus)
+_DIRECTIONS = tuple(PlayDirection)
+_COLORS = tuple(CardColor)
+_STATUS_CODES = {status: code for code, status in enumerate(_STATUSES)}
+_DIRECTION_CODES = {direction: code for code, direction in enumerate(_DIRECTIONS)}
+_COLOR_CODES = {color: code for code, color in enumerate(_COLORS)}
+
+
+class SnapshotFormatError(ValueError):
+    """Bytes que não formam um snapshot válido desta versão do formato"""
+
+
+_CARDS: List[Card] = []  # carta decodificada de cada id, compartilhada entre os jogos
+
+
+def _card_ids(cards: Sequence[Card]) -> List[int]:
+    faces = CardFacade.deck_template()
+    size = len(faces)
+    ids = []
+    for card in cards:
+        # O id precisa reproduzir a face da carta na decodificação (enums comparados por identidade)
+        card_id = card.id
+        face = faces[card_id % size]
+        if card_id < 0 or face[1] is not card.type or face[0] is not card.color or face[2] != card.value:
+            raise ValueError(f"Carta {card} (id {card_id}) não pertence ao baralho padrão")
+        ids.append(card_id)
+    return ids
+
+
+def _pack_ids(ids: List[int], wide: bool) -> bytes:
+    return struct.pack(f"<{len(ids)}H", *ids) if wide else bytes(ids)
+
+
+def _cards(count: int) -> List[Card]:
+    """Cartas dos ids 0..count-1, criadas na primeira vez que aparecem"""
+    if len(_CARDS) < count:
+        faces = CardFacade.deck_template()
+        for card_id in range(len(_CARDS), count):
+            _CARDS.append(Card(card_id, *faces[card_id % len(faces)]))
+    return _CARDS
+
+
+def _unpack_cards(data: bytes, offset: int, count: int, wide: bool) -> List[Card]:
+    size = 2 if wide else 1
+    end = offset + count * size
+    if end > len(data):
+        raise SnapshotFormatError("Snapshot truncado")
+    ids = struct.unpack_from(f"<{count}H", data, offset) if wide else data[offset:end]
+    if not ids:
+        return []
+    cards = _cards(max(ids) + 1)
+    return [cards[card_id] for card_id in ids]
+
+
+class SnapshotInfo(NamedTuple):
+    game_id: int
+    version: int
+    player_count: int
+
+
+def peek_snapshot(data: bytes) -> SnapshotInfo:
+    """Id, versão e número de jogadores, lidos só do cabeçalho (sem decodificar as cartas)"""
+    if len(data) < HEADER.size or data[:2] != MAGIC:
+        raise SnapshotFormatError("Não é um snapshot de jogo")
+    fields = HEADER.unpack_from(data)
+    return SnapshotInfo(fields[3], fields[4], fields[13])
+
+
+def encode_game(game: GameState) -> bytes:
+    """Serializa o jogo (ValueError se houver cartas fora do baralho padrão)"""
+    deck_ids = _card_ids(game.deck)
+    discard_ids = _card_ids(game.discard_pile)
+    hands = [_card_ids(player.hand) for player in game.players]
+    wide = max(max(deck_ids, default=0), max(discard_ids, default=0),
+               max((max(hand, default=0) for hand in hands), default=0)) > 0xFF
+    ruleset = game.rules.ruleset
+    seed = game.deck.seed
+    parts = [HEADER.pack(
+        MAGIC, FORMAT_VERSION, (IDS_U16 if wide else 0) | (SEEDED if seed is not None else 0),
+        game.id, game.version, _STATUS_CODES[game.status],
+        NO_WINNER if game.winner is None else game.winner,
+        game.current_player_index, _DIRECTION_CODES[game.play_direction],
+        NO_COLOR if game.current_color is None else _COLOR_CODES[game.current_color],
+        game.pending_draw,
+        sum(1 << bit for bit, name in enumerate(RULE_NAMES) if getattr(ruleset, name)),
+        game.deck.reshuffles, len(game.players), len(deck_ids), len(discard_ids)
+    )]
+    if seed is not None:
+        parts.append(_SEED.pack(seed))
+    parts += [_pack_ids(deck_ids, wide), _pack_ids(discard_ids, wide)]
+    for player, hand in zip(game.players, hands):
+        parts.append(_U16.pack(len(hand)))
+        if player.account_id is None:
+            parts.append(_U16.pack(ANONYMOUS))
+        else:
+            account = player.account_id.encode("utf-8")
+            if len(account) >= ANONYMOUS:
+                raise ValueError("Identificador de conta longo demais")
+            parts.append(_U16.pack(len(account)))
+            parts.append(account)
+        parts.append(_pack_ids(hand, wide))
+    return b"".join(parts)
+
+
+def decode_game(data: bytes) -> GameState:
+    """Reconstrói o jogo; SnapshotFormatError se os bytes forem inválidos"""
+    if len(data) < HEADER.size:
+        raise SnapshotFormatError("Snapshot truncado")
+    (magic, format_version, flags, game_id, version, status, winner, current_player, direction,
+     color, pending_draw, rule_bits, reshuffles, player_count, deck_count, discard_count) = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SnapshotFormatError("Não é um snapshot de jogo")
+    if format_version != FORMAT_VERSION:
+        raise SnapshotFormatError(f"Versão do formato não suportada: {format_version}")
+    try:
+        status = _STATUSES[status]
+        direction = _DIRECTIONS[direction]
+        color = None if color == NO_COLOR else _COLORS[color]
+    except IndexError:
+        raise SnapshotFormatError("Valor de enumeração inválido") from None
+    wide = bool(flags & IDS_U16)
+    size = 2 if wide else 1
+
+    offset = HEADER.size
+    seed = None
+    if flags & SEEDED:
+        if offset + _SEED.size > len(data):
+            raise SnapshotFormatError("Snapshot truncado")
+        seed, = _SEED.unpack_from(data, offset)
+        offset += _SEED.size
+    deck = _unpack_cards(data, offset, deck_count, wide)
+    offset += deck_count * size
+    discard_pile = _unpack_cards(data, offset, discard_count, wide)
+    offset += discard_count * size
+
+    players = []
+    for seat in range(player_count):
+        if offset + 4 > len(data):
+            raise SnapshotFormatError("Snapshot truncado")
+        hand_size, account_size = struct.unpack_from("<HH", data, offset)
+        offset += 4
+        account_id = None
+        if account_size != ANONYMOUS:
+            if offset + account_size > len(data):
+                raise SnapshotFormatError("Snapshot truncado")
+            try:
+                account_id = data[offset:offset + account_size].decode("utf-8")
+            except UnicodeDecodeError:
+                raise SnapshotFormatError("Identificador de conta inválido") from None
+            offset += account_size
+        players.append(Player(id=seat, hand=_unpack_cards(data, offset, hand_size, wide), account_id=account_id))
+        offset += hand_size * size
+    if offset != len(data):
+        raise SnapshotFormatError("Bytes sobrando no fim do snapshot")
+    if player_count and not 0 <= current_player < player_count:
+        raise SnapshotFormatError("Jogador da vez inválido")
+
+    game = GameState(
+        id=game_id,
+        players=players,
+        deck=Deck(deck, seed=seed),
+        discard_pile=discard_pile,
+        current_player_index=current_player,
+        status=status,
+        winner=None if winner == NO_WINNER else winner,
+        play_direction=direction,
+        current_color=color,
+        version=version,
+        pending_draw=pending_draw,
+        rules=compile_ruleset(Ruleset(**{name: bool(rule_bits >> bit & 1) for bit, name in enumerate(RULE_NAMES)}))
+    )
+    game.deck.reshuffles = reshuffles
+    return game
@@ -0,0 +1,143 @@
+"""
+Modo espectador: transmissão do estado público de um jogo por Server-Sent Events.
+
+Cada jogo assistido tem um canal. A visão pública (serialization.spectator_payload,
+só o tamanho das mãos) é serializada uma vez por versão do estado, já no
+formato de um evento SSE. O mesmo objeto bytes é entregue a todos os
+espectadores, então o custo de serialização não cresce com a audiência.
+
+Não há fila por espectador: cada um guarda só a última versão que enviou e,
+quando consegue escrever de novo, recebe a versão mais recente. Um
+espectador lento pula as versões intermediárias em vez de acumulá-las na
+memória. O estado final (jogo encerrado ou abandonado) é sempre entregue
+antes de o fluxo terminar. Se o jogo for migrado para outro processo
+(GAME_EXPORTED), o fluxo termina e o cliente se reconecta ao novo nó.
+"""
+import asyncio
+from typing import AsyncIterator, Dict, Optional
+
+from models import GameState, GameStatus
+from observer_pattern import Observer, GameEvent, GameEventType
+from serialization import dumps_json, spectator_payload
+
+SSE_MEDIA_TYPE = "text/event-stream"
+KEEPALIVE_INTERVAL = 15.0  # intervalo (segundos) dos comentários que mantêm os proxies abertos
+KEEPALIVE_FRAME = b": ping\n\n"
+
+_FINAL_STATUSES = (GameStatus.FINISHED, GameStatus.ABANDONED)
+
+
+def sse_frame(version: int, payload: dict) -> bytes:
+    """Evento SSE `estado` com a versão como id (o cliente pode retomar com Last-Event-ID)"""
+    return b"id: %d\nevent: estado\ndata: %s\n\n" % (version, dumps_json(payload))
+
+
+class _Channel:
+    """Estado público de um jogo e o sinal de mudança compartilhado pelos espectadores"""
+    __slots__ = ("game", "subscribers", "changed", "frame", "frame_version", "moved")
+
+    def __init__(self, game: GameState):
+        self.game = game
+        self.subscribers = 0
+        self.changed = asyncio.Event()
+        self.frame: Optional[bytes] = None
+        self.frame_version = -1
+        self.moved = False
+
+    def notify(self) -> None:
+        # Acorda quem espera e arma um novo sinal para a próxima versão
+        changed, self.changed = self.changed, asyncio.Event()
+        changed.set()
+
+
+class SpectatorHub(Observer):
+    """Canais de espectadores por jogo, alimentados pelos eventos do GameManager"""
+
+    def __init__(self, manager):
+        self.manager = manager
+        self._channels: Dict[int, _Channel] = {}
+        self.frames_built = 0
+        self.frames_sent = 0
+        self.versions_skipped = 0
+
+    def update(self, game_state: GameState):
+        pass
+
+    def on_event(self, event: GameEvent):
+        channel = self._channels.get(event.game_id)
+        if channel is not None:
+            if event.game_state is not None:
+                channel.game = event.game_state
+            channel.moved = event.type == GameEventType.GAME_EXPORTED
+            channel.notify()
+
+    def _frame(self, channel: _Channel) -> bytes:
+        """Evento da versão atual, serializado só na primeira vez que alguém o pede"""
+        game = channel.game
+        if channel.frame_version != game.version:
+            channel.frame = sse_frame(game.version, spectator_payload(game))
+            channel.frame_version = game.version
+            self.frames_built += 1
+        return channel.frame
+
+    def _open(self, game_id: int, game: GameState) -> _Channel:
+        channel = self._channels.get(game_id)
+        if channel is None:
+            channel = self._channels[game_id] = _Channel(game)
+        channel.subscribers += 1
+        return channel
+
+    def _close(self, game_id: int, channel: _Channel) -> None:
+        channel.subscribers -= 1
+        if not channel.subscribers and self._channels.get(game_id) is channel:
+            del self._channels[game_id]
+
+    def subscribe(self, game_id: int) -> AsyncIterator[bytes]:
+        """Fluxo de eventos SSE do jogo (ValueError se o jogo não existe)"""
+        game = self.manager.get_game_state(game_id)
+        if game is None:
+            raise ValueError("Jogo não encontrado")
+        return self._stream(game_id, game)
+
+    async def _stream(self, game_id: int, game: GameState) -> AsyncIterator[bytes]:
+        # A assinatura começa com o fluxo: um gerador nunca iniciado não deixa canal aberto
+        channel = self._open(game_id, game)
+        sent = -1
+        try:
+            while not channel.moved:
+                game = channel.game
+                if game.version != sent:
+                    if sent >= 0:
+                        self.versions_skipped += game.version - sent - 1
+                    sent = game.version
+                    self.frames_sent += 1
+                    yield self._frame(channel)
+                    if game.status in _FINAL_STATUSES:
+                        return
+                    continue
+                await channel.changed.wait()
+                if channel.game.version == sent:
+                    yield KEEPALIVE_FRAME  # acordado por keepalive()
+        finally:
+            self._close(game_id, channel)
+
+    def keepalive(self) -> None:
+        """
+        Acorda todos os espectadores para um comentário SSE; chamado
+        periodicamente, no lugar de um temporizador por conexão
+        """
+        for channel in self._channels.values():
+            channel.notify()
+
+    def spectators(self, game_id: int) -> int:
+        channel = self._channels.get(game_id)
+        return channel.subscribers if channel else 0
+
+    def get_metrics(self) -> Dict:
+        return {
+            "jogos_assistidos": len(self._channels),
+            "espectadores": sum(channel.subscribers for channel in self._channels.values()),
+            "eventos_serializados": self.frames_built,
+            "eventos_enviados": self.frames_sent,
+            "versoes_puladas": self.versions_skipped
+        }
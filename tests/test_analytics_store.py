@@ -0,0 +1,127 @@
+import threading
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from analytics_store import (
+    AnalyticsObserver, AnalyticsStore, ColumnStore, GAME_COLUMNS, MOVE_PASS, MOVE_PLAY, N_EFFECTS
+)
+from card_catalog import face_code
+from game_manager import GameManager
+from models import Card, CardType, EffectCode
+
+def _batch(n, player_count, winners, reshuffles=0):
+    return {
+        "game_id": np.arange(n),
+        "status": np.zeros(n),
+        "player_count": np.full(n, player_count),
+        "winner": winners,
+        "deck_count": np.ones(n),
+        "plays": np.full(n, 10),
+        "passes": np.full(n, 5),
+        "timeouts": np.zeros(n),
+        "cards_drawn": np.full(n, 5),
+        "reshuffles": np.full(n, reshuffles),
+        "effects": np.tile(np.eye(N_EFFECTS, dtype=np.int32)[EffectCode.SKIP] * 10, (n, 1)),
+    }
+
+def test_queries_aggregate_columns(tmp_path):
+    """Testa as agregações sobre um lote de jogos."""
+    store = AnalyticsStore(str(tmp_path))
+    store.games.append_batch(_batch(4, 2, np.array([0, 0, 0, 1])))
+    store.games.append_batch(_batch(2, 3, np.array([2, 2]), reshuffles=1))
+
+    assert store.win_rate_by_seat() == pytest.approx([0.5, 1 / 6, 1.0])
+    assert store.win_rate_by_seat(player_count=2) == pytest.approx([0.75, 0.25])
+    assert store.average_game_length() == 15.0
+    assert store.effect_frequency()["SKIP"] == 1.0
+    assert store.deck_exhaustion_rate() == pytest.approx(2 / 6)
+
+def test_empty_store_summary(tmp_path):
+    """Testa as consultas sem nenhum jogo gravado."""
+    summary = AnalyticsStore(str(tmp_path)).summary()
+    assert summary["jogos_finalizados"] == 0
+    assert summary["vitorias_por_assento"] == []
+    assert summary["duracao_media"] is None
+
+def test_columns_survive_reopen_and_torn_write(tmp_path):
+    """Testa se os dados persistem e uma escrita incompleta é descartada ao reabrir."""
+    store = ColumnStore(str(tmp_path), GAME_COLUMNS)
+    store.append_batch(_batch(3, 2, np.array([0, 1, 0])))
+    with open(tmp_path / "game_id.col", "ab") as f:
+        f.write(b"\x01\x02\x03")  # linha parcial de uma escrita interrompida
+
+    reopened = ColumnStore(str(tmp_path), GAME_COLUMNS)
+    assert len(reopened) == 3
+    assert reopened.column("winner").tolist() == [0, 1, 0]
+    assert isinstance(reopened.column("winner"), np.memmap)
+
+def test_observer_records_finished_game_and_moves(tmp_path):
+    """Testa se o Observer grava o jogo finalizado e cada jogada."""
+    manager = GameManager()
+    store = AnalyticsStore(str(tmp_path), record_moves=True)
+    manager.attach(AnalyticsObserver(store))
+    game_id = manager.novo_jogo(quantidade_jogadores=2)
+    game = manager.games[game_id]
+
+    manager.passar_vez(game_id, 0)
+    top = game.get_top_discard_card()
+    last = Card(id=900, color=top.color, type=CardType.NUMBER, value=3)
+    game.players[1].hand = [last]
+    manager.jogar_carta(game_id, 1, 0)
+    assert len(store.games.column("winner")) == 0  # ainda pendente em memória
+    store.flush()
+
+    assert store.games.column("winner").tolist() == [1]
+    assert store.games.column("plays").tolist() == [1]
+    assert store.games.column("passes").tolist() == [1]
+    assert store.games.column("effects")[0, EffectCode.NONE] == 1
+    assert store.moves.column("kind").tolist() == [MOVE_PASS, MOVE_PLAY]
+    assert store.moves.column("face").tolist() == [-1, face_code(last)]
+    assert store.moves.column("seq").tolist() == [1, 2]
+
+def test_missing_column_keeps_rows_of_the_others(tmp_path):
+    """Testa se uma coluna sem arquivo não apaga as linhas das outras ao reabrir."""
+    store = ColumnStore(str(tmp_path), GAME_COLUMNS)
+    store.append_batch(_batch(3, 2, np.array([0, 1, 0])))
+    (tmp_path / "reshuffles.col").unlink()
+
+    reopened = ColumnStore(str(tmp_path), GAME_COLUMNS)
+    assert len(reopened) == 3
+    assert reopened.column("winner").tolist() == [0, 1, 0]
+    assert reopened.column("reshuffles").tolist() == [0, 0, 0]
+
+def test_append_hands_batches_to_writer_thread(tmp_path, monkeypatch):
+    """Testa se o lote cheio é gravado pela thread da tabela, não por quem anexa."""
+    import analytics_store
+    monkeypatch.setattr(analytics_store, "FLUSH_EVERY", 2)
+    store = ColumnStore(str(tmp_path), GAME_COLUMNS)
+    writers = []
+    write = store._write
+    monkeypatch.setattr(store, "_write", lambda *batch: (writers.append(threading.current_thread()), write(*batch)))
+    row = {name: 0 for name in GAME_COLUMNS}
+    row["effects"] = [0] * N_EFFECTS
+
+    store.append(**row)
+    store.append(**row)
+    store.join()
+
+    assert store.rows == 2
+    assert writers and threading.current_thread() not in writers
+    store.close()
+
+def test_observer_counts_imported_games(tmp_path):
+    """Testa se um jogo importado (migração, checkpoint) também vira linha ao terminar."""
+    source, target = GameManager(), GameManager()
+    store = AnalyticsStore(str(tmp_path))
+    target.attach(AnalyticsObserver(store))
+    game_id = source.novo_jogo(quantidade_jogadores=12, modo_festa=True)
+    target.importar_jogo(source.exportar_jogo(game_id, remover=True))
+
+    target.passar_vez(game_id, 0)
+    target.encerrar_jogo(game_id)
+    store.flush()
+
+    assert store.games.column("game_id").tolist() == [game_id]
+    assert store.games.column("deck_count").tolist() == [2]
+    assert store.games.column("passes").tolist() == [1]
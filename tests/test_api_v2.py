@@ -0,0 +1,64 @@
+from game_manager import GameManager
+from models import Card, CardColor, CardType, EffectCode, GameStatus, describe_effect
+from card_catalog import face_code
+from card_effects import SkipCardEffect
+from api_v2 import COLOR_CODES, play_delta, pass_delta
+
+def _give_card(game, player_id, card):
+    game.players[player_id].hand.insert(0, card)
+
+def test_play_delta_is_compact():
+    """Testa se o delta da jogada usa só códigos numéricos."""
+    manager = GameManager()
+    game_id = manager.novo_jogo(quantidade_jogadores=3)
+    game = manager.get_game_state(game_id)
+    top_card = game.get_top_discard_card()
+    skip = Card(id=500, color=top_card.color, type=CardType.SKIP, effect_strategy=SkipCardEffect())
+    _give_card(game, 0, skip)
+
+    game, played, outcome = manager.resolver_jogada(game_id, 0, 0)
+    delta = play_delta(game, 0, played, outcome)
+
+    assert delta["c"] == face_code(skip)
+    assert delta["e"] == EffectCode.SKIP
+    assert delta["col"] == COLOR_CODES[top_card.color]
+    assert delta["v"] == game.version
+    assert delta["n"] == game.current_player_index
+    assert "w" not in delta
+    assert all(not isinstance(value, str) for value in delta.values())
+
+def test_play_delta_marks_winner():
+    """Testa se o delta indica o vencedor quando o jogo termina."""
+    manager = GameManager()
+    game_id = manager.novo_jogo(quantidade_jogadores=2)
+    game = manager.get_game_state(game_id)
+    top_card = game.get_top_discard_card()
+    game.players[0].hand = [Card(id=99, color=top_card.color, type=CardType.NUMBER, value=1)]
+
+    game, played, outcome = manager.resolver_jogada(game_id, 0, 0)
+
+    assert game.status == GameStatus.FINISHED
+    assert play_delta(game, 0, played, outcome)["w"] == 0
+
+def test_pass_delta_reports_drawn_card_code():
+    """Testa se o delta da passagem traz o código da carta comprada."""
+    manager = GameManager()
+    game_id = manager.novo_jogo(quantidade_jogadores=2)
+
+    game, cards = manager.resolver_passagem(game_id, 0)
+    delta = pass_delta(game, 0, cards)
+
+    assert delta["k"] == [face_code(card) for card in cards]
+    assert delta["h"] == 6
+    assert delta["n"] == 1
+
+def test_describe_effect_keeps_v1_messages():
+    """Testa se a formatação sob demanda mantém as mensagens da v1."""
+    manager = GameManager()
+    game_id = manager.novo_jogo(quantidade_jogadores=2)
+    game = manager.get_game_state(game_id)
+
+    outcome = game.resolve_wild_effect(CardColor.RED)
+
+    assert describe_effect(outcome)["message"] == "Cor mudada para RED!"
+    assert describe_effect(outcome)["effect"] == "wild"
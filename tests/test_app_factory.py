@@ -0,0 +1,63 @@
+import time
+from fastapi.testclient import TestClient
+import main
+from rules import Ruleset, compile_ruleset
+
+def test_apps_have_independent_state():
+    """Testa se cada create_app cria os próprios jogos, sem singletons de módulo."""
+    first, second = TestClient(main.create_app({})), TestClient(main.create_app({}))
+
+    assert first.get("/novoJogo", params={"quantidadeJog": 2}).json()["game_id"] == 1
+    assert second.get("/jogo/1/jogador_da_vez").status_code == 404
+    assert second.get("/novoJogo", params={"quantidadeJog": 3}).json()["game_id"] == 1
+
+def test_settings_come_from_environ():
+    """Testa a configuração pelas variáveis passadas ao create_app."""
+    client = TestClient(main.create_app({"UNO_MAX_GAMES": "1"}))
+
+    assert client.get("/novoJogo", params={"quantidadeJog": 2}).status_code == 200
+    assert client.get("/novoJogo", params={"quantidadeJog": 2}).status_code == 503
+
+def test_module_app_is_created_on_first_access():
+    """Testa se main.app continua disponível (uvicorn main:app), criado uma vez."""
+    assert main.app is main.app
+    assert TestClient(main.app).get("/").status_code == 200
+
+def test_preload_compiles_every_ruleset():
+    """Testa se o preload deixa todas as variantes compiladas antes do gc.freeze."""
+    compile_ruleset.cache_clear()
+    main.preload()
+    assert compile_ruleset.cache_info().currsize == 16
+    compile_ruleset(Ruleset(stacking=True, jump_in=True))
+    assert compile_ruleset.cache_info().misses == 16
+
+def test_worker_settings_get_own_files(monkeypatch):
+    """Testa o sufixo por worker dos arquivos quando há mais de um worker."""
+    monkeypatch.setenv("UNO_CHECKPOINT_PATH", "/tmp/jogos.ckpt")
+    monkeypatch.delenv("UNO_ARCHIVE_PATH", raising=False)
+
+    assert main._worker_env(0, 1)["UNO_CHECKPOINT_PATH"] == "/tmp/jogos.ckpt"
+    env = main._worker_env(2, 4)
+    assert env["UNO_CHECKPOINT_PATH"] == "/tmp/jogos.ckpt.2"
+    assert "UNO_ARCHIVE_PATH" not in env
+
+def test_ratings_saved_periodically(tmp_path, monkeypatch):
+    """Testa se os ratings são gravados durante a execução, não só no desligamento."""
+    registries = []
+
+    class RecordingRegistry(main.PlayerRegistry):
+        def __init__(self, path=None):
+            super().__init__(path)
+            registries.append(self)
+
+    monkeypatch.setattr(main, "PlayerRegistry", RecordingRegistry)
+    path = tmp_path / "ratings.json"
+    app = main.create_app({"UNO_RATINGS_PATH": str(path), "UNO_RATINGS_SAVE_INTERVAL": "0.01"})
+    with TestClient(app):
+        registry = registries[0]
+        registry.set_rating("ana", 1600.0)
+        registry.changes += 1
+        deadline = time.monotonic() + 5
+        while not path.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert main.PlayerRegistry(str(path)).profile("ana")["rating"] == 1600.0
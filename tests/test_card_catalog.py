@@ -0,0 +1,23 @@
+from models import Card, CardColor, CardType
+from card_catalog import CARD_FACES, DISPLAY_NAMES, FACE_COPIES, POINT_VALUES, face_code, card_code_or_name
+from card_facade import CardFacade
+
+def test_catalog_covers_standard_deck():
+    """Testa se o catálogo tem 54 faces e 108 cópias no total."""
+    assert len(CARD_FACES) == 54
+    assert sum(FACE_COPIES) == 108
+
+def test_tables_match_facade():
+    """Testa se as tabelas pré-calculadas batem com a fachada para todo o baralho."""
+    for card in CardFacade.create_uno_deck():
+        code = face_code(card)
+        assert DISPLAY_NAMES[code] == str(card)
+        assert POINT_VALUES[code] == CardFacade.get_card_point_value(card)
+
+def test_card_outside_catalog_falls_back_to_name():
+    """Testa se uma face fora do catálogo é enviada pelo nome."""
+    card = Card(id=1, color=CardColor.RED, type=CardType.WILD)
+
+    assert face_code(card) is None
+    assert card_code_or_name(card) == "RED_WILD"
+    assert CardFacade.get_card_point_value(card) == 50
@@ -95,4 +95,11 @@ def test_wild_draw_four_effect_calls_game_method(mock_game):
     
     effect.apply_effect(mock_game, player_id=1, chosen_color=chosen_color)
     
-    mock_game.apply_wild_draw_four_effect.assert_called_once_with(chosen_color)
\ No newline at end of file
+    mock_game.apply_wild_draw_four_effect.assert_called_once_with(chosen_color)
+def test_base_strategy_does_not_treat_wild_as_always_playable():
+    """Testa se só as strategies de curinga liberam o curinga; a base compara cor e tipo."""
+    wild_card = Card(id=1, color=CardColor.WILD, type=CardType.WILD)
+    top_card = Card(id=2, color=CardColor.BLUE, type=CardType.NUMBER, value=9)
+
+    assert NumberCardEffect().can_play(wild_card, top_card) is False
+    assert WildCardEffect().can_play(wild_card, top_card) is True
@@ -25,4 +25,18 @@ def test_can_play_card_invalida():
     top_card = Card(id=1, color=CardColor.RED, type=CardType.NUMBER, value=5)
     card_to_play = Card(id=2, color=CardColor.BLUE, type=CardType.NUMBER, value=3)
     
-    assert CardFacade.can_play_card(card_to_play, top_card) == False
\ No newline at end of file
+    assert CardFacade.can_play_card(card_to_play, top_card) == False
+
+def test_create_uno_deck_varios_baralhos():
+    """Testa a união de baralhos com ids únicos."""
+    deck = CardFacade.create_uno_deck(num_decks=3)
+
+    assert len(deck) == 3 * 108
+    assert len({card.id for card in deck}) == len(deck)
+
+def test_create_uno_deck_reusa_modelo():
+    """Testa se cada jogo recebe cartas novas montadas a partir do mesmo modelo."""
+    first, second = CardFacade.create_uno_deck(), CardFacade.create_uno_deck()
+
+    assert [(c.color, c.type, c.value) for c in first] == CardFacade.deck_faces()
+    assert all(a is not b and a.effect_strategy is b.effect_strategy for a, b in zip(first, second))
@@ -0,0 +1,115 @@
+import asyncio
+import pytest
+from checkpoint import (
+    CheckpointFormatError, CheckpointReader, collect_entries, collect_entries_async, write_checkpoint
+)
+from game_manager import GameManager
+from models import Card, CardType, GameStatus
+from observer_pattern import GameEventType, Observer
+from rules import Ruleset
+from snapshot_codec import encode_game
+
+class EventRecorder(Observer):
+    def __init__(self):
+        self.types = []
+
+    def update(self, game_state):
+        pass
+
+    def on_event(self, event):
+        self.types.append(event.type)
+
+def _checkpointed_manager(tmp_path, games=20):
+    manager = GameManager()
+    ids = [manager.novo_jogo(2 + i % 4, Ruleset(stacking=i % 2 == 0)) for i in range(games)]
+    for game_id in ids[::3]:
+        manager.passar_vez(game_id, 0)
+    manager.encerrar_jogo(ids[-1])
+    path = str(tmp_path / "jogos.ckpt")
+    write_checkpoint(path, list(collect_entries(manager)), manager.next_game_id)
+    return manager, ids[:-1], path
+
+def test_restore_is_lazy_and_exact(tmp_path):
+    """Testa se os jogos só são decodificados quando tocados e voltam idênticos."""
+    original, ids, path = _checkpointed_manager(tmp_path)
+    restored = GameManager()
+    recorder = EventRecorder()
+    restored.attach(recorder)
+
+    assert restored.restaurar_checkpoint(CheckpointReader(path)) == len(ids)
+    assert restored.games == {}
+    assert restored.cold_games() == len(ids)
+
+    game = restored.get_game_state(ids[3])
+    assert encode_game(game) == encode_game(original.get_game_state(ids[3]))
+    assert list(restored.games) == [ids[3]]
+    assert recorder.types == [GameEventType.GAME_IMPORTED]
+
+    # Jogadas e leituras carregam o jogo na primeira vez
+    snapshot = restored.get_snapshot(ids[0])
+    restored.passar_vez(ids[0], snapshot.current_player)
+    assert restored.cold_games() == len(ids) - 2
+
+def test_restore_keeps_ids_unique(tmp_path):
+    """Testa se jogos novos, abandonados e importados respeitam os ids do checkpoint."""
+    original, ids, path = _checkpointed_manager(tmp_path)
+    restored = GameManager()
+    restored.restaurar_checkpoint(CheckpointReader(path))
+
+    assert restored.novo_jogo(2) == original.next_game_id
+    assert restored.get_game_state(max(ids) + 1) is None  # abandonado antes do checkpoint
+    with pytest.raises(ValueError):
+        restored.importar_jogo(encode_game(original.get_game_state(ids[5])))
+
+def test_next_checkpoint_copies_untouched_games(tmp_path):
+    """Testa se o checkpoint seguinte junta jogos ainda no arquivo e jogos já em memória."""
+    original, ids, path = _checkpointed_manager(tmp_path)
+    restored = GameManager()
+    restored.restaurar_checkpoint(CheckpointReader(path))
+    game = restored.get_game_state(ids[1])
+    restored.passar_vez(ids[1], game.current_player_index)
+
+    # Grava por cima do arquivo ainda mapeado
+    entries = asyncio.run(collect_entries_async(restored, chunk=4))
+    write_checkpoint(path, entries, restored.next_game_id)
+
+    again = GameManager()
+    again.restaurar_checkpoint(CheckpointReader(path))
+    assert again.cold_games() == len(ids)
+    assert encode_game(again.get_game_state(ids[1])) == encode_game(game)
+    assert encode_game(again.get_game_state(ids[2])) == encode_game(original.get_game_state(ids[2]))
+    assert again.get_game_state(ids[1]).status == GameStatus.IN_PROGRESS
+
+def test_invalid_files_are_rejected(tmp_path):
+    """Testa a recusa de arquivos truncados ou de outro formato."""
+    _, _, path = _checkpointed_manager(tmp_path, games=3)
+    data = open(path, "rb").read()
+    for name, bad in (("truncado", data[:-1]), ("magic", b"XX" + data[2:]), ("curto", data[:5])):
+        bad_path = tmp_path / name
+        bad_path.write_bytes(bad)
+        with pytest.raises(CheckpointFormatError):
+            CheckpointReader(str(bad_path))
+
+def test_game_finished_during_collection_is_not_checkpointed(tmp_path):
+    """Testa se um jogo do arquivo que termina durante a coleta não volta como em andamento."""
+    _, ids, path = _checkpointed_manager(tmp_path)
+    restored = GameManager()
+    restored.restaurar_checkpoint(CheckpointReader(path))
+
+    async def scenario():
+        collecting = asyncio.create_task(collect_entries_async(restored, chunk=1))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        # Já coletados do arquivo: um é abandonado e o outro termina com vencedor
+        restored.encerrar_jogo(ids[0])
+        game = restored.get_game_state(ids[1])
+        top, seat = game.get_top_discard_card(), game.current_player_index
+        game.players[seat].hand = [Card(id=1, color=top.color, type=CardType.NUMBER, value=top.value)]
+        restored.resolver_jogada(ids[1], seat, 0)
+        return await collecting
+
+    entries = asyncio.run(scenario())
+    assert restored.get_game_state(ids[0]) is None  # abandonado sai da memória
+    assert restored.get_game_state(ids[1]).status == GameStatus.FINISHED
+    assert ids[0] not in dict(entries) and ids[1] not in dict(entries)
+    assert len(entries) == len(ids) - 2
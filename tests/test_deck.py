@@ -0,0 +1,83 @@
+import random
+import pytest
+from deck import Deck
+from game_manager import GameManager
+from card_facade import CardFacade
+from card_catalog import PLAYABLE_COLORS
+from models import Card, CardColor, CardType, GameStatus
+
+def _cards(n):
+    return [Card(id=i, color=CardColor.RED, type=CardType.NUMBER, value=i % 10) for i in range(n)]
+
+def test_draw_takes_from_top_and_put_bottom_goes_under():
+    """Testa a ordem de compra e a inserção no fundo."""
+    deck = Deck(_cards(3))
+    deck.put_bottom(Card(id=99, color=CardColor.BLUE, type=CardType.SKIP))
+
+    assert [deck.draw().id for _ in range(4)] == [2, 1, 0, 99]
+    assert deck.draw() is None
+    with pytest.raises(IndexError):
+        deck.pop()
+
+def test_draw_does_not_grow_buffer():
+    """Testa se comprar e devolver cartas reaproveita o mesmo buffer."""
+    deck = Deck(_cards(10))
+    capacity = deck.capacity
+    for _ in range(100):
+        deck.put_bottom(deck.draw())
+
+    assert deck.capacity == capacity
+    assert len(deck) == 10
+
+def test_refill_keeps_top_discard_and_shuffles_in_place():
+    """Testa se o reabastecimento mantém a carta do topo e conserva as cartas."""
+    deck = Deck(rng=random.Random(1))
+    discard_pile = _cards(20)
+    top = discard_pile[-1]
+
+    moved = deck.refill_from(discard_pile)
+
+    assert moved == 19
+    assert discard_pile == [top]
+    assert sorted(card.id for card in deck) == list(range(19))
+    assert deck.reshuffles == 1
+
+def test_passar_vez_replenishes_empty_deck():
+    """Testa se passar a vez com o deck vazio recompra do descarte."""
+    manager = GameManager()
+    game_id = manager.novo_jogo(quantidade_jogadores=2)
+    game = manager.get_game_state(game_id)
+    while game.deck:
+        game.discard_pile.insert(0, game.deck.draw())
+
+    result = manager.passar_vez(game_id, player_id=0)
+
+    assert result["card_bought"].startswith("Comprou")
+    assert len(game.discard_pile) == 1
+
+def test_cards_are_conserved_over_random_games():
+    """Testa se nenhuma carta é criada ou perdida ao longo de partidas aleatórias."""
+    rng = random.Random(42)
+    random.seed(42)
+    manager = GameManager()
+    total = len(CardFacade.create_uno_deck())
+
+    for _ in range(20):
+        game_id = manager.novo_jogo(quantidade_jogadores=rng.randint(2, 6))
+        game = manager.get_game_state(game_id)
+        for _ in range(500):
+            if game.status == GameStatus.FINISHED:
+                break
+            player_id = game.current_player_index
+            hand = game.players[player_id].hand
+            top = game.get_top_discard_card()
+            playable = [i for i, card in enumerate(hand) if CardFacade.can_play_card(card, top, game.current_color)]
+            if playable:
+                manager.jogar_carta(game_id, player_id, rng.choice(playable), rng.choice(PLAYABLE_COLORS))
+            else:
+                manager.passar_vez(game_id, player_id)
+
+            ids = [card.id for card in game.deck] + [card.id for card in game.discard_pile]
+            ids += [card.id for player in game.players for card in player.hand]
+            assert len(ids) == total
+            assert len(set(ids)) == total
@@ -0,0 +1,121 @@
+import time
+import random
+from card_catalog import FACE_CODES, PLAYABLE_COLORS
+from endgame_solver import EndgameSolver, LOSS, WIN
+from game_manager import GameManager
+from models import Card, CardColor, CardType
+from move_search import PASS, MoveSearch, SearchState, Simulation
+from rules import Ruleset, color_slot
+
+def _code(color, card_type=CardType.NUMBER, value=None):
+    return FACE_CODES[(color, card_type, value)]
+
+def _known_endgame(hand, opponent, top, color=None, ruleset=Ruleset()):
+    """Fim de jogo com o monte vazio: a mão do adversário é o conjunto de cartas não vistas"""
+    unseen = [0] * len(FACE_CODES)
+    for code in opponent:
+        unseen[code] += 1
+    return SearchState(
+        player=0, hand=tuple(hand), hand_sizes=(len(hand), len(opponent)), top=top,
+        color=color if color is not None else color_slot(CardColor.RED), direction=1, pending=0,
+        discard=(), unseen=tuple(unseen), deck_size=0, ruleset=ruleset
+    )
+
+def _plain_negamax(sim, depth):
+    """Referência sem poda nem tabela"""
+    if depth <= 0:
+        return 0
+    best = LOSS
+    for move in sim.moves():
+        child = sim.clone()
+        child.apply(move)
+        if child.winner is not None:
+            value = WIN if child.winner == sim.current else LOSS
+        elif child.current == sim.current:
+            value = _plain_negamax(child, depth - 1)
+        else:
+            value = -_plain_negamax(child, depth - 1)
+        best = max(best, value)
+    return best
+
+RED_3 = _code(CardColor.RED, value=3)
+BLUE_5 = _code(CardColor.BLUE, value=5)
+GREEN_7 = _code(CardColor.GREEN, value=7)
+WILD = _code(CardColor.WILD, CardType.WILD)
+
+def test_last_card_wins():
+    """Testa a vitória imediata com a última carta."""
+    state = _known_endgame([RED_3], [GREEN_7, GREEN_7, BLUE_5], top=_code(CardColor.RED, value=1))
+    assert EndgameSolver().winning_move(state) == (RED_3, None)
+
+def test_wild_color_choice_wins():
+    """Testa se o solver escolhe a cor do curinga que permite bater (em 2 jogadores o curinga mantém a vez)."""
+    state = _known_endgame([WILD, BLUE_5], [GREEN_7, GREEN_7, RED_3], top=_code(CardColor.RED, value=1))
+    scores = EndgameSolver().solve(state)
+
+    assert EndgameSolver().winning_move(state) == (WILD, PLAYABLE_COLORS.index(CardColor.BLUE))
+    assert scores[(WILD, PLAYABLE_COLORS.index(CardColor.BLUE))] == 1.0
+    assert scores[(PASS, None)] < 1.0
+
+def test_matches_plain_negamax_on_random_endgames():
+    """Testa a poda e a tabela de transposição contra o negamax completo."""
+    rng = random.Random(7)
+    faces = list(range(len(FACE_CODES)))
+    solver = EndgameSolver(max_depth=6)
+    for _ in range(40):
+        hand = rng.sample(faces, 2)
+        opponent = rng.sample(faces, 2)
+        top = rng.choice([code for code in faces if code not in (WILD, WILD + 1)])
+        sim = Simulation(_known_endgame(hand, opponent, top, color_slot(PLAYABLE_COLORS[rng.randrange(4)])),
+                         random.Random(0))
+        for move, value in solver.evaluate(sim, budget_ms=10_000).items():
+            child = sim.clone()
+            child.apply(move)
+            if child.winner is not None:
+                expected = WIN if child.winner == 0 else LOSS
+            elif child.current == 0:
+                expected = _plain_negamax(child, 5)
+            else:
+                expected = -_plain_negamax(child, 5)
+            # A tabela pode trazer vitórias/derrotas provadas além da profundidade
+            assert value == expected or expected == 0
+
+def test_table_is_bounded():
+    """Testa o limite da tabela de transposição."""
+    solver = EndgameSolver(max_cards=10, table_size=50, budget_ms=50)
+    state = _known_endgame([GREEN_7, BLUE_5, RED_3], [GREEN_7, BLUE_5, RED_3, WILD],
+                           top=_code(CardColor.YELLOW, value=9), color=color_slot(CardColor.YELLOW))
+    solver.solve(state)
+    metrics = solver.get_metrics()
+    assert metrics["posicoes_na_tabela"] <= 50
+    assert metrics["despejos"] > 0
+
+def test_move_search_uses_solver_in_endgame():
+    """Testa se a sugestão usa o solver em fins de jogo de 2 jogadores."""
+    manager = GameManager()
+    game = manager.get_game_state(manager.novo_jogo(quantidade_jogadores=2))
+    game.current_color = CardColor.RED
+    game.players[0].hand = [Card(id=900, color=CardColor.RED, type=CardType.NUMBER, value=3)]
+    game.players[1].hand = game.players[1].hand[:2]
+
+    suggestion = MoveSearch(endgame=EndgameSolver()).suggest(game, 0, seed=1)
+
+    assert suggestion.solved
+    assert (suggestion.card, suggestion.win_rate) == ("RED_3", 1.0)
+
+def test_waiting_for_lock_counts_against_deadline():
+    """Testa se a espera pelo lock conta no prazo: a consulta vencida desiste sem resolver."""
+    solver = EndgameSolver(budget_ms=20)
+    state = _known_endgame([GREEN_7], [BLUE_5], top=_code(CardColor.GREEN, value=1),
+                           color=color_slot(CardColor.GREEN))
+    solver._lock.acquire()  # outra consulta ocupando o solver
+    try:
+        started = time.monotonic()
+        assert solver.solve(state) is None
+        assert time.monotonic() - started < 0.5
+        assert solver.solve(state, budget_ms=1000, deadline=time.monotonic() - 1) is None
+    finally:
+        solver._lock.release()
+
+    assert solver.get_metrics()["expiradas_na_fila"] == 2
+    assert solver.solve(state) is not None
@@ -0,0 +1,136 @@
+import gzip
+import json
+import pytest
+import export_games
+from game_archive import GameArchive, GameArchiveObserver
+from game_manager import GameManager
+from models import Card, CardType, GameStatus
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+def _play_to_win(manager, game_id, seat):
+    game = manager.games[game_id]
+    top = game.get_top_discard_card()
+    game.current_player_index = seat
+    game.players[seat].hand = [Card(id=900, color=top.color, type=CardType.NUMBER, value=2)]
+    manager.jogar_carta(game_id, seat, 0)
+
+def _archive_with_games(tmp_path):
+    """Três jogos: finalizado em t=100, abandonado em t=200, finalizado em t=300"""
+    clock = FakeClock()
+    manager = GameManager()
+    archive = GameArchive(str(tmp_path / "jogos.ndjson"))
+    manager.attach(GameArchiveObserver(archive, clock))
+
+    first = manager.novo_jogo(2, player_ids=["ana", "bia"])
+    manager.passar_vez(first, 0)
+    _play_to_win(manager, first, 1)
+    clock.now = 200.0
+    manager.encerrar_jogo(manager.novo_jogo(3))
+    clock.now = 300.0
+    _play_to_win(manager, manager.novo_jogo(2), 0)
+    archive.close()
+    return archive
+
+def test_finished_game_is_archived_with_moves(tmp_path):
+    """Testa se o histórico gravado traz o resumo e as jogadas."""
+    archive = _archive_with_games(tmp_path)
+    record, _ = next(archive.iter_records())
+
+    assert record["status"] == "FINISHED"
+    assert record["winner"] == 1
+    assert record["accounts"] == ["ana", "bia"]
+    assert [move["type"] for move in record["moves"]] == ["turn_passed", "card_played"]
+    assert record["move_count"] == 2
+
+def test_filters_and_cursor_resume(tmp_path):
+    """Testa os filtros de status/horário e a retomada pelo cursor."""
+    archive = _archive_with_games(tmp_path)
+
+    finished = [r["finished_at"] for r, _ in archive.iter_records(status=GameStatus.FINISHED)]
+    assert finished == [100.0, 300.0]
+    assert [r["status"] for r, _ in archive.iter_records(since=150, until=300)] == ["ABANDONED"]
+
+    (_, cursor), = archive.iter_records(limit=1)
+    rest = [r["finished_at"] for r, _ in archive.iter_records(cursor)]
+    assert rest == [200.0, 300.0]
+    with pytest.raises(ValueError):
+        list(archive.iter_records(cursor + 1))
+
+def test_export_lines_gzip_stream(tmp_path):
+    """Testa se a exportação comprimida é NDJSON válido com o cursor em cada linha."""
+    archive = _archive_with_games(tmp_path)
+    data = gzip.decompress(b"".join(archive.export_lines(compress=True)))
+    lines = [json.loads(line) for line in data.splitlines()]
+
+    assert len(lines) == 3
+    assert lines[-1]["cursor"] == (tmp_path / "jogos.ndjson").stat().st_size
+
+def test_cli_exports_and_reports_cursor(tmp_path, capsys):
+    """Testa a CLI de exportação com filtro e limite."""
+    _archive_with_games(tmp_path)
+    output = tmp_path / "saida.ndjson"
+
+    code = export_games.main([
+        "--arquivo", str(tmp_path / "jogos.ndjson"), "--saida", str(output),
+        "--status", "FINISHED", "--limite", "1"
+    ])
+
+    assert code == 0
+    lines = output.read_bytes().splitlines()
+    assert len(lines) == 1
+    assert f"cursor: {json.loads(lines[0])['cursor']}" in capsys.readouterr().err
+
+def test_imported_game_is_archived_from_import(tmp_path):
+    """Testa se um jogo importado de outro nó é arquivado com as jogadas feitas aqui."""
+    origin = GameManager()
+    game_id = origin.novo_jogo(2)
+    origin.passar_vez(game_id, 0)
+    data = origin.exportar_jogo(game_id, remover=True)
+
+    manager = GameManager()
+    archive = GameArchive(str(tmp_path / "jogos.ndjson"))
+    manager.attach(GameArchiveObserver(archive, FakeClock()))
+    manager.importar_jogo(data)
+    _play_to_win(manager, game_id, 0)
+    archive.flush()
+
+    (record, _), = archive.iter_records()
+    assert record["game_id"] == game_id
+    assert record["imported_at_version"] == 2
+    assert [move["type"] for move in record["moves"]] == ["card_played"]
+    archive.close()
+
+def test_write_errors_do_not_stop_the_writer(tmp_path):
+    """Testa se um registro que não serializa não derruba a thread de escrita."""
+    archive = GameArchive(str(tmp_path / "jogos.ndjson"))
+    archive.enqueue({"game_id": 1, "bad": object()})
+    archive.enqueue({"game_id": 2, "finished_at": 1.0, "status": "FINISHED"})
+    archive.close()
+
+    assert archive.write_errors == 1
+    assert [r["game_id"] for r, _ in archive.iter_records()] == [2]
+
+def test_unexpected_errors_do_not_block_flush(tmp_path, monkeypatch):
+    """Testa se uma exceção inesperada na escrita é contada e a fila continua andando."""
+    archive = GameArchive(str(tmp_path / "jogos.ndjson"))
+    append = archive.append
+
+    def failing_once(record):
+        if record["game_id"] == 1:
+            raise RuntimeError("falha inesperada")
+        return append(record)
+
+    monkeypatch.setattr(archive, "append", failing_once)
+    archive.enqueue({"game_id": 1, "finished_at": 1.0, "status": "FINISHED"})
+    archive.enqueue({"game_id": 2, "finished_at": 1.0, "status": "FINISHED"})
+    archive.flush()
+    archive.close()
+
+    assert archive.write_errors == 1
+    assert [r["game_id"] for r, _ in archive.iter_records()] == [2]
@@ -0,0 +1,54 @@
+import asyncio
+from game_manager import GameManager
+from game_locks import GameLockRegistry, run_blocking
+from models import Card, CardType
+from observer_pattern import GameEventType
+
+def test_hold_serializes_same_game():
+    """Testa se duas operações no mesmo jogo não se intercalam."""
+    registry = GameLockRegistry()
+    order = []
+
+    async def operation(name):
+        async with registry.hold(1):
+            order.append(f"{name}-inicio")
+            await asyncio.sleep(0)
+            order.append(f"{name}-fim")
+
+    async def scenario():
+        await asyncio.gather(operation("a"), operation("b"))
+
+    asyncio.run(scenario())
+    assert order == ["a-inicio", "a-fim", "b-inicio", "b-fim"]
+
+def test_different_games_do_not_block_each_other():
+    """Testa se jogos diferentes usam locks independentes."""
+    registry = GameLockRegistry()
+
+    async def scenario():
+        async with registry.hold(1):
+            async with registry.hold(2):
+                return len(registry)
+
+    assert asyncio.run(scenario()) == 2
+
+def test_lock_discarded_when_game_finishes():
+    """Testa se o lock do jogo é descartado após GAME_FINISHED."""
+    manager = GameManager()
+    registry = GameLockRegistry()
+    manager.attach(registry, event_types=[GameEventType.GAME_FINISHED])
+    game_id = manager.novo_jogo(quantidade_jogadores=2)
+    game = manager.get_game_state(game_id)
+    top_card = game.get_top_discard_card()
+    game.players[0].hand = [Card(id=99, color=top_card.color, type=CardType.NUMBER, value=1)]
+
+    async def scenario():
+        async with registry.hold(game_id):
+            manager.jogar_carta(game_id, player_id=0, card_index=0)
+        return len(registry)
+
+    assert asyncio.run(scenario()) == 0
+
+def test_run_blocking_returns_result():
+    """Testa se run_blocking executa a função fora do loop e devolve o resultado."""
+    assert asyncio.run(run_blocking(sum, [1, 2, 3])) == 6
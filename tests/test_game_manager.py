@@ -1,5 +1,5 @@
 import pytest
-from game_manager import GameManager
+from game_manager import GameManager, VersionConflictError
 from models import Card, CardColor, CardType
 from models import GameStatus
 from card_effects import NumberCardEffect
@@ -112,4 +112,70 @@ def test_vitoria_jogo(manager: GameManager):
     
     assert result["game_finished"] == True
     assert result["winner"] == 0
-    assert game.status == GameStatus.FINISHED
\ No newline at end of file
+    assert game.status == GameStatus.FINISHED
+
+
+def test_novo_jogo_limite_sem_modo_festa(manager: GameManager):
+    """Testa se sem o modo festa o limite continua sendo 10 jogadores."""
+    with pytest.raises(ValueError, match="entre 2 e 10"):
+        manager.novo_jogo(quantidade_jogadores=11)
+
+def test_novo_jogo_modo_festa(manager: GameManager):
+    """Testa uma mesa grande no modo festa: vários baralhos unidos e ids únicos."""
+    game_id = manager.novo_jogo(quantidade_jogadores=300, modo_festa=True)
+    game = manager.get_game_state(game_id)
+
+    decks = manager.decks_needed(300)
+    cards = list(game.deck) + game.discard_pile + [card for player in game.players for card in player.hand]
+
+    assert decks > 1
+    assert len(game.players) == 300
+    assert all(len(player.hand) == 5 for player in game.players)
+    assert len(cards) == decks * 108
+    assert len({card.id for card in cards}) == len(cards)
+
+def test_modo_festa_limite(manager: GameManager):
+    """Testa o limite de jogadores do modo festa."""
+    with pytest.raises(ValueError, match="modo festa"):
+        manager.novo_jogo(quantidade_jogadores=1001, modo_festa=True)
+
+def test_versao_esperada_desatualizada_e_recusada(manager: GameManager):
+    """Testa o compare-and-swap: jogada sobre versão antiga não altera o jogo."""
+    game_id = manager.novo_jogo(quantidade_jogadores=2)
+    game = manager.get_game_state(game_id)
+    stale = game.version
+    manager.passar_vez(game_id, 0, expected_version=stale)
+
+    with pytest.raises(VersionConflictError) as conflict:
+        manager.passar_vez(game_id, 1, expected_version=stale)
+
+    assert conflict.value.current_version == game.version == stale + 1
+    assert game.current_player_index == 1
+    assert len(game.players[1].hand) == 5
+
+def test_snapshot_imutavel_por_versao(manager: GameManager):
+    """Testa se o snapshot é reaproveitado na mesma versão e não muda após a jogada."""
+    game_id = manager.novo_jogo(quantidade_jogadores=2)
+    snapshot = manager.get_snapshot(game_id)
+    hand = snapshot.hand(0)
+
+    assert manager.get_snapshot(game_id) is snapshot
+    manager.passar_vez(game_id, 0)
+
+    assert snapshot.hand(0) is hand and len(hand) == 5
+    assert snapshot.current_player == 0
+    # Mão não lida antes da jogada: nunca devolve a mão da versão seguinte
+    with pytest.raises(ValueError, match="versão anterior"):
+        snapshot.hand(1)
+    current = manager.get_snapshot(game_id)
+    assert current.version == snapshot.version + 1
+    assert len(current.hand(0)) == 6
+
+def test_snapshot_copia_so_a_mao_lida(manager: GameManager):
+    """Testa se o snapshot de uma mesa grande não copia as mãos que ninguém leu."""
+    game_id = manager.novo_jogo(quantidade_jogadores=200, modo_festa=True)
+    snapshot = manager.get_snapshot(game_id)
+
+    assert snapshot.player_count == 200
+    assert len(snapshot.hand(7)) == 5
+    assert list(snapshot._hands) == [7]
@@ -0,0 +1,117 @@
+import asyncio
+import pytest
+from game_locks import GameLockRegistry
+from game_manager import GameManager, VersionConflictError
+from idempotency import IdempotencyCache, IdempotencyKeyConflict
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def _pass(cache, manager, locks, game_id, player_id, key):
+    return asyncio.run(cache.run(
+        key, ("passa",), locks.hold(game_id),
+        lambda: manager.passar_vez(game_id, player_id)
+    ))
+
+def test_retry_returns_stored_response_without_mutating():
+    """Testa se a repetição com a mesma chave não compra outra carta."""
+    manager = GameManager()
+    locks = GameLockRegistry()
+    cache = IdempotencyCache()
+    game_id = manager.novo_jogo(quantidade_jogadores=2)
+    game = manager.games[game_id]
+
+    first, replayed_first = _pass(cache, manager, locks, game_id, 0, ("v1", game_id, 0, "abc"))
+    version = game.version
+    second, replayed_second = _pass(cache, manager, locks, game_id, 0, ("v1", game_id, 0, "abc"))
+
+    assert (replayed_first, replayed_second) == (False, True)
+    assert second == first
+    assert game.version == version
+    assert len(game.players[0].hand) == 6
+    assert cache.get_metrics()["taxa_acerto"] == 0.5
+
+def test_validation_error_is_replayed():
+    """Testa se o erro da primeira execução é repetido sem reexecutar."""
+    manager = GameManager()
+    locks = GameLockRegistry()
+    cache = IdempotencyCache()
+    game_id = manager.novo_jogo(quantidade_jogadores=2)
+    calls = []
+
+    def operation():
+        calls.append(1)
+        return manager.passar_vez(game_id, 1)  # não é a vez do jogador 1
+
+    for _ in range(2):
+        with pytest.raises(ValueError, match="Não é a vez"):
+            asyncio.run(cache.run(("v1", game_id, 1, "k"), ("passa",), locks.hold(game_id), operation))
+    assert calls == [1]
+
+def test_key_reused_with_other_parameters_conflicts():
+    """Testa se reutilizar a chave com outros parâmetros é rejeitado."""
+    cache = IdempotencyCache()
+    cache.store("k", ("jogar", 0, None, None), {"ok": True})
+    with pytest.raises(IdempotencyKeyConflict):
+        cache.lookup("k", ("jogar", 1, None, None))
+    assert cache.conflicts == 1
+
+def test_concurrent_retries_execute_once():
+    """Testa se repetições simultâneas esperam a primeira e reaproveitam o resultado."""
+    manager = GameManager()
+    locks = GameLockRegistry()
+    cache = IdempotencyCache()
+    game_id = manager.novo_jogo(quantidade_jogadores=2)
+
+    async def scenario():
+        key = ("v1", game_id, 0, "mesma")
+        operation = lambda: manager.passar_vez(game_id, 0)
+        return await asyncio.gather(*[
+            cache.run(key, ("passa",), locks.hold(game_id), operation) for _ in range(5)
+        ])
+
+    results = asyncio.run(scenario())
+    assert [replayed for _, replayed in results].count(False) == 1
+    assert len(manager.games[game_id].players[0].hand) == 6
+
+def test_entries_expire_and_are_bounded():
+    """Testa o TTL e o limite de entradas."""
+    clock = FakeClock()
+    cache = IdempotencyCache(max_entries=2, ttl=10, clock=clock)
+    cache.store("a", (), 1)
+    cache.store("b", (), 2)
+    cache.store("c", (), 3)
+    assert cache.lookup("a", ()) is None
+    assert cache.evictions == 1
+
+    clock.now = 11.0
+    assert cache.lookup("b", ()) is None
+    assert len(cache) == 0
+    assert cache.expirations == 2
+
+def test_precheck_rejects_before_lock_but_not_replays():
+    """Testa se a versão desatualizada é recusada antes do lock, sem afetar repetições."""
+    manager = GameManager()
+    locks = GameLockRegistry()
+    cache = IdempotencyCache()
+    game_id = manager.novo_jogo(quantidade_jogadores=2)
+
+    def run(key, version):
+        return asyncio.run(cache.run(
+            key, ("passa", version), locks.hold(game_id),
+            lambda: manager.passar_vez(game_id, 0, version),
+            lambda: manager.check_version(game_id, version)
+        ))
+
+    version = manager.games[game_id].version
+    first, _ = run(("v1", game_id, 0, "k"), version)
+    again, replayed = run(("v1", game_id, 0, "k"), version)
+    assert (again, replayed) == (first, True)
+
+    with pytest.raises(VersionConflictError):
+        run(("v1", game_id, 0, "outra"), version)
+    assert len(cache) == 1
@@ -0,0 +1,90 @@
+import random
+import pytest
+from game_manager import GameManager
+from leaderboard import INITIAL_RATING, Leaderboard, PlayerRegistry, RatingObserver
+from models import Card, CardColor, CardType, GameStatus
+
+def test_leaderboard_matches_sorted_reference():
+    """Testa rank e top-k da skip list contra uma lista ordenada."""
+    rng = random.Random(3)
+    board = Leaderboard(rng=random.Random(5))
+    ratings = {}
+    for step in range(2000):
+        account = f"p{rng.randrange(300)}"
+        if account in ratings and rng.random() < 0.2:
+            board.remove(account)
+            del ratings[account]
+        else:
+            ratings[account] = float(rng.randrange(1000, 2000))
+            board.insert(account, ratings[account])
+
+    expected = sorted(ratings.items(), key=lambda item: (-item[1], item[0]))
+    assert len(board) == len(expected)
+    assert board.top(len(expected)) == expected
+    assert board.top(5, offset=10) == expected[10:15]
+    for position, (account, _) in enumerate(expected, start=1):
+        assert board.rank(account) == position
+
+def test_rank_of_unknown_player():
+    """Testa o erro ao consultar a posição de quem não está no ranking."""
+    board = Leaderboard()
+    with pytest.raises(ValueError):
+        board.rank("ninguem")
+    assert board.top(3) == []
+
+def _finish_game(manager, game_id, winner_seat):
+    """Faz `winner_seat` vencer jogando sua última carta"""
+    game = manager.games[game_id]
+    top = game.get_top_discard_card()
+    game.current_player_index = winner_seat
+    game.players[winner_seat].hand = [Card(id=900, color=top.color, type=CardType.NUMBER, value=1)]
+    manager.jogar_carta(game_id, winner_seat, 0)
+    return game
+
+def test_rating_observer_updates_elo_and_points():
+    """Testa se o vencedor ganha o que os perdedores perdem e soma os pontos das mãos."""
+    manager = GameManager()
+    registry = PlayerRegistry()
+    manager.attach(RatingObserver(registry))
+    game_id = manager.novo_jogo(3, player_ids=["ana", "bia", None])
+    game = manager.games[game_id]
+    game.players[1].hand = [Card(id=901, color=CardColor.WILD, type=CardType.WILD)]
+    game.players[2].hand = [Card(id=902, color=CardColor.RED, type=CardType.NUMBER, value=7)]
+
+    game = _finish_game(manager, game_id, 0)
+
+    assert game.status == GameStatus.FINISHED
+    ana, bia = registry.get("ana"), registry.get("bia")
+    assert ana.rating == pytest.approx(INITIAL_RATING + 16)
+    assert bia.rating == pytest.approx(INITIAL_RATING - 16)
+    assert ana.wins == 1 and ana.points == 57
+    assert ana.games == bia.games == 1
+    assert registry.leaderboard.rank("ana") == 1
+    assert registry.leaderboard.rank("bia") == 2
+    assert len(registry.leaderboard) == 2
+
+def test_registry_persists_to_json(tmp_path):
+    """Testa se os ratings sobrevivem a um novo PlayerRegistry no mesmo arquivo."""
+    path = str(tmp_path / "ratings.json")
+    registry = PlayerRegistry(path)
+    registry.set_rating("ana", 1600.0)
+    registry.set_rating("bia", 1400.0)
+    registry.get("ana").wins = 3
+    registry.save()
+
+    loaded = PlayerRegistry(path)
+    assert loaded.profile("ana") == {
+        "account_id": "ana", "rating": 1600.0, "games": 0, "wins": 3, "points": 0, "rank": 1
+    }
+    assert loaded.leaderboard.rank("bia") == 2
+
+def test_novo_jogo_validates_player_ids():
+    """Testa a validação das identidades passadas ao criar o jogo."""
+    manager = GameManager()
+    with pytest.raises(ValueError):
+        manager.novo_jogo(2, player_ids=["ana"])
+    with pytest.raises(ValueError):
+        manager.novo_jogo(2, player_ids=["ana", "ana"])
+
+    game_id = manager.novo_jogo(2, player_ids=["ana", "bia"])
+    assert [p.account_id for p in manager.games[game_id].players] == ["ana", "bia"]
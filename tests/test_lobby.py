@@ -0,0 +1,155 @@
+import asyncio
+import pytest
+from game_manager import GameManager
+from lobby import Lobby, TicketStatus
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def _lobby():
+    clock = FakeClock()
+    manager = GameManager()
+    return clock, manager, Lobby(manager, clock)
+
+def test_match_forms_tables_in_arrival_order():
+    """Testa se o matcher cria mesas completas com os mais antigos primeiro."""
+    clock, manager, lobby = _lobby()
+    tickets = []
+    for i in range(7):
+        clock.now = float(i)
+        tickets.append(lobby.enqueue(3))
+
+    game_ids = lobby.match()
+
+    assert len(game_ids) == 2
+    assert [t.game_id for t in tickets[:6]] == [game_ids[0]] * 3 + [game_ids[1]] * 3
+    assert [t.player_id for t in tickets[:3]] == [0, 1, 2]
+    assert tickets[6].status == TicketStatus.WAITING
+    assert len(manager.games[game_ids[0]].players) == 3
+    assert len(lobby) == 1
+
+def test_queues_are_separated_by_size_and_skill():
+    """Testa se tamanhos e faixas de habilidade diferentes não se misturam."""
+    clock, manager, lobby = _lobby()
+    lobby.enqueue(2, skill_bucket=1)
+    lobby.enqueue(2, skill_bucket=2)
+    lobby.enqueue(3)
+    lobby.enqueue(3)
+
+    assert lobby.match() == []
+    assert lobby.queue_depths() == {"2/1": 1, "2/2": 1, "3": 2}
+
+def test_cancelled_ticket_is_skipped():
+    """Testa se um ticket cancelado não entra na mesa."""
+    clock, manager, lobby = _lobby()
+    first = lobby.enqueue(2)
+    second = lobby.enqueue(2)
+    third = lobby.enqueue(2)
+
+    lobby.cancel(first.id)
+    lobby.match()
+
+    assert first.status == TicketStatus.CANCELLED
+    assert first.game_id is None
+    assert second.game_id == third.game_id is not None
+    with pytest.raises(ValueError):
+        lobby.cancel(first.id)
+
+def test_many_cancellations_compact_the_heap():
+    """Testa se cancelamentos em massa não deixam o heap crescer sem limite."""
+    clock, manager, lobby = _lobby()
+    keep = lobby.enqueue(2)
+    for _ in range(1000):
+        lobby.cancel(lobby.enqueue(2).id)
+
+    assert len(lobby._queues[(2, None)]) < 200
+    lobby.enqueue(2)
+    lobby.match()
+    assert keep.status == TicketStatus.MATCHED
+
+def test_invalid_table_size():
+    """Testa a validação do tamanho da mesa."""
+    clock, manager, lobby = _lobby()
+    with pytest.raises(ValueError):
+        lobby.enqueue(1)
+    with pytest.raises(ValueError):
+        lobby.enqueue(11)
+
+def test_long_poll_wakes_on_match():
+    """Testa se o long-poll é acordado quando o matcher forma a mesa."""
+    clock, manager, lobby = _lobby()
+
+    async def scenario():
+        ticket = lobby.enqueue(2)
+        waiter = asyncio.create_task(lobby.wait_for_match(ticket.id, timeout=5))
+        await asyncio.sleep(0)
+        lobby.enqueue(2)
+        lobby.match()
+        return await waiter
+
+    ticket = asyncio.run(scenario())
+    assert ticket.status == TicketStatus.MATCHED
+    assert ticket.game_id in manager.games
+
+def test_long_poll_times_out_while_waiting():
+    """Testa se o long-poll devolve o ticket ainda na fila ao expirar."""
+    clock, manager, lobby = _lobby()
+    ticket = lobby.enqueue(4)
+
+    result = asyncio.run(lobby.wait_for_match(ticket.id, timeout=0.01))
+    assert result.status == TicketStatus.WAITING
+
+def test_metrics_report_wait_percentiles():
+    """Testa as métricas de profundidade e percentis de espera."""
+    clock, manager, lobby = _lobby()
+    for i in range(10):
+        clock.now = float(i)
+        lobby.enqueue(2)
+    clock.now = 10.0
+    lobby.match()
+    lobby.enqueue(5)
+
+    metrics = lobby.get_metrics()
+    assert metrics["mesas_formadas"] == 5
+    assert metrics["jogadores_pareados"] == 10
+    assert metrics["profundidade_filas"] == {"5": 1}
+    assert metrics["tempo_espera"] == {"p50": 5.0, "p90": 9.0, "p99": 10.0}
+
+def test_accounts_are_seated_and_unique_in_queue():
+    """Testa se a conta do ticket vai para o assento e não entra duas vezes na fila."""
+    clock, manager, lobby = _lobby()
+    lobby.enqueue(2, account_id="ana")
+    with pytest.raises(ValueError):
+        lobby.enqueue(2, account_id="ana")
+    lobby.enqueue(2)
+
+    game_id, = lobby.match()
+
+    assert [p.account_id for p in manager.games[game_id].players] == ["ana", None]
+    lobby.enqueue(2, account_id="ana")
+
+def test_failed_game_creation_keeps_tickets_queued():
+    """Testa se as mesas voltam para a fila, com as contas, quando a criação do jogo falha."""
+    clock, manager, lobby = _lobby()
+    first = lobby.enqueue(2, account_id="ana")
+    second = lobby.enqueue(2, account_id="bia")
+    original = manager.novo_jogo
+
+    def failing(*args, **kwargs):
+        raise RuntimeError("falha ao criar")
+
+    manager.novo_jogo = failing
+    with pytest.raises(RuntimeError):
+        lobby.match()
+    assert len(lobby) == 2 and first.status == second.status == TicketStatus.WAITING
+    with pytest.raises(ValueError):
+        lobby.enqueue(2, account_id="ana")
+
+    manager.novo_jogo = original
+    game_id, = lobby.match()
+    assert first.game_id == second.game_id == game_id
+    assert [p.account_id for p in manager.games[game_id].players] == ["ana", "bia"]
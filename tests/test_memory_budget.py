@@ -0,0 +1,159 @@
+import gc
+import tracemalloc
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from api_v2 import create_v2_router
+from game_locks import GameLockRegistry
+from game_manager import GameManager
+from lobby import Lobby, TicketStatus
+import main
+from match_tracker import MatchTracker
+from memory_budget import (
+    DEFAULT_NEW_GAME_SHARE, PRIORITY_IN_PROGRESS, AdmissionController, AdmissionRejected, MemoryAccountant,
+    estimate_game_bytes, estimate_new_game_bytes
+)
+from models import Card, CardType, GameStatus
+
+def _setup(budget_bytes=None, max_games=None):
+    manager = GameManager()
+    tracker = MatchTracker()
+    manager.attach(tracker)
+    accountant = MemoryAccountant(manager, tracker)
+    manager.attach(accountant)
+    return manager, tracker, accountant, AdmissionController(accountant, budget_bytes, max_games, retry_after=7)
+
+def _finish(manager, game_id):
+    game = manager.get_game_state(game_id)
+    top = game.get_top_discard_card()
+    seat = game.current_player_index
+    game.players[seat].hand = [Card(id=1, color=top.color, type=CardType.NUMBER, value=top.value)]
+    manager.resolver_jogada(game_id, seat, 0)
+    assert game.status == GameStatus.FINISHED
+
+def test_estimate_tracks_real_allocation():
+    """Testa se a estimativa fica perto da memória alocada de fato por jogo."""
+    manager = GameManager()
+    manager.novo_jogo(2)
+    for players in (2, 10):
+        gc.collect()
+        tracemalloc.start()
+        ids = [manager.novo_jogo(players) for _ in range(50)]
+        for game_id in ids:
+            manager.get_snapshot(game_id)
+        measured = tracemalloc.get_traced_memory()[0] / len(ids)
+        tracemalloc.stop()
+        estimate = estimate_game_bytes(manager.get_game_state(ids[0]))
+        assert 0.7 < estimate / measured < 1.3
+        assert abs(estimate_new_game_bytes(players) - estimate) < 0.1 * estimate
+
+def test_accounting_follows_game_lifecycle():
+    """Testa a conta incremental ao criar, jogar, encerrar, abandonar e exportar jogos."""
+    manager, tracker, accountant, _ = _setup()
+    first, second, third = (manager.novo_jogo(3) for _ in range(3))
+    per_game = estimate_game_bytes(manager.get_game_state(first))
+    assert accountant.live_bytes == 3 * per_game
+    assert accountant.summaries == 3
+
+    manager.passar_vez(first, 0)
+    assert accountant.live_bytes == 3 * per_game  # jogadas não mudam a conta
+
+    _finish(manager, first)
+    manager.encerrar_jogo(second)
+    manager.exportar_jogo(third, remover=True)
+    metrics = accountant.get_metrics()
+    assert metrics["bytes_em_andamento"] == 0
+    assert metrics["bytes_encerrados"] == per_game  # o abandonado já saiu da memória
+    assert accountant.summaries == len(tracker.games_finished) == 2
+
+def test_new_games_rejected_while_moves_continue():
+    """Testa a recusa de jogos novos acima do orçamento, sem afetar as jogadas."""
+    per_game = estimate_new_game_bytes(2)
+    manager, _, accountant, admission = _setup(budget_bytes=int(per_game * 3.5))
+    for _ in range(3):
+        admission.check(per_game)
+        game_id = manager.novo_jogo(2)
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        admission.check(per_game)
+    assert rejected.value.retry_after == 7
+    manager.passar_vez(game_id, 0)
+
+    # Jogo em andamento (importado) pode usar a folga reservada
+    admission.check(per_game // 4, PRIORITY_IN_PROGRESS)
+    assert admission.get_metrics()["recusados_novos"] == 1
+
+def test_finished_games_are_shed_before_rejecting():
+    """Testa o descarte dos jogos encerrados mais antigos para abrir espaço."""
+    per_game = estimate_new_game_bytes(2)
+    manager, tracker, accountant, admission = _setup(budget_bytes=int(per_game * 3.5))
+    ids = [manager.novo_jogo(2) for _ in range(3)]
+    _finish(manager, ids[1])
+    _finish(manager, ids[0])
+
+    admission.check(per_game)
+
+    assert ids[1] not in manager.games and ids[1] not in tracker.games_finished
+    assert ids[0] in manager.games and ids[2] in manager.games
+    assert accountant.games_shed == 1
+
+def test_max_games_limits_only_new_games():
+    """Testa o limite de jogos simultâneos."""
+    manager, _, _, admission = _setup(max_games=2)
+    manager.novo_jogo(2)
+    manager.novo_jogo(2)
+    assert not admission.allows(0)
+    assert admission.allows(0, PRIORITY_IN_PROGRESS)
+
+def test_lobby_keeps_tickets_queued_over_budget():
+    """Testa se o matcher só forma as mesas que cabem e deixa o resto na fila."""
+    per_game = estimate_new_game_bytes(2)
+    manager, _, _, admission = _setup(budget_bytes=int(per_game * 2.5 / DEFAULT_NEW_GAME_SHARE))
+    lobby = Lobby(manager, admission=admission)
+    tickets = [lobby.enqueue(2) for _ in range(8)]
+
+    assert len(lobby.match()) == 2
+    assert [t.status for t in tickets].count(TicketStatus.WAITING) == 4
+    assert lobby.get_metrics()["mesas_adiadas"] == 1
+
+def test_lobby_respects_max_games_within_a_batch():
+    """Testa se uma rodada do matcher não cria mais jogos que o limite de jogos simultâneos."""
+    manager, _, _, admission = _setup(max_games=2)
+    lobby = Lobby(manager, admission=admission)
+    tickets = [lobby.enqueue(2) for _ in range(20)]
+
+    assert len(lobby.match()) == 2
+    assert [t.status for t in tickets].count(TicketStatus.WAITING) == 16
+    assert lobby.match() == []
+
+def test_v2_create_returns_503_with_retry_after():
+    """Testa a resposta 503 com Retry-After na criação de jogos."""
+    manager, _, _, admission = _setup(max_games=1)
+    app = FastAPI()
+    app.include_router(create_v2_router(manager, GameLockRegistry(), admission=admission))
+    client = TestClient(app)
+
+    assert client.post("/v2/jogos?jogadores=2").status_code == 200
+    response = client.post("/v2/jogos?jogadores=2")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "7"
+
+def test_invalid_create_is_rejected_before_admission():
+    """Testa se pedidos inválidos dão 400 sem contar como admitidos nem descartar jogos."""
+    per_game = estimate_new_game_bytes(2)
+    manager, _, accountant, admission = _setup(budget_bytes=int(per_game * 1.5 / DEFAULT_NEW_GAME_SHARE))
+    _finish(manager, manager.novo_jogo(2))
+    app = FastAPI()
+    app.include_router(create_v2_router(manager, GameLockRegistry(), admission=admission))
+    client = TestClient(app)
+
+    for query in ("jogadores=11", "jogadores=1", "jogadores=5000&festa=true", "jogadores=2&regras=nenhuma"):
+        assert client.post(f"/v2/jogos?{query}").status_code == 400
+    assert admission.admitted == 0 and accountant.games_shed == 0
+    assert len(manager.games) == 1
+
+    v1 = TestClient(main.create_app({"UNO_MAX_GAMES": "1"}))
+    assert v1.get("/novoJogo", params={"quantidadeJog": 11}).status_code == 400
+    assert v1.get("/novoJogo", params={"quantidadeJog": 2, "contas": "ana,ana"}).status_code == 400
+    assert v1.get("/memoria/metricas").json()["admitidos"] == 0
+    assert v1.get("/novoJogo", params={"quantidadeJog": 2}).status_code == 200
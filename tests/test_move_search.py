@@ -0,0 +1,173 @@
+import asyncio
+import random
+import time
+import pytest
+from card_catalog import PLAYABLE_COLORS, face_code
+from game_locks import GameLockRegistry
+from game_manager import GameManager
+from models import Card, CardColor, CardType, PlayDirection
+from move_search import PASS, BotPlayers, MoveSearch, SearchState, Simulation
+from rules import Ruleset, color_slot
+
+def _mirror(game):
+    """Simulação com exatamente as mesmas mãos e o mesmo monte do jogo real"""
+    sim = Simulation(SearchState.of(game, game.current_player_index), random.Random(0))
+    sim.hands = [[face_code(card) for card in player.hand] for player in game.players]
+    sim.deck = [face_code(card) for card in game.deck]
+    return sim
+
+def _observe_game(game):
+    return (
+        game.current_player_index,
+        [sorted(face_code(card) for card in player.hand) for player in game.players],
+        face_code(game.get_top_discard_card()),
+        color_slot(game.current_color),
+        1 if game.play_direction == PlayDirection.CLOCKWISE else -1,
+        game.pending_draw,
+        game.winner
+    )
+
+def _observe_sim(sim):
+    return (sim.current, [sorted(hand) for hand in sim.hands], sim.top, sim.color,
+            sim.direction, sim.pending, sim.winner)
+
+@pytest.mark.parametrize("ruleset", [
+    Ruleset(), Ruleset(stacking=True), Ruleset(seven_zero=True), Ruleset(draw_until_playable=True)
+])
+@pytest.mark.parametrize("players", [2, 4])
+def test_simulation_matches_game_manager(ruleset, players):
+    """Testa se o motor interno da busca reproduz as jogadas do GameManager."""
+    rng = random.Random(players)
+    for _ in range(5):
+        manager = GameManager()
+        game_id = manager.novo_jogo(players, ruleset)
+        game = manager.get_game_state(game_id)
+        sim = _mirror(game)
+
+        while game.winner is None:
+            seat = game.current_player_index
+            top = game.get_top_discard_card()
+            playable = [i for i, card in enumerate(game.players[seat].hand)
+                        if game.rules.can_play(card, top, game.current_color, game.pending_draw)]
+            if playable and rng.random() < 0.9:
+                index = rng.choice(playable)
+                card = game.players[seat].hand[index]
+                slot = rng.randrange(4) if card.color == CardColor.WILD else None
+                manager.jogar_carta(game_id, seat, index, PLAYABLE_COLORS[slot] if slot is not None else None)
+                sim.apply((face_code(card), slot))
+            else:
+                manager.passar_vez(game_id, seat)
+                sim.apply((PASS, None))
+            if game.deck.reshuffles:
+                break  # o monte refeito é embaralhado de forma diferente nos dois motores
+            assert _observe_sim(sim) == _observe_game(game)
+
+@pytest.mark.parametrize("value", [7, 0])
+def test_simulation_last_seven_zero_card_wins(value):
+    """Testa se na simulação o 7 ou 0 como última carta vence sem trocar mãos."""
+    manager = GameManager()
+    game = manager.get_game_state(manager.novo_jogo(3, Ruleset(seven_zero=True)))
+    sim = _mirror(game)
+    top = game.get_top_discard_card()
+    color = top.color if top.color != CardColor.WILD else CardColor.RED
+    sim.color = color_slot(color)
+    code = face_code(Card(0, color, CardType.NUMBER, value))
+    sim.hands[0] = [code]
+    others = [list(hand) for hand in sim.hands[1:]]
+
+    sim.apply((code, None))
+
+    assert sim.winner == 0
+    assert sim.hands[0] == [] and sim.hands[1:] == others
+
+def test_suggests_winning_card_within_budget():
+    """Testa se a busca encontra a jogada vencedora e respeita o orçamento."""
+    manager = GameManager()
+    game_id = manager.novo_jogo(quantidade_jogadores=3)
+    game = manager.get_game_state(game_id)
+    game.current_color = CardColor.RED
+    game.players[0].hand = [Card(id=900, color=CardColor.RED, type=CardType.NUMBER, value=3)]
+
+    started = time.monotonic()
+    suggestion = MoveSearch().suggest(game, 0, budget_ms=30, seed=1)
+
+    assert time.monotonic() - started < 0.5
+    assert (suggestion.card_index, suggestion.card) == (0, "RED_3")
+    assert suggestion.win_rate == 1.0
+
+def test_wild_suggestion_has_color():
+    """Testa se o curinga sugerido vem com uma cor escolhida."""
+    manager = GameManager()
+    game_id = manager.novo_jogo(quantidade_jogadores=2)
+    game = manager.get_game_state(game_id)
+    game.players[0].hand = [Card(id=901, color=CardColor.WILD, type=CardType.WILD)]
+
+    suggestion = MoveSearch().suggest(game, 0, budget_ms=20, seed=2)
+
+    assert suggestion.card_index == 0
+    assert suggestion.chosen_color in PLAYABLE_COLORS
+
+def test_transposition_cache_accumulates_rollouts():
+    """Testa se uma nova consulta na mesma posição continua as simulações anteriores."""
+    manager = GameManager()
+    game = manager.get_game_state(manager.novo_jogo(quantidade_jogadores=4))
+    search = MoveSearch(budget_ms=20)
+
+    first = search.suggest(game, 0, seed=3)
+    second = search.suggest(game, 0, seed=4)
+
+    assert second.cached_rollouts == first.rollouts
+    assert second.rollouts > first.rollouts
+    assert search.get_metrics()["acertos_cache"] == 1
+
+def test_process_pool_search():
+    """Testa a busca dividida entre processos."""
+    manager = GameManager()
+    game = manager.get_game_state(manager.novo_jogo(quantidade_jogadores=3))
+    search = MoveSearch(budget_ms=500, workers=2)
+    try:
+        suggestion = asyncio.run(search.suggest_async(game, 0))
+    finally:
+        search.shutdown()
+    assert suggestion.rollouts > 0
+
+def test_bot_plays_its_turn():
+    """Testa se o bot joga quando a vez chega ao seu assento."""
+    manager = GameManager()
+    bots = BotPlayers(manager, MoveSearch(budget_ms=10), GameLockRegistry())
+    manager.attach(bots)
+    game_id = manager.novo_jogo(quantidade_jogadores=2)
+    game = manager.get_game_state(game_id)
+    bots.add(game_id, [1])
+    assert len(bots) == 0  # a vez ainda é do humano
+
+    manager.passar_vez(game_id, 0)
+    version = game.version
+    assert asyncio.run(bots.play_pending()) == 1
+    assert game.version > version
+    assert bots.moves == 1
+
+class FailingSearch(MoveSearch):
+    """Busca que falha em jogos escolhidos (ValueError ou erro inesperado)"""
+    def __init__(self, failures):
+        super().__init__(budget_ms=10)
+        self.failures = failures
+
+    async def suggest_async(self, game, player_id, budget_ms=None):
+        if game.id in self.failures:
+            raise self.failures[game.id]("falha simulada")
+        return await super().suggest_async(game, player_id, budget_ms)
+
+def test_bot_error_in_one_game_does_not_stop_others():
+    """Testa se o erro da vez de um bot é registrado sem parar os bots dos outros jogos."""
+    manager = GameManager()
+    ids = [manager.novo_jogo(quantidade_jogadores=2) for _ in range(3)]
+    bots = BotPlayers(manager, FailingSearch({ids[0]: ValueError, ids[1]: RuntimeError}), GameLockRegistry())
+    manager.attach(bots)
+    for game_id in ids:
+        bots.add(game_id, [0])
+    version = manager.get_game_state(ids[2]).version
+
+    assert asyncio.run(bots.play_pending()) == 1
+    assert bots.errors == 2
+    assert manager.get_game_state(ids[2]).version > version
@@ -1,6 +1,6 @@
 import pytest
 from unittest.mock import Mock
-from observer_pattern import Subject, Observer
+from observer_pattern import Subject, Observer, GameEvent, GameEventType
 from models import GameState, GameStatus, Player, Card, CardColor, CardType
 from card_facade import CardFacade
 
@@ -124,8 +124,122 @@ def test_observer_interface_requires_update_method():
         Observer()
 
 
-def test_subject_interface_requires_notify_method():
-    """Testa se Subject é uma classe abstrata que requer implementação de notify."""
-    with pytest.raises(TypeError):
-        Subject()
+def test_subject_delivers_only_through_publish(game_state):
+    """Testa se o Subject entrega os eventos só por publish, sem notify a implementar."""
+    from game_manager import GameManager
+
+    subject = Subject()
+    observer = ConcreteObserver()
+    subject.attach(observer)
+    subject.publish(GameEvent(type=GameEventType.GAME_CREATED, game_id=1, version=1, game_state=game_state))
+
+    assert observer.last_game_state is game_state
+    assert not hasattr(subject, "notify") and not hasattr(GameManager(), "notify")
+
+
+
+class EventObserver(Observer):
+    """Observer de testes que registra os eventos tipados recebidos"""
+    def __init__(self):
+        self.events = []
+
+    def update(self, game_state: GameState):
+        pass
+
+    def on_event(self, event: GameEvent):
+        self.events.append(event)
+
+
+def test_publish_respects_game_id_filter(subject):
+    """Testa se um observador filtrado por jogo só recebe eventos daquele jogo."""
+    observer_game_1 = EventObserver()
+    observer_all = EventObserver()
+    subject.attach(observer_game_1, game_id=1)
+    subject.attach(observer_all)
+
+    subject.publish(GameEvent(type=GameEventType.CARD_PLAYED, game_id=1, version=1))
+    subject.publish(GameEvent(type=GameEventType.CARD_PLAYED, game_id=2, version=1))
+
+    assert [e.game_id for e in observer_game_1.events] == [1]
+    assert [e.game_id for e in observer_all.events] == [1, 2]
+
+
+def test_publish_respects_event_type_filter(subject):
+    """Testa se o filtro por tipo de evento é aplicado."""
+    observer = EventObserver()
+    subject.attach(observer, event_types=[GameEventType.GAME_FINISHED])
+
+    subject.publish(GameEvent(type=GameEventType.TURN_PASSED, game_id=1, version=1))
+    subject.publish(GameEvent(type=GameEventType.GAME_FINISHED, game_id=1, version=2))
+
+    assert [e.type for e in observer.events] == [GameEventType.GAME_FINISHED]
+
 
+def test_detach_removes_from_index(subject):
+    """Testa se detach remove o observador do índice de assinaturas."""
+    observer = EventObserver()
+    subject.attach(observer, game_id=7, event_types=[GameEventType.CARD_PLAYED])
+    subject.detach(observer)
+
+    assert subject.subscribers_for(7, GameEventType.CARD_PLAYED) == []
+    assert subject._subscriptions == {}
+
+
+def test_legacy_observer_receives_state_through_events(subject, observer, game_state):
+    """Testa se observadores antigos continuam recebendo o estado completo."""
+    subject.attach(observer)
+    subject.publish(GameEvent(type=GameEventType.GAME_CREATED, game_id=1, version=1, game_state=game_state))
+
+    assert observer.update_count == 1
+    assert observer.last_game_state is game_state
+
+
+def test_game_manager_publishes_typed_deltas():
+    """Testa se o GameManager publica eventos com delta e versão crescente."""
+    from game_manager import GameManager
+
+    manager = GameManager()
+    observer = EventObserver()
+    manager.attach(observer, game_id=1)
+
+    game_id = manager.novo_jogo(quantidade_jogadores=2)
+    manager.novo_jogo(quantidade_jogadores=2)
+    manager.passar_vez(game_id, player_id=0)
+
+    assert [e.type for e in observer.events] == [GameEventType.GAME_CREATED, GameEventType.TURN_PASSED]
+    assert [e.version for e in observer.events] == [1, 2]
+    assert observer.events[1].delta["player_id"] == 0
+    assert observer.events[1].delta["next_player"] == 1
+
+
+@pytest.mark.parametrize("event_type", [
+    GameEventType.GAME_FINISHED, GameEventType.GAME_ABANDONED, GameEventType.GAME_EXPORTED
+])
+def test_game_subscriptions_released_when_game_leaves(subject, event_type):
+    """Testa se as inscrições de um jogo são descartadas quando ele termina ou sai do processo."""
+    game_only = EventObserver()
+    two_games = EventObserver()
+    everything = EventObserver()
+    subject.attach(game_only, game_id=1)
+    subject.attach(two_games, game_id=1, event_types=[GameEventType.CARD_PLAYED, event_type])
+    subject.attach(everything)
+
+    subject.publish(GameEvent(type=event_type, game_id=1, version=5))
+    subject.publish(GameEvent(type=GameEventType.CARD_PLAYED, game_id=1, version=6))
+
+    assert [e.version for e in game_only.events] == [5]
+    assert [e.version for e in two_games.events] == [5]
+    assert [e.version for e in everything.events] == [5, 6]
+    assert list(subject._observers) == [everything]
+    assert list(subject._subscriptions) == [(None, None)]
+
+
+def test_release_keeps_other_games_subscriptions(subject):
+    """Testa se descartar um jogo não mexe nas inscrições dos outros jogos."""
+    observer = EventObserver()
+    subject.attach(observer, game_id=2)
+    subject.publish(GameEvent(type=GameEventType.GAME_FINISHED, game_id=1, version=1))
+    subject.publish(GameEvent(type=GameEventType.CARD_PLAYED, game_id=2, version=1))
+
+    assert [e.game_id for e in observer.events] == [2]
+    assert observer in subject._observers
@@ -0,0 +1,175 @@
+import asyncio
+import multiprocessing
+import time
+from game_manager import GameManager
+from models import CardColor, GameStatus
+from replication import ReplicationFollower, ReplicationPrimary
+from rules import Ruleset
+from snapshot_codec import encode_game
+
+def _play_some_turns(manager, game_id, turns):
+    game = manager.get_game_state(game_id)
+    for _ in range(turns):
+        if game.status != GameStatus.IN_PROGRESS:
+            return
+        seat = game.current_player_index
+        top = game.get_top_discard_card()
+        playable = [i for i, card in enumerate(game.players[seat].hand)
+                    if game.rules.can_play(card, top, game.current_color, game.pending_draw)]
+        if playable:
+            card = game.players[seat].hand[playable[-1]]
+            color = CardColor.BLUE if card.color == CardColor.WILD else None
+            manager.jogar_carta(game_id, seat, playable[-1], color)
+        else:
+            manager.passar_vez(game_id, seat)
+
+def _state(manager):
+    return {game_id: encode_game(game) for game_id, game in manager.games.items()}
+
+async def _wait_for(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "tempo esgotado esperando o seguidor"
+        await asyncio.sleep(0.01)
+
+def _follower_process(address, connection):
+    """Seguidor em outro processo: responde pelo Pipe com o estado e as métricas"""
+    async def main():
+        manager = GameManager()
+        follower = ReplicationFollower(manager, retry_interval=0.01)
+        follower.start(address)
+        while True:
+            await asyncio.sleep(0.005)
+            if not connection.poll():
+                continue
+            command = connection.recv()
+            if command == "promote":
+                follower.promote()
+                game_id = manager.novo_jogo(2)
+                _play_some_turns(manager, game_id, 5)
+                connection.send(game_id)
+            elif command == "stop":
+                return
+            else:
+                connection.send((_state(manager), follower.get_metrics()))
+
+    asyncio.run(main())
+
+def test_follower_process_mirrors_primary(tmp_path):
+    """Testa o seguidor em outro processo chegando ao mesmo estado do primário, byte a byte."""
+    address = str(tmp_path / "replicacao.sock")
+    parent, child = multiprocessing.Pipe()
+
+    async def scenario():
+        manager = GameManager()
+        primary = ReplicationPrimary(manager)
+        manager.attach(primary)
+        await primary.start(address)
+
+        # Jogo anterior à conexão: chega no snapshot inicial
+        early = manager.novo_jogo(3, seed=1)  # semente: não depende dos sorteios dos outros testes
+        _play_some_turns(manager, early, 10)
+
+        process = multiprocessing.get_context("fork").Process(target=_follower_process, args=(address, child))
+        process.start()
+        try:
+            await _wait_for(lambda: primary.get_metrics()["seguidores"] == 1)
+
+            rulesets = [Ruleset(), Ruleset(stacking=True), Ruleset(seven_zero=True),
+                        Ruleset(draw_until_playable=True), Ruleset(seven_zero=True, stacking=True)]
+            games = [manager.novo_jogo(2 + i % 3, ruleset) for i, ruleset in enumerate(rulesets * 4)]
+            for _ in range(30):
+                for game_id in games:
+                    _play_some_turns(manager, game_id, 4)
+                await asyncio.sleep(0)
+            # Partidas longas até algum monte ser reembaralhado (vai como snapshot)
+            while not any(game.deck.reshuffles for game in manager.games.values()):
+                game_id = manager.novo_jogo(2, Ruleset(draw_until_playable=True))
+                _play_some_turns(manager, game_id, 300)
+                await asyncio.sleep(0)
+            manager.encerrar_jogo(early)
+            manager.exportar_jogo(games[0], remover=True)
+
+            expected = _state(manager)
+            assert any(game.deck.reshuffles for game in manager.games.values())
+            assert any(game.status == GameStatus.FINISHED for game in manager.games.values())
+
+            def mirrored():
+                parent.send("state")
+                state, metrics = parent.recv()
+                return state == expected
+
+            await _wait_for(mirrored)
+            parent.send("state")
+            _, metrics = parent.recv()
+            assert metrics["divergencias"] == 0
+            assert metrics["registros_aplicados"] >= primary.get_metrics()["registros_enviados"]
+            assert metrics["snapshots_aplicados"] >= 1
+            assert metrics["atraso_max_ms"] < 10_000
+
+            # Promovido, o seguidor aceita jogadas e continua a numeração dos jogos
+            parent.send("promote")
+            assert parent.recv() == max(expected) + 1
+        finally:
+            parent.send("stop")
+            process.join(5)
+            await primary.stop()
+
+    asyncio.run(scenario())
+
+def test_follower_resyncs_after_reconnect(tmp_path):
+    """Testa a ressincronização pelo snapshot completo quando a conexão cai."""
+    address = str(tmp_path / "replicacao.sock")
+
+    async def scenario():
+        primary_manager = GameManager()
+        primary = ReplicationPrimary(primary_manager)
+        primary_manager.attach(primary)
+        await primary.start(address)
+        follower_manager = GameManager()
+        follower = ReplicationFollower(follower_manager, retry_interval=0.01)
+        follower.start(address)
+
+        game_id = primary_manager.novo_jogo(2)
+        await _wait_for(lambda: follower.connected and game_id in follower_manager.games)
+
+        # Enquanto a conexão está caída, o primário segue jogando
+        await primary.stop()
+        await _wait_for(lambda: not follower.connected)
+        _play_some_turns(primary_manager, game_id, 8)
+        other = primary_manager.novo_jogo(3)
+        await primary.start(address)
+
+        await _wait_for(lambda: _state(follower_manager) == _state(primary_manager))
+        assert follower.get_metrics()["conexoes"] >= 2
+        assert other in follower_manager.games
+
+        follower.promote()
+        await primary.stop()
+
+    asyncio.run(scenario())
+
+def test_slow_follower_is_dropped(tmp_path):
+    """Testa o descarte do seguidor cujo buffer de envio passa do limite."""
+    address = str(tmp_path / "replicacao.sock")
+
+    async def scenario():
+        manager = GameManager()
+        primary = ReplicationPrimary(manager, max_buffer=0)
+        manager.attach(primary)
+        await primary.start(address)
+        reader, writer = await asyncio.open_unix_connection(address)
+        await _wait_for(lambda: primary.get_metrics()["seguidores"] == 1)
+
+        # Sem ler nada, o seguidor deixa dados pendentes no buffer do primário
+        for _ in range(2000):
+            manager.novo_jogo(10, modo_festa=True)
+            if primary.get_metrics()["seguidores_descartados"]:
+                break
+            await asyncio.sleep(0)
+        assert primary.get_metrics()["seguidores_descartados"] == 1
+        assert primary.get_metrics()["seguidores"] == 0
+        writer.close()
+        await primary.stop()
+
+    asyncio.run(scenario())
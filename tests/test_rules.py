@@ -0,0 +1,141 @@
+import pytest
+from game_manager import GameManager
+from models import Card, CardColor, CardType, GameStatus
+from card_catalog import CARD_FACES, PLAYABLE_COLORS
+from card_effects import NumberCardEffect
+from rules import (
+    Ruleset, STANDARD, compile_ruleset, parse_ruleset, standard_can_play
+)
+
+def _card(card_id, color, card_type, value=None):
+    return Card(id=card_id, color=color, type=card_type, value=value, effect_strategy=NumberCardEffect())
+
+def _new_game(ruleset, players=3):
+    manager = GameManager()
+    game_id = manager.novo_jogo(quantidade_jogadores=players, ruleset=ruleset)
+    game = manager.get_game_state(game_id)
+    top = game.get_top_discard_card()
+    game.current_color = top.color
+    return manager, game_id, game, top
+
+def test_compiled_table_matches_reference_rule():
+    """Testa a tabela compilada contra a regra de referência em todas as combinações."""
+    engine = compile_ruleset(STANDARD)
+    samples = [Card(id=i, color=c, type=t, value=v) for i, (c, t, v) in enumerate(CARD_FACES)]
+    for card in samples:
+        for top in samples:
+            for color in PLAYABLE_COLORS + (None, CardColor.WILD):
+                assert engine.can_play(card, top, color) == standard_can_play(card, top, color)
+
+def test_compile_is_cached_per_ruleset():
+    """Testa se cada Ruleset é compilado uma única vez."""
+    assert compile_ruleset(Ruleset(stacking=True)) is compile_ruleset(Ruleset(stacking=True))
+    assert compile_ruleset(STANDARD) is not compile_ruleset(Ruleset(stacking=True))
+
+def test_parse_ruleset():
+    """Testa a leitura das variantes a partir da query string."""
+    assert parse_ruleset(None) == STANDARD
+    assert parse_ruleset("stacking, jump_in") == Ruleset(stacking=True, jump_in=True)
+    with pytest.raises(ValueError, match="Regra desconhecida"):
+        parse_ruleset("sem_regras")
+
+def test_stacking_accumulates_and_target_draws_total():
+    """Testa o acúmulo de +2 e a compra do total por quem passa."""
+    manager, game_id, game, top = _new_game(Ruleset(stacking=True))
+    game.players[0].hand.insert(0, _card(900, top.color, CardType.DRAW_TWO))
+    game.players[1].hand.insert(0, _card(901, top.color, CardType.DRAW_TWO))
+    hand_before = len(game.players[2].hand)
+
+    manager.jogar_carta(game_id, 0, 0)
+    assert game.pending_draw == 2
+    assert game.current_player_index == 1
+
+    result = manager.jogar_carta(game_id, 1, 0)
+    assert result["effect"]["pending_draw"] == 4
+
+    # Com compra pendente, só +2/+4 podem ser jogados
+    game.players[2].hand.insert(0, _card(902, top.color, CardType.NUMBER, 3))
+    with pytest.raises(ValueError, match="compra acumulada"):
+        manager.jogar_carta(game_id, 2, 0)
+
+    manager.passar_vez(game_id, 2)
+    assert len(game.players[2].hand) == hand_before + 1 + 4
+    assert game.pending_draw == 0
+    assert game.current_player_index == 0
+
+def test_seven_swaps_hands_with_target():
+    """Testa a troca de mãos ao jogar um 7 na regra 7-0."""
+    manager, game_id, game, top = _new_game(Ruleset(seven_zero=True))
+    game.players[0].hand.insert(0, _card(900, top.color, CardType.NUMBER, 7))
+    hand_2 = game.players[2].hand
+
+    result = manager.jogar_carta(game_id, 0, 0, target_player=2)
+
+    assert result["effect"]["effect"] == "swap_hands"
+    assert game.players[0].hand is hand_2
+
+def test_zero_rotates_hands():
+    """Testa se o 0 passa todas as mãos no sentido do jogo."""
+    manager, game_id, game, top = _new_game(Ruleset(seven_zero=True))
+    game.players[0].hand.insert(0, _card(900, top.color, CardType.NUMBER, 0))
+    hands = [player.hand for player in game.players]
+
+    manager.jogar_carta(game_id, 0, 0)
+
+    assert game.players[1].hand is hands[0]
+    assert game.players[2].hand is hands[1]
+    assert game.players[0].hand is hands[2]
+
+def test_jump_in_with_identical_card():
+    """Testa o jump-in: carta idêntica ao topo joga fora da vez."""
+    manager, game_id, game, top = _new_game(Ruleset(jump_in=True))
+    game.players[2].hand.insert(0, _card(900, top.color, top.type, top.value))
+
+    manager.jogar_carta(game_id, 2, 0)
+
+    assert game.current_player_index == 0
+
+def test_rejected_jump_in_keeps_turn():
+    """Testa se um jump-in recusado por outra validação não toma a vez."""
+    manager, game_id, game, top = _new_game(Ruleset(seven_zero=True, jump_in=True))
+    game.players[2].hand.insert(0, _card(900, top.color, top.type, top.value))
+    version = game.version
+
+    with pytest.raises(ValueError, match="Jogador não encontrado"):
+        manager.jogar_carta(game_id, 2, 0, None, 99)
+
+    assert game.current_player_index == 0
+    assert game.version == version
+
+@pytest.mark.parametrize("value", [7, 0])
+def test_last_card_seven_zero_wins(value):
+    """Testa se 7 ou 0 como última carta encerra o jogo, sem passar a mão vazia adiante."""
+    manager, game_id, game, top = _new_game(Ruleset(seven_zero=True), players=2)
+    game.players[0].hand = [_card(900, top.color, CardType.NUMBER, value)]
+    other_hand = game.players[1].hand
+
+    manager.jogar_carta(game_id, 0, 0)
+
+    assert game.status == GameStatus.FINISHED
+    assert game.winner == 0
+    assert game.players[0].hand == [] and game.players[1].hand is other_hand
+
+def test_jump_in_disabled_in_standard_rules():
+    """Testa se sem a variante a carta idêntica não fura a vez."""
+    manager, game_id, game, top = _new_game(STANDARD)
+    game.players[2].hand.insert(0, _card(900, top.color, top.type, top.value))
+
+    with pytest.raises(ValueError, match="Não é a vez deste jogador"):
+        manager.jogar_carta(game_id, 2, 0)
+
+def test_draw_until_playable_keeps_turn():
+    """Testa se, ao comprar uma carta jogável, a vez continua com o jogador."""
+    manager, game_id, game, top = _new_game(Ruleset(draw_until_playable=True))
+    game.deck.push(_card(900, top.color, CardType.NUMBER, 1))
+    game.deck.push(_card(901, CardColor.WILD if top.color != CardColor.WILD else CardColor.RED, CardType.NUMBER, 99))
+
+    result = manager.passar_vez(game_id, 0)
+
+    assert result["card_bought"].count(",") == 1
+    assert result["next_player"] == 0
+    assert game.status == GameStatus.IN_PROGRESS
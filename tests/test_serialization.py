@@ -0,0 +1,42 @@
+import json
+import pytest
+from models import Card, CardColor, CardType
+from card_catalog import face_code
+import serialization
+from serialization import (
+    JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, negotiate, render, hand_payload
+)
+
+HAND = [
+    Card(id=1, color=CardColor.RED, type=CardType.NUMBER, value=5),
+    Card(id=2, color=CardColor.WILD, type=CardType.WILD)
+]
+
+def test_negotiate_defaults_to_json():
+    """Testa se sem Accept (ou com */*) a resposta é JSON."""
+    assert negotiate(None) == JSON_MEDIA_TYPE
+    assert negotiate("*/*") == JSON_MEDIA_TYPE
+
+def test_render_json_uses_card_names():
+    """Testa se o JSON rápido envia os nomes das cartas."""
+    content, media_type = render(lambda compact: hand_payload(1, 0, HAND, compact), "application/json")
+
+    assert media_type == JSON_MEDIA_TYPE
+    assert json.loads(content)["cards"] == ["RED_5", "WILD_WILD"]
+
+def test_render_msgpack_uses_card_codes():
+    """Testa se o MessagePack envia os códigos inteiros do catálogo."""
+    msgpack = pytest.importorskip("msgpack")
+    content, media_type = render(
+        lambda compact: hand_payload(1, 0, HAND, compact),
+        "application/x-msgpack;q=1.0, application/json;q=0.5"
+    )
+
+    assert media_type == MSGPACK_MEDIA_TYPE
+    assert msgpack.unpackb(content)["cards"] == [face_code(card) for card in HAND]
+
+def test_msgpack_not_offered_when_unavailable(monkeypatch):
+    """Testa se, sem o pacote msgpack, a negociação cai para JSON."""
+    monkeypatch.setattr(serialization, "msgpack", None)
+
+    assert negotiate(MSGPACK_MEDIA_TYPE) == JSON_MEDIA_TYPE
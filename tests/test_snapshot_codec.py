@@ -0,0 +1,160 @@
+import time
+import pytest
+from game_manager import GameManager, VersionConflictError
+from models import Card, CardColor, CardType, GameStatus
+from observer_pattern import GameEventType, Observer
+from rules import Ruleset
+from snapshot_codec import SnapshotFormatError, decode_game, encode_game
+from turn_timeouts import TurnTimeoutService
+from timing_wheel import HierarchicalTimingWheel
+
+class EventRecorder(Observer):
+    def __init__(self):
+        self.types = []
+
+    def update(self, game_state):
+        pass
+
+    def on_event(self, event):
+        self.types.append(event.type)
+
+def _observable(game):
+    return (
+        game.id, game.version, game.status, game.current_player_index, game.winner,
+        game.play_direction, game.current_color, game.pending_draw, game.rules.ruleset,
+        [(c.id, str(c)) for c in game.deck], [(c.id, str(c)) for c in game.discard_pile],
+        [(p.id, p.account_id, [(c.id, str(c)) for c in p.hand]) for p in game.players],
+        game.deck.reshuffles
+    )
+
+def _play_some_turns(manager, game_id, turns):
+    game = manager.get_game_state(game_id)
+    for _ in range(turns):
+        if game.status != GameStatus.IN_PROGRESS:
+            return
+        seat = game.current_player_index
+        top = game.get_top_discard_card()
+        playable = [i for i, card in enumerate(game.players[seat].hand)
+                    if game.rules.can_play(card, top, game.current_color, game.pending_draw)]
+        if playable:
+            card = game.players[seat].hand[playable[0]]
+            color = CardColor.RED if card.color == CardColor.WILD else None
+            manager.jogar_carta(game_id, seat, playable[0], color)
+        else:
+            manager.passar_vez(game_id, seat)
+
+def test_round_trip_is_compact():
+    """Testa se o snapshot reconstrói o jogo inteiro em poucas centenas de bytes."""
+    manager = GameManager()
+    game_id = manager.novo_jogo(3, Ruleset(stacking=True), player_ids=["ana", None, "bia"])
+    _play_some_turns(manager, game_id, 15)
+    game = manager.get_game_state(game_id)
+
+    data = encode_game(game)
+    restored = decode_game(data)
+
+    assert len(data) < 200
+    assert _observable(restored) == _observable(game)
+    assert all(card.effect_strategy is not None for card in restored.players[0].hand)
+
+def test_party_mode_uses_wide_ids():
+    """Testa ids de 2 bytes quando o jogo une vários baralhos."""
+    manager = GameManager()
+    game = manager.get_game_state(manager.novo_jogo(30, modo_festa=True))
+    restored = decode_game(encode_game(game))
+    assert max(card.id for card in game.deck) > 255
+    assert _observable(restored) == _observable(game)
+
+def test_invalid_snapshots_are_rejected():
+    """Testa a recusa de bytes truncados, de outro formato ou de cartas fora do baralho."""
+    manager = GameManager()
+    game = manager.get_game_state(manager.novo_jogo(2))
+    data = encode_game(game)
+    for bad in (data[:-1], data + b"\x00", b"XX" + data[2:], data[:2] + b"\x09" + data[3:]):
+        with pytest.raises(SnapshotFormatError):
+            decode_game(bad)
+
+    game.players[0].hand.append(Card(id=900, color=CardColor.RED, type=CardType.NUMBER, value=3))
+    with pytest.raises(ValueError):
+        encode_game(game)
+
+def test_live_migration_keeps_turn_and_version():
+    """Testa mover um jogo em andamento para outro GameManager sem perder a vez."""
+    source, target = GameManager(), GameManager()
+    recorder = EventRecorder()
+    target.attach(recorder)
+    game_id = source.novo_jogo(2)
+    _play_some_turns(source, game_id, 6)
+    before = _observable(source.get_game_state(game_id))
+    version = source.get_game_state(game_id).version
+
+    data = source.exportar_jogo(game_id, remover=True)
+    assert source.get_game_state(game_id) is None
+    assert target.importar_jogo(data) == game_id
+    moved = target.get_game_state(game_id)
+    assert _observable(moved) == before
+    assert recorder.types == [GameEventType.GAME_IMPORTED]
+
+    with pytest.raises(VersionConflictError):
+        target.passar_vez(game_id, moved.current_player_index, version - 1)
+    target.passar_vez(game_id, moved.current_player_index, version)
+    assert moved.version == version + 1
+    assert target.novo_jogo(2) == game_id + 1
+
+    with pytest.raises(ValueError, match="Já existe"):
+        target.importar_jogo(data)
+
+def test_export_cancels_timers_and_import_schedules_them():
+    """Testa se os prazos saem com o jogo exportado e começam no destino."""
+    source, target = GameManager(), GameManager()
+    source_timeouts = TurnTimeoutService(source, HierarchicalTimingWheel(tick=1))
+    target_timeouts = TurnTimeoutService(target, HierarchicalTimingWheel(tick=1))
+    source.attach(source_timeouts)
+    target.attach(target_timeouts)
+    game_id = source.novo_jogo(2)
+
+    target.importar_jogo(source.exportar_jogo(game_id, remover=True))
+    assert game_id not in source_timeouts._turn_timers
+    assert game_id in target_timeouts._turn_timers
+
+def test_codec_speed():
+    """Testa se codificar e decodificar um jogo leva microssegundos."""
+    manager = GameManager()
+    game = manager.get_game_state(manager.novo_jogo(4))
+    started = time.perf_counter()
+    for _ in range(200):
+        decode_game(encode_game(game))
+    assert (time.perf_counter() - started) / 200 < 0.002
+
+def _play_without_finishing(manager, game_id, turns):
+    """Joga só enquanto a mão tem mais de duas cartas: o jogo dura e o monte é refeito"""
+    game = manager.get_game_state(game_id)
+    for _ in range(turns):
+        seat = game.current_player_index
+        hand = game.players[seat].hand
+        top = game.get_top_discard_card()
+        playable = [i for i, card in enumerate(hand)
+                    if game.rules.can_play(card, top, game.current_color, game.pending_draw)]
+        if playable and len(hand) > 2:
+            color = CardColor.RED if hand[playable[0]].color == CardColor.WILD else None
+            manager.jogar_carta(game_id, seat, playable[0], color)
+        else:
+            manager.passar_vez(game_id, seat)
+
+def test_seeded_game_stays_reproducible_after_migration():
+    """Testa se um jogo com semente embaralha o descarte igual depois de exportado e importado."""
+    original, source, target = GameManager(), GameManager(), GameManager()
+    game_id = original.novo_jogo(4, seed=7)
+    assert source.novo_jogo(4, seed=7) == game_id
+    _play_without_finishing(original, game_id, 150)
+    _play_without_finishing(source, game_id, 150)
+
+    data = source.exportar_jogo(game_id, remover=True)
+    target.importar_jogo(data)
+    assert target.get_game_state(game_id).deck.seed == 7
+    reshuffles = original.get_game_state(game_id).deck.reshuffles
+    _play_without_finishing(original, game_id, 600)
+    _play_without_finishing(target, game_id, 600)
+
+    assert original.get_game_state(game_id).deck.reshuffles > reshuffles
+    assert _observable(target.get_game_state(game_id)) == _observable(original.get_game_state(game_id))
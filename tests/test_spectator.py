@@ -0,0 +1,111 @@
+import asyncio
+import json
+import pytest
+from game_manager import GameManager
+from spectator import KEEPALIVE_FRAME, SpectatorHub
+
+def _setup(players=2):
+    manager = GameManager()
+    hub = SpectatorHub(manager)
+    manager.attach(hub)
+    return manager, hub, manager.novo_jogo(quantidade_jogadores=players)
+
+def _data(frame):
+    return json.loads(frame.split(b"data: ", 1)[1])
+
+def test_frame_is_serialized_once_for_all_spectators():
+    """Testa se todos os espectadores recebem o mesmo buffer, serializado uma vez por versão."""
+    manager, hub, game_id = _setup()
+
+    async def scenario():
+        streams = [hub.subscribe(game_id) for _ in range(1000)]
+        first = [await anext(stream) for stream in streams]
+        manager.passar_vez(game_id, 0)
+        second = [await anext(stream) for stream in streams]
+        for stream in streams:
+            await stream.aclose()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert all(frame is first[0] for frame in first)
+    assert all(frame is second[0] for frame in second)
+    assert hub.frames_built == 2
+    assert hub.get_metrics()["eventos_enviados"] == 2000
+    assert hub.get_metrics()["jogos_assistidos"] == 0
+
+def test_public_view_has_no_cards():
+    """Testa se a visão pública traz só o tamanho das mãos."""
+    manager, hub, game_id = _setup(3)
+    game = manager.get_game_state(game_id)
+
+    async def scenario():
+        stream = hub.subscribe(game_id)
+        frame = await anext(stream)
+        await stream.aclose()
+        return frame
+
+    frame = asyncio.run(scenario())
+    payload = _data(frame)
+    assert frame.startswith(b"id: %d\nevent: estado\n" % game.version)
+    assert payload["hand_sizes"] == [5, 5, 5]
+    assert set(payload) == {
+        "game_id", "version", "status", "current_player", "direction", "current_color",
+        "top_discard_card", "pending_draw", "deck_size", "hand_sizes", "winner"
+    }
+
+def test_slow_spectator_skips_intermediate_versions():
+    """Testa se um espectador lento recebe direto a versão mais recente."""
+    manager, hub, game_id = _setup()
+    game = manager.get_game_state(game_id)
+
+    async def scenario():
+        stream = hub.subscribe(game_id)
+        await anext(stream)
+        for _ in range(5):
+            manager.passar_vez(game_id, game.current_player_index)
+        frame = await anext(stream)
+        await stream.aclose()
+        return frame
+
+    frame = asyncio.run(scenario())
+    assert _data(frame)["version"] == game.version
+    assert hub.versions_skipped == 4
+    assert hub.frames_built == 2
+
+def test_stream_ends_with_final_state():
+    """Testa se o fluxo entrega o estado final e termina quando o jogo é encerrado."""
+    manager, hub, game_id = _setup()
+
+    async def scenario():
+        stream = hub.subscribe(game_id)
+        await anext(stream)
+        waiting = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+        manager.encerrar_jogo(game_id)
+        final = await waiting
+        with pytest.raises(StopAsyncIteration):
+            await anext(stream)
+        return final
+
+    final = asyncio.run(scenario())
+    assert _data(final)["status"] == "ABANDONED"
+    assert hub.spectators(game_id) == 0
+
+def test_keepalive_and_unknown_game():
+    """Testa o comentário de keepalive e a recusa de jogos inexistentes."""
+    manager, hub, game_id = _setup()
+
+    async def scenario():
+        stream = hub.subscribe(game_id)
+        await anext(stream)
+        waiting = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+        assert hub.spectators(game_id) == 1
+        hub.keepalive()
+        frame = await waiting
+        await stream.aclose()
+        return frame
+
+    assert asyncio.run(scenario()) == KEEPALIVE_FRAME
+    with pytest.raises(ValueError):
+        hub.subscribe(999)
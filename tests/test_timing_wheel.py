@@ -0,0 +1,153 @@
+import random
+from game_manager import GameManager
+from match_tracker import MatchTracker
+from models import GameStatus
+from observer_pattern import Observer, GameEventType
+from timing_wheel import HierarchicalTimingWheel
+from turn_timeouts import TurnTimeoutService
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class EventRecorder(Observer):
+    def __init__(self):
+        self.events = []
+
+    def update(self, game_state):
+        pass
+
+    def on_event(self, event):
+        self.events.append(event)
+
+def _wheel(clock, **kwargs):
+    return HierarchicalTimingWheel(tick=1.0, wheel_size=8, levels=3, clock=clock, **kwargs)
+
+def test_timers_fire_at_their_tick_across_levels():
+    """Testa se temporizadores de todos os níveis disparam no tick exato."""
+    clock = FakeClock()
+    wheel = _wheel(clock)
+    fired = []
+    delays = random.Random(7).sample(range(1, 600), 80)
+    for delay in delays:
+        wheel.schedule(delay, lambda d: fired.append((d, wheel.current_tick)), delay)
+
+    for second in range(1, 601):
+        clock.now = second
+        wheel.advance()
+
+    assert sorted(fired) == sorted((d, d) for d in delays)
+    assert len(wheel) == 0
+
+def test_cancel_is_removed_and_never_fires():
+    """Testa se um temporizador cancelado não dispara."""
+    clock = FakeClock()
+    wheel = _wheel(clock)
+    fired = []
+    timer = wheel.schedule(100, fired.append, "a")
+    wheel.schedule(100, fired.append, "b")
+
+    assert wheel.cancel(timer)
+    assert not wheel.cancel(timer)
+    assert wheel.advance(200.0) == 1
+    assert fired == ["b"]
+
+def test_callback_can_cancel_timer_due_on_same_tick():
+    """Testa se um callback cancelando outro vencido no mesmo tick é respeitado."""
+    clock = FakeClock()
+    wheel = _wheel(clock)
+    fired = []
+    second = None
+    wheel.schedule(5, lambda: (fired.append("primeiro"), wheel.cancel(second)))
+    second = wheel.schedule(5, fired.append, "segundo")
+
+    wheel.advance(5.0)
+    assert fired in (["primeiro"], ["segundo"])
+    assert len(wheel) == 0
+
+def test_delay_beyond_span_is_kept_until_due():
+    """Testa se atrasos além do alcance da roda são reposicionados até vencer."""
+    clock = FakeClock()
+    wheel = _wheel(clock)  # alcance de 8**3 = 512 ticks
+    fired = []
+    wheel.schedule(1500, fired.append, "longo")
+
+    wheel.advance(1499.0)
+    assert fired == []
+    wheel.advance(1500.0)
+    assert fired == ["longo"]
+
+def _service(turn_timeout=10, idle_timeout=25):
+    clock = FakeClock()
+    manager = GameManager()
+    service = TurnTimeoutService(manager, _wheel(clock), turn_timeout, idle_timeout)
+    manager.attach(service)
+    return clock, manager, service
+
+def test_turn_timeout_passes_turn_automatically():
+    """Testa se o prazo da vez esgotado passa a vez e publica TURN_TIMED_OUT."""
+    clock, manager, service = _service()
+    game_id = manager.novo_jogo(quantidade_jogadores=3)
+    game = manager.games[game_id]
+    hand_size = len(game.players[0].hand)
+    observer = EventRecorder()
+    manager.attach(observer, event_types=[GameEventType.TURN_TIMED_OUT])
+
+    service.tick(9.0)
+    assert game.current_player_index == 0
+    service.tick(10.0)
+
+    assert game.current_player_index == 1
+    assert len(game.players[0].hand) == hand_size + 1
+    assert [e.delta["player_id"] for e in observer.events] == [0]
+    assert service.turns_timed_out == 1
+
+def test_player_move_resets_turn_deadline():
+    """Testa se uma jogada do jogador reinicia o prazo da vez."""
+    clock, manager, service = _service()
+    game_id = manager.novo_jogo(quantidade_jogadores=2)
+    game = manager.games[game_id]
+
+    service.tick(8.0)
+    manager.passar_vez(game_id, 0)
+    service.tick(15.0)
+
+    assert game.current_player_index == 1
+    assert service.turns_timed_out == 0
+
+def test_idle_game_is_reaped():
+    """Testa se um jogo sem jogadas é encerrado como abandonado e removido."""
+    clock, manager, service = _service(turn_timeout=10, idle_timeout=25)
+    tracker = MatchTracker()
+    manager.attach(tracker)
+    game_id = manager.novo_jogo(quantidade_jogadores=2)
+    game = manager.games[game_id]
+
+    service.tick(24.0)
+    assert game_id in manager.games
+    service.tick(25.0)
+
+    assert game_id not in manager.games
+    assert game.status == GameStatus.ABANDONED
+    assert game_id in tracker.games_finished
+    assert service.turns_timed_out == 2
+    assert service.games_reaped == 1
+    assert len(service) == 0
+    assert len(service.wheel) == 0
+
+def test_finished_game_cancels_timers():
+    """Testa se GAME_FINISHED cancela os temporizadores do jogo."""
+    clock, manager, service = _service()
+    game_id = manager.novo_jogo(quantidade_jogadores=2)
+    game = manager.games[game_id]
+    game.players[0].hand = game.players[0].hand[:1]
+    top = game.get_top_discard_card()
+    game.players[0].hand[0] = top
+
+    manager.jogar_carta(game_id, 0, 0)
+
+    assert game.status == GameStatus.FINISHED
+    assert len(service.wheel) == 0
@@ -0,0 +1,62 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+import main
+from replay_traffic import _replay_in_process, mismatches, recorded_summary, route_of
+from traffic_recorder import TrafficFormatError, TrafficRecord, encode_record, read_traffic
+
+def _record_session(path):
+    """Alguns jogos v1 e v2 com leituras e jogadas, gravados pelo middleware."""
+    with TestClient(main.create_app({"UNO_TRAFFIC_RECORD": str(path)})) as client:
+        for players in (2, 3, 4):
+            game_id = client.get("/novoJogo", params={"quantidadeJog": players}).json()["game_id"]
+            for _ in range(6):
+                current = client.get(f"/jogo/{game_id}/jogador_da_vez").json()["current_player"]
+                client.get(f"/jogo/{game_id}/jogador/{current}")
+                client.put(f"/jogo/{game_id}/passa", params={"id_jogador": current})
+            client.get(f"/debug/jogo/{game_id}")
+        v2_game = client.post("/v2/jogos", params={"jogadores": 2, "semente": 7}).json()["id"]
+        client.get(f"/v2/jogos/{v2_game}/vez")
+        client.get("/memoria/metricas")
+        client.get("/jogo/999/jogador_da_vez")
+    return read_traffic(str(path))[1]
+
+def test_records_requests_with_seeds(tmp_path):
+    """Testa a gravação das requisições e das sementes dos jogos criados."""
+    records = _record_session(tmp_path / "trafego.bin")
+
+    assert len(records) == 3 * 20 + 4
+    created = [r for r in records if r.target.startswith("/novoJogo")]
+    assert all("semente=" in r.target for r in created)
+    assert [r.target for r in records if r.target.startswith("/v2/jogos?")] == ["/v2/jogos?jogadores=2&semente=7"]
+    assert records[-1].status == 404
+    assert [r.offset for r in records] == sorted(r.offset for r in records)
+    assert recorded_summary(records)["rotas"]["/jogo/{id}/passa"]["n"] == 18
+
+def test_replay_reproduces_responses(tmp_path):
+    """Testa se a reprodução com as sementes gravadas devolve as mesmas respostas."""
+    records = _record_session(tmp_path / "trafego.bin")
+
+    results, _ = asyncio.run(_replay_in_process(records, speed=0))
+    assert mismatches(records, results) == []
+
+    # Sem as sementes os jogos são outros e as mãos deixam de bater
+    unseeded = [r._replace(target=r.target.split("&semente=")[0]) for r in records]
+    results, _ = asyncio.run(_replay_in_process(unseeded, speed=0))
+    assert any(route_of(records[i].target) == "/jogo/{id}/jogador/{id}" for i in mismatches(records, results))
+
+def test_log_format(tmp_path):
+    """Testa a leitura do formato, o corte de registro incompleto e arquivos inválidos."""
+    path = tmp_path / "trafego.bin"
+    _record_session(path)
+    data = path.read_bytes()
+    record = TrafficRecord(1.5, 0.25, 201, b"12345678", "POST", "/jogos/importar",
+                           (("content-type", "application/x-uno-snapshot"),), b"\x00\x01")
+    path.write_bytes(data + encode_record(record))
+    assert read_traffic(str(path))[1][-1] == record
+
+    path.write_bytes(data + encode_record(record)[:-1])
+    assert read_traffic(str(path))[1][-1] != record
+    path.write_bytes(b"XX" + data[2:])
+    with pytest.raises(TrafficFormatError):
+        read_traffic(str(path))
@@ -0,0 +1,89 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from card_catalog import CARD_FACES, PLAYABLE_COLORS, face_code
+from card_facade import CardFacade
+from models import Card
+from rules import Ruleset
+from training_env import (
+    ACTIONS, N_ACTIONS, OBS_COLOR, OBS_HAND, OBS_HAND_SIZES, OBS_TOP, PASS_ACTION, VectorEnv, observation_size
+)
+
+def _random_actions(rng, masks):
+    return (rng.random(masks.shape) * masks).argmax(axis=1)
+
+def _card(code):
+    color, card_type, value = CARD_FACES[code]
+    return Card(id=code, color=color, type=card_type, value=value)
+
+def test_reset_fills_buffers():
+    """Testa o formato das observações e o início das partidas."""
+    env = VectorEnv(8, player_count=3)
+    observations, masks = env.reset(seed=1)
+
+    assert observations.shape == (8, observation_size(3))
+    assert masks.shape == (8, N_ACTIONS)
+    assert masks[:, PASS_ACTION].all()
+    assert (observations[:, OBS_HAND:OBS_HAND + len(CARD_FACES)].sum(axis=1) == 5).all()
+    assert (observations[:, OBS_HAND_SIZES:] == 5).all()
+    assert (observations[:, OBS_TOP:OBS_TOP + len(CARD_FACES)].sum(axis=1) == 1).all()
+
+def test_masks_match_card_facade():
+    """Testa se a máscara libera exatamente as cartas que CardFacade.can_play_card aceita."""
+    env = VectorEnv(16, player_count=2)
+    observations, masks = env.reset(seed=2)
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        for row, mask in zip(observations, masks):
+            top = _card(int(row[OBS_TOP:OBS_TOP + len(CARD_FACES)].argmax()))
+            slot = int(row[OBS_COLOR:OBS_COLOR + 6].argmax())
+            color = PLAYABLE_COLORS[slot] if slot < len(PLAYABLE_COLORS) else top.color
+            for code in np.flatnonzero(row[OBS_HAND:OBS_HAND + len(CARD_FACES)]):
+                card = _card(int(code))
+                expected = CardFacade.can_play_card(card, top, color)
+                allowed = [mask[a] for a, (face, _) in enumerate(ACTIONS) if face == face_code(card)]
+                assert all(allowed) == expected and any(allowed) == expected
+        observations, masks, _, _ = env.step(_random_actions(rng, masks))
+
+def test_episodes_finish_with_rewards():
+    """Testa se as partidas terminam, dão recompensa e recomeçam sozinhas."""
+    env = VectorEnv(32, player_count=2)
+    _, masks = env.reset(seed=3)
+    rng = np.random.default_rng(1)
+    total_rewards = []
+    for _ in range(200):
+        _, masks, rewards, dones = env.step(_random_actions(rng, masks))
+        assert (rewards[~dones] == 0).all()
+        total_rewards.extend(rewards[dones])
+    assert env.episodes == len(total_rewards) > 0
+    assert set(total_rewards) <= {-1.0, 0.0, 1.0}
+    assert 1.0 in total_rewards
+
+def test_illegal_action_is_rejected():
+    """Testa se ações fora da máscara são recusadas sem avançar as partidas."""
+    env = VectorEnv(4)
+    observations, masks = env.reset(seed=4)
+    before = observations.copy()
+    illegal = np.flatnonzero(~masks[0])[0]
+    actions = np.full(4, PASS_ACTION)
+    actions[0] = illegal
+    with pytest.raises(ValueError):
+        env.step(actions)
+    assert (env.observations == before).all()
+    assert env.steps == 0
+
+def test_workers_match_single_process():
+    """Testa se dividir as partidas entre processos dá o mesmo resultado (memória compartilhada)."""
+    results = []
+    for workers in (0, 2):
+        with VectorEnv(6, player_count=3, ruleset=Ruleset(stacking=True), workers=workers) as env:
+            observations, masks = env.reset(seed=5)
+            rng = np.random.default_rng(2)
+            rewards_seen = []
+            for _ in range(50):
+                observations, masks, rewards, _ = env.step(_random_actions(rng, masks))
+                rewards_seen.append(rewards.copy())
+            results.append((observations.copy(), np.array(rewards_seen)))
+    assert (results[0][0] == results[1][0]).all()
+    assert (results[0][1] == results[1][1]).all()
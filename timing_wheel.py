@@ -0,0 +1,126 @@
+import math
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+class Timer:
+    """Temporizador agendado na roda; guarda o slot onde está para cancelar em O(1)"""
+    __slots__ = ("expire_tick", "callback", "args", "_slot")
+
+    def __init__(self, expire_tick: int, callback: Callable[..., Any], args: tuple):
+        self.expire_tick = expire_tick
+        self.callback = callback
+        self.args = args
+        self._slot: Optional[Dict['Timer', None]] = None
+
+    @property
+    def active(self) -> bool:
+        return self._slot is not None
+
+
+class HierarchicalTimingWheel:
+    """
+    Roda de tempo hierárquica (estilo Varghese & Lauck / kernel Linux).
+
+    Cada nível tem `wheel_size` slots; o nível 0 avança um slot por tick e
+    cada nível acima cobre `wheel_size` vezes o intervalo do anterior.
+    Agendar e cancelar são O(1) (slots são dicts); ao virar um nível, os
+    temporizadores do slot superior descem ("cascata") para o nível certo.
+    """
+
+    def __init__(self, tick: float = 0.1, wheel_size: int = 64, levels: int = 4,
+                 clock: Callable[[], float] = time.monotonic):
+        if wheel_size & (wheel_size - 1):
+            raise ValueError("wheel_size deve ser potência de 2")
+        self.tick = tick
+        self.clock = clock
+        self._bits = wheel_size.bit_length() - 1
+        self._mask = wheel_size - 1
+        self._levels: List[List[Dict[Timer, None]]] = [
+            [{} for _ in range(wheel_size)] for _ in range(levels)
+        ]
+        self._span = wheel_size ** levels  # alcance máximo em ticks
+        self._origin = clock()
+        self.current_tick = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Quantidade de temporizadores ativos"""
+        return self._count
+
+    def _place(self, timer: Timer) -> None:
+        delay = timer.expire_tick - self.current_tick
+        if delay < 0:
+            delay = 0
+        elif delay >= self._span:
+            delay = self._span - 1  # reposicionado nas cascatas seguintes
+        expire = self.current_tick + delay
+        level = 0
+        while delay >> (self._bits * (level + 1)):
+            level += 1
+        slot = self._levels[level][(expire >> (self._bits * level)) & self._mask]
+        slot[timer] = None
+        timer._slot = slot
+
+    def schedule(self, delay: float, callback: Callable[..., Any], *args) -> Timer:
+        """Agenda `callback(*args)` para daqui a `delay` segundos (mínimo um tick)"""
+        ticks = max(1, math.ceil(delay / self.tick))
+        timer = Timer(self.current_tick + ticks, callback, args)
+        self._place(timer)
+        self._count += 1
+        return timer
+
+    def cancel(self, timer: Optional[Timer]) -> bool:
+        """Cancela o temporizador; retorna False se ele já disparou ou foi cancelado"""
+        if timer is None or timer._slot is None:
+            return False
+        del timer._slot[timer]
+        timer._slot = None
+        self._count -= 1
+        return True
+
+    def _cascade(self, level: int) -> None:
+        """Redistribui o slot atual do `level` nos níveis inferiores"""
+        index = (self.current_tick >> (self._bits * level)) & self._mask
+        slot = self._levels[level][index]
+        if not slot:
+            return
+        self._levels[level][index] = {}
+        for timer in slot:
+            self._place(timer)
+
+    def _step(self) -> List[Timer]:
+        """Avança um tick e retorna os temporizadores vencidos"""
+        self.current_tick += 1
+        tick = self.current_tick
+        # Ao virar o nível 0, desce primeiro o conteúdo dos níveis superiores
+        if not tick & self._mask:
+            level = 1
+            while level < len(self._levels):
+                self._cascade(level)
+                if (tick >> (self._bits * level)) & self._mask:
+                    break
+                level += 1
+        wheel = self._levels[0]
+        index = tick & self._mask
+        due = wheel[index]
+        if not due:
+            return []
+        wheel[index] = {}
+        return list(due)  # o dict antigo continua como `_slot` até o disparo
+
+    def advance(self, now: Optional[float] = None) -> int:
+        """Avança a roda até `now` (padrão: relógio atual) e dispara os vencidos"""
+        if now is None:
+            now = self.clock()
+        target = int((now - self._origin) / self.tick)
+        fired = 0
+        while self.current_tick < target:
+            for timer in self._step():
+                if timer._slot is None:
+                    continue  # cancelado por um callback anterior do mesmo tick
+                timer._slot = None
+                self._count -= 1
+                fired += 1
+                timer.callback(*timer.args)
+        return fired
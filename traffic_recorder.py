@@ -0,0 +1,194 @@
+"""
+Gravação do tráfego real das rotas, para reproduzi-lo depois (replay_traffic.py).
+
+TrafficRecorder é um middleware opcional de main.py (UNO_TRAFFIC_RECORD=<arquivo>).
+Cada requisição vira um registro binário com:
+- o instante em relação ao início da gravação e a latência observada;
+- o status;
+- o método, o caminho com a query e os cabeçalhos que mudam a resposta;
+- o corpo da requisição;
+- um resumo (blake2b de 8 bytes) do corpo da resposta.
+
+Jogos criados sem `semente` recebem uma semente sorteada pelo gravador,
+colocada na query antes da rota. Ela fica gravada junto com a requisição.
+Na reprodução, o jogo é embaralhado do mesmo jeito e as respostas podem ser
+comparadas pelo resumo.
+
+Layout (little-endian):
+    cabeçalho  LOG_HEADER: magic, versão do formato, epoch do início da gravação
+    registros  RECORD seguido do caminho, dos cabeçalhos e do corpo
+"""
+import os
+import random
+import struct
+import time
+from hashlib import blake2b
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+from fastapi import Request
+
+MAGIC = b"UT"
+FORMAT_VERSION = 1
+LOG_HEADER = struct.Struct("<2sBxd")  # magic, versão, epoch do início
+# instante, latência (s), status, resumo da resposta, método, tamanhos do caminho, cabeçalhos e corpo
+RECORD = struct.Struct("<dfH8sBHHI")
+DIGEST_SIZE = 8
+
+METHODS = ("GET", "POST", "PUT", "DELETE", "PATCH", "HEAD")
+RECORDED_HEADERS = ("accept", "content-type", "idempotency-key")
+# Rotas que criam jogos: recebem a semente do gravador quando o cliente não mandou uma
+SEEDED_ROUTES = (("GET", "/novoJogo"), ("POST", "/v2/jogos"))
+SEED_PARAM = "semente"
+SKIPPED_SUFFIXES = ("/espectar",)  # SSE: a resposta só termina quando o cliente sai
+FLUSH_EVERY = 256  # registros entre flushes do arquivo
+
+
+class TrafficFormatError(ValueError):
+    """Arquivo que não é uma gravação de tráfego desta versão do formato"""
+
+
+class TrafficRecord(NamedTuple):
+    offset: float     # segundos desde o início da gravação
+    latency: float    # segundos até o fim do corpo da resposta
+    status: int
+    digest: bytes     # resumo do corpo da resposta
+    method: str
+    target: str       # caminho com a query
+    headers: Tuple[Tuple[str, str], ...]
+    body: bytes
+
+
+def response_digest(body: bytes = b"") -> "blake2b":
+    """Resumo incremental usado na gravação e na comparação das respostas"""
+    return blake2b(body, digest_size=DIGEST_SIZE)
+
+
+def encode_record(record: TrafficRecord) -> bytes:
+    target = record.target.encode()
+    headers = "\n".join(f"{name}:{value}" for name, value in record.headers).encode()
+    return RECORD.pack(record.offset, record.latency, record.status, record.digest,
+                       METHODS.index(record.method), len(target), len(headers), len(record.body)) \
+        + target + headers + record.body
+
+
+def read_traffic(path: str) -> Tuple[float, List[TrafficRecord]]:
+    """(epoch do início, registros na ordem em que as requisições chegaram)"""
+    with open(path, "rb") as file:
+        data = file.read()
+    if len(data) < LOG_HEADER.size:
+        raise TrafficFormatError("Gravação truncada")
+    magic, format_version, started_at = LOG_HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise TrafficFormatError("Não é uma gravação de tráfego")
+    if format_version != FORMAT_VERSION:
+        raise TrafficFormatError(f"Versão do formato não suportada: {format_version}")
+    records = []
+    offset = LOG_HEADER.size
+    while offset < len(data):
+        if offset + RECORD.size > len(data):
+            break  # último registro cortado (servidor derrubado no meio da escrita)
+        moment, latency, status, digest, method, target_size, headers_size, body_size = \
+            RECORD.unpack_from(data, offset)
+        start = offset + RECORD.size
+        end = start + target_size + headers_size + body_size
+        if end > len(data):
+            break
+        target = data[start:start + target_size].decode()
+        headers = data[start + target_size:start + target_size + headers_size].decode()
+        records.append(TrafficRecord(
+            moment, latency, status, digest, METHODS[method], target,
+            tuple(tuple(line.split(":", 1)) for line in headers.split("\n")) if headers else (),
+            data[end - body_size:end]
+        ))
+        offset = end
+    records.sort(key=lambda record: record.offset)  # gravados ao terminar; reproduzidos na ordem de chegada
+    return started_at, records
+
+
+class TrafficRecorder:
+    """Middleware HTTP que grava cada requisição atendida em `path`"""
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.perf_counter,
+                 rng: Optional[random.Random] = None):
+        self.path = path
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._file = None  # aberto na primeira requisição
+        self._started = 0.0
+        self._pending = 0
+        self.recorded = 0
+        self.seeds_injected = 0
+        self.bytes_written = 0
+
+    def _open(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, "wb")
+        self._file.write(LOG_HEADER.pack(MAGIC, FORMAT_VERSION, time.time()))
+        self._started = self._clock()
+
+    def _inject_seed(self, request: Request) -> None:
+        """Sorteia a semente do jogo criado, se o cliente não fixou uma"""
+        if (request.method, request.url.path) not in SEEDED_ROUTES or SEED_PARAM in request.query_params:
+            return
+        query = request.scope["query_string"]
+        seed = f"{SEED_PARAM}={self._rng.getrandbits(31)}".encode()
+        request.scope["query_string"] = query + b"&" + seed if query else seed
+        self.seeds_injected += 1
+
+    def _write(self, record: TrafficRecord) -> None:
+        if self._file is None:
+            return  # resposta terminada depois do close (desligamento)
+        data = encode_record(record)
+        self._file.write(data)
+        self.bytes_written += len(data)
+        self.recorded += 1
+        self._pending += 1
+        if self._pending >= FLUSH_EVERY:
+            self.flush()
+
+    async def __call__(self, request: Request, call_next):
+        if request.url.path.endswith(SKIPPED_SUFFIXES) or request.method not in METHODS:
+            return await call_next(request)
+        if self._file is None:
+            self._open()
+        self._inject_seed(request)
+        body = b"" if request.method in ("GET", "HEAD") else await request.body()
+        query = request.scope["query_string"].decode()
+        target = request.url.path + ("?" + query if query else "")
+        headers = tuple((name, request.headers[name]) for name in RECORDED_HEADERS if name in request.headers)
+        started = self._clock()
+        response = await call_next(request)
+        content = response.body_iterator
+
+        async def recorded_body():
+            # O registro é gravado quando o corpo termina: a latência inclui a serialização
+            digest = response_digest()
+            async for chunk in content:
+                digest.update(chunk)
+                yield chunk
+            finished = self._clock()
+            self._write(TrafficRecord(started - self._started, finished - started, response.status_code,
+                                      digest.digest(), request.method, target, headers, body))
+
+        response.body_iterator = recorded_body()
+        return response
+
+    def flush(self) -> None:
+        if self._file is not None:
+            self._file.flush()
+            self._pending = 0
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def get_metrics(self) -> dict:
+        return {
+            "arquivo": self.path,
+            "requisicoes_gravadas": self.recorded,
+            "sementes_sorteadas": self.seeds_injected,
+            "bytes_gravados": self.bytes_written
+        }
@@ -0,0 +1,339 @@
+"""
+Ambiente vetorizado de treino (API no estilo Gym) com as regras de produção.
+
+Cada VectorEnv mantém N partidas. O agente joga sempre no assento 0 e os
+demais assentos seguem a política padrão das simulações (carta jogável
+aleatória, curinga na cor mais comum da mão). `reset()` e `step(actions)`
+operam sobre as N partidas de uma vez. Partidas terminadas são reiniciadas
+automaticamente, e a observação devolvida já é a da partida nova.
+
+As partidas rodam no motor de códigos de face da busca de sugestões
+(move_search.Simulation). Ele usa as tabelas de legalidade do RulesEngine, as
+mesmas que CardFacade.can_play_card consulta, e a ordem de turnos do
+GameManager. Assim um passo não cria objetos Card, dicts de resultado nem
+modelos pydantic.
+
+Observações, máscaras de ações, recompensas e fins de partida são escritos em
+buffers NumPy pré-alocados. Com `workers`, os buffers ficam em memória
+compartilhada (multiprocessing.shared_memory), e cada processo avança uma
+faixa contígua de partidas, escrevendo direto nas linhas dela.
+
+Observação (int16, uma linha por partida):
+    [0, 54)       cópias de cada face na mão do agente
+    [54, 108)     face do topo do descarte (one-hot)
+    [108, 114)    slot da cor atual (one-hot, ver rules.color_slot)
+    114           compra acumulada pendente
+    115           direção (1 = horário, -1 = anti-horário)
+    116           cartas no monte
+    117 + i       cartas na mão do assento i
+
+Ações (N_ACTIONS = 61):
+    0-51          jogar a face colorida de mesmo código
+    52-55         jogar o curinga na cor PLAYABLE_COLORS[ação - 52]
+    56-59         jogar o +4 na cor PLAYABLE_COLORS[ação - 56]
+    60            passar a vez
+
+Recompensa: +1 quando o agente vence, -1 quando outro assento vence, 0 nos
+demais passos (inclusive partidas cortadas em `max_turns`).
+
+NumPy é opcional: sem ele o módulo importa, mas `VectorEnv` não pode ser criado.
+"""
+import random
+from multiprocessing import get_context, shared_memory
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depende do ambiente
+    np = None
+
+from card_catalog import CARD_FACES, PLAYABLE_COLORS, WILD_CODE, WILD_DRAW_FOUR_CODE
+from move_search import PASS, Candidate, Simulation, _IS_WILD, _N_COLOR_SLOTS
+from rules import Ruleset, STANDARD
+
+N_FACES = len(CARD_FACES)
+N_COLORS = len(PLAYABLE_COLORS)
+AGENT_SEAT = 0
+DEFAULT_MAX_TURNS = 500
+
+# Ação -> candidata do motor de simulação
+ACTIONS: Tuple[Candidate, ...] = (
+    tuple((code, None) for code in range(N_FACES) if not _IS_WILD[code])
+    + tuple((WILD_CODE, slot) for slot in range(N_COLORS))
+    + tuple((WILD_DRAW_FOUR_CODE, slot) for slot in range(N_COLORS))
+    + ((PASS, None),)
+)
+N_ACTIONS = len(ACTIONS)
+PASS_ACTION = N_ACTIONS - 1
+# Primeira ação de cada face (curingas: uma por cor a partir dela)
+_FIRST_ACTION = tuple(ACTIONS.index((code, 0 if _IS_WILD[code] else None)) for code in range(N_FACES))
+
+OBS_HAND = 0
+OBS_TOP = OBS_HAND + N_FACES
+OBS_COLOR = OBS_TOP + N_FACES
+OBS_PENDING = OBS_COLOR + _N_COLOR_SLOTS
+OBS_DIRECTION = OBS_PENDING + 1
+OBS_DECK = OBS_DIRECTION + 1
+OBS_HAND_SIZES = OBS_DECK + 1
+
+
+def observation_size(player_count: int) -> int:
+    return OBS_HAND_SIZES + player_count
+
+
+def _buffer_layout(num_envs: int, player_count: int) -> Dict[str, Tuple[str, tuple]]:
+    """nome -> (dtype, formato) dos buffers"""
+    return {
+        "observations": ("<i2", (num_envs, observation_size(player_count))),
+        "action_masks": ("?", (num_envs, N_ACTIONS)),
+        "rewards": ("<f4", (num_envs,)),
+        "dones": ("?", (num_envs,)),
+        "actions": ("<i8", (num_envs,)),
+    }
+
+
+class _Shard:
+    """Faixa [start, stop) das partidas, escrevendo nas linhas correspondentes dos buffers"""
+
+    def __init__(self, buffers: Dict[str, "np.ndarray"], start: int, stop: int, player_count: int,
+                 ruleset: Ruleset, max_turns: int):
+        self.buffers = buffers
+        self.start = start
+        self.stop = stop
+        self.player_count = player_count
+        self.ruleset = ruleset
+        self.max_turns = max_turns
+        self.games: List[Simulation] = []
+        self.turns: List[int] = []
+
+    def reset(self, seed: Optional[int]) -> None:
+        self.games = []
+        self.turns = []
+        for index in range(self.start, self.stop):
+            # Uma semente por partida: o resultado não depende da divisão entre processos
+            rng = random.Random(None if seed is None else seed * 1_000_003 + index)
+            self.games.append(Simulation.deal(self.player_count, self.ruleset, rng))
+            self.turns.append(0)
+            self._write(index)
+        self.buffers["rewards"][self.start:self.stop] = 0
+        self.buffers["dones"][self.start:self.stop] = False
+
+    def _write(self, index: int) -> None:
+        """Observação e máscara de ações do agente na partida `index`"""
+        game = self.games[index - self.start]
+        hand = game.hands[AGENT_SEAT]
+        row = [0] * (OBS_HAND_SIZES + self.player_count)
+        for code in hand:
+            row[OBS_HAND + code] += 1
+        row[OBS_TOP + game.top] = 1
+        row[OBS_COLOR + game.color] = 1
+        row[OBS_PENDING] = game.pending
+        row[OBS_DIRECTION] = game.direction
+        row[OBS_DECK] = len(game.deck)
+        for seat, seat_hand in enumerate(game.hands):
+            row[OBS_HAND_SIZES + seat] = len(seat_hand)
+        self.buffers["observations"][index] = row
+
+        mask = [False] * N_ACTIONS
+        mask[PASS_ACTION] = True
+        for i in game.legal(AGENT_SEAT):
+            first = _FIRST_ACTION[hand[i]]
+            if _IS_WILD[hand[i]]:
+                mask[first:first + N_COLORS] = [True] * N_COLORS
+            else:
+                mask[first] = True
+        self.buffers["action_masks"][index] = mask
+
+    def _opponents(self, game: Simulation, turns: int) -> int:
+        """Joga pelos outros assentos até a vez voltar ao agente (ou a partida acabar)"""
+        while game.winner is None and game.current != AGENT_SEAT and turns < self.max_turns:
+            playable = game.legal(game.current)
+            if playable:
+                index = playable[int(game.rng.random() * len(playable))]
+                hand = game.hands[game.current]
+                game.play(index, game._favourite_color(hand) if _IS_WILD[hand[index]] else None)
+            else:
+                game.pass_turn()
+            turns += 1
+        return turns
+
+    def step(self) -> None:
+        actions = self.buffers["actions"]
+        rewards = self.buffers["rewards"]
+        dones = self.buffers["dones"]
+        for index in range(self.start, self.stop):
+            offset = index - self.start
+            game = self.games[offset]
+            game.apply(ACTIONS[actions[index]])
+            turns = self._opponents(game, self.turns[offset] + 1)
+
+            reward = 0.0
+            if game.winner is not None:
+                reward = 1.0 if game.winner == AGENT_SEAT else -1.0
+            done = game.winner is not None or turns >= self.max_turns
+            if done:
+                self.games[offset] = Simulation.deal(self.player_count, self.ruleset, game.rng)
+                turns = 0
+            self.turns[offset] = turns
+            rewards[index] = reward
+            dones[index] = done
+            self._write(index)
+
+
+def _worker(connection, layout, names, start, stop, player_count, ruleset, max_turns) -> None:
+    """Processo que avança as partidas [start, stop) sobre os buffers compartilhados"""
+    blocks, buffers = [], {}
+    for name, (dtype, shape) in layout.items():
+        block = shared_memory.SharedMemory(name=names[name])
+        blocks.append(block)
+        buffers[name] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+    shard = _Shard(buffers, start, stop, player_count, ruleset, max_turns)
+    try:
+        while True:
+            command, seed = connection.recv()
+            if command == "close":
+                break
+            try:
+                if command == "reset":
+                    shard.reset(seed)
+                else:
+                    shard.step()
+                connection.send(None)
+            except Exception as e:
+                connection.send(e)
+    finally:
+        buffers.clear()  # solta as views antes de fechar os blocos
+        for block in blocks:
+            block.close()
+        connection.close()
+
+
+class VectorEnv:
+    """
+    N partidas avançadas em lote. Os arrays `observations`, `action_masks`,
+    `rewards` e `dones` são reescritos a cada chamada (não são cópias).
+    """
+
+    def __init__(self, num_envs: int, player_count: int = 2, ruleset: Ruleset = STANDARD,
+                 workers: int = 0, max_turns: int = DEFAULT_MAX_TURNS):
+        if np is None:
+            raise RuntimeError("numpy não está instalado")
+        if num_envs < 1:
+            raise ValueError("num_envs deve ser ao menos 1")
+        if not 2 <= player_count <= 10:
+            raise ValueError("Número de jogadores deve ser entre 2 e 10")
+        self.num_envs = num_envs
+        self.player_count = player_count
+        self.ruleset = ruleset
+        self.max_turns = max_turns
+        self.workers = min(workers, num_envs)
+        self.steps = 0
+        self.episodes = 0
+        layout = _buffer_layout(num_envs, player_count)
+
+        self._blocks: List[shared_memory.SharedMemory] = []
+        self._processes = []
+        self._connections = []
+        self._shard: Optional[_Shard] = None
+        if self.workers:
+            buffers = {}
+            for name, (dtype, shape) in layout.items():
+                block = shared_memory.SharedMemory(create=True, size=np.dtype(dtype).itemsize * int(np.prod(shape)))
+                self._blocks.append(block)
+                buffers[name] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+            names = {name: block.name for name, block in zip(layout, self._blocks)}
+            context = get_context()
+            bounds = [num_envs * i // self.workers for i in range(self.workers + 1)]
+            for start, stop in zip(bounds, bounds[1:]):
+                parent, child = context.Pipe()
+                process = context.Process(
+                    target=_worker, daemon=True,
+                    args=(child, layout, names, start, stop, player_count, ruleset, max_turns)
+                )
+                process.start()
+                child.close()
+                self._processes.append(process)
+                self._connections.append(parent)
+        else:
+            buffers = {name: np.zeros(shape, dtype=dtype) for name, (dtype, shape) in layout.items()}
+            self._shard = _Shard(buffers, 0, num_envs, player_count, ruleset, max_turns)
+
+        self._buffers = buffers
+        self.observations = buffers["observations"]
+        self.action_masks = buffers["action_masks"]
+        self.rewards = buffers["rewards"]
+        self.dones = buffers["dones"]
+
+    def _run(self, command: str, seed: Optional[int] = None) -> None:
+        """Executa o comando em todas as faixas (no próprio processo ou nos workers)"""
+        if self._shard is not None:
+            if command == "reset":
+                self._shard.reset(seed)
+            else:
+                self._shard.step()
+            return
+        for connection in self._connections:
+            connection.send((command, seed))
+        errors = [connection.recv() for connection in self._connections]
+        for error in errors:
+            if error is not None:
+                raise error
+
+    def reset(self, seed: Optional[int] = None) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Começa N partidas novas; devolve (observações, máscaras de ações)"""
+        self._run("reset", seed)
+        return self.observations, self.action_masks
+
+    def step(self, actions) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray", "np.ndarray"]:
+        """
+        Aplica uma ação por partida e joga pelos adversários até a vez voltar ao agente
+        Devolve (observações, máscaras, recompensas, fins de partida)
+        ValueError se alguma ação não estiver liberada na máscara
+        """
+        actions = np.asarray(actions)
+        if actions.shape != (self.num_envs,):
+            raise ValueError(f"Esperadas {self.num_envs} ações")
+        if ((actions < 0) | (actions >= N_ACTIONS)).any() or \
+                not self.action_masks[np.arange(self.num_envs), actions].all():
+            raise ValueError("Ação não permitida pela máscara")
+        self._buffers["actions"][:] = actions
+        self._run("step")
+        self.steps += self.num_envs
+        self.episodes += int(self.dones.sum())
+        return self.observations, self.action_masks, self.rewards, self.dones
+
+    def close(self) -> None:
+        """Encerra os processos e libera a memória compartilhada"""
+        for connection in self._connections:
+            try:
+                connection.send(("close", None))
+            except OSError:
+                pass
+        for process in self._processes:
+            process.join(timeout=5)
+        for connection in self._connections:
+            connection.close()
+        self._processes, self._connections = [], []
+        self.observations = self.action_masks = self.rewards = self.dones = None
+        self._buffers = {}
+        for block in self._blocks:
+            try:
+                block.close()
+            except BufferError:
+                pass  # o chamador ainda guarda arrays apontando para o bloco
+            block.unlink()
+        self._blocks = []
+
+    def __enter__(self) -> 'VectorEnv':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def get_metrics(self) -> Dict:
+        return {
+            "partidas": self.num_envs,
+            "processos": self.workers,
+            "passos": self.steps,
+            "partidas_concluidas": self.episodes
+        }
@@ -0,0 +1,84 @@
+from typing import Dict, Optional
+
+from models import GameState
+from observer_pattern import Observer, GameEvent, GameEventType
+from timing_wheel import HierarchicalTimingWheel, Timer
+
+DEFAULT_TURN_TIMEOUT = 60.0     # segundos para o jogador da vez agir
+DEFAULT_IDLE_TIMEOUT = 1800.0   # segundos sem jogadas até o jogo ser encerrado
+
+_ACTIVITY_EVENTS = (GameEventType.GAME_CREATED, GameEventType.CARD_PLAYED, GameEventType.TURN_PASSED,
+                    GameEventType.GAME_IMPORTED)
+# Jogos exportados continuam em outro processo: os prazos passam a ser de lá
+_END_EVENTS = (GameEventType.GAME_FINISHED, GameEventType.GAME_ABANDONED, GameEventType.GAME_EXPORTED)
+
+
+class TurnTimeoutService(Observer):
+    """
+    Observer que mantém dois temporizadores por jogo na roda de tempo:
+    - prazo da vez: ao expirar, a vez é passada automaticamente (TURN_TIMED_OUT);
+    - inatividade: sem jogadas de nenhum jogador, o jogo é encerrado (GAME_ABANDONED).
+
+    Cada evento custa um cancelamento e um agendamento O(1); nenhuma varredura
+    de `GameManager.games` é feita. Passagens forçadas não contam como atividade,
+    então uma mesa sem ninguém acaba encerrada pelo prazo de inatividade.
+    """
+    def __init__(self, manager, wheel: Optional[HierarchicalTimingWheel] = None,
+                 turn_timeout: float = DEFAULT_TURN_TIMEOUT,
+                 idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        self.manager = manager
+        self.wheel = wheel if wheel is not None else HierarchicalTimingWheel()
+        self.turn_timeout = turn_timeout
+        self.idle_timeout = idle_timeout
+        self._turn_timers: Dict[int, Timer] = {}
+        self._idle_timers: Dict[int, Timer] = {}
+        self.turns_timed_out = 0
+        self.games_reaped = 0
+
+    def update(self, game_state: GameState):
+        pass
+
+    def on_event(self, event: GameEvent):
+        game_id = event.game_id
+        if event.type in _END_EVENTS:
+            self.wheel.cancel(self._turn_timers.pop(game_id, None))
+            self.wheel.cancel(self._idle_timers.pop(game_id, None))
+            return
+
+        # Toda mudança de vez (inclusive a forçada) reinicia o prazo da vez
+        self.wheel.cancel(self._turn_timers.get(game_id))
+        self._turn_timers[game_id] = self.wheel.schedule(
+            self.turn_timeout, self._turn_expired, game_id, event.version
+        )
+        if event.type in _ACTIVITY_EVENTS:
+            self.wheel.cancel(self._idle_timers.get(game_id))
+            self._idle_timers[game_id] = self.wheel.schedule(
+                self.idle_timeout, self._game_idle, game_id
+            )
+
+    def _turn_expired(self, game_id: int, version: int) -> None:
+        self._turn_timers.pop(game_id, None)
+        game = self.manager.get_game_state(game_id)
+        if game is None or game.version != version:
+            return
+        try:
+            self.manager.expirar_vez(game_id)
+        except ValueError:
+            return
+        self.turns_timed_out += 1
+
+    def _game_idle(self, game_id: int) -> None:
+        self._idle_timers.pop(game_id, None)
+        try:
+            self.manager.encerrar_jogo(game_id)
+        except ValueError:
+            return
+        self.games_reaped += 1
+
+    def tick(self, now: Optional[float] = None) -> int:
+        """Avança a roda até `now`; retorna quantos temporizadores dispararam"""
+        return self.wheel.advance(now)
+
+    def __len__(self) -> int:
+        """Quantidade de jogos com prazo de vez ativo"""
+        return len(self._turn_timers)